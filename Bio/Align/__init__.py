@@ -59,6 +59,111 @@ AlignmentCounts = collections.namedtuple(
     "AlignmentCounts", ["gaps", "identities", "mismatches"]
 )
 
+# Number of matrix elements processed at a time when counting letters in the
+# character matrix of an alignment, to limit the size of temporary arrays.
+_matrix_chunk_size = 1 << 22
+
+
+def _find_first_letters(data):
+    """Find where each letter first appears in a uint8 character matrix (PRIVATE).
+
+    Returns a dictionary mapping each letter code to twice its index in the
+    flattened matrix plus one.
+    """
+    length = data.shape[1]
+    number = np.count_nonzero(np.bincount(data.ravel(), minlength=256))
+    first = {}
+    for i, row in enumerate(data):
+        if len(first) == number:
+            break
+        values, indices = np.unique(row, return_index=True)
+        for value, index in zip(values, indices):
+            if value not in first:
+                first[value] = 2 * (i * length + index) + 1
+    return first
+
+
+def _count_frequencies(data, weights, codes):
+    """Return the weighted frequency of each letter in each column (PRIVATE).
+
+    Arguments:
+     - data    - uint8 character matrix, with one row for each sequence.
+     - weights - NumPy array with the weight of each row.
+     - codes   - letters to be included in the dictionary, in order.
+
+    """
+    n, length = data.shape
+    lookup = np.zeros(256, np.intp)
+    lookup[codes] = np.arange(len(codes))
+    columns = np.arange(length)
+    frequencies = np.zeros(len(codes) * length)
+    if (weights == 1.0).all():
+        size = len(frequencies)
+        step = max(1, _matrix_chunk_size // max(length, 1))
+        for i in range(0, n, step):
+            indices = lookup[data[i : i + step]] * length + columns
+            frequencies += np.bincount(indices.ravel(), minlength=size)
+    else:
+        # add the weights row by row to get the same rounding as in a loop
+        for row, weight in zip(data, weights):
+            frequencies[lookup[row] * length + columns] += weight
+    frequencies = frequencies.reshape(len(codes), length)
+    return {chr(code): row for code, row in zip(codes, frequencies)}
+
+
+def _count_substitutions(data, gaps, letters):
+    """Count the letter pairs in each column of a character matrix (PRIVATE).
+
+    Returns a square array with the number of times letters[i1] in an upper
+    row is aligned to letters[i2] in a lower row of the same column; gaps
+    (where the boolean matrix gaps is True) are skipped.
+    """
+    k = len(letters)
+    lookup = np.full(256, k, np.intp)
+    lookup[np.frombuffer(letters.encode("latin-1"), np.uint8)] = np.arange(k)
+    n, length = data.shape
+    # For each pair of rows i1 < i2 of a column, add 1 to m[c1, c2], where
+    # c1 and c2 are the letters in rows i1 and i2.  For each letter c1, the
+    # number of rows above row i2 containing c1 is found by a cumulative
+    # sum over the rows; these numbers are then summed by the letter c2.
+    counts = np.zeros((k, k + 1))
+    step = max(1, _matrix_chunk_size // max(n, 1))
+    for j in range(0, length, step):
+        indices = lookup[data[:, j : j + step]]
+        indices[gaps[:, j : j + step]] = k
+        for c1 in np.unique(indices):
+            if c1 == k:
+                continue
+            found = indices == c1
+            above = np.cumsum(found, axis=0) - found
+            counts[c1] += np.bincount(indices.ravel(), above.ravel(), minlength=k + 1)
+    return counts[:, :k]
+
+
+def _count_pairs(data):
+    """Count gaps, identities, and mismatches over all pairs of rows (PRIVATE)."""
+    n, length = data.shape
+    # Count the letters in each column
+    codes = np.flatnonzero(np.bincount(data.ravel(), minlength=256))
+    lookup = np.zeros(256, np.intp)
+    lookup[codes] = np.arange(len(codes))
+    columns = np.arange(length)
+    size = len(codes) * length
+    counts = np.zeros(size, np.int64)
+    step = max(1, _matrix_chunk_size // max(length, 1))
+    for i in range(0, n, step):
+        indices = lookup[data[i : i + step]] * length + columns
+        counts += np.bincount(indices.ravel(), minlength=size)
+    counts = counts.reshape(len(codes), length)
+    letters = codes != ord("-")
+    # number of pairs of letters in each column (excluding gaps):
+    pairs = counts[letters].sum(0)
+    pairs = pairs * (pairs - 1) // 2
+    identities = int((counts[letters] * (counts[letters] - 1) // 2).sum())
+    gaps = int(n * (n - 1) // 2 * length - pairs.sum())
+    mismatches = int(pairs.sum()) - identities
+    return AlignmentCounts(gaps, identities, mismatches)
+
 
 class MultipleSeqAlignment:
     """Represents a classical multiple sequence alignment (MSA).
@@ -1141,10 +1246,24 @@ class Alignment:
                     )
         self.coordinates = coordinates
 
-    def __array__(self, dtype=None):
+    def __array__(self, dtype=None, copy=None):
+        # The matrix is created on each call, so it never needs to be copied
+        data, gaps = self._get_matrix()
+        data = data.view("S1")
+        if dtype is not None:
+            data = np.asarray(data, dtype)
+        return data
+
+    def _get_matrix(self):
+        """Return the alignment as a uint8 matrix, and a boolean gap matrix (PRIVATE).
+
+        The matrix has one row for each sequence and one column for each
+        column of the alignment, with gaps stored as dashes.  The matrices are
+        created from the current sequences and coordinates on each call.
+        """
         coordinates = self.coordinates.copy()
         sequences = list(self.sequences)
-        steps = np.diff(self.coordinates, 1)
+        steps = np.diff(coordinates, 1)
         aligned = sum(steps != 0, 0) > 1
         # True for steps in which at least two sequences align, False if a gap
         for i, sequence in enumerate(sequences):
@@ -1157,17 +1276,24 @@ class Alignment:
                 steps[i, :] = -steps[i, :]
             else:
                 raise ValueError(f"Inconsistent steps in row {i}")
-        gaps = steps.max(0)
-        if not ((steps == gaps) | (steps <= 0)).all():
+        widths = steps.max(0)
+        if not ((steps == widths) | (steps <= 0)).all():
             raise ValueError("Unequal step sizes in alignment")
-        n = len(steps)
-        m = sum(gaps)
-        data = np.empty((n, m), "S1")
-        for i in range(n):
-            sequence = sequences[i]
+        gaps = np.repeat(steps <= 0, widths, axis=1)
+        data = np.full(gaps.shape, ord("-"), np.uint8)
+        for i, sequence in enumerate(sequences):
             k = coordinates[i, 0]
+            if (steps[i] >= 0).all():
+                # the aligned letters form a contiguous subsequence
+                j = coordinates[i, -1]
+                try:
+                    subsequence = bytes(sequence[k:j])
+                except TypeError:  # str
+                    subsequence = bytes(sequence[k:j], "UTF8")
+                data[i, ~gaps[i]] = np.frombuffer(subsequence, np.uint8)
+                continue
             m = 0
-            for step, gap in zip(steps[i], gaps):
+            for step, width in zip(steps[i], widths):
                 if step > 0:
                     j = k + step
                     n = m + step
@@ -1175,18 +1301,13 @@ class Alignment:
                         subsequence = bytes(sequence[k:j])
                     except TypeError:  # str
                         subsequence = bytes(sequence[k:j], "UTF8")
-                    data[i, :].data.cast("B")[m:n] = subsequence
+                    data[i, m:n] = np.frombuffer(subsequence, np.uint8)
                     k = j
                     m = n
-                elif step < 0:
+                else:
                     k += step
-                else:  # step == 0
-                    n = m + gap
-                    data[i, m:n] = b"-"
-                    m = n
-        if dtype is not None:
-            data = np.array(data, dtype)
-        return data
+                    m += width
+        return data, gaps
 
     def __add__(self, other):
         """Combine two alignments by adding them row-wise.
@@ -1346,64 +1467,24 @@ class Alignment:
         >>> alignment.frequencies
         {'G': array([2., 0., 0., 0., 0., 0., 2.]), 'A': array([0., 2., 0., 0., 0., 0., 0.]), 'C': array([0., 0., 1., 1., 0., 1., 0.]), 'T': array([0., 0., 0., 0., 2., 0., 0.]), '-': array([0., 0., 1., 1., 0., 1., 0.])}
         """
-        coordinates = self.coordinates.copy()
-        sequences = list(self.sequences)
-        steps = np.diff(self.coordinates, 1)
-        aligned = sum(steps != 0, 0) > 1
-        # True for steps in which at least two sequences align, False if a gap
-        for i, sequence in enumerate(sequences):
-            row = steps[i, aligned]
-            if (row >= 0).all():
-                pass
-            elif (row <= 0).all():
-                sequences[i] = reverse_complement(sequence)
-                coordinates[i, :] = len(sequence) - coordinates[i, :]
-                steps[i, :] = -steps[i, :]
-            else:
-                raise ValueError(f"Inconsistent steps in row {i}")
-        gaps = steps.max(0)
-        if not ((steps == gaps) | (steps <= 0)).all():
-            raise ValueError("Unequal step sizes in alignment")
-        n = len(steps)
-        length = sum(gaps)
-        counts = {}
-        for i in range(n):
-            sequence = sequences[i]
+        data, gaps = self._get_matrix()
+        n, length = data.shape
+        weights = np.ones(n)
+        for i, sequence in enumerate(self.sequences):
             try:
-                weight = sequence.annotations.get("weight", 1.0)
+                weights[i] = sequence.annotations.get("weight", 1.0)
             except AttributeError:
-                weight = 1.0
-            k = coordinates[i, 0]
-            m = 0
-            for step, gap in zip(steps[i], gaps):
-                if step > 0:
-                    j = k + step
-                    n = m + step
-                    try:
-                        subsequence = bytes(sequence[k:j])
-                    except TypeError:  # str
-                        subsequence = bytes(sequence[k:j], "UTF8")
-                    for index, letter in zip(range(m, n), subsequence):
-                        character = chr(letter)
-                        row = counts.get(character)
-                        if row is None:
-                            row = np.zeros(length)
-                            counts[character] = row
-                        row[index] += weight
-                    k = j
-                    m = n
-                elif step < 0:
-                    k += step
-                else:  # step == 0
-                    n = m + gap
-                    character = "-"
-                    row = counts.get(character)
-                    if row is None:
-                        row = np.zeros(length)
-                        counts[character] = row
-                    row[m:n] += weight
-                    m = n
-        return counts
+                pass
+        first = _find_first_letters(data)
+        # A gap of zero width also introduces a dash
+        steps = np.diff(self.coordinates, 1)
+        rows, segments = np.nonzero(steps == 0)
+        if len(rows) > 0:
+            starts = np.concatenate([[0], np.cumsum(abs(steps).max(0))])
+            index = 2 * min(rows * length + starts[segments])
+            first[ord("-")] = min(first.get(ord("-"), index), index)
+        codes = sorted(first, key=first.get)
+        return _count_frequencies(data, weights, codes)
 
     @property
     def target(self):
@@ -3524,6 +3605,19 @@ class Alignment:
                 letters.update(s)
         letters = "".join(sorted(letters))
         m = substitution_matrices.Array(letters, dims=2)
+        if max(letters, default="\0") > "\xff":
+            # not representable in the character matrix
+            return self._count_substitutions(m, sequences, coordinates)
+        try:
+            data, gaps = self._get_matrix()
+        except UndefinedSequenceError:
+            # only the aligned parts of the sequences may be defined
+            return self._count_substitutions(m, sequences, coordinates)
+        m[:, :] = _count_substitutions(data, gaps, letters)
+        return m
+
+    @staticmethod
+    def _count_substitutions(m, sequences, coordinates):
         n = len(sequences)
         for i1 in range(n):
             sequence1 = sequences[i1]
@@ -3573,20 +3667,8 @@ class Alignment:
         namedtuple. This is calculated for all the pairs of sequences in the
         alignment.
         """
-        gaps = identities = mismatches = 0
-        for i, seq1 in enumerate(self):
-            for j, seq2 in enumerate(self):
-                if i == j:
-                    # Don't count seq1 vs seq2 and seq2 vs seq1
-                    break
-                for a, b in zip(seq1, seq2):
-                    if a == "-" or b == "-":
-                        gaps += 1
-                    elif a == b:
-                        identities += 1
-                    else:
-                        mismatches += 1
-        return AlignmentCounts(gaps, identities, mismatches)
+        data, gaps = self._get_matrix()
+        return _count_pairs(data)
 
     def reverse_complement(self):
         """Reverse-complement the alignment and return it.
@@ -3756,6 +3838,127 @@ class PairwiseAlignments(AlignmentsAbstractBaseClass):
         self._index = -1
 
 
+class _PathList:
+    """Iterator over a list of alignment paths (PRIVATE).
+
+    This provides the same interface as the path generator returned by the
+    C code, and is used for aligners that return their paths as a list
+    (currently only linear-space alignments).
+    """
+
+    def __init__(self, paths):
+        self._paths = paths
+        self._index = 0
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        index = self._index
+        if index == len(self._paths):
+            raise StopIteration
+        self._index += 1
+        return self._paths[index]
+
+    def reset(self):
+        self._index = 0
+
+
+class QueryProfile:
+    """Query sequence prepared for repeated alignments with a PairwiseAligner.
+
+    Before aligning, the pairwise aligner converts each sequence to an array
+    of indices into its alphabet (or to an array of character codes if the
+    aligner has no alphabet). When one query is
+    aligned against many targets, this conversion can be done once by
+    creating a QueryProfile, which can then be passed as the query to the
+    ``score`` and ``align`` methods of the aligner:
+
+    >>> from Bio import Align
+    >>> aligner = Align.PairwiseAligner(scoring="blastp", mode="local")
+    >>> profile = Align.QueryProfile(aligner, "EVLA")
+    >>> for target in ("KEVLAK", "EVIA", "EFLAD"):
+    ...     print(target, aligner.score(target, profile))
+    ...
+    KEVLAK 17.0
+    EVIA 15.0
+    EFLAD 12.0
+    >>> alignments = aligner.align("KEVLAK", profile)
+    >>> print(alignments[0])
+    target            1 EVLA 5
+                      0 |||| 4
+    query             0 EVLA 4
+    <BLANKLINE>
+
+    The profile stores the substitution matrix, alphabet, and wildcard of the
+    aligner at the time the profile was created; using the profile with an
+    aligner with a different substitution matrix, alphabet, or wildcard raises
+    a ValueError. Other aligner parameters, such as the gap scores and the
+    alignment mode, can be changed freely.
+    """
+
+    def __init__(self, aligner, query):
+        """Initialize the query profile.
+
+        Arguments:
+         - aligner - the PairwiseAligner object that will be used to align
+           sequences to the query.
+         - query   - the query sequence (plain string, bytes, Seq, MutableSeq,
+           or SeqRecord).
+
+        """
+        self.query = query
+        self.substitution_matrix = aligner.substitution_matrix
+        self.alphabet = aligner.alphabet
+        self.wildcard = aligner.wildcard
+        self._indices = {"+": self._convert(query)}
+
+    def _convert(self, sequence):
+        if isinstance(sequence, (Seq, MutableSeq, SeqRecord)):
+            sequence = bytes(sequence)
+        if len(sequence) == 0:
+            raise ValueError("sequence has zero length")
+        alphabet = self.alphabet
+        if alphabet is None:
+            if isinstance(sequence, str):
+                sequence = sequence.encode("utf-32-le")
+                return np.frombuffer(sequence, np.int32).astype(np.intc)
+            return np.frombuffer(sequence, np.uint8).astype(np.intc)
+        if isinstance(alphabet, str) and isinstance(sequence, bytes):
+            sequence = sequence.decode("latin-1")
+        mapping = {letter: index for index, letter in enumerate(alphabet)}
+        try:
+            indices = [mapping[letter] for letter in sequence]
+        except KeyError:
+            raise ValueError("sequence contains letters not in the alphabet") from None
+        return np.array(indices, np.intc)
+
+    def __len__(self):
+        """Return the length of the query sequence."""
+        return len(self._indices["+"])
+
+    def __repr__(self):
+        """Return a representation of the query profile."""
+        return f"<{self.__class__.__name__} for a query of length {len(self)}>"
+
+    def indices(self, strand="+"):
+        """Return the query converted to an array of indices for the aligner.
+
+        If strand is "-", the indices of the reverse complement of the query
+        are returned.
+        """
+        indices = self._indices.get(strand)
+        if indices is None:
+            if strand != "-":
+                raise ValueError("strand must be '+' or '-'")
+            indices = self._convert(reverse_complement(self.query))
+            self._indices[strand] = indices
+        return indices
+
+
 class PairwiseAligner(_pairwisealigner.PairwiseAligner):
     """Performs pairwise sequence alignment using dynamic programming.
 
@@ -3946,31 +4149,57 @@ class PairwiseAligner(_pairwisealigner.PairwiseAligner):
         _pairwisealigner.PairwiseAligner.__setattr__(self, key, value)
 
     def align(self, seqA, seqB, strand="+"):
-        """Return the alignments of two sequences using PairwiseAligner."""
+        """Return the alignments of two sequences using PairwiseAligner.
+
+        The query seqB may be a QueryProfile object created for this aligner.
+        """
         if isinstance(seqA, (Seq, MutableSeq, SeqRecord)):
             sA = bytes(seqA)
         else:
             sA = seqA
-        if strand == "+":
-            sB = seqB
-        else:  # strand == "-":
-            sB = reverse_complement(seqB)
-        if isinstance(seqB, (Seq, MutableSeq, SeqRecord)):
-            sB = bytes(sB)
+        if isinstance(seqB, QueryProfile):
+            sB = self._profile_indices(seqB, strand)
+            seqB = seqB.query
+        else:
+            if strand == "+":
+                sB = seqB
+            else:  # strand == "-":
+                sB = reverse_complement(seqB)
+            if isinstance(seqB, (Seq, MutableSeq, SeqRecord)):
+                sB = bytes(sB)
         score, paths = super().align(sA, sB, strand)
+        if self.linear_space:
+            paths = _PathList(paths)
         alignments = PairwiseAlignments(seqA, seqB, score, paths)
         return alignments
 
     def score(self, seqA, seqB, strand="+"):
-        """Return the alignment score of two sequences using PairwiseAligner."""
+        """Return the alignment score of two sequences using PairwiseAligner.
+
+        The query seqB may be a QueryProfile object created for this aligner.
+        """
         if isinstance(seqA, (Seq, MutableSeq, SeqRecord)):
             seqA = bytes(seqA)
+        if isinstance(seqB, QueryProfile):
+            seqB = self._profile_indices(seqB, strand)
+            return super().score(seqA, seqB, strand)
         if strand == "-":
             seqB = reverse_complement(seqB)
         if isinstance(seqB, (Seq, MutableSeq, SeqRecord)):
             seqB = bytes(seqB)
         return super().score(seqA, seqB, strand)
 
+    def _profile_indices(self, profile, strand):
+        if profile.substitution_matrix is not self.substitution_matrix:
+            raise ValueError(
+                "query profile was created for a different substitution matrix"
+            )
+        if profile.alphabet != self.alphabet:
+            raise ValueError("query profile was created for a different alphabet")
+        if profile.wildcard != self.wildcard:
+            raise ValueError("query profile was created for a different wildcard")
+        return profile.indices(strand)
+
     def __getstate__(self):
         state = {
             "wildcard": self.wildcard,
@@ -3987,6 +4216,7 @@ class PairwiseAligner(_pairwisealigner.PairwiseAligner):
             "query_right_open_gap_score": self.query_right_open_gap_score,
             "query_right_extend_gap_score": self.query_right_extend_gap_score,
             "mode": self.mode,
+            "linear_space": self.linear_space,
         }
         if self.substitution_matrix is None:
             state["match_score"] = self.match_score
@@ -4012,6 +4242,7 @@ class PairwiseAligner(_pairwisealigner.PairwiseAligner):
         self.query_right_open_gap_score = state["query_right_open_gap_score"]
         self.query_right_extend_gap_score = state["query_right_extend_gap_score"]
         self.mode = state["mode"]
+        self.linear_space = state.get("linear_space", False)
         substitution_matrix = state.get("substitution_matrix")
         if substitution_matrix is None:
             self.match_score = state["match_score"]
@@ -4230,6 +4461,7 @@ class CodonAligner(_codonaligner.CodonAligner):
 # fmt: off
 formats = (
     "a2m",        # A2M files created by align2model or hmmscore
+    "bam",        # Binary Alignment/Map (BAM) format
     "bed",        # BED (Browser Extensible Data) files
     "bigbed",     # bigBed format
     "bigmaf",     # MAF file saved as a bigBed file
@@ -4329,6 +4561,53 @@ def parse(source, fmt):
     return alignments
 
 
+def parse_batches(source, fmt, batch_size=100000):
+    """Parse a tabular alignment file and return an iterator over record batches.
+
+    Arguments:
+     - source     - File or file-like object to read from, or filename as string.
+     - fmt        - String describing the file format (case-insensitive).
+                    Currently the "tabular", "psl", and "bed" formats are
+                    supported.
+     - batch_size - Maximum number of records in each batch (default 100000).
+
+    Instead of an Alignment object for each line in the file, this function
+    returns AlignmentBatch objects (defined in Bio.Align.interfaces) storing
+    up to batch_size records in a column-oriented NumPy structured array.
+    Column values are stored as they appear in the file; no coordinate
+    conversion is done. This allows fast, vectorized filtering of large files:
+
+    >>> from Bio import Align
+    >>> for batch in Align.parse_batches("Blat/psl_34_001.psl", "psl", 10):
+    ...     selected = batch[batch["matches"] > 30]
+    ...     print(len(batch), len(selected))
+    10 7
+    10 8
+    2 2
+
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive")
+    module = _load(fmt)
+    if not hasattr(module.AlignmentIterator, "_read_next_batch"):
+        raise ValueError(
+            f"Batch parsing has not yet been implemented for the {fmt} format"
+        )
+    alignments = module.AlignmentIterator(source)
+    return _parse_batches(alignments, batch_size)
+
+
+def _parse_batches(alignments, batch_size):
+    """Iterate over the record batches of an alignment iterator (PRIVATE)."""
+    with alignments:
+        stream = alignments._stream
+        while True:
+            batch = alignments._read_next_batch(stream, batch_size)
+            if batch is None:
+                break
+            yield batch
+
+
 def read(handle, fmt):
     """Parse a file containing one alignment, and return it.
 
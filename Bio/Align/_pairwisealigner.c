@@ -1726,6 +1726,7 @@ typedef struct {
     PyObject* alphabet;
     int* mapping;
     int wildcard;
+    int linear_space;
 } Aligner;
 
 
@@ -1841,6 +1842,7 @@ Aligner_init(Aligner *self, PyObject *args, PyObject *kwds)
     self->alphabet = NULL;
     self->mapping = NULL;
     self->wildcard = -1;
+    self->linear_space = 0;
     return 0;
 }
 
@@ -1928,9 +1930,10 @@ Aligner_str(Aligner* self)
                      self->query_right_extend_gap_score);
     }
     switch (self->mode) {
-        case Global: sprintf(p, "  mode: global\n"); break;
-        case Local: sprintf(p, "  mode: local\n"); break;
+        case Global: p += sprintf(p, "  mode: global\n"); break;
+        case Local: p += sprintf(p, "  mode: local\n"); break;
     }
+    if (self->linear_space) sprintf(p, "  linear_space: True\n");
     s = PyUnicode_FromFormat(text, args[0], args[1], args[2]);
     Py_XDECREF(wildcard);
     return s;
@@ -3724,6 +3727,24 @@ Aligner_set_wildcard(Aligner* self, PyObject* value, void* closure)
 
 static char Aligner_wildcard__doc__[] = "wildcard character";
 
+static PyObject*
+Aligner_get_linear_space(Aligner* self, void* closure)
+{
+    return PyBool_FromLong(self->linear_space);
+}
+
+static int
+Aligner_set_linear_space(Aligner* self, PyObject* value, void* closure)
+{
+    const int linear_space = PyObject_IsTrue(value);
+    if (linear_space < 0) return -1;
+    self->linear_space = linear_space;
+    return 0;
+}
+
+static char Aligner_linear_space__doc__[] =
+"use a divide-and-conquer traceback requiring memory linear in the sequence lengths";
+
 static Algorithm _get_algorithm(Aligner* self)
 {
     Algorithm algorithm = self->algorithm;
@@ -3765,6 +3786,35 @@ Aligner_get_algorithm(Aligner* self, void* closure)
     const char* s = NULL;
     const Mode mode = self->mode;
     const Algorithm algorithm = _get_algorithm(self);
+    if (self->linear_space) {
+        switch (algorithm) {
+            case NeedlemanWunschSmithWaterman:
+                switch (mode) {
+                    case Global:
+                        s = "Hirschberg global alignment algorithm";
+                        break;
+                    case Local:
+                        s = "Hirschberg local alignment algorithm";
+                        break;
+                }
+                break;
+            case Gotoh:
+                switch (mode) {
+                    case Global:
+                        s = "Myers-Miller global alignment algorithm";
+                        break;
+                    case Local:
+                        s = "Myers-Miller local alignment algorithm";
+                        break;
+                }
+                break;
+            case WatermanSmithBeyer:
+            case Unknown:
+            default:
+                break;
+        }
+        if (s) return PyUnicode_FromString(s);
+    }
     switch (algorithm) {
         case NeedlemanWunschSmithWaterman:
             switch (mode) {
@@ -4020,6 +4070,10 @@ static PyGetSetDef Aligner_getset[] = {
         (getter)Aligner_get_wildcard,
         (setter)Aligner_set_wildcard,
         Aligner_wildcard__doc__, NULL},
+    {"linear_space",
+        (getter)Aligner_get_linear_space,
+        (setter)Aligner_set_linear_space,
+        Aligner_linear_space__doc__, NULL},
     {"algorithm",
         (getter)Aligner_get_algorithm,
         (setter)NULL,
@@ -6392,6 +6446,561 @@ Aligner_watermansmithbeyer_local_align_matrix(Aligner* self,
     WATERMANSMITHBEYER_EXIT_ALIGN;
 }
 
+/* --------------- linear-space alignment algorithms --------------- */
+
+/* The linear-space aligner uses a divide-and-conquer approach (Hirschberg,
+ * extended to affine gap scores by Myers and Miller) to find one optimal
+ * alignment without storing the full traceback matrix.  The last step into
+ * a cell is one of the following states:
+ */
+
+#define LS_M 0      /* aligned letters, or the start point */
+#define LS_H 1      /* gap in the target (horizontal step) */
+#define LS_V 2      /* gap in the query (vertical step) */
+#define LS_ANY 3    /* no constraint on the last step */
+
+/* Blocks with fewer cells than this are solved with a full traceback. */
+#define LS_BLOCK_SIZE 4096
+
+typedef struct {
+    const int* sA;
+    const int* sB;
+    int nA;
+    int nB;
+    Mode mode;
+    double epsilon;
+    const double* scores;
+    Py_ssize_t n;
+    double match;
+    double mismatch;
+    int wildcard;
+    /* gap scores, indexed by LEFT (0), INTERNAL (1), and RIGHT (2): */
+    double open_A[3];
+    double extend_A[3];
+    double open_B[3];
+    double extend_B[3];
+    double* rows;            /* six rows of nB+1 scores */
+    unsigned char* traces;   /* traceback for a single block */
+    unsigned char* buffer;   /* steps for a single block, in reverse */
+    unsigned char* steps;    /* steps of the alignment found so far */
+    Py_ssize_t nsteps;
+} LinearSpaceAligner;
+
+#define LS_SELECT(x0, x1, x2) \
+    score = x0; \
+    state = LS_M; \
+    if (x1 > score) { score = x1; state = LS_H; } \
+    if (x2 > score) { score = x2; state = LS_V; }
+
+#define LS_MAX(x0, x1, x2) \
+    (x0 > x1 ? (x0 > x2 ? x0 : x2) : (x1 > x2 ? x1 : x2))
+
+static double
+ls_pair_score(const LinearSpaceAligner* p, int i, int j)
+{
+    const int kA = p->sA[i];
+    const int kB = p->sB[j];
+    if (p->scores) return p->scores[kA*p->n+kB];
+    if (kA == p->wildcard || kB == p->wildcard) return 0;
+    return (kA == kB) ? p->match : p->mismatch;
+}
+
+/* Gap scores depend on whether the gap is at the left end, in the interior,
+ * or at the right end of the full alignment, not of the current block. */
+
+static int
+ls_row_position(const LinearSpaceAligner* p, int i)
+{
+    if (p->mode == Local) return 1;
+    if (i == 0) return 0;
+    if (i == p->nA) return 2;
+    return 1;
+}
+
+static int
+ls_column_position(const LinearSpaceAligner* p, int j)
+{
+    if (p->mode == Local) return 1;
+    if (j == 0) return 0;
+    if (j == p->nB) return 2;
+    return 1;
+}
+
+/* Scores of the best paths from (i0, j0), entered in state start, to each
+ * cell (i1, j) with j0 <= j <= j1, for each state of the last step. */
+static void
+ls_forward(const LinearSpaceAligner* p, int i0, int i1, int j0, int j1,
+           int start, double* M, double* H, double* V)
+{
+    int i, k, c, d;
+    const int n = j1 - j0;
+    double m, v, dm, dh, dv;
+
+    M[0] = (start == LS_M) ? 0 : -DBL_MAX;
+    H[0] = (start == LS_H) ? 0 : -DBL_MAX;
+    V[0] = (start == LS_V) ? 0 : -DBL_MAX;
+    c = ls_row_position(p, i0);
+    for (k = 1; k <= n; k++) {
+        M[k] = -DBL_MAX;
+        V[k] = -DBL_MAX;
+        H[k] = LS_MAX(M[k-1] + p->open_A[c],
+                      H[k-1] + p->extend_A[c],
+                      V[k-1] + p->open_A[c]);
+    }
+    for (i = i0 + 1; i <= i1; i++) {
+        c = ls_row_position(p, i);
+        d = ls_column_position(p, j0);
+        dm = M[0];
+        dh = H[0];
+        dv = V[0];
+        V[0] = LS_MAX(M[0] + p->open_B[d], H[0] + p->open_B[d],
+                      V[0] + p->extend_B[d]);
+        M[0] = -DBL_MAX;
+        H[0] = -DBL_MAX;
+        for (k = 1; k <= n; k++) {
+            d = ls_column_position(p, j0 + k);
+            v = LS_MAX(M[k] + p->open_B[d], H[k] + p->open_B[d],
+                       V[k] + p->extend_B[d]);
+            m = LS_MAX(dm, dh, dv) + ls_pair_score(p, i-1, j0+k-1);
+            dm = M[k];
+            dh = H[k];
+            dv = V[k];
+            M[k] = m;
+            V[k] = v;
+            H[k] = LS_MAX(M[k-1] + p->open_A[c],
+                          H[k-1] + p->extend_A[c],
+                          V[k-1] + p->open_A[c]);
+        }
+    }
+}
+
+/* Scores of the best paths from each cell (i0, j) with j0 <= j <= j1 to
+ * (i1, j1), where the last step into (i1, j1) is in state end, for each
+ * state of the step into (i0, j).  If best is not NULL, also find the
+ * highest-scoring path that starts with aligned letters at any cell in the
+ * block (used to find the start of a local alignment). */
+static void
+ls_backward(const LinearSpaceAligner* p, int i0, int i1, int j0, int j1,
+            int end, double* M, double* H, double* V,
+            double* best, int* ibest, int* jbest)
+{
+    int i, k, c, d;
+    const int n = j1 - j0;
+    double h, v, s, saved;
+    double ho, he, vo, ve;
+
+    M[n] = (end == LS_ANY || end == LS_M) ? 0 : -DBL_MAX;
+    H[n] = (end == LS_ANY || end == LS_H) ? 0 : -DBL_MAX;
+    V[n] = (end == LS_ANY || end == LS_V) ? 0 : -DBL_MAX;
+    c = ls_row_position(p, i1);
+    for (k = n - 1; k >= 0; k--) {
+        h = H[k+1];
+        M[k] = h + p->open_A[c];
+        H[k] = h + p->extend_A[c];
+        V[k] = h + p->open_A[c];
+    }
+    for (i = i1 - 1; i >= i0; i--) {
+        c = ls_row_position(p, i);
+        d = ls_column_position(p, j1);
+        saved = M[n];
+        v = V[n];
+        M[n] = v + p->open_B[d];
+        H[n] = v + p->open_B[d];
+        V[n] = v + p->extend_B[d];
+        for (k = n - 1; k >= 0; k--) {
+            d = ls_column_position(p, j0 + k);
+            s = saved + ls_pair_score(p, i, j0 + k);
+            if (best && s > *best) {
+                *best = s;
+                *ibest = i;
+                *jbest = j0 + k;
+            }
+            saved = M[k];
+            v = V[k];
+            h = H[k+1];
+            ho = h + p->open_A[c];
+            he = h + p->extend_A[c];
+            vo = v + p->open_B[d];
+            ve = v + p->extend_B[d];
+            M[k] = LS_MAX(s, ho, vo);
+            H[k] = LS_MAX(s, he, vo);
+            V[k] = LS_MAX(s, ho, ve);
+        }
+    }
+}
+
+/* Align a small block using a full traceback matrix, and append the steps
+ * of the best path to the alignment. */
+static void
+ls_block(LinearSpaceAligner* p, int i0, int i1, int j0, int j1,
+         int start, int end, double* result)
+{
+    int i, k, c, d, r;
+    int state, pm, ph, pv;
+    const int n = j1 - j0;
+    double score, m, v, dm, dh, dv;
+    double* M = p->rows;
+    double* H = M + p->nB + 1;
+    double* V = H + p->nB + 1;
+    unsigned char* traces = p->traces;
+    unsigned char* buffer = p->buffer;
+    Py_ssize_t nsteps = 0;
+
+    M[0] = (start == LS_M) ? 0 : -DBL_MAX;
+    H[0] = (start == LS_H) ? 0 : -DBL_MAX;
+    V[0] = (start == LS_V) ? 0 : -DBL_MAX;
+    traces[0] = 0;
+    c = ls_row_position(p, i0);
+    for (k = 1; k <= n; k++) {
+        M[k] = -DBL_MAX;
+        V[k] = -DBL_MAX;
+        LS_SELECT(M[k-1] + p->open_A[c],
+                  H[k-1] + p->extend_A[c],
+                  V[k-1] + p->open_A[c]);
+        H[k] = score;
+        traces[k] = state << 2;
+    }
+    for (i = i0 + 1; i <= i1; i++) {
+        r = (i - i0) * (n + 1);
+        c = ls_row_position(p, i);
+        d = ls_column_position(p, j0);
+        dm = M[0];
+        dh = H[0];
+        dv = V[0];
+        LS_SELECT(M[0] + p->open_B[d], H[0] + p->open_B[d],
+                  V[0] + p->extend_B[d]);
+        V[0] = score;
+        M[0] = -DBL_MAX;
+        H[0] = -DBL_MAX;
+        traces[r] = state << 4;
+        for (k = 1; k <= n; k++) {
+            d = ls_column_position(p, j0 + k);
+            LS_SELECT(M[k] + p->open_B[d], H[k] + p->open_B[d],
+                      V[k] + p->extend_B[d]);
+            v = score;
+            pv = state;
+            LS_SELECT(dm, dh, dv);
+            pm = state;
+            m = score + ls_pair_score(p, i-1, j0+k-1);
+            dm = M[k];
+            dh = H[k];
+            dv = V[k];
+            M[k] = m;
+            V[k] = v;
+            LS_SELECT(M[k-1] + p->open_A[c],
+                      H[k-1] + p->extend_A[c],
+                      V[k-1] + p->open_A[c]);
+            H[k] = score;
+            ph = state;
+            traces[r+k] = pm | (ph << 2) | (pv << 4);
+        }
+    }
+    switch (end) {
+        case LS_M: score = M[n]; state = LS_M; break;
+        case LS_H: score = H[n]; state = LS_H; break;
+        case LS_V: score = V[n]; state = LS_V; break;
+        case LS_ANY:
+        default: LS_SELECT(M[n], H[n], V[n]); break;
+    }
+    *result = score;
+    i = i1;
+    k = n;
+    while (i > i0 || k > 0) {
+        r = (i - i0) * (n + 1) + k;
+        switch (state) {
+            case LS_M:
+                state = traces[r] & 0x3;
+                buffer[nsteps++] = DIAGONAL;
+                i--;
+                k--;
+                break;
+            case LS_H:
+                state = (traces[r] >> 2) & 0x3;
+                buffer[nsteps++] = HORIZONTAL;
+                k--;
+                break;
+            case LS_V:
+                state = (traces[r] >> 4) & 0x3;
+                buffer[nsteps++] = VERTICAL;
+                i--;
+                break;
+        }
+    }
+    while (nsteps > 0) p->steps[p->nsteps++] = buffer[--nsteps];
+}
+
+/* Find the best path from (i0, j0), entered in state start, to (i1, j1),
+ * ending in state end, and append its steps to the alignment. */
+static void
+ls_solve(LinearSpaceAligner* p, int i0, int i1, int j0, int j1,
+         int start, int end, double* result)
+{
+    int k, im, kbest;
+    int state, sbest;
+    const int n = j1 - j0;
+    double score, temp, ignored;
+    double* FM;
+    double* FH;
+    double* FV;
+    double* GM;
+    double* GH;
+    double* GV;
+
+    if (i1 - i0 <= 1
+     || (Py_ssize_t)(i1 - i0 + 1) * (n + 1) <= LS_BLOCK_SIZE) {
+        ls_block(p, i0, i1, j0, j1, start, end, result);
+        return;
+    }
+    FM = p->rows;
+    FH = FM + p->nB + 1;
+    FV = FH + p->nB + 1;
+    GM = FV + p->nB + 1;
+    GH = GM + p->nB + 1;
+    GV = GH + p->nB + 1;
+    im = (i0 + i1) / 2;
+    ls_forward(p, i0, im, j0, j1, start, FM, FH, FV);
+    ls_backward(p, im, i1, j0, j1, end, GM, GH, GV, NULL, NULL, NULL);
+    score = -DBL_MAX;
+    kbest = 0;
+    sbest = LS_M;
+    for (k = 0; k <= n; k++) {
+        temp = FM[k] + GM[k];
+        if (temp > score) { score = temp; kbest = k; sbest = LS_M; }
+        temp = FH[k] + GH[k];
+        if (temp > score) { score = temp; kbest = k; sbest = LS_H; }
+        temp = FV[k] + GV[k];
+        if (temp > score) { score = temp; kbest = k; sbest = LS_V; }
+    }
+    *result = score;
+    state = sbest;
+    ls_solve(p, i0, im, j0, j0 + kbest, start, state, &ignored);
+    ls_solve(p, im, i1, j0 + kbest, j1, state, end, &ignored);
+}
+
+/* Find the end point and the score of the best local alignment. */
+static double
+ls_local_end(const LinearSpaceAligner* p, int* iend, int* jend)
+{
+    int i, k;
+    const int n = p->nB;
+    const double open_A = p->open_A[1];
+    const double open_B = p->open_B[1];
+    const double extend_A = p->extend_A[1];
+    const double extend_B = p->extend_B[1];
+    double* M = p->rows;
+    double* H = M + n + 1;
+    double* V = H + n + 1;
+    double m, v, dm, dh, dv;
+    double maximum = 0;
+
+    *iend = 0;
+    *jend = 0;
+    for (k = 0; k <= n; k++) {
+        M[k] = -DBL_MAX;
+        H[k] = -DBL_MAX;
+        V[k] = -DBL_MAX;
+    }
+    for (i = 1; i <= p->nA; i++) {
+        dm = 0;
+        dh = H[0];
+        dv = V[0];
+        for (k = 1; k <= n; k++) {
+            v = LS_MAX(M[k] + open_B, H[k] + open_B, V[k] + extend_B);
+            m = LS_MAX(dm, dh, dv);
+            if (m < 0) m = 0;
+            m += ls_pair_score(p, i-1, k-1);
+            if (m > maximum + p->epsilon) {
+                maximum = m;
+                *iend = i;
+                *jend = k;
+            }
+            dm = M[k];
+            dh = H[k];
+            dv = V[k];
+            M[k] = m;
+            V[k] = v;
+            H[k] = LS_MAX(M[k-1] + open_A, H[k-1] + extend_A, V[k-1] + open_A);
+        }
+    }
+    return maximum;
+}
+
+static PyObject*
+ls_create_path(const LinearSpaceAligner* p, int i, int j, unsigned char strand)
+{
+    Py_ssize_t k;
+    Py_ssize_t m = 0;
+    Py_ssize_t n = 1;
+    unsigned char step;
+    unsigned char direction = 0;
+    PyObject* tuple;
+    PyObject* target_row;
+    PyObject* query_row;
+    PyObject* value;
+    const unsigned char* steps = p->steps;
+    const Py_ssize_t nsteps = p->nsteps;
+
+    for (k = 0; k < nsteps; k++) {
+        if (steps[k] != direction) {
+            n++;
+            direction = steps[k];
+        }
+    }
+    tuple = PyTuple_New(2);
+    if (!tuple) return NULL;
+    target_row = PyTuple_New(n);
+    query_row = PyTuple_New(n);
+    PyTuple_SET_ITEM(tuple, 0, target_row);
+    PyTuple_SET_ITEM(tuple, 1, query_row);
+    if (!target_row || !query_row) goto error;
+    direction = 0;
+    for (k = 0; k <= nsteps; k++) {
+        step = (k < nsteps) ? steps[k] : 0;
+        if (step != direction) {
+            value = PyLong_FromLong(i);
+            if (!value) goto error;
+            PyTuple_SET_ITEM(target_row, m, value);
+            value = PyLong_FromLong(strand == '+' ? j : p->nB - j);
+            if (!value) goto error;
+            PyTuple_SET_ITEM(query_row, m, value);
+            m++;
+            direction = step;
+        }
+        switch (step) {
+            case HORIZONTAL: j++; break;
+            case VERTICAL: i++; break;
+            case DIAGONAL: i++; j++; break;
+        }
+    }
+    return tuple;
+error:
+    Py_DECREF(tuple);
+    return NULL;
+}
+
+static PyObject*
+Aligner_linear_space_align(Aligner* self,
+                           const int* sA, int nA,
+                           const int* sB, int nB,
+                           unsigned char strand)
+{
+    int i;
+    int iA = 0;
+    int iB = 0;
+    int iend;
+    int jend;
+    double score = 0;
+    Py_ssize_t size;
+    PyObject* path = NULL;
+    PyObject* result = NULL;
+    LinearSpaceAligner aligner;
+    LinearSpaceAligner* p = &aligner;
+
+    if (_get_algorithm(self) == WatermanSmithBeyer) {
+        PyErr_SetString(PyExc_ValueError,
+                        "linear-space alignment is not available for "
+                        "gap score functions");
+        return NULL;
+    }
+    p->sA = sA;
+    p->sB = sB;
+    p->nA = nA;
+    p->nB = nB;
+    p->mode = self->mode;
+    p->epsilon = self->epsilon;
+    if (self->substitution_matrix.obj) {
+        p->scores = self->substitution_matrix.buf;
+        p->n = self->substitution_matrix.shape[0];
+    }
+    else {
+        p->scores = NULL;
+        p->n = 0;
+    }
+    p->match = self->match;
+    p->mismatch = self->mismatch;
+    p->wildcard = self->wildcard;
+    p->open_A[1] = self->target_internal_open_gap_score;
+    p->extend_A[1] = self->target_internal_extend_gap_score;
+    p->open_B[1] = self->query_internal_open_gap_score;
+    p->extend_B[1] = self->query_internal_extend_gap_score;
+    switch (strand) {
+        case '+':
+            p->open_A[0] = self->target_left_open_gap_score;
+            p->extend_A[0] = self->target_left_extend_gap_score;
+            p->open_A[2] = self->target_right_open_gap_score;
+            p->extend_A[2] = self->target_right_extend_gap_score;
+            p->open_B[0] = self->query_left_open_gap_score;
+            p->extend_B[0] = self->query_left_extend_gap_score;
+            p->open_B[2] = self->query_right_open_gap_score;
+            p->extend_B[2] = self->query_right_extend_gap_score;
+            break;
+        case '-':
+            p->open_A[0] = self->target_right_open_gap_score;
+            p->extend_A[0] = self->target_right_extend_gap_score;
+            p->open_A[2] = self->target_left_open_gap_score;
+            p->extend_A[2] = self->target_left_extend_gap_score;
+            p->open_B[0] = self->query_right_open_gap_score;
+            p->extend_B[0] = self->query_right_extend_gap_score;
+            p->open_B[2] = self->query_left_open_gap_score;
+            p->extend_B[2] = self->query_left_extend_gap_score;
+            break;
+        default:
+            PyErr_SetString(PyExc_RuntimeError, "strand was neither '+' nor '-'");
+            return NULL;
+    }
+    size = 2 * ((Py_ssize_t)nB + 1);
+    if (size < LS_BLOCK_SIZE) size = LS_BLOCK_SIZE;
+    p->rows = PyMem_Malloc(6 * ((Py_ssize_t)nB + 1) * sizeof(double));
+    p->traces = PyMem_Malloc(size);
+    p->buffer = PyMem_Malloc(size);
+    p->steps = PyMem_Malloc((Py_ssize_t)nA + nB);
+    p->nsteps = 0;
+    if (!p->rows || !p->traces || !p->buffer || !p->steps) {
+        PyErr_NoMemory();
+        goto exit;
+    }
+    switch (p->mode) {
+        case Global:
+            ls_solve(p, 0, nA, 0, nB, LS_M, LS_ANY, &score);
+            break;
+        case Local:
+            score = ls_local_end(p, &iend, &jend);
+            if (score == 0) break;
+            {   double maximum = -DBL_MAX;
+                double* M = p->rows;
+                double* H = M + nB + 1;
+                double* V = H + nB + 1;
+                ls_backward(p, 0, iend, 0, jend, LS_M, M, H, V,
+                            &maximum, &iA, &iB);
+            }
+            ls_solve(p, iA, iend, iB, jend, LS_M, LS_M, &score);
+            /* With gap scores of zero, the path may start with a gap;
+             * local alignments start with aligned letters. */
+            for (i = 0; i < p->nsteps && p->steps[i] != DIAGONAL; i++) {
+                switch (p->steps[i]) {
+                    case HORIZONTAL: iB++; break;
+                    case VERTICAL: iA++; break;
+                }
+            }
+            p->nsteps -= i;
+            memmove(p->steps, p->steps + i, p->nsteps);
+            break;
+    }
+    if (p->mode == Local && score == 0) {
+        result = Py_BuildValue("d[]", score);
+        goto exit;
+    }
+    path = ls_create_path(p, iA, iB, strand);
+    if (!path) goto exit;
+    result = Py_BuildValue("d[N]", score, path);
+exit:
+    PyMem_Free(p->rows);
+    PyMem_Free(p->traces);
+    PyMem_Free(p->buffer);
+    PyMem_Free(p->steps);
+    return result;
+}
+
 static int*
 convert_1bytes_to_ints(const int mapping[], Py_ssize_t n, const unsigned char s[])
 {
@@ -6834,6 +7443,13 @@ Aligner_align(Aligner* self, PyObject* args, PyObject* keywords)
     sA = bA.buf;
     sB = bB.buf;
 
+    if (self->linear_space) {
+        result = Aligner_linear_space_align(self, sA, nA, sB, nB, strand);
+        sequence_converter(NULL, &bA);
+        sequence_converter(NULL, &bB);
+        return result;
+    }
+
     switch (algorithm) {
         case NeedlemanWunschSmithWaterman:
             switch (mode) {
@@ -9,6 +9,8 @@
 import sys
 from collections import Counter
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from heapq import heapify
 from heapq import heappop
 from heapq import heappush
@@ -20,6 +22,8 @@ from math import sqrt
 
 import numpy as np
 
+from Bio._utils import call_worker
+from Bio._utils import initialize_worker
 from Bio.Align import Alignment
 from Bio.Data import CodonTable
 
@@ -88,34 +92,104 @@ def calculate_dn_ds(alignment, method="NG86", codon_table=None, k=1, cfreq=None)
     if method == "ML":
         return _ml(codons1, codons2, cfreq, codon_table)
     elif method == "NG86":
-        return _ng86(codons1, codons2, k, codon_table)
+        indices1 = _get_codon_indices(codons1, codon_table)
+        indices2 = _get_codon_indices(codons2, codon_table)
+        return _ng86(indices1, indices2, k, codon_table)
     elif method == "LWL85":
-        return _lwl85(codons1, codons2, codon_table)
+        indices1 = _get_codon_indices(codons1, codon_table)
+        indices2 = _get_codon_indices(codons2, codon_table)
+        return _lwl85(indices1, indices2, codon_table)
     elif method == "YN00":
         return _yn00(codons1, codons2, codon_table)
     else:
         raise ValueError(f"Unknown method '{method}'")
 
 
+#################################################################
+#        private functions for precomputed codon tables
+#################################################################
+
+
+@lru_cache(maxsize=16)
+def _get_codons(codon_table):
+    """Return the codons in the codon table, and a dictionary of their indices (PRIVATE).
+
+    Stop codons are included; codons containing U are skipped.
+    """
+    codons = [
+        codon
+        for codon in list(codon_table.forward_table.keys()) + codon_table.stop_codons
+        if "U" not in codon
+    ]
+    indices = {codon: i for i, codon in enumerate(codons)}
+    return codons, indices
+
+
+def _get_codon_indices(codons, codon_table):
+    """Convert a list of codons to an array of indices into the codon table (PRIVATE)."""
+    indices = _get_codons(codon_table)[1]
+    return np.array([indices[codon] for codon in codons], int)
+
+
+def _check_codons(indices1, indices2, table, codon_table):
+    """Raise a KeyError for codons with an undefined row in the table (PRIVATE).
+
+    The precomputed tables store NaN in the rows of stop codons, which raise
+    a KeyError in the codon table when counting sites.
+    """
+    for indices in (indices1, indices2):
+        undefined = np.isnan(table[indices, 0])
+        if undefined.any():
+            codons = _get_codons(codon_table)[0]
+            raise KeyError(codons[indices[undefined.argmax()]])
+
+
 #################################################################
 #              private functions for NG86 method
 #################################################################
 
 
-def _ng86(codons1, codons2, k, codon_table):
-    """NG86 method main function (PRIVATE)."""
-    S_sites1, N_sites1 = _count_site_NG86(codons1, codon_table=codon_table, k=k)
-    S_sites2, N_sites2 = _count_site_NG86(codons2, codon_table=codon_table, k=k)
-    S_sites = (S_sites1 + S_sites2) / 2.0
-    N_sites = (N_sites1 + N_sites2) / 2.0
-    SN = [0, 0]
-    for codon1, codon2 in zip(codons1, codons2):
-        SN = [
-            m + n
-            for m, n in zip(
-                SN, _count_diff_NG86(codon1, codon2, codon_table=codon_table)
+@lru_cache(maxsize=16)
+def _get_NG86_sites(codon_table, k):
+    """Return the number of synonymous and non-synonymous sites of each codon (PRIVATE).
+
+    Rows for stop codons are set to NaN.
+    """
+    codons, indices = _get_codons(codon_table)
+    sites = np.full((len(codons), 2), np.nan)
+    for i, codon in enumerate(codons):
+        if codon not in codon_table.stop_codons:
+            sites[i, :] = _count_site_NG86([codon], codon_table=codon_table, k=k)
+    return sites
+
+
+@lru_cache(maxsize=16)
+def _get_NG86_differences(codon_table):
+    """Return the synonymous and non-synonymous differences between codons (PRIVATE)."""
+    codons, indices = _get_codons(codon_table)
+    n = len(codons)
+    differences = np.zeros((n, n, 2))
+    for i, codon1 in enumerate(codons):
+        for j, codon2 in enumerate(codons):
+            differences[i, j, :] = _count_diff_NG86(
+                codon1, codon2, codon_table=codon_table
             )
-        ]
+    return differences
+
+
+def _ng86(indices1, indices2, k, codon_table):
+    """NG86 method main function (PRIVATE).
+
+    The codons are given as arrays of indices into the codons of the codon
+    table, as returned by _get_codon_indices.
+    """
+    sites = _get_NG86_sites(codon_table, k)
+    _check_codons(indices1, indices2, sites, codon_table)
+    S_sites, N_sites = (
+        (sites[indices1].sum(0) + sites[indices2].sum(0)) / 2.0
+    ).tolist()
+    differences = _get_NG86_differences(codon_table)
+    SN = differences[indices1, indices2].sum(0).tolist()
 
     ps = SN[0] / S_sites
     pn = SN[1] / N_sites
@@ -275,35 +349,48 @@ def _count_diff_NG86(codon1, codon2, codon_table):
 #################################################################
 
 
-def _lwl85(codons1, codons2, codon_table):
+@lru_cache(maxsize=16)
+def _get_LWL85_tables(codon_table):
+    """Return the fold classes of each codon and the differences between codons (PRIVATE).
+
+    The first array stores the number of 0-fold, 2-fold, and 4-fold
+    degenerate positions of each codon, with rows for stop codons set to NaN.
+    The second array stores the differences (P0, P2, P4, Q0, Q2, Q4) between
+    each pair of codons.
+    """
+    codons, indices = _get_codons(codon_table)
+    codon_fold_dict = _get_codon_fold(codon_table)
+    n = len(codons)
+    folds = np.full((n, 3), np.nan)
+    differences = np.zeros((n, n, 6))
+    for i, codon1 in enumerate(codons):
+        try:
+            fold_num = codon_fold_dict[codon1]
+        except KeyError:  # stop codon
+            continue
+        folds[i, :] = [fold_num.count(f) for f in "024"]
+        for j, codon2 in enumerate(codons):
+            if codon1 != codon2:
+                differences[i, j, :] = _diff_codon(
+                    codon1, codon2, fold_dict=codon_fold_dict
+                )
+    return folds, differences
+
+
+def _lwl85(indices1, indices2, codon_table):
     """LWL85 method main function (PRIVATE).
 
     Nomenclature is according to Li et al. (1985), PMID 3916709.
+    The codons are given as arrays of indices into the codons of the codon
+    table, as returned by _get_codon_indices.
     """
-    codon_fold_dict = _get_codon_fold(codon_table)
+    folds, differences = _get_LWL85_tables(codon_table)
+    _check_codons(indices1, indices2, folds, codon_table)
     # count number of sites in different degenerate classes
-    fold0 = [0, 0]
-    fold2 = [0, 0]
-    fold4 = [0, 0]
-    for codon in codons1 + codons2:
-        fold_num = codon_fold_dict[codon]
-        for f in fold_num:
-            if f == "0":
-                fold0[0] += 1
-            elif f == "2":
-                fold2[0] += 1
-            elif f == "4":
-                fold4[0] += 1
-    L = [sum(fold0) / 2.0, sum(fold2) / 2.0, sum(fold4) / 2.0]
+    L = ((folds[indices1].sum(0) + folds[indices2].sum(0)) / 2.0).tolist()
     # count number of differences in different degenerate classes
-    PQ = [0] * 6  # with P0, P2, P4, Q0, Q2, Q4 in each position
-    for codon1, codon2 in zip(codons1, codons2):
-        if codon1 == codon2:
-            continue
-        PQ = [
-            i + j
-            for i, j in zip(PQ, _diff_codon(codon1, codon2, fold_dict=codon_fold_dict))
-        ]
+    # with P0, P2, P4, Q0, Q2, Q4 in each position
+    PQ = differences[indices1, indices2].sum(0).tolist()
     PQ = [i / j for i, j in zip(PQ, L * 2)]
     P = PQ[:3]
     Q = PQ[3:]
@@ -317,8 +404,12 @@ def _lwl85(codons1, codons2, codon_table):
     return dN, dS
 
 
+@lru_cache(maxsize=16)
 def _get_codon_fold(codon_table):
-    """Classify different position in a codon into different folds (PRIVATE)."""
+    """Classify different position in a codon into different folds (PRIVATE).
+
+    The returned dictionary is cached, and must not be modified.
+    """
     fold_table = {}
     forward_table = codon_table.forward_table
     bases = {"A", "T", "C", "G"}
@@ -464,14 +555,11 @@ def _yn00(codons1, codons2, codon_table):
         for base in ("A", "T", "C", "G"):
             bfreqSN[i][base] = (bfreqSN1[i][base] + bfreqSN2[i][base]) / 2
     # use NG86 method to get initial t and w
-    SN = [0, 0]
-    for codon1, codon2 in zip(codons1, codons2):
-        SN = [
-            m + n
-            for m, n in zip(
-                SN, _count_diff_NG86(codon1, codon2, codon_table=codon_table)
-            )
-        ]
+    codons, indices = _get_codons(codon_table)
+    indices1 = _get_codon_indices(codons1, codon_table)
+    indices2 = _get_codon_indices(codons2, codon_table)
+    differences = _get_NG86_differences(codon_table)
+    SN = differences[indices1, indices2].sum(0).tolist()
     ps = SN[0] / S_sites
     pn = SN[1] / N_sites
     p = sum(SN) / (S_sites + N_sites)
@@ -479,20 +567,14 @@ def _yn00(codons1, codons2, codon_table):
     t = -3 / 4 * log(1 - 4 / 3 * p)
     tolerance = 1e-5
     dSdN_pre = [0, 0]
+    codon_npath = Counter(zip(codons1, codons2))
     for temp in range(20):
         # count synonymous and nonsynonymous differences under kappa, w, t
-        codons = [
-            codon
-            for codon in list(codon_table.forward_table.keys())
-            + codon_table.stop_codons
-            if "U" not in codon
-        ]
         Q = _get_Q(pi, kappa, w, codons, codon_table)
         P = expm(Q * t)
         TV = [0, 0, 0, 0]  # synonymous/nonsynonymous transition/transversion
-        codon_npath = Counter(zip(codons1, codons2))
         for (nucleotide1, nucleotide2), count in codon_npath.items():
-            tv = _count_diff_YN00(nucleotide1, nucleotide2, P, codons, codon_table)
+            tv = _count_diff_YN00(nucleotide1, nucleotide2, P, indices, codon_table)
             TV = [m + n * count for m, n in zip(TV, tv)]
         TV = (TV[0] / S_sites, TV[1] / S_sites), (TV[2] / N_sites, TV[3] / N_sites)
         # according to the DistanceF84() function of yn00.c in paml,
@@ -629,13 +711,14 @@ def _count_site_YN00(codons1, codons2, pi, k, codon_table):
     return S_sites, N_sites, freqSN
 
 
-def _count_diff_YN00(codon1, codon2, P, codons, codon_table):
+def _count_diff_YN00(codon1, codon2, P, indices, codon_table):
     """Count differences between two codons (three-letter string; PRIVATE).
 
     The function will weighted multiple pathways from codon1 to codon2
     according to P matrix of codon substitution. The proportion
     of transition and transversion (TV) will also be calculated in
-    the function.
+    the function. The dictionary indices maps each codon to its row and
+    column in the P matrix.
     """
     TV = [
         0,
@@ -689,7 +772,7 @@ def _count_diff_YN00(codon1, codon2, P, codons, codon_table):
             tmp_codons = [codon1[:i] + codon2[i] + codon1[i + 1 :] for i in diff_pos]
             path_prob = []
             for codon in tmp_codons:
-                codon_idx = list(map(codons.index, [codon1, codon, codon2]))
+                codon_idx = [indices[c] for c in (codon1, codon, codon2)]
                 prob = (P[codon_idx[0], codon_idx[1]], P[codon_idx[1], codon_idx[2]])
                 path_prob.append(prob[0] * prob[1])
             path_prob = [2 * i / sum(path_prob) for i in path_prob]
@@ -721,7 +804,7 @@ def _count_diff_YN00(codon1, codon2, P, codons, codon_table):
                 tmp1 = codon1[:index1] + codon2[index1] + codon1[index1 + 1 :]
                 tmp2 = tmp1[:index2] + codon2[index2] + tmp1[index2 + 1 :]
                 tmp_codons.append((tmp1, tmp2))
-                codon_idx = list(map(codons.index, [codon1, tmp1, tmp2, codon2]))
+                codon_idx = [indices[c] for c in (codon1, tmp1, tmp2, codon2)]
                 prob = (
                     P[codon_idx[0], codon_idx[1]],
                     P[codon_idx[1], codon_idx[2]],
@@ -762,12 +845,18 @@ def _ml(codons1, codons2, cmethod, codon_table):
     from scipy.optimize import minimize
 
     pi = _get_pi(codons1, codons2, cmethod, codon_table=codon_table)
-    codon_cnt = Counter(zip(codons1, codons2))
-    codons = [
-        codon
-        for codon in list(codon_table.forward_table.keys()) + codon_table.stop_codons
-        if "U" not in codon
-    ]
+    codons, indices = _get_codons(codon_table)
+    codon_cnt = np.zeros((len(codons), len(codons)))
+    np.add.at(
+        codon_cnt,
+        (
+            _get_codon_indices(codons1, codon_table),
+            _get_codon_indices(codons2, codon_table),
+        ),
+        1,
+    )
+    freqs = np.array([pi.get(codon, 0) for codon in codons])
+    types, synonymous, nonsynonymous = _get_substitution_types(codon_table)
 
     # apply optimization
     def func(
@@ -794,25 +883,10 @@ def _ml(codons1, codons2, cmethod, codon_table):
     )
     t, k, w = opt_res.x
     Q = _get_Q(pi, k, w, codons, codon_table)
-    Sd = Nd = 0
-    for i, codon1 in enumerate(codons):
-        for j, codon2 in enumerate(codons):
-            if i != j:
-                try:
-                    if (
-                        codon_table.forward_table[codon1]
-                        == codon_table.forward_table[codon2]
-                    ):
-                        # synonymous count
-                        Sd += pi[codon1] * Q[i, j]
-                    else:
-                        # nonsynonymous count
-                        Nd += pi[codon1] * Q[i, j]
-                except KeyError:
-                    # This is probably due to stop codons
-                    pass
-    Sd *= t
-    Nd *= t
+    # stop codons are neither synonymous nor nonsynonymous
+    flux = freqs[:, None] * Q
+    Sd = flux[synonymous].sum() * t
+    Nd = flux[nonsynonymous].sum() * t
 
     # count differences (with w fixed to 1)
     def func_w1(
@@ -839,27 +913,11 @@ def _ml(codons1, codons2, cmethod, codon_table):
     t, k = opt_res.x
     w = 1.0
     Q = _get_Q(pi, k, w, codons, codon_table)
-    rhoS = rhoN = 0
-    for i, codon1 in enumerate(codons):
-        for j, codon2 in enumerate(codons):
-            if i != j:
-                try:
-                    if (
-                        codon_table.forward_table[codon1]
-                        == codon_table.forward_table[codon2]
-                    ):
-                        # synonymous count
-                        rhoS += pi[codon1] * Q[i, j]
-                    else:
-                        # nonsynonymous count
-                        rhoN += pi[codon1] * Q[i, j]
-                except KeyError:
-                    # This is probably due to stop codons
-                    pass
-    rhoS *= 3
-    rhoN *= 3
-    dN = Nd / rhoN
-    dS = Sd / rhoS
+    flux = freqs[:, None] * Q
+    rhoS = flux[synonymous].sum() * 3
+    rhoN = flux[nonsynonymous].sum() * 3
+    dN = float(Nd / rhoN)
+    dS = float(Sd / rhoS)
     return dN, dS
 
 
@@ -963,50 +1021,207 @@ def _q(codon1, codon2, pi, k, w, codon_table):
             return w * pi[codon2]
 
 
-def _get_Q(pi, k, w, codons, codon_table):
-    """Q matrix for codon substitution (PRIVATE)."""
-    codon_num = len(codons)
-    Q = np.zeros((codon_num, codon_num))
+@lru_cache(maxsize=16)
+def _get_substitution_types(codon_table):
+    """Classify the substitutions between each pair of codons (PRIVATE).
+
+    Returns three arrays, indexed by the codons returned by _get_codons.
+    The first array stores 1 for synonymous transitions, 2 for synonymous
+    transversions, 3 for nonsynonymous transitions, 4 for nonsynonymous
+    transversions, and 0 if the codons are identical, differ at more than
+    one position, or if either of them is a stop codon (see _q). The second
+    and third arrays are True for pairs of different sense codons coding
+    for the same and for different amino acids, respectively.
+    """
+    codons, indices = _get_codons(codon_table)
+    forward_table = codon_table.forward_table
+    stop_codons = codon_table.stop_codons
+    transitions = {("A", "G"), ("G", "A"), ("C", "T"), ("T", "C")}
+    n = len(codons)
+    types = np.zeros((n, n), int)
+    synonymous = np.zeros((n, n), bool)
+    nonsynonymous = np.zeros((n, n), bool)
     for i1, codon1 in enumerate(codons):
+        if codon1 in stop_codons:
+            continue
         for i2, codon2 in enumerate(codons):
-            if i1 != i2:
-                Q[i1, i2] = _q(codon1, codon2, pi, k, w, codon_table=codon_table)
-    nucl_substitutions = 0
-    for i, codon in enumerate(codons):
-        Q[i, i] = -sum(Q[i, :])
-        try:
-            nucl_substitutions += pi[codon] * (-Q[i, i])
-        except KeyError:
-            pass
+            if i1 == i2 or codon2 in stop_codons:
+                continue
+            if forward_table[codon1] == forward_table[codon2]:
+                synonymous[i1, i2] = True
+                substitution_type = 1
+            else:
+                nonsynonymous[i1, i2] = True
+                substitution_type = 3
+            diff = [
+                (nucleotide1, nucleotide2)
+                for nucleotide1, nucleotide2 in zip(codon1, codon2)
+                if nucleotide1 != nucleotide2
+            ]
+            if len(diff) == 1:
+                if diff[0] not in transitions:
+                    substitution_type += 1
+                types[i1, i2] = substitution_type
+    return types, synonymous, nonsynonymous
+
+
+def _get_Q(pi, k, w, codons, codon_table):
+    """Q matrix for codon substitution (PRIVATE).
+
+    The codons must be the list of codons returned by _get_codons. The
+    result is equal to that calculated element by element using _q.
+    """
+    types = _get_substitution_types(codon_table)[0]
+    codon_num = len(codons)
+    present = np.array([codon in pi for codon in codons])
+    freqs = np.array([pi[codon] if codon in pi else 0 for codon in codons], float)
+    rates = np.array([0, k, 1, w * k, w])
+    Q = rates[types] * freqs
+    Q[~present, :] = 0
+    Q[:, ~present] = 0
+    diagonal = Q.sum(1)
+    Q[np.arange(codon_num), np.arange(codon_num)] = -diagonal
+    nucl_substitutions = np.dot(freqs, diagonal)
     Q /= nucl_substitutions
     return Q
 
 
 def _likelihood_func(t, k, w, pi, codon_cnt, codons, codon_table):
-    """Likelihood function for ML method (PRIVATE)."""
+    """Likelihood function for ML method (PRIVATE).
+
+    The argument codon_cnt is a matrix with the number of times each pair of
+    codons (in the order of codons) was observed.
+    """
     from scipy.linalg import expm
 
     Q = _get_Q(pi, k, w, codons, codon_table)
     P = expm(Q * t)
-    likelihood = 0
-    for i, codon1 in enumerate(codons):
-        for j, codon2 in enumerate(codons):
-            if (codon1, codon2) in codon_cnt:
-                if P[i, j] * pi[codon1] <= 0:
-                    likelihood += codon_cnt[(codon1, codon2)] * 0
-                else:
-                    likelihood += codon_cnt[(codon1, codon2)] * log(
-                        pi[codon1] * P[i, j]
-                    )
+    freqs = np.array([pi.get(codon, 0) for codon in codons])
+    P *= freqs[:, None]
+    mask = (codon_cnt > 0) & (P > 0)
+    likelihood = np.dot(codon_cnt[mask], np.log(P[mask]))
     return likelihood
 
 
-def calculate_dn_ds_matrix(alignment, method="NG86", codon_table=None):
+class _PairwiseDnDs:
+    """Calculate dN and dS for pairs of sequences in a codon alignment (PRIVATE).
+
+    The codons of each sequence are converted once to an array of indices
+    into the codons of the codon table, which is then used for each pair of
+    sequences. Pairs that cannot be handled in this way (for example, if an
+    aligned block is not a multiple of three nucleotides long, or if a codon
+    contains an unrecognized character) are passed to calculate_dn_ds.
+    """
+
+    def __init__(self, alignment, method, codon_table):
+        """Convert the aligned sequences to arrays of codon indices."""
+        self.sequences = alignment.sequences
+        self.coordinates = alignment.coordinates
+        self.method = method
+        self.codon_table = codon_table
+        self.gaps = None
+        if (np.diff(self.coordinates, 1) < 0).any():
+            # Sequences aligned to the reverse strand; use calculate_dn_ds.
+            return
+        try:
+            data, gaps = alignment._get_matrix()
+        except Exception:  # for example, undefined sequence contents
+            return
+        codons, indices = _get_codons(codon_table)
+        # Number each codon as 25 * i + 5 * j + k, with nucleotides A, C, G,
+        # T numbered 0, 1, 2, 3, and 4 for any other character.
+        nucleotides = np.full(256, 4, np.uint8)
+        for i, nucleotide in enumerate(b"ACGT"):
+            nucleotides[nucleotide] = i
+        lookup = np.full(125, -1)
+        for codon, index in indices.items():
+            i, j, k = nucleotides[np.frombuffer(codon.encode(), np.uint8)]
+            lookup[25 * i + 5 * j + k] = index
+        self.indices = []
+        self.positions = []
+        for row, gaps_row in zip(data, gaps):
+            letters = nucleotides[row[~gaps_row]].astype(int)
+            numbers = 25 * letters[:-2] + 5 * letters[1:-1] + letters[2:]
+            self.indices.append(lookup[numbers])
+            self.positions.append(np.cumsum(~gaps_row) - 1)
+        self.gaps = gaps
+
+    def _get_codon_indices(self, i, j):
+        """Return arrays with the indices of the aligned codons of sequences i and j.
+
+        Returns None if the codons cannot be obtained from the precomputed
+        arrays.
+        """
+        gaps1 = self.gaps[i]
+        gaps2 = self.gaps[j]
+        # columns containing a nucleotide in at least one of the two sequences
+        columns = np.flatnonzero(~(gaps1 & gaps2))
+        aligned = ~(gaps1[columns] | gaps2[columns])
+        edges = np.diff(aligned.astype(np.int8), prepend=0, append=0)
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        sizes = ends - starts
+        if (sizes % 3).any():
+            return None
+        counts = sizes // 3
+        offsets = np.repeat(np.cumsum(counts) - counts, counts)
+        columns = columns[
+            np.repeat(starts, counts) + 3 * (np.arange(counts.sum()) - offsets)
+        ]
+        indices1 = self.indices[i][self.positions[i][columns]]
+        indices2 = self.indices[j][self.positions[j][columns]]
+        if (indices1 < 0).any() or (indices2 < 0).any():
+            return None
+        return indices1, indices2
+
+    def __call__(self, i):
+        """Return lists with dN and dS between sequence i and sequences 0 to i-1."""
+        method = self.method
+        codon_table = self.codon_table
+        dn_row = []
+        ds_row = []
+        for j in range(i):
+            if self.gaps is None:
+                indices = None
+            else:
+                indices = self._get_codon_indices(i, j)
+            if indices is None:
+                pairwise_sequences = [self.sequences[i], self.sequences[j]]
+                pairwise_coordinates = self.coordinates[(i, j), :]
+                pairwise_alignment = Alignment(pairwise_sequences, pairwise_coordinates)
+                dn, ds = calculate_dn_ds(
+                    pairwise_alignment, method=method, codon_table=codon_table
+                )
+            elif method == "NG86":
+                dn, ds = _ng86(*indices, 1, codon_table)
+            elif method == "LWL85":
+                dn, ds = _lwl85(*indices, codon_table)
+            else:
+                codons = _get_codons(codon_table)[0]
+                codons1 = [codons[index] for index in indices[0]]
+                codons2 = [codons[index] for index in indices[1]]
+                if method == "ML":
+                    dn, ds = _ml(codons1, codons2, "F3x4", codon_table)
+                elif method == "YN00":
+                    dn, ds = _yn00(codons1, codons2, codon_table)
+                else:
+                    raise ValueError(f"Unknown method '{method}'")
+            dn_row.append(dn)
+            ds_row.append(ds)
+        dn_row.append(0.0)
+        ds_row.append(0.0)
+        return dn_row, ds_row
+
+
+def calculate_dn_ds_matrix(alignment, method="NG86", codon_table=None, processes=1):
     """Calculate dN and dS pairwise for the multiple alignment, and return as matrices.
 
     Argument:
      - method       - Available methods include NG86, LWL85, YN00 and ML.
      - codon_table  - Codon table to use for forward translation.
+     - processes    - Number of worker processes used to calculate dN and dS
+       for the pairs of sequences in parallel (default 1). If None,
+       the number of processors on the machine is used.
 
     """
     from Bio.Phylo.TreeConstruction import DistanceMatrix
@@ -1014,25 +1229,18 @@ def calculate_dn_ds_matrix(alignment, method="NG86", codon_table=None):
     if codon_table is None:
         codon_table = CodonTable.generic_by_id[1]
     sequences = alignment.sequences
-    coordinates = alignment.coordinates
     names = [record.id for record in sequences]
     size = len(names)
-    dn_matrix = []
-    ds_matrix = []
-    for i in range(size):
-        dn_matrix.append([])
-        ds_matrix.append([])
-        for j in range(i):
-            pairwise_sequences = [sequences[i], sequences[j]]
-            pairwise_coordinates = coordinates[(i, j), :]
-            pairwise_alignment = Alignment(pairwise_sequences, pairwise_coordinates)
-            dn, ds = calculate_dn_ds(
-                pairwise_alignment, method=method, codon_table=codon_table
-            )
-            dn_matrix[i].append(dn)
-            ds_matrix[i].append(ds)
-        dn_matrix[i].append(0.0)
-        ds_matrix[i].append(0.0)
+    function = _PairwiseDnDs(alignment, method, codon_table)
+    if processes == 1:
+        rows = list(map(function, range(size)))
+    else:
+        with ProcessPoolExecutor(
+            processes, initializer=initialize_worker, initargs=(function,)
+        ) as executor:
+            rows = list(executor.map(call_worker, range(size)))
+    dn_matrix = [dn_row for dn_row, ds_row in rows]
+    ds_matrix = [ds_row for dn_row, ds_row in rows]
     dn_dm = DistanceMatrix(names, matrix=dn_matrix)
     ds_dm = DistanceMatrix(names, matrix=ds_matrix)
     return dn_dm, ds_dm
@@ -0,0 +1,987 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Bio.Align support for the "bam" pairwise alignment format.
+
+The Binary Alignment/Map (BAM) format is the BGZF-compressed binary
+equivalent of the Sequence Alignment/Map (SAM) format. Each alignment record
+in a BAM file contains the same information as the corresponding line in a
+SAM file, and is converted to an Alignment object in the same way as in the
+SAM parser in Bio.Align.sam.
+
+A BAM file sorted by coordinate can be indexed by a BAI or CSI index file.
+Use the ``create_index`` function in this module to create the index, and the
+``search`` method of the AlignmentIterator to find the alignments overlapping
+a genomic region.
+
+See http://www.htslib.org/ for more information.
+
+You are expected to use this module via the Bio.Align functions.
+
+Coordinates in the BAM format are zero-based, as in Python.
+"""
+
+import io
+import os
+import struct
+from itertools import chain
+
+import numpy as np
+
+from Bio import bgzf
+from Bio.Align import sam
+from Bio.Seq import Seq
+from Bio.SeqRecord import SeqRecord
+
+_cigar_operations = "MIDNSHP=X"
+_cigar_codes = {letter: code for code, letter in enumerate(_cigar_operations)}
+# CIGAR operations that consume the reference sequence (M, D, N, =, X):
+_reference_operations = frozenset((0, 2, 3, 7, 8))
+
+_nucleotides = "=ACMGRSVTWYHKDBN"
+_nucleotide_pairs = [a + b for a in _nucleotides for b in _nucleotides]
+_nucleotide_codes = bytearray(b"\x0f" * 256)
+for _code, _letter in enumerate(_nucleotides):
+    _nucleotide_codes[ord(_letter)] = _code
+    _nucleotide_codes[ord(_letter.lower())] = _code
+_nucleotide_codes = bytes(_nucleotide_codes)
+del _code, _letter
+
+_quality_to_text = bytes((value + 33) & 0xFF for value in range(256))
+_quality_from_text = bytes((value - 33) & 0xFF for value in range(256))
+
+_tag_formats = {
+    "c": struct.Struct("<b"),
+    "C": struct.Struct("<B"),
+    "s": struct.Struct("<h"),
+    "S": struct.Struct("<H"),
+    "i": struct.Struct("<i"),
+    "I": struct.Struct("<I"),
+    "f": struct.Struct("<f"),
+}
+
+# refID, pos, l_read_name, mapq, bin, n_cigar_op, flag, l_seq,
+# next_refID, next_pos, tlen
+_record_formatter = struct.Struct("<iiBBHHHIiii")
+
+
+def _reg2bin(start, end, min_shift=14, depth=5):
+    """Return the bin number of the smallest bin containing start:end (PRIVATE)."""
+    end -= 1
+    shift = min_shift
+    offset = ((1 << depth * 3) - 1) // 7
+    for level in range(depth, 0, -1):
+        if start >> shift == end >> shift:
+            return offset + (start >> shift)
+        shift += 3
+        offset -= 1 << (level - 1) * 3
+    return 0
+
+
+def _reg2bins(start, end, min_shift=14, depth=5):
+    """Return the bin numbers of all bins overlapping start:end (PRIVATE)."""
+    bins = []
+    end -= 1
+    shift = min_shift + depth * 3
+    offset = 0
+    for level in range(depth + 1):
+        bins.extend(range(offset + (start >> shift), offset + (end >> shift) + 1))
+        shift -= 3
+        offset += 1 << level * 3
+    return bins
+
+
+def _decode_tags(data, offset):
+    """Return the optional fields of a BAM record in the SAM text format (PRIVATE)."""
+    fields = []
+    size = len(data)
+    while offset < size:
+        tag = data[offset : offset + 2].decode()
+        datatype = chr(data[offset + 2])
+        offset += 3
+        if datatype == "A":
+            value = chr(data[offset])
+            offset += 1
+        elif datatype in "cCsSiI":
+            formatter = _tag_formats[datatype]
+            (value,) = formatter.unpack_from(data, offset)
+            offset += formatter.size
+            datatype = "i"
+        elif datatype == "f":
+            formatter = _tag_formats[datatype]
+            (value,) = formatter.unpack_from(data, offset)
+            offset += formatter.size
+            value = "%g" % value
+        elif datatype in "ZH":
+            end = data.index(0, offset)
+            value = data[offset:end].decode()
+            offset = end + 1
+        elif datatype == "B":
+            subtype = chr(data[offset])
+            (count,) = struct.unpack_from("<I", data, offset + 1)
+            offset += 5
+            formatter = _tag_formats[subtype]
+            values = struct.unpack_from(
+                "<%d%s" % (count, formatter.format[-1]), data, offset
+            )
+            offset += count * formatter.size
+            if subtype == "f":
+                values = ["%g" % value for value in values]
+            value = ",".join(chain(subtype, map(str, values)))
+        else:
+            raise ValueError(f"Unknown data type '{datatype}' in tag '{tag}'")
+        fields.append(f"{tag}:{datatype}:{value}")
+    return fields
+
+
+def _encode_tag(field):
+    """Return an optional field in the SAM text format as BAM bytes (PRIVATE)."""
+    tag, datatype, value = field.split(":", 2)
+    data = tag.encode()
+    if datatype == "A":
+        return data + b"A" + value.encode()
+    if datatype == "i":
+        value = int(value)
+        if value < 0:
+            if value >= -0x80:
+                datatype = "c"
+            elif value >= -0x8000:
+                datatype = "s"
+            else:
+                datatype = "i"
+        elif value <= 0xFF:
+            datatype = "C"
+        elif value <= 0xFFFF:
+            datatype = "S"
+        else:
+            datatype = "I"
+        return data + datatype.encode() + _tag_formats[datatype].pack(value)
+    if datatype == "f":
+        return data + b"f" + _tag_formats["f"].pack(float(value))
+    if datatype in "ZH":
+        return data + datatype.encode() + value.encode() + b"\x00"
+    if datatype == "B":
+        subtype, *values = value.split(",")
+        formatter = _tag_formats[subtype]
+        if subtype == "f":
+            values = [float(value) for value in values]
+        else:
+            values = [int(value) for value in values]
+        count = len(values)
+        return (
+            data
+            + b"B"
+            + subtype.encode()
+            + struct.pack("<I%d%s" % (count, formatter.format[-1]), count, *values)
+        )
+    raise ValueError(f"Unknown data type '{datatype}' in tag '{field}'")
+
+
+class Record:
+    """Lightweight representation of a single alignment record in a BAM file.
+
+    Record objects are returned by the AlignmentIterator if it was created
+    with ``lightweight=True``. Only the fixed-size fields of the BAM record
+    are decoded when the Record is created; the read name, CIGAR string,
+    sequence, quality string, and optional fields are decoded on demand.
+    This is much faster than creating an Alignment object for each record,
+    and is useful for example for counting reads in a genomic region.
+
+    The following attributes are available:
+
+     - qname      - query template name;
+     - flag       - bitwise flags;
+     - rname      - reference sequence name, or "*" if not available;
+     - pos        - zero-based leftmost position on the reference sequence,
+                    or -1 if not available;
+     - end        - zero-based end position on the reference sequence;
+     - mapq       - mapping quality;
+     - cigar      - CIGAR string;
+     - rnext      - reference sequence name of the next read, or "*";
+     - pnext      - zero-based position of the next read, or -1;
+     - tlen       - observed template length;
+     - seq        - segment sequence as a string, or "*";
+     - qual       - ASCII-encoded Phred quality string, or "*";
+     - tags       - the optional fields as a list of strings in the SAM format.
+
+    Use str(record) to obtain the record as a line in the SAM format.
+    """
+
+    __slots__ = (
+        "_data",
+        "_names",
+        "refID",
+        "pos",
+        "_l_read_name",
+        "mapq",
+        "bin",
+        "_n_cigar_op",
+        "flag",
+        "_l_seq",
+        "next_refID",
+        "pnext",
+        "tlen",
+    )
+
+    def __init__(self, data, names):
+        """Create a Record from the binary record data and the reference names."""
+        self._data = data
+        self._names = names
+        (
+            self.refID,
+            self.pos,
+            self._l_read_name,
+            self.mapq,
+            self.bin,
+            self._n_cigar_op,
+            self.flag,
+            self._l_seq,
+            self.next_refID,
+            self.pnext,
+            self.tlen,
+        ) = _record_formatter.unpack_from(data)
+
+    @property
+    def qname(self):
+        """Query template name."""
+        start = _record_formatter.size
+        return self._data[start : start + self._l_read_name - 1].decode()
+
+    @property
+    def rname(self):
+        """Reference sequence name, or "*" if not available."""
+        refID = self.refID
+        if refID < 0:
+            return "*"
+        return self._names[refID]
+
+    @property
+    def rnext(self):
+        """Reference sequence name of the next read, or "*" if not available."""
+        refID = self.next_refID
+        if refID < 0:
+            return "*"
+        return self._names[refID]
+
+    def _cigar_values(self):
+        start = _record_formatter.size + self._l_read_name
+        return struct.unpack_from("<%dI" % self._n_cigar_op, self._data, start)
+
+    @property
+    def cigar(self):
+        """CIGAR string, or "*" if not available."""
+        values = self._cigar_values()
+        if not values:
+            return "*"
+        return "".join(
+            "%d%s" % (value >> 4, _cigar_operations[value & 0xF]) for value in values
+        )
+
+    @property
+    def end(self):
+        """End position on the reference sequence (exclusive).
+
+        For unmapped reads and reads without any CIGAR operation consuming the
+        reference, the end position is one past the start position, as in the
+        binning scheme used by BAI and CSI indices.
+        """
+        length = sum(
+            value >> 4
+            for value in self._cigar_values()
+            if value & 0xF in _reference_operations
+        )
+        if length == 0:
+            length = 1
+        return self.pos + length
+
+    @property
+    def seq(self):
+        """Segment sequence, or "*" if not available."""
+        l_seq = self._l_seq
+        if l_seq == 0:
+            return "*"
+        start = _record_formatter.size + self._l_read_name + 4 * self._n_cigar_op
+        end = start + (l_seq + 1) // 2
+        data = self._data[start:end]
+        return "".join([_nucleotide_pairs[byte] for byte in data])[:l_seq]
+
+    @property
+    def qual(self):
+        """ASCII-encoded Phred quality string, or "*" if not available."""
+        l_seq = self._l_seq
+        start = _record_formatter.size + self._l_read_name + 4 * self._n_cigar_op
+        start += (l_seq + 1) // 2
+        data = self._data[start : start + l_seq]
+        if l_seq == 0 or data[0] == 0xFF:
+            return "*"
+        return data.translate(_quality_to_text).decode("latin-1")
+
+    @property
+    def tags(self):
+        """Optional fields as a list of strings in the SAM text format."""
+        l_seq = self._l_seq
+        start = _record_formatter.size + self._l_read_name + 4 * self._n_cigar_op
+        start += (l_seq + 1) // 2 + l_seq
+        return _decode_tags(self._data, start)
+
+    def _fields(self):
+        """Return the record as a list of fields in the SAM text format (PRIVATE)."""
+        rname = self.rname
+        rnext = self.rnext
+        if rnext == rname and rnext != "*":
+            rnext = "="
+        fields = [
+            self.qname,
+            str(self.flag),
+            rname,
+            str(self.pos + 1),
+            str(self.mapq),
+            self.cigar,
+            rnext,
+            str(self.pnext + 1),
+            str(self.tlen),
+            self.seq,
+            self.qual,
+        ]
+        fields.extend(self.tags)
+        return fields
+
+    def __str__(self):
+        """Return the record as a line in the SAM text format."""
+        return "\t".join(self._fields())
+
+
+class _Index:
+    """BAI or CSI index of a coordinate-sorted BAM file (PRIVATE).
+
+    For each reference sequence, ``bins`` stores a dictionary mapping each bin
+    number to a tuple (loffset, chunks), where loffset is the smallest virtual
+    file offset of any alignment overlapping the bin, and chunks is a list of
+    (start, end) virtual file offsets of the alignments assigned to the bin.
+    """
+
+    def __init__(self, min_shift=14, depth=5):
+        self.min_shift = min_shift
+        self.depth = depth
+        self.bins = []
+        self.linear = []
+        self.n_no_coor = None
+
+    @property
+    def metadata_bin(self):
+        """Bin number of the pseudo-bin storing the reference metadata."""
+        return ((1 << (self.depth + 1) * 3) - 1) // 7 + 1
+
+    @classmethod
+    def fromfile(cls, path):
+        with open(path, "rb") as stream:
+            magic = stream.read(4)
+            if magic == b"BAI\x01":
+                index = cls()
+                index._read_bai(stream)
+                return index
+        with bgzf.BgzfReader(path, "rb") as stream:
+            magic = stream.read(4)
+            if magic == b"CSI\x01":
+                min_shift, depth, l_aux = struct.unpack("<iii", stream.read(12))
+                stream.read(l_aux)
+                index = cls(min_shift, depth)
+                index._read_csi(stream)
+                return index
+        raise ValueError("file is not a BAI or CSI index file")
+
+    def _read_bai(self, stream):
+        metadata_bin = self.metadata_bin
+        (n_ref,) = struct.unpack("<i", stream.read(4))
+        for i in range(n_ref):
+            bins = {}
+            (n_bin,) = struct.unpack("<i", stream.read(4))
+            for j in range(n_bin):
+                number, n_chunk = struct.unpack("<Ii", stream.read(8))
+                values = struct.unpack(
+                    "<%dQ" % (2 * n_chunk), stream.read(16 * n_chunk)
+                )
+                if number == metadata_bin:
+                    continue
+                chunks = list(zip(values[::2], values[1::2]))
+                bins[number] = (0, chunks)
+            (n_intv,) = struct.unpack("<i", stream.read(4))
+            linear = struct.unpack("<%dQ" % n_intv, stream.read(8 * n_intv))
+            self.bins.append(bins)
+            self.linear.append(linear)
+        data = stream.read(8)
+        if len(data) == 8:
+            (self.n_no_coor,) = struct.unpack("<Q", data)
+
+    def _read_csi(self, stream):
+        metadata_bin = self.metadata_bin
+        (n_ref,) = struct.unpack("<i", stream.read(4))
+        for i in range(n_ref):
+            bins = {}
+            (n_bin,) = struct.unpack("<i", stream.read(4))
+            for j in range(n_bin):
+                number, loffset, n_chunk = struct.unpack("<IQi", stream.read(16))
+                values = struct.unpack(
+                    "<%dQ" % (2 * n_chunk), stream.read(16 * n_chunk)
+                )
+                if number == metadata_bin:
+                    continue
+                chunks = list(zip(values[::2], values[1::2]))
+                bins[number] = (loffset, chunks)
+            self.bins.append(bins)
+            self.linear.append(None)
+        data = stream.read(8)
+        if len(data) == 8:
+            (self.n_no_coor,) = struct.unpack("<Q", data)
+
+    def chunks(self, refID, start, end):
+        """Return the merged chunks that may contain alignments in start:end."""
+        min_shift = self.min_shift
+        depth = self.depth
+        bins = self.bins[refID]
+        linear = self.linear[refID]
+        if linear is None:
+            # CSI: use the loffset of the smallest bin containing start
+            min_offset = 0
+            shift = min_shift
+            offset = ((1 << depth * 3) - 1) // 7
+            for level in range(depth, -1, -1):
+                number = offset + (start >> shift)
+                if number in bins:
+                    min_offset = bins[number][0]
+                    break
+                if level > 0:
+                    shift += 3
+                    offset -= 1 << (level - 1) * 3
+        elif linear:
+            window = min(start >> min_shift, len(linear) - 1)
+            min_offset = linear[window]
+        else:
+            min_offset = 0
+        chunks = []
+        for number in _reg2bins(start, end, min_shift, depth):
+            try:
+                loffset, bin_chunks = bins[number]
+            except KeyError:
+                continue
+            for chunk in bin_chunks:
+                if chunk[1] > min_offset:
+                    chunks.append(chunk)
+        chunks.sort()
+        merged = []
+        for chunk_start, chunk_end in chunks:
+            if merged and chunk_start <= merged[-1][1]:
+                if chunk_end > merged[-1][1]:
+                    merged[-1][1] = chunk_end
+            else:
+                merged.append([max(chunk_start, min_offset), chunk_end])
+        return merged
+
+
+def _read_record(stream):
+    """Read the next alignment record as bytes, or None at the end (PRIVATE)."""
+    data = stream.read(4)
+    if not data:
+        return None
+    if len(data) < 4:
+        raise ValueError("truncated BAM file")
+    (block_size,) = struct.unpack("<i", data)
+    data = stream.read(block_size)
+    if len(data) < block_size:
+        raise ValueError("truncated BAM file")
+    return data
+
+
+class AlignmentIterator(sam.AlignmentIterator):
+    """Alignment iterator for Binary Alignment/Map (BAM) files.
+
+    Each alignment record in the BAM file is loaded and returned incrementally,
+    in the same way as the alignments in a SAM file. See the documentation of
+    Bio.Align.sam.AlignmentIterator for the attributes stored on each
+    alignment.
+
+    Use the search method to find alignments overlapping a genomic region.
+    This requires a BAI or CSI index file, which can be created with the
+    create_index function in this module.
+    """
+
+    fmt = "BAM"
+    mode = "b"
+
+    def __init__(self, source, index=None, lightweight=False):
+        """Create an AlignmentIterator object.
+
+        Arguments:
+         - source      - input file stream, or path to input file
+         - index       - path to a BAI or CSI index file. If None (default),
+                         the index file is found by appending ".bai" or ".csi"
+                         to the path of the BAM file, if the index is needed
+                         by the search method.
+         - lightweight - If True, return Record objects with the undecoded
+                         alignment record instead of Alignment objects.
+                         If False (default), return Alignment objects.
+
+        """
+        self.lightweight = lightweight
+        self._index_path = index
+        super().__init__(source)
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        try:
+            stream = self._stream
+        except AttributeError:
+            return
+        if self._handle is not self.source:
+            stream.close()
+        del self._stream
+
+    def _read_header(self, stream):
+        if not isinstance(stream, bgzf.BgzfReader):
+            self._handle = stream
+            stream = bgzf.BgzfReader(fileobj=stream, mode="rb")
+            self._stream = stream
+        magic = stream.read(4)
+        if magic != b"BAM\x01":
+            raise ValueError("file does not start with the BAM magic string")
+        (l_text,) = struct.unpack("<i", stream.read(4))
+        text = stream.read(l_text).rstrip(b"\x00").decode()
+        sam.AlignmentIterator._read_header(self, io.StringIO(text))
+        (n_ref,) = struct.unpack("<i", stream.read(4))
+        names = []
+        lengths = []
+        for i in range(n_ref):
+            (l_name,) = struct.unpack("<i", stream.read(4))
+            name = stream.read(l_name).rstrip(b"\x00").decode()
+            (l_ref,) = struct.unpack("<i", stream.read(4))
+            names.append(name)
+            lengths.append(l_ref)
+        if not self.targets:
+            for name, length in zip(names, lengths):
+                sequence = Seq(None, length=length)
+                record = SeqRecord(sequence, id=name, description="")
+                self.targets.append(record)
+            self._target_indices = {name: index for index, name in enumerate(names)}
+        self._names = names
+
+    def _read_next_alignment(self, stream):
+        data = _read_record(stream)
+        if data is None:
+            return None
+        record = Record(data, self._names)
+        if self.lightweight:
+            return record
+        return self._create_alignment(record._fields())
+
+    @property
+    def index(self):
+        """The BAI or CSI index of the BAM file, loaded when first needed."""
+        try:
+            return self._index_data
+        except AttributeError:
+            pass
+        path = self._index_path
+        if path is None:
+            if not isinstance(self.source, (str, os.PathLike)):
+                raise ValueError("index file must be specified for file streams")
+            for suffix in (".bai", ".csi"):
+                try:
+                    index = _Index.fromfile(os.fspath(self.source) + suffix)
+                except FileNotFoundError:
+                    continue
+                break
+            else:
+                raise ValueError(
+                    "failed to find a BAI or CSI index file for %s" % self.source
+                ) from None
+        else:
+            index = _Index.fromfile(path)
+        if len(index.bins) != len(self._names):
+            raise ValueError(
+                "number of reference sequences in the index (%d) is inconsistent "
+                "with the BAM file (%d)" % (len(index.bins), len(self._names))
+            )
+        self._index_data = index
+        return index
+
+    def search(self, chromosome=None, start=None, end=None):
+        """Iterate over alignments overlapping the specified chromosome region.
+
+        This method uses the BAI or CSI index to find alignments to the
+        specified chromosome that fully or partially overlap the chromosome
+        region between start and end. Unmapped reads placed on the chromosome
+        are included if their position falls in the region.
+
+        Arguments:
+         - chromosome - chromosome name. If None (default value), include all
+           alignments.
+         - start      - starting position on the chromosome. If None (default
+           value), use 0 as the starting position.
+         - end        - end position on the chromosome. If None (default value),
+           use the length of the chromosome as the end position.
+
+        Depending on the lightweight attribute of the iterator, Alignment or
+        Record objects are returned.
+        """
+        stream = self._stream
+        if chromosome is None:
+            if start is not None or end is not None:
+                raise ValueError(
+                    "start and end must both be None if chromosome is None"
+                )
+            self.rewind()
+            yield from self
+            return
+        try:
+            refID = self._names.index(chromosome)
+        except ValueError:
+            raise ValueError("Failed to find %s in alignments" % chromosome) from None
+        if start is None:
+            if end is None:
+                start = 0
+                end = len(self.targets[self._target_indices[chromosome]])
+            else:
+                raise ValueError("end must be None if start is None")
+        elif end is None:
+            end = start + 1
+        names = self._names
+        for chunk_start, chunk_end in self.index.chunks(refID, start, end):
+            stream.seek(chunk_start)
+            while stream.tell() < chunk_end:
+                data = _read_record(stream)
+                if data is None:
+                    break
+                record = Record(data, names)
+                if record.refID != refID or record.pos >= end:
+                    return
+                if record.end <= start:
+                    continue
+                if self.lightweight:
+                    yield record
+                else:
+                    yield self._create_alignment(record._fields())
+
+
+class AlignmentWriter(sam.AlignmentWriter):
+    """Alignment file writer for the Binary Alignment/Map (BAM) file format."""
+
+    fmt = "BAM"
+    mode = "b"
+
+    def __init__(self, target, targets=None, md=False):
+        """Create an AlignmentWriter object.
+
+        Arguments:
+         - target  - output stream or file name.
+         - targets - A list of SeqRecord objects with the reference sequences.
+                     The sequence contents in each SeqRecord may be undefined,
+                     but the sequence length must be defined, as in this
+                     example:
+
+                     SeqRecord(Seq(None, length=248956422), id="chr1")
+
+                     If targets is None (the default value), the targets
+                     attribute of the alignments is used if available.
+                     Otherwise, the reference sequences are collected from
+                     the alignments.
+         - md      - If True, calculate the MD tag from the alignment and
+                     include it in the output.
+                     If False (default), do not include the MD tag in the
+                     output.
+
+        """
+        super().__init__(target, md=md)
+        self.targets = targets
+
+    def _find_targets(self, alignments):
+        """Return the reference sequences and the alignments (PRIVATE)."""
+        targets = self.targets
+        if targets is None:
+            try:
+                targets = alignments.targets
+            except AttributeError:
+                targets = None
+        if targets:
+            return list(targets), alignments
+        alignments = list(alignments)
+        lengths = {}
+        for alignment in alignments:
+            target = alignment.target
+            if target is None:  # unmapped
+                continue
+            try:
+                length = len(target)
+            except TypeError:  # sequence length is undefined
+                length = max(alignment.coordinates[0, 0], alignment.coordinates[0, -1])
+                length = max(length, lengths.get(target.id, 0))
+            lengths[target.id] = length
+        targets = [
+            SeqRecord(Seq(None, length=length), id=name, description="")
+            for name, length in lengths.items()
+        ]
+        return targets, alignments
+
+    def write_header(self, stream, alignments, targets):
+        """Write the BAM header, including the SAM header text."""
+        try:
+            metadata = alignments.metadata
+        except AttributeError:
+            metadata = {}
+        header = _Header(metadata, targets)
+        text = io.StringIO()
+        super().write_header(text, header)
+        text = text.getvalue().encode()
+        stream.write(b"BAM\x01")
+        stream.write(struct.pack("<i", len(text)))
+        stream.write(text)
+        stream.write(struct.pack("<i", len(targets)))
+        for target in targets:
+            name = target.id.encode() + b"\x00"
+            stream.write(struct.pack("<i", len(name)))
+            stream.write(name)
+            stream.write(struct.pack("<i", len(target)))
+
+    def format_alignment(self, alignment, md=None):
+        """Return a single alignment as a BAM record in bytes."""
+        line = super().format_alignment(alignment, md)
+        fields = line[:-1].split("\t")
+        return self._encode_record(fields)
+
+    def _encode_record(self, fields):
+        """Return the BAM record for a list of SAM text fields (PRIVATE)."""
+        refIDs = self._refIDs
+        qname = fields[0].encode() + b"\x00"
+        flag = int(fields[1])
+        rname = fields[2]
+        refID = -1 if rname == "*" else refIDs[rname]
+        pos = int(fields[3]) - 1
+        mapq = int(fields[4])
+        cigar = fields[5]
+        values = []
+        length = 0
+        if cigar != "*":
+            number = 0
+            for letter in cigar:
+                if letter.isdigit():
+                    number = 10 * number + int(letter)
+                else:
+                    code = _cigar_codes[letter]
+                    values.append(number << 4 | code)
+                    if code in _reference_operations:
+                        length += number
+                    number = 0
+        end = pos + (length if length > 0 else 1)
+        rnext = fields[6]
+        if rnext == "=":
+            next_refID = refID
+        elif rnext == "*":
+            next_refID = -1
+        else:
+            next_refID = refIDs[rnext]
+        pnext = int(fields[7]) - 1
+        tlen = int(fields[8])
+        seq = fields[9]
+        if seq == "*":
+            l_seq = 0
+            seq = b""
+        else:
+            l_seq = len(seq)
+            codes = np.frombuffer(
+                seq.encode().translate(_nucleotide_codes), dtype=np.uint8
+            )
+            if l_seq % 2:
+                codes = np.append(codes, np.uint8(0))
+            seq = (codes[0::2] << 4 | codes[1::2]).tobytes()
+        qual = fields[10]
+        if qual == "*":
+            qual = b"\xff" * l_seq
+        else:
+            qual = qual.encode("latin-1").translate(_quality_from_text)
+        data = b"".join(
+            [
+                _record_formatter.pack(
+                    refID,
+                    pos,
+                    len(qname),
+                    mapq,
+                    _reg2bin(pos, end),
+                    len(values),
+                    flag,
+                    l_seq,
+                    next_refID,
+                    pnext,
+                    tlen,
+                ),
+                qname,
+                struct.pack("<%dI" % len(values), *values),
+                seq,
+                qual,
+            ]
+            + [_encode_tag(field) for field in fields[11:]]
+        )
+        return struct.pack("<i", len(data)) + data
+
+    def write_file(self, stream, alignments):
+        """Write the alignments to the file stream, and return the number of alignments.
+
+        alignments - A list or iterator returning Alignment objects
+        stream     - Output file stream.
+        """
+        targets, alignments = self._find_targets(alignments)
+        self._refIDs = {target.id: index for index, target in enumerate(targets)}
+        output = bgzf.BgzfWriter(fileobj=stream)
+        self.write_header(output, alignments, targets)
+        output.flush()
+        count = self.write_alignments(output, alignments)
+        output.flush()
+        stream.write(bgzf._bgzf_eof)
+        return count
+
+
+class _Header:
+    """Collect the metadata and targets for writing the SAM header text (PRIVATE)."""
+
+    def __init__(self, metadata, targets):
+        self.metadata = metadata
+        self.targets = targets
+
+
+def create_index(source, target=None, fmt="bai", min_shift=14, depth=5):
+    """Create a BAI or CSI index for a BAM file sorted by coordinate.
+
+    Arguments:
+     - source    - path to the BAM file.
+     - target    - path to the index file. If None (default), the index file
+                   is written to the path of the BAM file with ".bai" or
+                   ".csi" appended.
+     - fmt       - "bai" (default) to create a BAI index, or "csi" to create
+                   a CSI index.
+     - min_shift - number of bits of the minimum bin size of a CSI index.
+                   The default value of 14 corresponds to bins of 16 kbp.
+     - depth     - number of levels in the binning scheme of a CSI index.
+                   A BAI index always uses min_shift=14 and depth=5, which
+                   is sufficient for reference sequences up to 512 Mbp.
+
+    Returns the path to the index file.
+    """
+    fmt = fmt.lower()
+    if fmt == "bai":
+        if min_shift != 14 or depth != 5:
+            raise ValueError("BAI indices require min_shift=14 and depth=5")
+    elif fmt != "csi":
+        raise ValueError("fmt should be 'bai' or 'csi' (found '%s')" % fmt)
+    if target is None:
+        target = os.fspath(source) + "." + fmt
+    with AlignmentIterator(source, lightweight=True) as alignments:
+        stream = alignments._stream
+        index = _Index(min_shift, depth)
+        n_ref = len(alignments._names)
+        metadata = [None] * n_ref
+        for i in range(n_ref):
+            index.bins.append({})
+            index.linear.append([])
+        n_no_coor = 0
+        previous = (-1, -1)
+        while True:
+            offset = stream.tell()
+            data = _read_record(stream)
+            if data is None:
+                break
+            record = Record(data, alignments._names)
+            refID = record.refID
+            pos = record.pos
+            if refID < 0:
+                n_no_coor += 1
+                previous = (n_ref, pos)
+                continue
+            if (refID, pos) < previous:
+                raise ValueError(
+                    "alignments must be sorted by coordinate to create an index"
+                )
+            previous = (refID, pos)
+            end_offset = stream.tell()
+            start = max(pos, 0)
+            end = record.end
+            bins = index.bins[refID]
+            number = _reg2bin(start, end, min_shift, depth)
+            chunks = bins.setdefault(number, [])
+            if chunks and chunks[-1][1] == offset:
+                chunks[-1][1] = end_offset
+            else:
+                chunks.append([offset, end_offset])
+            linear = index.linear[refID]
+            first = start >> min_shift
+            last = (end - 1) >> min_shift
+            if len(linear) <= last:
+                linear.extend([None] * (last + 1 - len(linear)))
+            for window in range(first, last + 1):
+                if linear[window] is None:
+                    linear[window] = offset
+            values = metadata[refID]
+            if values is None:
+                values = metadata[refID] = [offset, end_offset, 0, 0]
+            values[1] = end_offset
+            if record.flag & 0x4:
+                values[3] += 1
+            else:
+                values[2] += 1
+    for linear in index.linear:
+        value = 0
+        for window in range(len(linear) - 1, -1, -1):
+            if linear[window] is None:
+                linear[window] = value
+            else:
+                value = linear[window]
+    metadata_bin = index.metadata_bin
+    data = io.BytesIO()
+    data.write(struct.pack("<i", n_ref))
+    for bins, linear, values in zip(index.bins, index.linear, metadata):
+        n_bin = len(bins)
+        if values is not None:
+            n_bin += 1
+        data.write(struct.pack("<i", n_bin))
+        for number, chunks in sorted(bins.items()):
+            if fmt == "bai":
+                data.write(struct.pack("<Ii", number, len(chunks)))
+            else:
+                loffset = chunks[0][0]
+                level_shift = min_shift
+                level_start = ((1 << depth * 3) - 1) // 7
+                for level in range(depth, 0, -1):
+                    if number >= level_start:
+                        break
+                    level_shift += 3
+                    level_start -= 1 << (level - 1) * 3
+                window = ((number - level_start) << level_shift) >> min_shift
+                if window < len(linear):
+                    loffset = min(loffset, linear[window])
+                data.write(struct.pack("<IQi", number, loffset, len(chunks)))
+            for chunk in chunks:
+                data.write(struct.pack("<QQ", *chunk))
+        if values is not None:
+            if fmt == "bai":
+                data.write(struct.pack("<Ii", metadata_bin, 2))
+            else:
+                data.write(struct.pack("<IQi", metadata_bin, 0, 2))
+            data.write(struct.pack("<QQQQ", *values))
+        if fmt == "bai":
+            data.write(struct.pack("<i", len(linear)))
+            data.write(struct.pack("<%dQ" % len(linear), *linear))
+    data.write(struct.pack("<Q", n_no_coor))
+    data = data.getvalue()
+    if fmt == "bai":
+        with open(target, "wb") as stream:
+            stream.write(b"BAI\x01")
+            stream.write(data)
+    else:
+        with bgzf.BgzfWriter(target, "wb") as stream:
+            stream.write(b"CSI\x01")
+            stream.write(struct.pack("<iii", min_shift, depth, 0))
+            stream.write(data)
+    return target
+
+
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+
+    run_doctest()
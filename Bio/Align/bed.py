@@ -35,6 +35,23 @@ from Bio.Align import interfaces
 from Bio.Seq import Seq
 from Bio.SeqRecord import SeqRecord
 
+# column names and data types used by Bio.Align.parse_batches; None
+# indicates a text column
+_batch_columns = (
+    ("chrom", None),
+    ("chromStart", np.int64),
+    ("chromEnd", np.int64),
+    ("name", None),
+    ("score", np.float64),
+    ("strand", None),
+    ("thickStart", np.int64),
+    ("thickEnd", np.int64),
+    ("itemRgb", None),
+    ("blockCount", np.int64),
+    ("blockSizes", None),
+    ("chromStarts", None),
+)
+
 
 class AlignmentWriter(interfaces.AlignmentWriter):
     """Alignment file writer for the Browser Extensible Data (BED) file format."""
@@ -164,6 +181,22 @@ class AlignmentIterator(interfaces.AlignmentIterator):
 
     fmt = "BED"
 
+    def _read_next_batch(self, stream, batch_size):
+        lines = []
+        for line in stream:
+            lines.append(line)
+            if len(lines) == batch_size:
+                break
+        if not lines:
+            return None
+        bedN = len(lines[0].split())
+        if bedN < 3 or bedN > 12:
+            raise ValueError("expected between 3 and 12 columns, found %d" % bedN)
+        names, dtypes = zip(*_batch_columns[:bedN])
+        return interfaces.AlignmentBatch._from_lines(
+            lines, names, dtypes, whitespace=True
+        )
+
     def _read_next_alignment(self, stream):
         for line in stream:
             # note that we cannot extract one line by calling next, as stream
@@ -50,13 +50,21 @@ You are expected to use this module via the Bio.Align functions.
 # CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 # ------------------------------------------------------------------------------
 
+import bisect
 import copy
+import heapq
 import io
 import itertools
+import operator
+import pickle
 import struct
 import sys
+import tempfile
 import zlib
+from collections import deque
 from collections import namedtuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 
 import numpy as np
@@ -229,6 +237,9 @@ class AlignmentWriter(interfaces.AlignmentWriter):
         itemsPerSlot=512,
         blockSize=256,
         extraIndex=(),
+        sort=False,
+        sortBufferSize=1000000,
+        threads=1,
     ):
         """Create an AlignmentWriter object.
 
@@ -265,9 +276,27 @@ class AlignmentWriter(interfaces.AlignmentWriter):
          - extraIndex   - List of strings with the names of extra columns to be
                           indexed.
                           Default value is an empty list.
+         - sort         - If False (default), the alignments must be sorted by
+                          target name and start coordinate, and are read three
+                          times while writing the file.
+                          If True, the alignments are read only once and sorted
+                          by the writer; sorted runs of sortBufferSize rows are
+                          stored in temporary files on disk and merged, so
+                          the alignments do not have to be kept in memory.
+         - sortBufferSize - Maximum number of rows to sort in memory if sort
+                          is True. Default value is 1000000.
+         - threads      - Number of threads used to compress the data blocks
+                          and zoom blocks with zlib. The blocks are written in
+                          the same order as in serial compression, so the
+                          output does not depend on the number of threads.
+                          Default value is 1.
         """
         if bedN < 3 or bedN > 12:
             raise ValueError("bedN must be between 3 and 12")
+        if sortBufferSize < 1:
+            raise ValueError("sortBufferSize must be positive")
+        if threads < 1:
+            raise ValueError("threads must be positive")
         super().__init__(target)
         self.bedN = bedN
         self.declaration = declaration
@@ -276,6 +305,9 @@ class AlignmentWriter(interfaces.AlignmentWriter):
         self.extraIndexNames = extraIndex
         self.itemsPerSlot = itemsPerSlot
         self.blockSize = blockSize
+        self.sort = sort
+        self.sortBufferSize = sortBufferSize
+        self.threads = threads
 
     def write_file(self, stream, alignments):
         """Write the alignments to the file stream, and return the number of alignments.
@@ -297,8 +329,20 @@ class AlignmentWriter(interfaces.AlignmentWriter):
         declaration = self.declaration
         header.fieldCount = len(declaration)
         extra_indices = _ExtraIndices(self.extraIndexNames, declaration)
-        chromUsageList, aveSize = self._get_chrom_usage(
-            alignments, targets, extra_indices
+        rows = _AlignmentRows(alignments, self._extract_fields, extra_indices)
+        if self.sort:
+            rows = _SortedRows(rows.iterate(True), self.sortBufferSize)
+        blocks = _BlockWriter(stream, self.compress, self.threads)
+        try:
+            self._write_contents(stream, rows, blocks, header, targets, extra_indices)
+        finally:
+            blocks.close()
+            rows.close()
+
+    def _write_contents(self, stream, rows, blocks, header, targets, extra_indices):
+        declaration = self.declaration
+        chromUsageList, aveSize, bedCount = self._get_chrom_usage(
+            rows.iterate(False), targets, extra_indices
         )
         stream.write(bytes(header.size))
         stream.write(bytes(_ZoomLevels.size))
@@ -314,11 +358,11 @@ class AlignmentWriter(interfaces.AlignmentWriter):
         )
         header.fullDataOffset = stream.tell()
         reductions = _ZoomLevels.calculate_reductions(aveSize)
-        stream.write(len(alignments).to_bytes(8, sys.byteorder))
-        extra_indices.initialize(len(alignments))
+        stream.write(bedCount.to_bytes(8, sys.byteorder))
+        extra_indices.initialize(bedCount)
         maxBlockSize, regions = self.write_alignments(
-            alignments,
-            stream,
+            rows.iterate(True),
+            blocks,
             reductions,
             extra_indices,
         )
@@ -333,8 +377,9 @@ class AlignmentWriter(interfaces.AlignmentWriter):
             regions, self.blockSize, 1, header.fullIndexOffset, stream
         )
         zoomList, totalSum = self._write_zoom_levels(
-            alignments,
-            stream,
+            rows.iterate(False),
+            bedCount,
+            blocks,
             header.fullIndexOffset - header.fullDataOffset,
             chromUsageList,
             reductions,
@@ -355,7 +400,7 @@ class AlignmentWriter(interfaces.AlignmentWriter):
         data = header.signature.to_bytes(4, sys.byteorder)
         stream.write(data)
 
-    def _get_chrom_usage(cls, alignments, targets, extra_indices):
+    def _get_chrom_usage(self, rows, targets, extra_indices):
         aveSize = 0
         chromId = 0
         totalBases = 0
@@ -365,14 +410,9 @@ class AlignmentWriter(interfaces.AlignmentWriter):
         keySize = 0
         chromSize = -1
         minDiff = sys.maxsize
-        for alignment in alignments:
-            chrom = alignment.sequences[0].id
-            # Note that for MAF files, this may be a multiple alignment, so
-            # alignment.target.id won't necessarily work.
-            start = alignment.coordinates[0, 0]
-            end = alignment.coordinates[0, -1]
-            for extra_index in extra_indices:
-                extra_index.updateMaxFieldSize(alignment)
+        for chrom, start, end, rest, keys in rows:
+            for extra_index, key in zip(extra_indices, keys):
+                extra_index.updateMaxFieldSize(key)
             if start > end:
                 raise ValueError(
                     f"end ({end}) before start ({start}) in alignment [{bedCount}]"
@@ -419,15 +459,15 @@ class AlignmentWriter(interfaces.AlignmentWriter):
         )
         if bedCount > 0:
             aveSize = totalBases / bedCount
-        alignments._len = bedCount
-        return chromUsageList, aveSize
+        return chromUsageList, aveSize, bedCount
 
     def _write_zoom_levels(
-        self, alignments, output, dataSize, chromUsageList, reductions
+        self, rows, bedCount, blocks, dataSize, chromUsageList, reductions
     ):
         zoomList = _ZoomLevels()
         totalSum = _Summary()
-        if len(alignments) == 0:
+        output = blocks.output
+        if bedCount == 0:
             totalSum.minVal = 0.0
             totalSum.maxVal = 0.0
         else:
@@ -446,13 +486,10 @@ class AlignmentWriter(interfaces.AlignmentWriter):
                 initialReduction = reductions[0]
             initialReduction["size"].tofile(output)
             size = itemsPerSlot * _RegionSummary.size
-            if doCompress:
-                buffer = _ZippedBufferedStream(output, size)
-            else:
-                buffer = _BufferedStream(output, size)
+            buffer = _BufferedStream(blocks, size)
             regions = []
             rezoomedList = []
-            trees = _RangeTree.generate(chromUsageList, alignments)
+            trees = _RangeTree.generate(chromUsageList, rows)
             scale = int(initialReduction["scale"])
             doubleReductionSize = scale * _ZoomLevels.bbiResIncrement
             for tree in trees:
@@ -476,9 +513,9 @@ class AlignmentWriter(interfaces.AlignmentWriter):
                 regions, blockSize, itemsPerSlot, indexOffset, output
             )
             if doCompress:
-                buffer = _ZippedBufferedStream(output, size)
+                buffer = _BufferedStream(blocks, size)
             else:
-                buffer = _BufferedStream(output, _RegionSummary.size)
+                buffer = _BufferedStream(blocks, _RegionSummary.size)
             zoomList.reduce(
                 rezoomedList, initialReduction, buffer, blockSize, itemsPerSlot
             )
@@ -598,11 +635,11 @@ class AlignmentWriter(interfaces.AlignmentWriter):
         rest = "\t".join(row).encode()
         return chrom, chromStart, chromEnd, rest
 
-    def write_alignments(self, alignments, output, reductions, extra_indices):
-        """Write alignments to the output file, and return the number of alignments.
+    def write_alignments(self, rows, blocks, reductions, extra_indices):
+        """Write the data blocks, and return the maximum block size and the regions.
 
-        alignments - A list or iterator returning Alignment objects
-        stream     - Output file stream.
+        rows   - An iterator returning (chrom, start, end, rest, keys) tuples
+        blocks - _BlockWriter object writing (compressed) blocks to the output
         """
         itemsPerSlot = self.itemsPerSlot
         chromId = -1
@@ -612,10 +649,7 @@ class AlignmentWriter(interfaces.AlignmentWriter):
         currentChrom = None
 
         regions = []
-        if self.compress is True:
-            buffer = _ZippedStream()
-        else:
-            buffer = BytesIO()
+        buffer = BytesIO()
         maxBlockSize = 0
 
         # Supplemental Table 12: Binary BED-data format
@@ -627,15 +661,14 @@ class AlignmentWriter(interfaces.AlignmentWriter):
 
         done = False
         region = None
-        alignments = iter(alignments)
+        rows = iter(rows)
         while True:
             try:
-                alignment = next(alignments)
+                chrom, start, end, rest, keys = next(rows)
             except StopIteration:
                 itemIx = itemsPerSlot
                 done = True
             else:
-                chrom, start, end, rest = self._extract_fields(alignment)
                 if chrom != currentChrom:
                     if currentChrom is not None:
                         itemIx = itemsPerSlot
@@ -643,26 +676,29 @@ class AlignmentWriter(interfaces.AlignmentWriter):
                     chromId += 1
                     reductions["end"] = 0
             if itemIx == itemsPerSlot:
-                blockStartOffset = output.tell()
                 size = buffer.tell()
                 if size > maxBlockSize:
                     maxBlockSize = size
-                data = buffer.getvalue()
-                output.write(data)
-                buffer.seek(0)
-                buffer.truncate(0)
-                if extra_indices:
-                    blockEndOffset = output.tell()
-                    blockSize = blockEndOffset - blockStartOffset
+
+                # The block may be compressed in another thread; its offset
+                # and size are filled in once it has been written.
+                def callback(
+                    offset,
+                    size,
+                    region=region,
+                    sectionStartIx=sectionStartIx,
+                    sectionEndIx=sectionEndIx,
+                ):
                     for extra_index in extra_indices:
                         extra_index.addOffsetSize(
-                            blockStartOffset,
-                            blockSize,
-                            sectionStartIx,
-                            sectionEndIx,
+                            offset, size, sectionStartIx, sectionEndIx
                         )
-                    sectionStartIx = sectionEndIx
-                region.offset = blockStartOffset
+                    region.offset = offset
+
+                blocks.write(buffer.getvalue(), callback)
+                buffer.seek(0)
+                buffer.truncate(0)
+                sectionStartIx = sectionEndIx
                 if done is True:
                     break
                 itemIx = 0
@@ -680,11 +716,12 @@ class AlignmentWriter(interfaces.AlignmentWriter):
                     row["size"] += 1
                     row["end"] += row["scale"]
             if extra_indices:
-                for extra_index in extra_indices:
-                    extra_index.addKeysFromRow(alignment, sectionEndIx)
+                for extra_index, key in zip(extra_indices, keys):
+                    extra_index.addKeysFromRow(key, sectionEndIx)
                 sectionEndIx += 1
             data = formatter.pack(chromId, start, end)
             buffer.write(data + rest + b"\0")
+        blocks.flush()
         return maxBlockSize, regions
 
 
@@ -699,6 +736,8 @@ class AlignmentIterator(interfaces.AlignmentIterator):
     fmt = "bigBed"
     mode = "b"
 
+    blockCacheSize = 256  # maximum number of decompressed data blocks to cache
+
     def _read_header(self, stream):
         header = _Header.fromfile(stream)
         byteorder = header.byteorder
@@ -741,6 +780,7 @@ class AlignmentIterator(interfaces.AlignmentIterator):
 
         stream.seek(header.fullIndexOffset)
         self.tree = _RTreeFormatter(byteorder).read(stream)
+        self._blocks = OrderedDict()
         self._data = self._iterate_index(stream)
 
     def _read_autosql(self, stream, header):
@@ -845,6 +885,24 @@ class AlignmentIterator(interfaces.AlignmentIterator):
             else:
                 node = children[0]
 
+    def _read_block(self, stream, node):
+        # Return the decompressed data block, using the cache if possible.
+        blocks = self._blocks
+        key = node.dataOffset
+        try:
+            data = blocks[key]
+        except KeyError:
+            stream.seek(key)
+            data = stream.read(node.dataSize)
+            if self._compressed > 0:
+                data = zlib.decompress(data)
+            blocks[key] = data
+            if len(blocks) > self.blockCacheSize:
+                blocks.popitem(last=False)
+        else:
+            blocks.move_to_end(key)
+        return data
+
     def _search_index(self, stream, chromIx, start, end):
         # Supplemental Table 12: Binary BED-data format
         # chromId     4 bytes, unsigned
@@ -860,10 +918,7 @@ class AlignmentIterator(interfaces.AlignmentIterator):
             try:
                 children = node.children
             except AttributeError:
-                stream.seek(node.dataOffset)
-                data = stream.read(node.dataSize)
-                if self._compressed > 0:
-                    data = zlib.decompress(data)
+                data = self._read_block(stream, node)
                 if self.itemsPerSlot == 1:
                     child_chromIx, child_chromStart, child_chromEnd = formatter.unpack(
                         data[:size]
@@ -936,6 +991,83 @@ class AlignmentIterator(interfaces.AlignmentIterator):
                 else:
                     break
 
+    def _find_leaves(self, regions):
+        # Yield the leaves of the R-tree (i.e., the data blocks) that may
+        # contain alignments in the sorted, non-overlapping regions.
+        # The nodes are visited in order of their start position, so regions
+        # that end before the start of a node can be discarded permanently.
+        n = len(regions)
+        k = 0
+        stack = [iter([self.tree])]
+        while stack:
+            try:
+                node = next(stack[-1])
+            except StopIteration:
+                stack.pop()
+                continue
+            startChromIx = node.startChromIx
+            startBase = node.startBase
+            while k < n:
+                chromIx, start, end = regions[k]
+                if (chromIx, end + 1) < (startChromIx, startBase):
+                    k += 1
+                else:
+                    break
+            else:
+                return
+            if (node.endChromIx, node.endBase) < (chromIx, start - 1):
+                continue
+            try:
+                children = node.children
+            except AttributeError:
+                yield node
+            else:
+                stack.append(iter(children))
+
+    def _search_index_many(self, stream, regions):
+        # Supplemental Table 12: Binary BED-data format
+        # chromId     4 bytes, unsigned
+        # chromStart  4 bytes, unsigned
+        # chromEnd    4 bytes, unsigned
+        # rest        zero-terminated string in tab-separated format
+        formatter = struct.Struct(self.byteorder + "III")
+        size = formatter.size
+        n = len(regions)
+        ends = [(chromIx, end) for chromIx, start, end in regions]
+        for node in self._find_leaves(regions):
+            data = self._read_block(stream, node)
+            i = 0
+            m = len(data)
+            while i < m:
+                j = i + size
+                child_chromIx, child_chromStart, child_chromEnd = formatter.unpack(
+                    data[i:j]
+                )
+                i = j
+                j = data.index(b"\00", i) + 1
+                rest = data[i:j]
+                i = j
+                k = bisect.bisect_left(ends, (child_chromIx, child_chromStart))
+                while k < n:
+                    chromIx, start, end = regions[k]
+                    if (chromIx, start) > (child_chromIx, child_chromEnd):
+                        break
+                    k += 1
+                    if end <= child_chromStart or child_chromEnd <= start:
+                        if child_chromStart != child_chromEnd:
+                            continue
+                        if child_chromStart != end and child_chromEnd != start:
+                            continue
+                    yield (
+                        child_chromIx,
+                        child_chromStart,
+                        child_chromEnd,
+                        rest,
+                        0,
+                        len(rest),
+                    )
+                    break
+
     def _read_next_alignment(self, stream):
         try:
             row = next(self._data)
@@ -1085,48 +1217,252 @@ class AlignmentIterator(interfaces.AlignmentIterator):
             )
             yield alignment
 
+    def search_many(self, regions):
+        """Iterate over alignments overlapping any of the specified regions.
+
+        This method is equivalent to calling the search method for each
+        region, but is much faster if many regions are searched. The regions
+        are sorted and overlapping regions are merged, such that each node of
+        the index and each data block is visited only once. Each alignment is
+        returned only once, in the order in which it is stored in the file,
+        even if it overlaps with more than one region.
 
-class _ZippedStream(io.BytesIO):
-    def getvalue(self):
-        data = super().getvalue()
-        return zlib.compress(data)
+        Decompressed data blocks are kept in a cache shared by calls to
+        search_many and search, which speeds up repeated searches of nearby
+        regions. The maximum number of cached blocks is given by the
+        blockCacheSize attribute (default value 256).
+
+        Arguments:
+         - regions - iterable of (chromosome, start, end) tuples. As in the
+           search method, start may be None to search the full chromosome,
+           and end may be None to search the single position at start.
+
+        """
+        stream = self._stream
+        chromIxs = {target.id: chromIx for chromIx, target in enumerate(self.targets)}
+        items = []
+        for chromosome, start, end in regions:
+            try:
+                chromIx = chromIxs[chromosome]
+            except KeyError:
+                raise ValueError(
+                    "Failed to find %s in alignments" % chromosome
+                ) from None
+            if start is None:
+                if end is None:
+                    start = 0
+                    end = len(self.targets[chromIx])
+                else:
+                    raise ValueError("end must be None if start is None")
+            elif end is None:
+                end = start + 1
+            items.append((chromIx, start, end))
+        items.sort()
+        regions = []
+        for chromIx, start, end in items:
+            if regions:
+                previous = regions[-1]
+                if previous[0] == chromIx and start <= previous[2]:
+                    if end > previous[2]:
+                        regions[-1] = (chromIx, previous[1], end)
+                    continue
+            regions.append((chromIx, start, end))
+        data = self._search_index_many(stream, regions)
+        for row in data:
+            chromIx, chromStart, chromEnd, rest, dataStart, dataEnd = row
+            alignment = self._create_alignment(
+                chromIx, chromStart, chromEnd, rest, dataStart, dataEnd
+            )
+            yield alignment
+
+
+class _AlignmentRows:
+    """Present the alignments as rows of a bigBed file (PRIVATE).
+
+    Each row is a (chrom, start, end, rest, keys) tuple, where rest contains
+    the remaining BED fields as bytes and keys the values of the extra indices.
+    The alignments are iterated over again each time the rows are needed.
+    """
+
+    def __init__(self, alignments, extract_fields, extra_indices):
+        self.alignments = alignments
+        self.extract_fields = extract_fields
+        self.extra_indices = extra_indices
+
+    def iterate(self, full):
+        """Iterate over the rows; rest is None unless full is True."""
+        extract_fields = self.extract_fields
+        extra_indices = self.extra_indices
+        for alignment in self.alignments:
+            if full:
+                chrom, start, end, rest = extract_fields(alignment)
+            else:
+                # Note that for MAF files, this may be a multiple alignment, so
+                # alignment.target.id won't necessarily work.
+                chrom = alignment.sequences[0].id
+                start = alignment.coordinates[0, 0]
+                end = alignment.coordinates[0, -1]
+                rest = None
+            keys = tuple(
+                extra_index.get_value(alignment) for extra_index in extra_indices
+            )
+            yield chrom, int(start), int(end), rest, keys
+
+    def close(self):
+        return
+
+
+class _SortedRows:
+    """Rows sorted by chromosome name and start position (PRIVATE).
+
+    The rows are sorted in memory in runs of at most bufferSize rows. If there
+    is more than one run, each run is stored in a temporary file, and the runs
+    are merged into a single temporary file that is read each time the rows
+    are needed.
+    """
+
+    chunkSize = 1024
+
+    def __init__(self, rows, bufferSize):
+        key = operator.itemgetter(0, 1)
+        runs = []
+        buffer = []
+        for row in rows:
+            buffer.append(row)
+            if len(buffer) == bufferSize:
+                buffer.sort(key=key)
+                runs.append(self._spill(buffer))
+                buffer = []
+        buffer.sort(key=key)
+        if runs:
+            if buffer:
+                runs.append(self._spill(buffer))
+            # heapq.merge is stable, so rows with the same chromosome and start
+            # position remain in the order in which they were provided.
+            rows = heapq.merge(*[self._load(run) for run in runs], key=key)
+            self.stream = self._spill(rows)
+            for run in runs:
+                run.close()
+            self.rows = None
+        else:
+            self.stream = None
+            self.rows = buffer
+
+    def _spill(self, rows):
+        stream = tempfile.TemporaryFile()
+        chunkSize = self.chunkSize
+        rows = iter(rows)
+        while True:
+            chunk = list(itertools.islice(rows, chunkSize))
+            if not chunk:
+                break
+            pickle.dump(chunk, stream, pickle.HIGHEST_PROTOCOL)
+        return stream
+
+    @staticmethod
+    def _load(stream):
+        stream.seek(0)
+        while True:
+            try:
+                chunk = pickle.load(stream)
+            except EOFError:
+                break
+            yield from chunk
+
+    def iterate(self, full):
+        """Iterate over the sorted rows."""
+        if self.stream is None:
+            return iter(self.rows)
+        return self._load(self.stream)
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.close()
+
+
+class _BlockWriter:
+    """Write blocks of data to the output, compressing them if requested (PRIVATE).
+
+    If threads is larger than 1, the blocks are compressed with zlib in a
+    pool of threads (zlib releases the GIL while compressing), but they are
+    written in the order in which they were submitted. The output is therefore
+    identical to that of serial compression.
+    """
+
+    def __init__(self, output, compress, threads=1):
+        self.output = output
+        self.compress = compress
+        self.pending = deque()
+        if compress and threads > 1:
+            self.executor = ThreadPoolExecutor(max_workers=threads)
+            self.maxPending = 2 * threads
+        else:
+            self.executor = None
+
+    def write(self, data, callback=None):
+        """Write the block; callback(offset, size) is called once it is written."""
+        if self.executor is None:
+            if self.compress:
+                data = zlib.compress(data)
+            self._write(data, callback)
+        else:
+            future = self.executor.submit(zlib.compress, data)
+            self.pending.append((future, callback))
+            if len(self.pending) > self.maxPending:
+                future, callback = self.pending.popleft()
+                self._write(future.result(), callback)
+
+    def _write(self, data, callback):
+        offset = self.output.tell()
+        self.output.write(data)
+        if callback is not None:
+            callback(offset, len(data))
+
+    def flush(self):
+        """Write all pending blocks to the output."""
+        pending = self.pending
+        while pending:
+            future, callback = pending.popleft()
+            self._write(future.result(), callback)
+
+    def close(self):
+        """Write all pending blocks, and shut down the thread pool."""
+        self.flush()
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
 
 
 class _BufferedStream:
-    def __init__(self, output, size):
+    def __init__(self, blocks, size):
         self.buffer = BytesIO()
-        self.output = output
+        self.items = []
+        self.blocks = blocks
+        self.output = blocks.output
         self.size = size
 
     def write(self, item):
-        item.offset = self.output.tell()
+        self.items.append(item)
         data = bytes(item)
         self.buffer.write(data)
         if self.buffer.tell() == self.size:
-            self.output.write(self.buffer.getvalue())
-            self.buffer.seek(0)
-            self.buffer.truncate(0)
+            self._write_block()
 
-    def flush(self):
-        self.output.write(self.buffer.getvalue())
-        self.buffer.seek(0)
-        self.buffer.truncate(0)
+    def _write_block(self):
+        items = self.items
 
+        def callback(offset, size):
+            for item in items:
+                item.offset = offset
 
-class _ZippedBufferedStream(_BufferedStream):
-    def write(self, item):
-        item.offset = self.output.tell()
-        data = bytes(item)
-        self.buffer.write(data)
-        if self.buffer.tell() == self.size:
-            self.output.write(zlib.compress(self.buffer.getvalue()))
-            self.buffer.seek(0)
-            self.buffer.truncate(0)
-
-    def flush(self):
-        self.output.write(zlib.compress(self.buffer.getvalue()))
+        self.blocks.write(self.buffer.getvalue(), callback)
         self.buffer.seek(0)
         self.buffer.truncate(0)
+        self.items = []
+
+    def flush(self):
+        self._write_block()
+        self.blocks.flush()
 
 
 class _Header:
@@ -1241,14 +1577,12 @@ class _ExtraIndex:
         else:
             self.get_value = lambda alignment: alignment.annotations[name]
 
-    def updateMaxFieldSize(self, alignment):
-        value = self.get_value(alignment)
+    def updateMaxFieldSize(self, value):
         size = len(value)
         if size > self.maxFieldSize:
             self.maxFieldSize = size
 
-    def addKeysFromRow(self, alignment, recordIx):
-        value = self.get_value(alignment)
+    def addKeysFromRow(self, value, recordIx):
         self.chunks[recordIx]["name"] = value.encode()
 
     def addOffsetSize(self, offset, size, startIx, endIx):
@@ -1522,22 +1856,22 @@ class _RangeTree:
         self.chromSize = chromSize
 
     @classmethod
-    def generate(cls, chromUsageList, alignments):
-        alignments = iter(alignments)
-        alignment = None
+    def generate(cls, chromUsageList, rows):
+        rows = iter(rows)
+        row = None
         for chromName, chromId, chromSize in chromUsageList:
             chromName = chromName.decode()
             tree = _RangeTree(chromId, chromSize)
-            if alignment is not None:
-                tree.addToCoverageDepth(alignment)
+            if row is not None:
+                tree.addToCoverageDepth(row[1], row[2])
             while True:
                 try:
-                    alignment = next(alignments)
+                    row = next(rows)
                 except StopIteration:
                     break
-                if alignment.target.id != chromName:
+                if row[0] != chromName:
                     break
-                tree.addToCoverageDepth(alignment)
+                tree.addToCoverageDepth(row[1], row[2])
             yield tree
 
     def generate_summaries(self, scale, totalSum):
@@ -1686,9 +2020,7 @@ class _RangeTree:
                 x = m
                 p = self.stack.pop()
 
-    def addToCoverageDepth(self, alignment):
-        start = alignment.coordinates[0, 0]
-        end = alignment.coordinates[0, -1]
+    def addToCoverageDepth(self, start, end):
         if start > end:
             start, end = end, start
         existing = self.find(start, end)
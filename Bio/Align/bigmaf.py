@@ -69,6 +69,7 @@ class AlignmentWriter(bigbed.AlignmentWriter):
         compress=True,
         blockSize=256,
         itemsPerSlot=512,
+        threads=1,
     ):
         """Create an AlignmentWriter object.
 
@@ -95,6 +96,8 @@ class AlignmentWriter(bigbed.AlignmentWriter):
                           See UCSC's bedToBigBed program for more information.
                           Use itemsPerSlot=1 for faster searching.
                           Default value is 512.
+         - threads      - Number of threads used to compress the data blocks
+                          and zoom blocks. Default value is 1.
 
         """
         super().__init__(
@@ -105,6 +108,7 @@ class AlignmentWriter(bigbed.AlignmentWriter):
             compress=compress,
             blockSize=blockSize,
             itemsPerSlot=itemsPerSlot,
+            threads=threads,
         )
 
     def write_file(self, stream, alignments):
@@ -133,7 +137,11 @@ class AlignmentWriter(bigbed.AlignmentWriter):
         targets[0] = SeqRecord(record.seq, id=chromosome)
         fixed_alignments.targets = targets
         bigbed.AlignmentWriter(
-            stream, bedN=3, declaration=declaration, compress=self.compress
+            stream,
+            bedN=3,
+            declaration=declaration,
+            compress=self.compress,
+            threads=self.threads,
         ).write(fixed_alignments)
 
 
@@ -181,6 +181,7 @@ class AlignmentWriter(bigbed.AlignmentWriter):
         fa=False,
         mask=None,
         wildcard="N",
+        threads=1,
     ):
         """Create an AlignmentWriter object.
 
@@ -217,6 +218,8 @@ class AlignmentWriter(bigbed.AlignmentWriter):
                          of in the `matches`, `misMatches`, or `repMatches`
                          fields.
                          Default value is 'N'.
+         - threads     - Number of threads used to compress the data blocks
+                         and zoom blocks. Default value is 1.
         """
         super().__init__(
             target,
@@ -225,6 +228,7 @@ class AlignmentWriter(bigbed.AlignmentWriter):
             targets=targets,
             compress=compress,
             extraIndex=extraIndex,
+            threads=threads,
         )
         self.cds = cds
         self.fa = fa
@@ -427,7 +431,11 @@ class AlignmentWriter(bigbed.AlignmentWriter):
         )
         fixed_alignments.targets = alignments.targets
         bigbed.AlignmentWriter(
-            stream, bedN=12, declaration=declaration, compress=self.compress
+            stream,
+            bedN=12,
+            declaration=declaration,
+            compress=self.compress,
+            threads=self.threads,
         ).write(fixed_alignments)
 
 
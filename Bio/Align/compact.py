@@ -0,0 +1,334 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+"""Compact multiple sequence alignments stored as a NumPy character matrix.
+
+A CompactAlignment object stores a multiple sequence alignment as a single
+two-dimensional NumPy array of bytes (one row for each sequence, one column
+for each alignment column, with gaps stored as dashes), together with a
+parallel array of sequence identifiers. Compared to an Alignment object or a
+MultipleSeqAlignment object, no Python objects are created for individual
+sequences, and slicing rows and columns returns views of the same matrix
+without copying the data.
+
+The matrix can be saved to disk and memory-mapped, so that very large
+alignments do not have to be read into memory:
+
+>>> from Bio.Align.compact import CompactAlignment
+>>> alignment = CompactAlignment([b"ACGT-A", b"A-GTTA", b"ACCTTA"],
+...                              ["seq1", "seq2", "seq3"])
+>>> alignment.shape
+(3, 6)
+>>> print(alignment)
+seq1              0 ACGT-A 5
+seq2              0 A-GTTA 5
+seq3              0 ACCTTA 6
+<BLANKLINE>
+>>> alignment[1]
+'A-GTTA'
+>>> print(alignment[:2, 1:4])
+seq1              0 CGT 3
+                  0 -|| 3
+seq2              0 -GT 2
+<BLANKLINE>
+>>> print(alignment.counts())
+AlignmentCounts(gaps=4, identities=12, mismatches=2)
+
+Use the alignment property to obtain an Alignment object with the same
+sequences and coordinates.
+"""
+
+import json
+
+import numpy as np
+
+from Bio.Align import _count_frequencies
+from Bio.Align import _count_pairs
+from Bio.Align import _count_substitutions
+from Bio.Align import _find_first_letters
+from Bio.Align import Alignment
+from Bio.Align import MultipleSeqAlignment
+from Bio.Align import substitution_matrices
+from Bio.Seq import Seq
+from Bio.SeqIO.FastaIO import SimpleFastaParser
+from Bio.SeqRecord import SeqRecord
+
+_gap = ord("-")
+
+
+class CompactAlignment:
+    """Multiple sequence alignment stored as a uint8 character matrix.
+
+    Arguments:
+     - data - A two-dimensional NumPy array of dtype uint8 or S1 (which may
+       be a memory-mapped array), or a list of bytes or str objects of equal
+       length, one for each aligned sequence including the gaps.
+     - ids  - A list of sequence identifiers, one for each row of the matrix.
+       If None (default), empty identifiers are used.
+
+    A NumPy array of dtype uint8 or S1 is used without copying it.
+    """
+
+    def __init__(self, data, ids=None):
+        """Initialize the alignment from a character matrix."""
+        if isinstance(data, np.ndarray):
+            if data.dtype == np.dtype("S1"):
+                data = data.view(np.uint8)
+            elif data.dtype != np.uint8:
+                raise ValueError("expected an array of dtype uint8 or S1")
+        else:
+            lines = [
+                line.encode() if isinstance(line, str) else bytes(line) for line in data
+            ]
+            length = len(lines[0]) if lines else 0
+            for line in lines:
+                if len(line) != length:
+                    raise ValueError("all sequences must have the same length")
+            data = np.frombuffer(b"".join(lines), np.uint8)
+            data = data.reshape(len(lines), length)
+        if data.ndim != 2:
+            raise ValueError("expected a two-dimensional array")
+        if ids is None:
+            ids = np.full(len(data), "")
+        else:
+            ids = np.array(ids, str)
+            if ids.shape != (len(data),):
+                raise ValueError(
+                    "number of identifiers (%d) does not match the number of sequences (%d)"
+                    % (len(ids), len(data))
+                )
+        self.data = data
+        self.ids = ids
+
+    @classmethod
+    def from_alignment(cls, alignment):
+        """Create a CompactAlignment from an Alignment or MultipleSeqAlignment."""
+        if isinstance(alignment, MultipleSeqAlignment):
+            data = [bytes(record.seq) for record in alignment]
+            records = alignment
+        else:
+            data, gaps = alignment._get_matrix()
+            records = alignment.sequences
+        ids = [getattr(record, "id", None) or "" for record in records]
+        return cls(data, ids)
+
+    @classmethod
+    def from_fasta(cls, source):
+        """Read an aligned FASTA file directly into a character matrix.
+
+        Arguments:
+         - source - file name or a file-like object opened in text mode.
+
+        The sequences are copied into a single buffer as they are read, so
+        no sequence objects are created.
+        """
+        buffer = bytearray()
+        ids = []
+        length = None
+        try:
+            stream = open(source)
+        except TypeError:  # not a path, assume we received a stream
+            stream = source
+        try:
+            for title, sequence in SimpleFastaParser(stream):
+                if length is None:
+                    length = len(sequence)
+                elif len(sequence) != length:
+                    raise ValueError(
+                        "sequence '%s' has length %d, expected %d"
+                        % (title, len(sequence), length)
+                    )
+                ids.append(title.split(None, 1)[0] if title else "")
+                buffer += sequence.encode()
+        finally:
+            if stream is not source:
+                stream.close()
+        data = np.frombuffer(buffer, np.uint8).reshape(len(ids), length or 0)
+        return cls(data, ids)
+
+    def save(self, target):
+        """Save the alignment to a file that can be memory-mapped by load.
+
+        The file consists of the character matrix in NumPy's .npy format,
+        followed by the sequence identifiers encoded as a JSON list.
+        """
+        try:
+            stream = open(target, "wb")
+        except TypeError:  # not a path, assume we received a stream
+            stream = target
+        try:
+            np.lib.format.write_array(stream, self.data, allow_pickle=False)
+            stream.write(json.dumps(self.ids.tolist()).encode())
+        finally:
+            if stream is not target:
+                stream.close()
+
+    @classmethod
+    def load(cls, source, mmap_mode=None):
+        """Load an alignment saved by the save method.
+
+        Arguments:
+         - source    - file name.
+         - mmap_mode - If None (default), read the character matrix into
+           memory. Otherwise, memory-map the matrix using this mode ('r' for
+           read-only, 'r+' for read-write, or 'c' for copy-on-write), as in
+           numpy.load.
+
+        """
+        with open(source, "rb") as stream:
+            version = np.lib.format.read_magic(stream)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(
+                    stream
+                )
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(
+                    stream
+                )
+            if dtype != np.uint8 or fortran_order or len(shape) != 2:
+                raise ValueError("not a saved CompactAlignment")
+            offset = stream.tell()
+            size = shape[0] * shape[1]
+            if mmap_mode is None:
+                data = np.fromfile(stream, np.uint8, size).reshape(shape)
+            stream.seek(offset + size)
+            ids = json.loads(stream.read())
+        if mmap_mode is not None:
+            data = np.memmap(source, np.uint8, mmap_mode, offset, shape)
+        return cls(data, ids)
+
+    def __len__(self):
+        """Return the number of sequences in the alignment."""
+        return len(self.data)
+
+    @property
+    def length(self):
+        """Return the number of columns in the alignment."""
+        return self.data.shape[1]
+
+    @property
+    def shape(self):
+        """Return the number of sequences and columns as a tuple."""
+        return self.data.shape
+
+    def __array__(self, dtype=None, copy=None):
+        data = self.data.view("S1")
+        if dtype is not None:
+            data = np.array(data, dtype)
+        elif copy:
+            data = data.copy()
+        return data
+
+    def __getitem__(self, key):
+        """Return self[key].
+
+        Indices of the form
+
+        self[k]
+        self[k, j]
+        self[k, i:j]
+
+        return a string with the aligned sequence (including gaps) in row k
+        for the selected columns, while
+
+        self[i:j]
+        self[i:j, cols]
+        self[rows, cols]
+
+        return a new CompactAlignment object. If rows and cols are slices,
+        the new object is a view of the same character matrix.
+        """
+        if isinstance(key, tuple):
+            rows, cols = key
+        else:
+            rows, cols = key, slice(None)
+        if isinstance(rows, (int, np.integer)):
+            row = self.data[rows, cols]
+            if row.ndim == 0:
+                return chr(row)
+            return row.tobytes().decode()
+        if isinstance(rows, slice) and isinstance(cols, slice):
+            data = self.data[rows, cols]
+        else:
+            data = self.data[rows][:, cols]
+        ids = self.ids[rows]
+        return CompactAlignment(data, ids)
+
+    @property
+    def alignment(self):
+        """Return an Alignment object with the same sequences and coordinates.
+
+        Columns consisting of gaps only are removed.
+        """
+        data = self.data
+        empty = (data == _gap).all(0)
+        if empty.any():
+            data = data[:, ~empty]
+        lines = [row.tobytes() for row in data]
+        sequences, coordinates = Alignment.parse_printed_alignment(lines)
+        records = [
+            SeqRecord(Seq(sequence), id=str(identifier))
+            for sequence, identifier in zip(sequences, self.ids)
+        ]
+        return Alignment(records, coordinates)
+
+    def __format__(self, format_spec):
+        """Return the alignment as a string in the specified file format."""
+        return format(self.alignment, format_spec)
+
+    def __str__(self):
+        """Return a human-readable string representation of the alignment."""
+        return str(self.alignment)
+
+    def __repr__(self):
+        """Return a representation of the alignment."""
+        n, m = self.shape
+        return "<%s object (%d rows x %d columns) at 0x%x>" % (
+            type(self).__name__,
+            n,
+            m,
+            id(self),
+        )
+
+    @property
+    def frequencies(self):
+        """Return the frequency of each letter in each column of the alignment.
+
+        Gaps are represented by a dash ("-") character. As for Alignment
+        objects, the letters are listed in the order in which they first
+        appear in the alignment.
+        """
+        data = self.data
+        codes = _find_first_letters(data)
+        codes = sorted(codes, key=codes.get)
+        weights = np.ones(len(data))
+        return _count_frequencies(data, weights, codes)
+
+    @property
+    def substitutions(self):
+        """Return an Array with the number of substitutions of letters in the alignment.
+
+        As for Alignment objects, rows of the substitution matrix correspond
+        to letters in upper rows of the alignment, and columns of the matrix
+        to letters in lower rows of the alignment.
+        """
+        data = self.data
+        codes = np.flatnonzero(np.bincount(data.ravel(), minlength=256))
+        letters = "".join(chr(code) for code in codes if code != _gap)
+        m = substitution_matrices.Array(letters, dims=2)
+        m[:, :] = _count_substitutions(data, data == _gap, letters)
+        return m
+
+    def counts(self):
+        """Return the number of identities, mismatches, and gaps.
+
+        This is calculated for all pairs of sequences in the alignment, as
+        for Alignment objects.
+        """
+        return _count_pairs(self.data)
+
+
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+
+    run_doctest()
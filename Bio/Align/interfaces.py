@@ -16,6 +16,8 @@ from abc import ABC
 from abc import abstractmethod
 from typing import Optional
 
+import numpy as np
+
 from Bio import StreamModeError
 from Bio.Align import Alignments
 from Bio.Align import AlignmentsAbstractBaseClass
@@ -194,6 +196,153 @@ class AlignmentIterator(AlignmentsAbstractBaseClass):
         self._index = 0
 
 
+class AlignmentBatch:
+    """Column-oriented batch of alignment records read from a tabular file.
+
+    Alignment batches are returned by Bio.Align.parse_batches. Instead of
+    creating an Alignment object for each line in the file, the columns of
+    the file are stored as fields of a NumPy structured array, available as
+    the ``columns`` attribute. Numerical columns are stored as integer or
+    floating-point fields. Text columns, such as sequence identifiers, are
+    stored as a pair of ``offset`` and ``length`` subfields pointing into the
+    ``buffer`` attribute, which holds the raw bytes shared by all records in
+    the batch.
+
+    Indexing the batch by a column name returns the values in that column as
+    a NumPy array; text columns are decoded to strings. Any other index (a
+    slice, an integer array, or a boolean mask) returns a new AlignmentBatch
+    sharing the same buffer, which allows vectorized filtering:
+
+    >>> from Bio import Align
+    >>> batches = Align.parse_batches("Blast/tab_2226_tblastn_005.txt", "tabular")
+    >>> batch = next(batches)
+    >>> len(batch)
+    12
+    >>> batch.names[:4]
+    ('query id', 'subject id', '% identity', 'alignment length')
+    >>> selected = batch[batch["evalue"] < 1e-60]
+    >>> len(selected)
+    4
+    >>> selected["bit score"]
+    array([199., 202., 202., 202.])
+    >>> print(selected["subject id"][0])
+    gi|350596019|ref|XM_003360601.2|
+
+    """
+
+    def __init__(self, columns, buffer):
+        """Initialize the batch from a structured array and a buffer."""
+        self.columns = columns
+        self.buffer = buffer
+
+    @classmethod
+    def _from_lines(cls, lines, names, dtypes, whitespace=False):
+        """Create a batch from lines of tab-delimited text (PRIVATE).
+
+        The dtypes argument provides the NumPy data type of each column;
+        use None for text columns. If whitespace is True, columns may also
+        be separated by any run of whitespace, as with str.split.
+        """
+        n = len(lines)
+        m = len(names)
+        if whitespace:
+            lines = [
+                (
+                    line
+                    if line.count("\t") == m - 1 and " " not in line
+                    else "\t".join(line.split()) + "\n"
+                )
+                for line in lines
+            ]
+        data = "".join(lines).encode()
+        if not data.endswith(b"\n"):
+            data += b"\n"
+        array = np.frombuffer(data, np.uint8)
+        separators = np.flatnonzero((array == 9) | (array == 10))
+        if len(separators) != n * m:
+            raise ValueError("inconsistent number of columns; expected %d" % m)
+        ends = separators.reshape(n, m)
+        if not (array[ends[:, -1]] == 10).all():
+            raise ValueError("inconsistent number of columns; expected %d" % m)
+        starts = np.empty_like(ends)
+        starts[0, 0] = 0
+        starts[1:, 0] = ends[:-1, -1] + 1
+        starts[:, 1:] = ends[:, :-1] + 1
+        lengths = ends - starts
+        fields = []
+        for name, dtype in zip(names, dtypes):
+            if dtype is None:
+                dtype = [("offset", np.int64), ("length", np.int64)]
+            fields.append((name, dtype))
+        columns = np.empty(n, fields)
+        # maximum length of the values in each numerical column
+        widths = [
+            max(lengths[:, i].max(), 1) if dtype is not None else 0
+            for i, dtype in enumerate(dtypes)
+        ]
+        padded = np.concatenate([array, np.zeros(max(widths), np.uint8)])
+        for i, (name, dtype) in enumerate(zip(names, dtypes)):
+            column = columns[name]
+            if dtype is None:
+                column["offset"] = starts[:, i]
+                column["length"] = lengths[:, i]
+            else:
+                width = widths[i]
+                offsets = np.arange(width)
+                # gather the characters of each value into a fixed-width
+                # byte string, and let NumPy convert them in one go
+                values = padded[starts[:, i, None] + offsets]
+                values[offsets >= lengths[:, i, None]] = 0
+                values = values.view("S%d" % width).reshape(n)
+                try:
+                    column[:] = values.astype(dtype)
+                except ValueError:
+                    raise ValueError(
+                        "failed to convert values in column '%s' to %s"
+                        % (name, np.dtype(dtype).name)
+                    ) from None
+        return cls(columns, data)
+
+    def __len__(self):
+        return len(self.columns)
+
+    @property
+    def names(self):
+        """Return the column names as a tuple."""
+        return self.columns.dtype.names
+
+    def __getitem__(self, key):
+        columns = self.columns
+        if isinstance(key, str):
+            column = columns[key]
+            if column.dtype.names is None:
+                return column
+            buffer = self.buffer
+            return np.array(
+                [
+                    buffer[offset : offset + length].decode()
+                    for offset, length in zip(
+                        column["offset"].tolist(), column["length"].tolist()
+                    )
+                ],
+                str,
+            )
+        columns = columns[key]
+        if columns.ndim > 0:
+            return AlignmentBatch(columns, self.buffer)
+        # single record; return it as a dictionary
+        record = {}
+        for name in self.names:
+            value = columns[name]
+            if value.dtype.names is None:
+                value = value.item()
+            else:
+                offset, length = value.item()
+                value = self.buffer[offset : offset + length].decode()
+            record[name] = value
+        return record
+
+
 class AlignmentWriter(ABC):  # noqa: B024
     """Base class for alignment writers. This class should be subclassed.
 
@@ -41,6 +41,34 @@ from Bio.SeqFeature import SeqFeature
 from Bio.SeqFeature import SimpleLocation
 from Bio.SeqRecord import SeqRecord
 
+# column names and data types used by Bio.Align.parse_batches; None
+# indicates a text column
+_batch_columns = (
+    ("matches", np.int64),
+    ("misMatches", np.int64),
+    ("repMatches", np.int64),
+    ("nCount", np.int64),
+    ("qNumInsert", np.int64),
+    ("qBaseInsert", np.int64),
+    ("tNumInsert", np.int64),
+    ("tBaseInsert", np.int64),
+    ("strand", None),
+    ("qName", None),
+    ("qSize", np.int64),
+    ("qStart", np.int64),
+    ("qEnd", np.int64),
+    ("tName", None),
+    ("tSize", np.int64),
+    ("tStart", np.int64),
+    ("tEnd", np.int64),
+    ("blockCount", np.int64),
+    ("blockSizes", None),
+    ("qStarts", None),
+    ("tStarts", None),
+    ("qSeqs", None),  # PSLX only
+    ("tSeqs", None),  # PSLX only
+)
+
 
 class AlignmentWriter(interfaces.AlignmentWriter):
     """Alignment file writer for the Pattern Space Layout (PSL) file format."""
@@ -333,6 +361,29 @@ class AlignmentIterator(interfaces.AlignmentIterator):
         else:
             self._line = line
 
+    def _read_next_batch(self, stream, batch_size):
+        try:
+            line = self._line
+        except AttributeError:
+            lines = stream
+        else:
+            del self._line
+            lines = chain([line], stream)
+        batch = []
+        for line in lines:
+            batch.append(line)
+            if len(batch) == batch_size:
+                break
+        if not batch:
+            return None
+        n = len(batch[0].split())
+        if n not in (21, 23):
+            raise ValueError("line has %d columns; expected 21 or 23" % n)
+        names, dtypes = zip(*_batch_columns[:n])
+        return interfaces.AlignmentBatch._from_lines(
+            batch, names, dtypes, whitespace=True
+        )
+
     def _read_next_alignment(self, stream):
         try:
             line = self._line
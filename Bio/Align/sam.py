@@ -118,7 +118,9 @@ class AlignmentWriter(interfaces.AlignmentWriter):
         """Return a string with a single alignment formatted as one SAM line."""
         if not isinstance(alignment, Alignment):
             raise TypeError("Expected an Alignment object")
-        coordinates = alignment.coordinates.transpose()
+        coordinates = alignment.coordinates
+        if coordinates is not None:
+            coordinates = coordinates.transpose()
         target, query = alignment.sequences
         hard_clip_left = None
         hard_clip_right = None
@@ -144,22 +146,28 @@ class AlignmentWriter(interfaces.AlignmentWriter):
                 qual = "".join(chr(value + 33) for value in phred)
             query = query.seq
         qSize = len(query)
-        try:
-            rname = target.id
-        except AttributeError:
-            rname = "target"
+        if target is None:  # unmapped
+            rname = "*"
         else:
-            target = target.seq
-        if coordinates[0, 0] > coordinates[-1, 0]:
-            coordinates = coordinates[::-1, :]
-        if coordinates[0, 1] < coordinates[-1, 1]:  # mapped to forward strand
-            flag = 0
-        else:  # mapped to reverse strand
-            flag = 16
-            query = reverse_complement(query)
-            coordinates = np.array(coordinates)
-            coordinates[:, 1] = qSize - coordinates[:, 1]
-            hard_clip_left, hard_clip_right = hard_clip_right, hard_clip_left
+            try:
+                rname = target.id
+            except AttributeError:
+                rname = "target"
+            else:
+                target = target.seq
+        if coordinates is None:  # unmapped
+            flag = 4
+        else:
+            if coordinates[0, 0] > coordinates[-1, 0]:
+                coordinates = coordinates[::-1, :]
+            if coordinates[0, 1] < coordinates[-1, 1]:  # mapped to forward strand
+                flag = 0
+            else:  # mapped to reverse strand
+                flag = 16
+                query = reverse_complement(query)
+                coordinates = np.array(coordinates)
+                coordinates[:, 1] = qSize - coordinates[:, 1]
+                hard_clip_left, hard_clip_right = hard_clip_right, hard_clip_left
         try:
             flag |= alignment.flag
         except AttributeError:
@@ -172,59 +180,64 @@ class AlignmentWriter(interfaces.AlignmentWriter):
             query = "*"
         else:
             query = str(query, "ASCII")
-        tStart, qStart = coordinates[0, :]
-        pos = tStart + 1  # 1-based coordinate
-        cigar = ""
-        if hard_clip_left is not None:
-            cigar += "%dH" % hard_clip_left
-        if qStart > 0:
-            cigar += "%dS" % qStart
-        try:
-            operations = alignment.operations
-        except AttributeError:
+        if coordinates is None:  # unmapped
+            pos = 0
+            cigar = "*"
             operations = None
-            for tEnd, qEnd in coordinates[1:, :]:
-                tCount = tEnd - tStart
-                qCount = qEnd - qStart
-                if tCount == 0:
-                    cigar += "%dI" % qCount  # insertion to the reference
-                    qStart = qEnd
-                elif qCount == 0:
-                    cigar += "%dD" % tCount  # deletion from the reference
-                    tStart = tEnd
-                else:
-                    if tCount != qCount:
-                        raise ValueError("Unequal step sizes in alignment")
-                    cigar += "%dM" % tCount
-                    tStart = tEnd
-                    qStart = qEnd
         else:
-            for operation, (tEnd, qEnd) in zip(operations, coordinates[1:, :]):
-                tCount = tEnd - tStart
-                qCount = qEnd - qStart
-                if tCount == 0:
-                    assert operation == ord("I")
-                    cigar += "%dI" % qCount  # insertion to the reference
-                    qStart = qEnd
-                elif qCount == 0:
-                    if operation == ord("N"):
-                        cigar += "%dN" % tCount  # skipped region from the reference
-                    elif operation == ord("D"):
+            tStart, qStart = coordinates[0, :]
+            pos = tStart + 1  # 1-based coordinate
+            cigar = ""
+            if hard_clip_left is not None:
+                cigar += "%dH" % hard_clip_left
+            if qStart > 0:
+                cigar += "%dS" % qStart
+            try:
+                operations = alignment.operations
+            except AttributeError:
+                operations = None
+                for tEnd, qEnd in coordinates[1:, :]:
+                    tCount = tEnd - tStart
+                    qCount = qEnd - qStart
+                    if tCount == 0:
+                        cigar += "%dI" % qCount  # insertion to the reference
+                        qStart = qEnd
+                    elif qCount == 0:
                         cigar += "%dD" % tCount  # deletion from the reference
+                        tStart = tEnd
                     else:
-                        raise ValueError(f"Unexpected operation {operation}")
-                    tStart = tEnd
-                else:
-                    if tCount != qCount:
-                        raise ValueError("Unequal step sizes in alignment")
-                    assert operation == ord("M")
-                    cigar += "%dM" % tCount
-                    tStart = tEnd
-                    qStart = qEnd
-        if qEnd < qSize:
-            cigar += "%dS" % (qSize - qEnd)
-        if hard_clip_right is not None:
-            cigar += "%dH" % hard_clip_right
+                        if tCount != qCount:
+                            raise ValueError("Unequal step sizes in alignment")
+                        cigar += "%dM" % tCount
+                        tStart = tEnd
+                        qStart = qEnd
+            else:
+                for operation, (tEnd, qEnd) in zip(operations, coordinates[1:, :]):
+                    tCount = tEnd - tStart
+                    qCount = qEnd - qStart
+                    if tCount == 0:
+                        assert operation == ord("I")
+                        cigar += "%dI" % qCount  # insertion to the reference
+                        qStart = qEnd
+                    elif qCount == 0:
+                        if operation == ord("N"):
+                            cigar += "%dN" % tCount  # skipped region from the reference
+                        elif operation == ord("D"):
+                            cigar += "%dD" % tCount  # deletion from the reference
+                        else:
+                            raise ValueError(f"Unexpected operation {operation}")
+                        tStart = tEnd
+                    else:
+                        if tCount != qCount:
+                            raise ValueError("Unequal step sizes in alignment")
+                        assert operation == ord("M")
+                        cigar += "%dM" % tCount
+                        tStart = tEnd
+                        qStart = qEnd
+            if qEnd < qSize:
+                cigar += "%dS" % (qSize - qEnd)
+            if hard_clip_right is not None:
+                cigar += "%dH" % hard_clip_right
         try:
             mapq = alignment.mapq
         except AttributeError:
@@ -242,7 +255,10 @@ class AlignmentWriter(interfaces.AlignmentWriter):
             pnext = 0
         else:
             pnext += 1  # 1-based coordinates
-        tLen = 0
+        try:
+            tLen = alignment.tlen
+        except AttributeError:
+            tLen = 0
         fields = [
             qName,
             str(flag),
@@ -261,6 +277,8 @@ class AlignmentWriter(interfaces.AlignmentWriter):
         if md is True:
             if query == "*":
                 raise ValueError("requested MD tag with undefined sequence")
+            if coordinates is None:
+                raise ValueError("requested MD tag for unmapped read")
             # calculate the MD tag from the alignment coordinates and sequences
             tStart, qStart = coordinates[0, :]
             number = 0
@@ -351,18 +369,18 @@ class AlignmentWriter(interfaces.AlignmentWriter):
                         datatype = "Z"
                 elif isinstance(value, bytes):
                     datatype = "H"
-                    value = "".join(map(str, value))
-                elif isinstance(value, np.array):
+                    value = value.hex().upper()
+                elif isinstance(value, np.ndarray):
                     datatype = "B"
                     if np.issubdtype(value.dtype, np.integer):
-                        pass
+                        letter = "i"
                     elif np.issubdtype(value.dtype, float):
-                        pass
+                        letter = "f"
                     else:
                         raise ValueError(
                             f"Array of incompatible data type {value.dtype} in annotation '{key}'"
                         )
-                    value = "".join(map(str, value))
+                    value = ",".join(chain(letter, map(str, value)))
                 field = f"{key}:{datatype}:{value}"
                 fields.append(field)
         line = "\t".join(fields) + "\n"
@@ -468,298 +486,292 @@ class AlignmentIterator(interfaces.AlignmentIterator):
             del self._line
         for line in lines:
             fields = line.split()
-            if len(fields) < 11:
-                raise ValueError(
-                    "line has %d columns; expected at least 11" % len(fields)
-                )
-            qname = fields[0]
-            flag = int(fields[1])
-            rname = fields[2]
-            target_pos = int(fields[3]) - 1
-            mapq = int(fields[4])
-            cigar = fields[5]
-            rnext = fields[6]
-            pnext = int(fields[7]) - 1
-            tlen = int(fields[8])
-            query = fields[9]
-            qual = fields[10]
-            md = None
-            score = None
-            annotations = {}
-            for field in fields[11:]:
-                tag, datatype, value = field.split(":", 2)
-                if tag == "AS":
-                    assert datatype == "i"
-                    score = int(value)
-                elif tag == "MD":
-                    assert datatype == "Z"
-                    md = value
-                else:
-                    if datatype == "i":
-                        value = int(value)
-                    elif datatype == "f":
-                        value = float(value)
-                    elif datatype in ("A", "Z"):  # string
-                        pass
-                    elif datatype == "H":
-                        n = len(value)
-                        value = bytes(int(value[i : i + 2]) for i in range(0, n, 2))
-                    elif datatype == "B":
-                        letter = value[0]
-                        value = value[1:].split(",")
-                        if letter in "cCsSiI":
-                            dtype = int
-                        elif letter == "f":
-                            dtype = float
-                        else:
-                            raise ValueError(
-                                f"Unknown number type '{letter}' in tag '{field}'"
-                            )
-                        value = np.array(value, dtype)
-                    annotations[tag] = value
-            if flag & 0x10:
-                strand = "-"
+            return self._create_alignment(fields)
+
+    def _create_alignment(self, fields):
+        if len(fields) < 11:
+            raise ValueError("line has %d columns; expected at least 11" % len(fields))
+        qname = fields[0]
+        flag = int(fields[1])
+        rname = fields[2]
+        target_pos = int(fields[3]) - 1
+        mapq = int(fields[4])
+        cigar = fields[5]
+        rnext = fields[6]
+        pnext = int(fields[7]) - 1
+        tlen = int(fields[8])
+        query = fields[9]
+        qual = fields[10]
+        md = None
+        score = None
+        annotations = {}
+        for field in fields[11:]:
+            tag, datatype, value = field.split(":", 2)
+            if tag == "AS":
+                assert datatype == "i"
+                score = int(value)
+            elif tag == "MD":
+                assert datatype == "Z"
+                md = value
             else:
-                strand = "+"
-            hard_clip_left = None
-            hard_clip_right = None
-            store_operations = False
-            if flag & 0x4:  # unmapped
-                target = None
-                coordinates = None
-            elif md is None:
-                query_pos = 0
-                coordinates = [[target_pos, query_pos]]
-                number = ""
-                operations = bytearray()
-                for letter in cigar:
-                    if letter == "M":
-                        # M: alignment match
-                        length = int(number)
-                        target_pos += length
-                        query_pos += length
-                    elif letter in "=X":
-                        # =: sequence match
-                        # X: sequence mismatch
-                        length = int(number)
-                        target_pos += length
-                        query_pos += length
-                        store_operations = True
-                    elif letter == "I":
-                        # I: insertion to the reference
-                        length = int(number)
-                        query_pos += length
-                    elif letter == "S":
-                        # S: soft clipping
-                        length = int(number)
-                        if query_pos == 0:
-                            coordinates[0][1] += length
-                        query_pos += length
-                        number = ""
-                        continue
-                    elif letter == "D":
-                        # D: deletion from the reference
-                        length = int(number)
-                        target_pos += length
-                    elif letter == "N":
-                        # N: skipped region from the reference
-                        length = int(number)
-                        target_pos += length
-                        store_operations = True
-                    elif letter == "H":  # hard clipping
-                        if query_pos == 0:
-                            hard_clip_left = int(number)
-                        else:
-                            hard_clip_right = int(number)
-                        number = ""
-                        continue
-                    elif letter == "P":  # padding
-                        raise NotImplementedError(
-                            "padding operator is not yet implemented"
+                if datatype == "i":
+                    value = int(value)
+                elif datatype == "f":
+                    value = float(value)
+                elif datatype in ("A", "Z"):  # string
+                    pass
+                elif datatype == "H":
+                    value = bytes.fromhex(value)
+                elif datatype == "B":
+                    letter, *value = value.split(",")
+                    if letter in "cCsSiI":
+                        dtype = int
+                    elif letter == "f":
+                        dtype = float
+                    else:
+                        raise ValueError(
+                            f"Unknown number type '{letter}' in tag '{field}'"
                         )
+                    value = np.array(value, dtype)
+                annotations[tag] = value
+        if flag & 0x10:
+            strand = "-"
+        else:
+            strand = "+"
+        hard_clip_left = None
+        hard_clip_right = None
+        store_operations = False
+        if flag & 0x4:  # unmapped
+            target = None
+            coordinates = None
+        elif md is None:
+            query_pos = 0
+            coordinates = [[target_pos, query_pos]]
+            number = ""
+            operations = bytearray()
+            for letter in cigar:
+                if letter == "M":
+                    # M: alignment match
+                    length = int(number)
+                    target_pos += length
+                    query_pos += length
+                elif letter in "=X":
+                    # =: sequence match
+                    # X: sequence mismatch
+                    length = int(number)
+                    target_pos += length
+                    query_pos += length
+                    store_operations = True
+                elif letter == "I":
+                    # I: insertion to the reference
+                    length = int(number)
+                    query_pos += length
+                elif letter == "S":
+                    # S: soft clipping
+                    length = int(number)
+                    if query_pos == 0:
+                        coordinates[0][1] += length
+                    query_pos += length
+                    number = ""
+                    continue
+                elif letter == "D":
+                    # D: deletion from the reference
+                    length = int(number)
+                    target_pos += length
+                elif letter == "N":
+                    # N: skipped region from the reference
+                    length = int(number)
+                    target_pos += length
+                    store_operations = True
+                elif letter == "H":  # hard clipping
+                    if query_pos == 0:
+                        hard_clip_left = int(number)
                     else:
-                        number += letter
-                        continue
-                    coordinates.append([target_pos, query_pos])
-                    operations.append(ord(letter))
+                        hard_clip_right = int(number)
                     number = ""
-                index = self._target_indices.get(rname)
-                if index is None:
-                    if self.targets:
-                        raise ValueError(f"Found target {rname} missing from header")
-                    target = SeqRecord(None, id=rname, description="")
+                    continue
+                elif letter == "P":  # padding
+                    raise NotImplementedError("padding operator is not yet implemented")
                 else:
-                    target = self.targets[index]
-            else:
-                query_pos = 0
-                coordinates = [[target_pos, query_pos]]
-                seq = query
-                target = ""
-                starts = [target_pos]
-                size = 0
-                sizes = []
+                    number += letter
+                    continue
+                coordinates.append([target_pos, query_pos])
+                operations.append(ord(letter))
                 number = ""
-                operations = bytearray()
-                for letter in cigar:
-                    if letter in "M":
-                        # M: alignment match
-                        length = int(number)
-                        target_pos += length
-                        query_pos += length
-                        target += seq[:length]
-                        seq = seq[length:]
-                        size += length
-                    elif letter in "=X":
-                        # =: sequence match
-                        # X: sequence mismatch
-                        length = int(number)
-                        target_pos += length
-                        query_pos += length
-                        target += seq[:length]
-                        seq = seq[length:]
-                        size += length
-                        store_operations = True
-                    elif letter == "I":
-                        # I: insertion to the reference
-                        length = int(number)
-                        query_pos += length
-                        seq = seq[length:]
-                    elif letter == "S":
-                        # S: soft clipping
-                        length = int(number)
-                        if query_pos == 0:
-                            coordinates[0][1] += length
-                        query_pos += length
-                        seq = seq[length:]
-                        number = ""
-                        continue
-                    elif letter == "D":  # deletion from the reference
-                        length = int(number)
-                        target_pos += length
-                        size += length
-                        starts.append(target_pos)
-                        sizes.append(size)
-                        size = 0
-                    elif letter == "N":  # skipped region from the reference
-                        length = int(number)
-                        target_pos += length
-                        starts.append(target_pos)
-                        sizes.append(size)
-                        size = 0
-                        store_operations = True
-                    elif letter == "H":
-                        # hard clipping (clipped sequences not present in sequence)
-                        if query_pos == 0:
-                            hard_clip_left = int(number)
-                        else:
-                            hard_clip_right = int(number)
-                        number = ""
-                        continue
-                    elif letter == "P":  # padding
-                        raise NotImplementedError(
-                            "padding operator is not yet implemented"
-                        )
+            index = self._target_indices.get(rname)
+            if index is None:
+                if self.targets:
+                    raise ValueError(f"Found target {rname} missing from header")
+                target = SeqRecord(None, id=rname, description="")
+            else:
+                target = self.targets[index]
+        else:
+            query_pos = 0
+            coordinates = [[target_pos, query_pos]]
+            seq = query
+            target = ""
+            starts = [target_pos]
+            size = 0
+            sizes = []
+            number = ""
+            operations = bytearray()
+            for letter in cigar:
+                if letter in "M":
+                    # M: alignment match
+                    length = int(number)
+                    target_pos += length
+                    query_pos += length
+                    target += seq[:length]
+                    seq = seq[length:]
+                    size += length
+                elif letter in "=X":
+                    # =: sequence match
+                    # X: sequence mismatch
+                    length = int(number)
+                    target_pos += length
+                    query_pos += length
+                    target += seq[:length]
+                    seq = seq[length:]
+                    size += length
+                    store_operations = True
+                elif letter == "I":
+                    # I: insertion to the reference
+                    length = int(number)
+                    query_pos += length
+                    seq = seq[length:]
+                elif letter == "S":
+                    # S: soft clipping
+                    length = int(number)
+                    if query_pos == 0:
+                        coordinates[0][1] += length
+                    query_pos += length
+                    seq = seq[length:]
+                    number = ""
+                    continue
+                elif letter == "D":  # deletion from the reference
+                    length = int(number)
+                    target_pos += length
+                    size += length
+                    starts.append(target_pos)
+                    sizes.append(size)
+                    size = 0
+                elif letter == "N":  # skipped region from the reference
+                    length = int(number)
+                    target_pos += length
+                    starts.append(target_pos)
+                    sizes.append(size)
+                    size = 0
+                    store_operations = True
+                elif letter == "H":
+                    # hard clipping (clipped sequences not present in sequence)
+                    if query_pos == 0:
+                        hard_clip_left = int(number)
                     else:
-                        number += letter
-                        continue
-                    coordinates.append([target_pos, query_pos])
-                    operations.append(ord(letter))
+                        hard_clip_right = int(number)
                     number = ""
-                sizes.append(size)
-                seq = target
-                target = ""
+                    continue
+                elif letter == "P":  # padding
+                    raise NotImplementedError("padding operator is not yet implemented")
+                else:
+                    number += letter
+                    continue
+                coordinates.append([target_pos, query_pos])
+                operations.append(ord(letter))
                 number = ""
-                letters = iter(md)
-                for letter in letters:
-                    if letter in "ACGTNacgtn":
-                        if number:
-                            number = int(number)
-                            target += seq[:number]
-                            seq = seq[number:]
-                            number = ""
-                        target += letter
-                        seq = seq[1:]
-                    elif letter == "^":
-                        if number:
-                            number = int(number)
-                            target += seq[:number]
-                            seq = seq[number:]
-                            number = ""
-                        for letter in letters:
-                            if letter not in "ACGTNacgtn":
-                                break
-                            target += letter
-                        else:
+            sizes.append(size)
+            seq = target
+            target = ""
+            number = ""
+            letters = iter(md)
+            for letter in letters:
+                if letter in "ACGTNacgtn":
+                    if number:
+                        number = int(number)
+                        target += seq[:number]
+                        seq = seq[number:]
+                        number = ""
+                    target += letter
+                    seq = seq[1:]
+                elif letter == "^":
+                    if number:
+                        number = int(number)
+                        target += seq[:number]
+                        seq = seq[number:]
+                        number = ""
+                    for letter in letters:
+                        if letter not in "ACGTNacgtn":
                             break
-                        number = letter
+                        target += letter
                     else:
-                        number += letter
-                if number:
-                    number = int(number)
-                    target += seq[:number]
-                seq = target
-                rname_target = self.targets[self._target_indices[rname]]
-                length = len(rname_target.seq)
-                data = {}
-                index = 0
-                for start, size in zip(starts, sizes):
-                    data[start] = seq[index : index + size]
-                    index += size
+                        break
+                    number = letter
+                else:
+                    number += letter
+            if number:
+                number = int(number)
+                target += seq[:number]
+            seq = target
+            rname_target = self.targets[self._target_indices[rname]]
+            length = len(rname_target.seq)
+            data = {}
+            index = 0
+            for start, size in zip(starts, sizes):
+                data[start] = seq[index : index + size]
+                index += size
 
-                target = SeqRecord._from_validated(
-                    Seq(data, length=length),
-                    rname_target.id,
-                    rname_target.name,
-                    rname_target.description,
-                    annotations={
-                        key: copy.copy(val)
-                        for key, val in rname_target.annotations.items()
-                    },
-                )
-            if coordinates is not None:
-                coordinates = np.array(coordinates).transpose()
-                if strand == "-":
-                    coordinates[1, :] = query_pos - coordinates[1, :]
-            if query == "*":
-                length = query_pos
-                sequence = Seq(None, length=length)
-            else:
-                sequence = Seq(query)
-                if not (flag & 0x4):  # not unmapped
-                    assert len(query) == query_pos
-                    if strand == "-":
-                        sequence = sequence.reverse_complement()
-            query = SeqRecord(sequence, id=qname, description="")
+            target = SeqRecord._from_validated(
+                Seq(data, length=length),
+                rname_target.id,
+                rname_target.name,
+                rname_target.description,
+                annotations={
+                    key: copy.copy(val) for key, val in rname_target.annotations.items()
+                },
+            )
+        if coordinates is not None:
+            coordinates = np.array(coordinates).transpose()
             if strand == "-":
-                hard_clip_left, hard_clip_right = hard_clip_right, hard_clip_left
-            if hard_clip_left is not None:
-                query.annotations["hard_clip_left"] = hard_clip_left
-            if hard_clip_right is not None:
-                query.annotations["hard_clip_right"] = hard_clip_right
-            if qual != "*":
-                phred = [ord(c) - 33 for c in qual]
-                query.letter_annotations["phred_quality"] = phred
-            records = [target, query]
-            alignment = Alignment(records, coordinates)
-            alignment.flag = flag
-            if mapq != 255:
-                alignment.mapq = mapq
-            if rnext == "=":
-                alignment.rnext = rname
-            elif rnext != "*":
-                alignment.rnext = rnext
-            if pnext >= 0:
-                alignment.pnext = pnext
-            if tlen != 0:
-                alignment.tlen = tlen
-            if score is not None:
-                alignment.score = score
-            if annotations:
-                alignment.annotations = annotations
-            if hard_clip_left is not None:
-                alignment.hard_clip_left = hard_clip_left
-            if hard_clip_right is not None:
-                alignment.hard_clip_right = hard_clip_right
-            if store_operations:
-                alignment.operations = operations
-            return alignment
+                coordinates[1, :] = query_pos - coordinates[1, :]
+        if query == "*":
+            length = query_pos
+            sequence = Seq(None, length=length)
+        else:
+            sequence = Seq(query)
+            if not (flag & 0x4):  # not unmapped
+                assert len(query) == query_pos
+                if strand == "-":
+                    sequence = sequence.reverse_complement()
+        query = SeqRecord(sequence, id=qname, description="")
+        if strand == "-":
+            hard_clip_left, hard_clip_right = hard_clip_right, hard_clip_left
+        if hard_clip_left is not None:
+            query.annotations["hard_clip_left"] = hard_clip_left
+        if hard_clip_right is not None:
+            query.annotations["hard_clip_right"] = hard_clip_right
+        if qual != "*":
+            phred = [ord(c) - 33 for c in qual]
+            query.letter_annotations["phred_quality"] = phred
+        records = [target, query]
+        alignment = Alignment(records, coordinates)
+        alignment.flag = flag
+        if mapq != 255:
+            alignment.mapq = mapq
+        if rnext == "=":
+            alignment.rnext = rname
+        elif rnext != "*":
+            alignment.rnext = rnext
+        if pnext >= 0:
+            alignment.pnext = pnext
+        if tlen != 0:
+            alignment.tlen = tlen
+        if score is not None:
+            alignment.score = score
+        if annotations:
+            alignment.annotations = annotations
+        if hard_clip_left is not None:
+            alignment.hard_clip_left = hard_clip_left
+        if hard_clip_right is not None:
+            alignment.hard_clip_right = hard_clip_right
+        if store_operations:
+            alignment.operations = operations
+        return alignment
@@ -21,6 +21,30 @@ from Bio.Align import interfaces
 from Bio.Seq import Seq
 from Bio.SeqRecord import SeqRecord
 
+# data types of the numerical fields, used by Bio.Align.parse_batches;
+# all other fields are stored as text
+_batch_dtypes = {
+    "% identity": np.float64,
+    "alignment length": np.int64,
+    "mismatches": np.int64,
+    "gap opens": np.int64,
+    "q. start": np.int64,
+    "q. end": np.int64,
+    "s. start": np.int64,
+    "s. end": np.int64,
+    "evalue": np.float64,
+    "bit score": np.float64,
+    "query length": np.int64,
+    "subject length": np.int64,
+    "% subject coverage": np.float64,
+    "score": np.int64,
+    "identical": np.int64,
+    "positives": np.int64,
+    "gaps": np.int64,
+    "% positives": np.float64,
+    "% hsp coverage": np.float64,
+}
+
 
 class State(enum.Enum):
     """Enumerate alignment states needed when parsing a BTOP string."""
@@ -332,6 +356,34 @@ class AlignmentIterator(interfaces.AlignmentIterator):
             alignment.score = score
         return alignment
 
+    def _read_next_batch(self, stream, batch_size):
+        try:
+            final_prefix = self._final_prefix
+        except AttributeError:
+            # end of file reached
+            return None
+        fields = getattr(self, "_fields", None)
+        lines = []
+        for line in stream:
+            if line.startswith("# "):
+                line = line.rstrip()
+                if line.startswith(final_prefix) and line.endswith(" queries"):
+                    del self._final_prefix
+                    break
+                self._parse_header(stream, line)
+                if lines and getattr(self, "_fields", None) != fields:
+                    # start a new batch, as the columns are different
+                    break
+                fields = getattr(self, "_fields", None)
+                continue
+            lines.append(line)
+            if len(lines) == batch_size:
+                break
+        if not lines:
+            return None
+        dtypes = [_batch_dtypes.get(field) for field in fields]
+        return interfaces.AlignmentBatch._from_lines(lines, fields, dtypes)
+
     def parse_btop(self, btop):
         """Parse a BTOP string and return alignment coordinates.
 
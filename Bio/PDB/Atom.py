@@ -16,6 +16,8 @@ from typing import TypeVar
 import numpy as np
 
 from Bio.Data import IUPACData
+from Bio.PDB.Entity import _get_slot_state
+from Bio.PDB.Entity import _set_slot_state
 from Bio.PDB.Entity import DisorderedEntityWrapper
 from Bio.PDB.PDBExceptions import PDBConstructionWarning
 from Bio.PDB.vectors import Vector
@@ -36,6 +38,35 @@ class Atom:
     atomic charge and radius.
     """
 
+    __slots__ = (
+        "parent",
+        "name",
+        "fullname",
+        "_coord",
+        "_coord_block",
+        "bfactor",
+        "occupancy",
+        "altloc",
+        "full_id",
+        "id",
+        "disordered_flag",
+        "anisou_array",
+        "siguij_array",
+        "sigatm_array",
+        "serial_number",
+        "_xtra",
+        "element",
+        "mass",
+        "pqr_charge",
+        "radius",
+        "__dict__",
+    )
+
+    level = "A"
+
+    # For atom sorting (protein backbone atoms first)
+    _sorting_keys = {"N": 0, "CA": 1, "C": 2, "O": 3}
+
     def __init__(
         self,
         name: str,
@@ -79,13 +110,14 @@ class Atom:
         :param radius: atom radius
         :type radius: number
         """
-        self.level = "A"
         # Reference to the residue
         self.parent: Optional[Residue] = None
         # the atomic data
         self.name = name  # eg. CA, spaces are removed from atom name
         self.fullname = fullname  # e.g. " CA ", spaces included
-        self.coord = coord
+        self._coord = coord
+        # coordinate block of the model if coord is a view of it
+        self._coord_block = None
         self.bfactor = bfactor
         self.occupancy = occupancy
         self.altloc = altloc
@@ -96,16 +128,44 @@ class Atom:
         self.siguij_array = None
         self.sigatm_array = None
         self.serial_number = serial_number
-        # Dictionary that keeps additional properties
-        self.xtra: dict = {}
+        # Dictionary that keeps additional properties, created on demand
+        self._xtra: Optional[dict] = None
         assert not element or element == element.upper(), element
         self.element = self._assign_element(element)
         self.mass = self._assign_atom_mass()
         self.pqr_charge = pqr_charge
         self.radius = radius
 
-        # For atom sorting (protein backbone atoms first)
-        self._sorting_keys = {"N": 0, "CA": 1, "C": 2, "O": 3}
+    @property
+    def xtra(self) -> dict:
+        """Dictionary that keeps additional properties."""
+        if self._xtra is None:
+            self._xtra = {}
+        return self._xtra
+
+    @xtra.setter
+    def xtra(self, value: dict):
+        self._xtra = value
+
+    @property
+    def coord(self) -> np.ndarray:
+        """Atomic coordinates (x, y, z) as a NumPy array.
+
+        For structures created by the parsers, this is a view of a row of an
+        array storing the coordinates of all atoms in the model (see the
+        get_coords method of the Model class). Replacing the array (rather
+        than modifying it in place) stops sharing the coordinates.
+        """
+        return self._coord
+
+    @coord.setter
+    def coord(self, value: np.ndarray):
+        if value is not self._coord:
+            block = self._coord_block
+            if block is not None:
+                block.valid = False
+                self._coord_block = None
+            self._coord = value
 
     # Sorting Methods
     # standard across different objects and allows direct comparison
@@ -247,6 +307,14 @@ class Atom:
 
     # Special methods
 
+    def __getstate__(self):
+        """Return the attributes of the atom for pickling."""
+        return _get_slot_state(self)
+
+    def __setstate__(self, state):
+        """Restore the attributes of the atom when unpickling."""
+        _set_slot_state(self, state)
+
     def __repr__(self):
         """Print Atom object as <Atom atom_name>."""
         return f"<Atom {self.get_id()}>"
@@ -494,8 +562,10 @@ class Atom:
         # Do a shallow copy then explicitly copy what needs to be deeper.
         shallow = copy.copy(self)
         shallow.detach_parent()
+        shallow._coord_block = None
         shallow.set_coord(copy.copy(self.get_coord()))
-        shallow.xtra = self.xtra.copy()
+        if self._xtra is not None:
+            shallow._xtra = self._xtra.copy()
         return shallow
 
 
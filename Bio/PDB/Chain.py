@@ -25,9 +25,12 @@ class Chain(Entity["Model", "Residue"]):
     access atoms from residues.
     """
 
+    __slots__ = ("internal_coord",)
+
+    level = "C"
+
     def __init__(self, id):
         """Initialize the class."""
-        self.level = "C"
         self.internal_coord = None
         Entity.__init__(self, id)
 
@@ -9,6 +9,8 @@ r"""Use the DSSP program to calculate secondary structure and accessibility.
 
 You need to have a working version of DSSP (and a license, free for academic
 use) in order to use this. For DSSP, see https://swift.cmbi.umcn.nl/gv/dssp/.
+The NativeDSSP class in Bio.PDB.native_dssp provides the same values without
+the DSSP program.
 
 The following Accessible surface area (ASA) values can be used, defaulting
 to the Sander and Rost values:
@@ -316,6 +318,87 @@ def _make_dssp_dict(handle):
     return dssp, keys
 
 
+def _get_dssp_values(res, values, residue_max_acc):
+    """Store the DSSP values of a residue in its xtra dictionary (PRIVATE).
+
+    The values are a tuple in the format of the dictionaries returned by
+    make_dssp_dict. Returns the tuple of values provided by the DSSP class,
+    with the relative accessibility instead of the absolute accessibility.
+    """
+    (
+        aa,
+        ss,
+        acc,
+        phi,
+        psi,
+        dssp_index,
+        NH_O_1_relidx,
+        NH_O_1_energy,
+        O_NH_1_relidx,
+        O_NH_1_energy,
+        NH_O_2_relidx,
+        NH_O_2_energy,
+        O_NH_2_relidx,
+        O_NH_2_energy,
+    ) = values
+
+    res.xtra["SS_DSSP"] = ss
+    res.xtra["EXP_DSSP_ASA"] = acc
+    res.xtra["PHI_DSSP"] = phi
+    res.xtra["PSI_DSSP"] = psi
+    res.xtra["DSSP_INDEX"] = dssp_index
+    res.xtra["NH_O_1_RELIDX_DSSP"] = NH_O_1_relidx
+    res.xtra["NH_O_1_ENERGY_DSSP"] = NH_O_1_energy
+    res.xtra["O_NH_1_RELIDX_DSSP"] = O_NH_1_relidx
+    res.xtra["O_NH_1_ENERGY_DSSP"] = O_NH_1_energy
+    res.xtra["NH_O_2_RELIDX_DSSP"] = NH_O_2_relidx
+    res.xtra["NH_O_2_ENERGY_DSSP"] = NH_O_2_energy
+    res.xtra["O_NH_2_RELIDX_DSSP"] = O_NH_2_relidx
+    res.xtra["O_NH_2_ENERGY_DSSP"] = O_NH_2_energy
+
+    # Relative accessibility
+    resname = res.get_resname()
+    try:
+        rel_acc = acc / residue_max_acc[resname]
+    except KeyError:
+        # Invalid value for resname
+        rel_acc = "NA"
+    else:
+        if rel_acc > 1.0:
+            rel_acc = 1.0
+    res.xtra["EXP_DSSP_RASA"] = rel_acc
+    # Verify if AA in DSSP == AA in Structure
+    # Something went wrong if this is not true!
+    # NB: DSSP uses X often
+    resname = protein_letters_3to1.get(resname, "X")
+    if resname == "C":
+        # DSSP renames C in C-bridges to a,b,c,d,...
+        # - we rename it back to 'C'
+        if _dssp_cys.match(aa):
+            aa = "C"
+    # Take care of HETATM again
+    if (resname != aa) and (res.id[0] == " " or aa != "X"):
+        raise PDBException(f"Structure/DSSP mismatch at {res}")
+
+    dssp_vals = (
+        dssp_index,
+        aa,
+        ss,
+        rel_acc,
+        phi,
+        psi,
+        NH_O_1_relidx,
+        NH_O_1_energy,
+        O_NH_1_relidx,
+        O_NH_1_energy,
+        NH_O_2_relidx,
+        NH_O_2_energy,
+        O_NH_2_relidx,
+        O_NH_2_energy,
+    )
+    return dssp_vals
+
+
 class DSSP(AbstractResiduePropertyMap):
     """Run DSSP and parse secondary structure and accessibility.
 
@@ -415,7 +498,7 @@ class DSSP(AbstractResiduePropertyMap):
         # Here we create a dictionary to map label_asym_id to auth_asym_id
         # using the mmCIF file
         if file_type == "MMCIF" and version(dssp_version) < version("4.0.0"):
-            mmcif_dict = MMCIF2Dict(in_file)
+            mmcif_dict = MMCIF2Dict(in_file, categories=["_atom_site"])
             mmcif_chain_dict = {}
             for i, c in enumerate(mmcif_dict["_atom_site.label_asym_id"]):
                 if c not in mmcif_chain_dict:
@@ -492,77 +575,7 @@ class DSSP(AbstractResiduePropertyMap):
                                 res = r
                                 break
 
-            (
-                aa,
-                ss,
-                acc,
-                phi,
-                psi,
-                dssp_index,
-                NH_O_1_relidx,
-                NH_O_1_energy,
-                O_NH_1_relidx,
-                O_NH_1_energy,
-                NH_O_2_relidx,
-                NH_O_2_energy,
-                O_NH_2_relidx,
-                O_NH_2_energy,
-            ) = dssp_dict[key]
-
-            res.xtra["SS_DSSP"] = ss
-            res.xtra["EXP_DSSP_ASA"] = acc
-            res.xtra["PHI_DSSP"] = phi
-            res.xtra["PSI_DSSP"] = psi
-            res.xtra["DSSP_INDEX"] = dssp_index
-            res.xtra["NH_O_1_RELIDX_DSSP"] = NH_O_1_relidx
-            res.xtra["NH_O_1_ENERGY_DSSP"] = NH_O_1_energy
-            res.xtra["O_NH_1_RELIDX_DSSP"] = O_NH_1_relidx
-            res.xtra["O_NH_1_ENERGY_DSSP"] = O_NH_1_energy
-            res.xtra["NH_O_2_RELIDX_DSSP"] = NH_O_2_relidx
-            res.xtra["NH_O_2_ENERGY_DSSP"] = NH_O_2_energy
-            res.xtra["O_NH_2_RELIDX_DSSP"] = O_NH_2_relidx
-            res.xtra["O_NH_2_ENERGY_DSSP"] = O_NH_2_energy
-
-            # Relative accessibility
-            resname = res.get_resname()
-            try:
-                rel_acc = acc / self.residue_max_acc[resname]
-            except KeyError:
-                # Invalid value for resname
-                rel_acc = "NA"
-            else:
-                if rel_acc > 1.0:
-                    rel_acc = 1.0
-            res.xtra["EXP_DSSP_RASA"] = rel_acc
-            # Verify if AA in DSSP == AA in Structure
-            # Something went wrong if this is not true!
-            # NB: DSSP uses X often
-            resname = protein_letters_3to1.get(resname, "X")
-            if resname == "C":
-                # DSSP renames C in C-bridges to a,b,c,d,...
-                # - we rename it back to 'C'
-                if _dssp_cys.match(aa):
-                    aa = "C"
-            # Take care of HETATM again
-            if (resname != aa) and (res.id[0] == " " or aa != "X"):
-                raise PDBException(f"Structure/DSSP mismatch at {res}")
-
-            dssp_vals = (
-                dssp_index,
-                aa,
-                ss,
-                rel_acc,
-                phi,
-                psi,
-                NH_O_1_relidx,
-                NH_O_1_energy,
-                O_NH_1_relidx,
-                O_NH_1_energy,
-                NH_O_2_relidx,
-                NH_O_2_energy,
-                O_NH_2_relidx,
-                O_NH_2_energy,
-            )
+            dssp_vals = _get_dssp_values(res, dssp_dict[key], self.residue_max_acc)
 
             dssp_map[(chain_id, res_id)] = dssp_vals
             dssp_list.append(dssp_vals)
@@ -32,6 +32,88 @@ _Parent = TypeVar("_Parent", bound=Optional["Entity"])
 _Self = TypeVar("_Self", bound="Entity[Any, Any]")
 
 
+class _CoordinateBlock:
+    """Coordinates of all atoms in a model stored in a single array (PRIVATE).
+
+    The coord attribute of each atom in the model is a view of a row of the
+    array, and ranges maps the id of each chain and residue to the rows of
+    its atoms. The block becomes invalid if atoms are added, removed, or
+    reordered, or if the coord attribute of an atom is replaced. Only the
+    selected atom of disordered atoms is stored in the array; disordered is
+    True if the model contains disordered atoms.
+    """
+
+    __slots__ = ("coord", "ranges", "valid", "disordered")
+
+    def __init__(self, coord=None, ranges=None, disordered=False):
+        self.coord = coord
+        self.ranges = ranges
+        self.valid = coord is not None
+        self.disordered = disordered
+
+    def __reduce__(self):
+        # Copied atoms do not share their coordinates
+        return (_CoordinateBlock, ())
+
+
+def _invalidate_coordinates(entity):
+    """Invalidate the coordinate block of the model containing entity (PRIVATE)."""
+    while entity is not None:
+        block = entity._coord_block
+        if block is not None:
+            block.valid = False
+            entity._coord_block = None
+            return
+        entity = entity.parent
+
+
+def _get_slot_state(obj):
+    """Return the attributes of an object using __slots__ as a dictionary (PRIVATE).
+
+    This is used by __getstate__, so that the object can be pickled with
+    all pickle protocols (protocols 0 and 1 require __getstate__ for classes
+    defining __slots__).
+    """
+    state = dict(obj.__dict__)
+    for cls in type(obj).__mro__:
+        for name in cls.__dict__.get("__slots__", ()):
+            if name == "__dict__":
+                continue
+            try:
+                state[name] = getattr(obj, name)
+            except AttributeError:  # slot not set
+                pass
+    return state
+
+
+def _set_slot_state(obj, state):
+    """Restore the attributes stored by _get_slot_state (PRIVATE)."""
+    for name, value in state.items():
+        object.__setattr__(obj, name, value)
+
+
+def _transform_atoms(atoms, rot, tran):
+    """Apply rotation and translation to the coordinates of atoms (PRIVATE).
+
+    This is equivalent to calling the transform method of each atom (which
+    transforms all alternative locations of disordered atoms), but the
+    coordinates of all atoms are transformed in a single NumPy operation.
+    """
+    unpacked = []
+    for atom in atoms:
+        if atom.level != "A":
+            atom.transform(rot, tran)
+        elif atom.is_disordered() == 2:
+            unpacked.extend(atom.disordered_get_list())
+        else:
+            unpacked.append(atom)
+    if not unpacked:
+        return
+    coords = np.dot([atom.coord for atom in unpacked], rot) + tran
+    for atom, coord in zip(unpacked, coords):
+        atom.coord = coord
+
+
 class Entity(Generic[_Parent, _Child]):
     """Basic container object for PDB hierarchy.
 
@@ -39,6 +121,17 @@ class Entity(Generic[_Parent, _Child]):
     It deals with storage and lookup.
     """
 
+    __slots__ = (
+        "_id",
+        "full_id",
+        "parent",
+        "child_list",
+        "child_dict",
+        "xtra",
+        "_coord_block",
+        "__dict__",
+    )
+
     parent: Optional[_Parent]
     child_list: list[_Child]
     child_dict: dict[Any, _Child]
@@ -53,9 +146,19 @@ class Entity(Generic[_Parent, _Child]):
         self.child_dict = {}
         # Dictionary that keeps additional properties
         self.xtra = {}
+        # coordinate block of a model, see Model.get_coords
+        self._coord_block = None
 
     # Special methods
 
+    def __getstate__(self):
+        """Return the attributes of the entity for pickling."""
+        return _get_slot_state(self)
+
+    def __setstate__(self, state):
+        """Restore the attributes of the entity when unpickling."""
+        _set_slot_state(self, state)
+
     def __len__(self):
         """Return the number of children."""
         return len(self.child_list)
@@ -263,6 +366,7 @@ class Entity(Generic[_Parent, _Child]):
         child.detach_parent()
         del self.child_dict[id]
         self.child_list.remove(child)
+        _invalidate_coordinates(self)
 
     def add(self, entity: _Child):
         """Add a child to the Entity."""
@@ -272,6 +376,7 @@ class Entity(Generic[_Parent, _Child]):
         entity.set_parent(self)
         self.child_list.append(entity)
         self.child_dict[entity_id] = entity
+        _invalidate_coordinates(self)
 
     def insert(self, pos: int, entity: _Child):
         """Add a child to the Entity at a specified position."""
@@ -281,6 +386,7 @@ class Entity(Generic[_Parent, _Child]):
         entity.set_parent(self)
         self.child_list[pos:pos] = [entity]
         self.child_dict[entity_id] = entity
+        _invalidate_coordinates(self)
 
     def get_iterator(self):
         """Return iterator over children."""
@@ -346,8 +452,7 @@ class Entity(Generic[_Parent, _Child]):
             entity.transform(rotation, translation)
 
         """
-        for o in self.get_list():
-            o.transform(rot, tran)
+        _transform_atoms(self.get_atoms(), rot, tran)
 
     def center_of_mass(self, geometric=False):
         """Return the center of mass of the Entity as a numpy array.
@@ -382,6 +487,51 @@ class Entity(Generic[_Parent, _Child]):
 
         return np.average(coords, axis=0, weights=masses)
 
+    def get_coords(self):
+        """Return the coordinates of the atoms as a NumPy array of shape (N, 3).
+
+        The atoms are in the same order as returned by get_atoms, using the
+        selected atom for disordered atoms.
+
+        For structures created by the parsers, the coordinates of all atoms
+        in a model are stored in a single array, and the coord attribute of
+        each atom is a view of a row of this array. The coordinates of a
+        model, chain or residue are then returned as a view of this array
+        without copying them, and modifying the returned array modifies the
+        atom coordinates. If atoms were added, removed, or reordered, or the
+        coord attribute of an atom was replaced (for example by transform),
+        a new array is returned instead.
+        """
+        coords = self._get_shared_coords()
+        if coords is not None:
+            return coords
+        coords = [atom.coord for atom in self.get_atoms()]
+        if not coords:
+            return np.empty((0, 3), np.float32)
+        return np.array(coords)
+
+    def _get_shared_coords(self, complete=False):
+        """Return a view of the shared coordinate array of the atoms (PRIVATE).
+
+        Returns None if the atom coordinates are not stored in a valid shared
+        coordinate array (see get_coords). If complete is True, None is also
+        returned if the alternative locations of disordered atoms in the model
+        are not stored in the array.
+        """
+        entity = self
+        while entity is not None:
+            block = entity._coord_block
+            if block is not None:
+                if block.valid and not (complete and block.disordered):
+                    if entity is self:
+                        return block.coord
+                    rows = block.ranges.get(id(self))
+                    if rows is not None:
+                        return block.coord[rows[0] : rows[1]]
+                return None
+            entity = entity.parent
+        return None
+
     def copy(self):
         """Copy entity recursively."""
         shallow = copy(self)
@@ -389,6 +539,7 @@ class Entity(Generic[_Parent, _Child]):
         shallow.child_list = []
         shallow.child_dict = {}
         shallow.xtra = copy(self.xtra)
+        shallow._coord_block = None
 
         shallow.detach_parent()
 
@@ -418,6 +569,14 @@ class DisorderedEntityWrapper:
 
     # Special methods
 
+    def __getstate__(self):
+        """Return the attributes of the wrapper for pickling.
+
+        This is defined here, as pickle would otherwise find the __slots__
+        and __getstate__ of the selected child through __getattr__.
+        """
+        return self.__dict__
+
     def __getattr__(self, method):
         """Forward the method call to the selected child."""
         if method == "__setstate__":
@@ -552,6 +711,7 @@ class DisorderedEntityWrapper:
         Uncaught method calls are forwarded to the selected child object.
         """
         self.selected_child = self.child_dict[id]
+        _invalidate_coordinates(self.parent)
 
     def disordered_add(self, child):
         """Add disordered entry.
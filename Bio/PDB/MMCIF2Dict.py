@@ -7,68 +7,105 @@
 
 """Turn an mmCIF file into a dictionary."""
 
+import io
+
 from Bio.File import as_handle
 
+try:
+    from Bio.PDB import _mmcif_tokenizer
+except ImportError:
+    _mmcif_tokenizer = None
+
 
 class MMCIF2Dict(dict):
     """Parse a mmCIF file and return a dictionary."""
 
-    def __init__(self, filename):
+    def __init__(self, filename, categories=None):
         """Parse a mmCIF file and return a dictionary.
 
         Arguments:
          - file - name of the PDB file OR an open filehandle
+         - categories - optional list of category names (such as
+           "_atom_site"). If given, only the keys in these categories (and
+           the "data_" key) are stored in the dictionary, which saves time
+           and memory if only part of the file is needed.
 
+        If the C extension is available, ASCII files are tokenized in C.
         """
         self.quote_chars = ["'", '"']
         self.whitespace_chars = [" ", "\t"]
+        if categories is not None:
+            categories = {
+                category if category.startswith("_") else "_" + category
+                for category in categories
+            }
         with as_handle(filename) as handle:
-            loop_flag = False
-            key = None
-            tokens = self._tokenize(handle)
-            try:
-                token = next(tokens)
-            except StopIteration:
-                return  # for Python 3.7 and PEP 479
-            self[token[0:5]] = token[5:]
-            if not token[0:5].startswith("data_"):
-                raise ValueError(
-                    "The input mmCIF file must begin with a 'data_' directive."
-                )
-            i = 0
-            n = 0
-            for token in tokens:
-                if token.lower() == "loop_":
-                    loop_flag = True
-                    keys = []
-                    i = 0
-                    n = 0
-                    continue
-                elif loop_flag:
-                    # The second condition checks we are in the first column
-                    # Some mmCIF files (e.g. 4q9r) have values in later columns
-                    # starting with an underscore and we don't want to read
-                    # these as keys
-                    if token.startswith("_") and (n == 0 or i % n == 0):
-                        if i > 0:
-                            loop_flag = False
-                        else:
+            if _mmcif_tokenizer is not None:
+                text = handle.read()
+                if isinstance(text, str) and text.isascii():
+                    _mmcif_tokenizer.parse(text, self, categories)
+                    return
+                handle = io.StringIO(text)
+            self._parse(handle, categories)
+
+    def _parse(self, handle, categories):
+        """Tokenize the file and store its contents (PRIVATE)."""
+        loop_flag = False
+        key = None
+        tokens = self._tokenize(handle)
+        try:
+            token = next(tokens)
+        except StopIteration:
+            return  # for Python 3.7 and PEP 479
+        self[token[0:5]] = token[5:]
+        if not token[0:5].startswith("data_"):
+            raise ValueError(
+                "The input mmCIF file must begin with a 'data_' directive."
+            )
+        i = 0
+        n = 0
+        for token in tokens:
+            if token.lower() == "loop_":
+                loop_flag = True
+                keys = []
+                i = 0
+                n = 0
+                continue
+            elif loop_flag:
+                # The second condition checks we are in the first column
+                # Some mmCIF files (e.g. 4q9r) have values in later columns
+                # starting with an underscore and we don't want to read
+                # these as keys
+                if token.startswith("_") and (n == 0 or i % n == 0):
+                    if i > 0:
+                        loop_flag = False
+                    else:
+                        if self._is_selected(token, categories):
                             self[token] = []
                             keys.append(token)
-                            n += 1
-                            continue
-                    else:
-                        self[keys[i % n]].append(token)
-                        i += 1
+                        else:
+                            keys.append(None)
+                        n += 1
                         continue
-                if key is None:
-                    key = token
                 else:
+                    loop_key = keys[i % n]
+                    if loop_key is not None:
+                        self[loop_key].append(token)
+                    i += 1
+                    continue
+            if key is None:
+                key = token
+            else:
+                if self._is_selected(key, categories):
                     self[key] = [token]
-                    key = None
+                key = None
 
     # Private methods
 
+    @staticmethod
+    def _is_selected(key, categories):
+        return categories is None or key.split(".", 1)[0] in categories
+
     def _splitline(self, line):
         # See https://www.iucr.org/resources/cif/spec/version1.1/cifsyntax for the syntax
         in_token = False
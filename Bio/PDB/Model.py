@@ -7,6 +7,9 @@
 
 from typing import TYPE_CHECKING
 
+import numpy as np
+
+from Bio.PDB.Entity import _CoordinateBlock
 from Bio.PDB.Entity import Entity
 from Bio.PDB.internal_coords import IC_Chain
 
@@ -23,6 +26,10 @@ class Model(Entity["Structure", "Chain"]):
     structures normally contain many different models.
     """
 
+    __slots__ = ("serial_num",)
+
+    level = "M"
+
     def __init__(self, id, serial_num=None):
         """Initialize.
 
@@ -31,7 +38,6 @@ class Model(Entity["Structure", "Chain"]):
          - serial_num - int
 
         """
-        self.level = "M"
         if serial_num is None:
             self.serial_num = id
         else:
@@ -57,6 +63,49 @@ class Model(Entity["Structure", "Chain"]):
         for r in self.get_residues():
             yield from r
 
+    def _pack_coords(self):
+        """Store the coordinates of all atoms in a single array (PRIVATE).
+
+        The coord attribute of each atom (the selected atom for disordered
+        atoms) is replaced by a view of a row of the array, so that get_coords
+        can return the coordinates of the model, or of a chain or residue in
+        it, without copying them. This is called by the StructureBuilder.
+
+        Models with internal coordinates are left unchanged, as their atom
+        coordinates are already views of the internal coordinates array.
+        """
+        atoms = []
+        ranges = {}
+        disordered = False
+        for chain in self:
+            if chain.internal_coord is not None:
+                return
+            chain_start = len(atoms)
+            for residue in chain:
+                start = len(atoms)
+                for atom in residue:
+                    if atom.is_disordered() == 2:
+                        atom = atom.selected_child
+                        disordered = True
+                    atoms.append(atom)
+                ranges[id(residue)] = (start, len(atoms))
+                if residue.is_disordered() == 2:
+                    ranges[id(residue.selected_child)] = (start, len(atoms))
+            ranges[id(chain)] = (chain_start, len(atoms))
+        if not atoms:
+            return
+        try:
+            coord = np.array([atom._coord for atom in atoms])
+        except ValueError:
+            return
+        if coord.dtype == object or coord.shape != (len(atoms), 3):
+            return
+        block = _CoordinateBlock(coord, ranges, disordered)
+        for atom, row in zip(atoms, coord):
+            atom._coord = row
+            atom._coord_block = block
+        self._coord_block = block
+
     def atom_to_internal_coordinates(self, verbose: bool = False) -> None:
         """Create/update internal coordinates from Atom X,Y,Z coordinates.
 
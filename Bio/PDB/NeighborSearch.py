@@ -8,6 +8,9 @@
 
 """Fast atom neighbor lookup using a KD tree (implemented in C)."""
 
+from typing import NamedTuple
+from typing import Optional
+
 import numpy as np
 
 from Bio.PDB.PDBExceptions import PDBException
@@ -16,6 +19,77 @@ from Bio.PDB.Selection import unfold_entities
 from Bio.PDB.Selection import uniqueify
 
 
+class ContactMap(NamedTuple):
+    """Sparse contact map, with the contacts stored as index pairs.
+
+    Attributes:
+     - entities  - list of the atoms/residues/chains/models/structures that
+       the indices refer to
+     - pairs     - NumPy array of shape (n, 2) with the indices i < j of the
+       entities in contact, sorted by i and then by j (this is the COO
+       format of a sparse matrix, storing only the upper triangle)
+     - distances - NumPy array of shape (n,) with the shortest distance
+       between the atoms of each pair of entities, or None if distances
+       were not requested
+
+    """
+
+    entities: list
+    pairs: np.ndarray
+    distances: Optional[np.ndarray] = None
+
+    def to_dense(self):
+        """Return the contact map as a symmetric boolean NumPy array."""
+        n = len(self.entities)
+        matrix = np.zeros((n, n), bool)
+        i, j = self.pairs.T
+        matrix[i, j] = True
+        matrix[j, i] = True
+        return matrix
+
+
+def aggregate_pairs(pairs, index, distances=None):
+    """Map index pairs to pairs of parent indices.
+
+    Arguments:
+     - pairs     - NumPy array of shape (n, 2) with index pairs, for example
+       as returned by NeighborSearch.search_all_arrays
+     - index     - NumPy array mapping each index to the index of its parent
+       (e.g. the index of the residue of each atom)
+     - distances - optional NumPy array of shape (n,) with the distance of
+       each pair
+
+    Pairs with both indices mapping to the same parent are removed, and each
+    parent pair is reported only once, as (i, j) with i < j. Returns a tuple
+    of the sorted parent pairs and their shortest distances (None if no
+    distances were given).
+
+    >>> import numpy as np
+    >>> pairs = np.array([[0, 1], [1, 2], [0, 3], [2, 3]])
+    >>> distances = np.array([1.0, 2.0, 3.0, 1.5])
+    >>> index = np.array([0, 0, 1, 1])
+    >>> aggregate_pairs(pairs, index, distances)
+    (array([[0, 1]]), array([2.]))
+
+    """
+    index = np.asarray(index)
+    parents = index[pairs]
+    parents.sort(axis=1)
+    mask = parents[:, 0] != parents[:, 1]
+    parents = parents[mask]
+    if distances is None:
+        return np.unique(parents, axis=0), None
+    distances = np.asarray(distances)[mask]
+    # sort by parent pair, and by distance within each parent pair, so that
+    # the first distance of each parent pair is the shortest one
+    order = np.lexsort((distances, parents[:, 1], parents[:, 0]))
+    parents = parents[order]
+    distances = distances[order]
+    first = np.ones(len(parents), bool)
+    first[1:] = np.any(parents[1:] != parents[:-1], axis=1)
+    return parents[first], distances[first]
+
+
 class NeighborSearch:
     """Class for neighbor searching.
 
@@ -129,3 +203,117 @@ class NeighborSearch:
             next_level_pair_list = self._get_unique_parent_pairs(next_level_pair_list)
             if level == next_level:
                 return next_level_pair_list
+
+    def search_all_arrays(self, radius, distances=False):
+        """All neighbor search, returning the atom pairs as NumPy arrays.
+
+        Find all atom pairs within radius of each other, as indices into the
+        atom list. This is much faster than search_all for large numbers of
+        contacts, as no Python objects are created for the individual pairs.
+        The search releases the global interpreter lock, so several searches
+        can run concurrently in threads.
+
+        Arguments:
+         - radius - float
+         - distances - if True, also return the distance of each atom pair
+
+        Returns a NumPy array of shape (n, 2) with the atom indices i < j of
+        each pair, sorted by i and then by j, or a tuple of this array and a
+        NumPy array of shape (n,) with the distances if distances is True.
+        """
+        indices, radii = self.kdt.neighbor_search_arrays(radius, distances)
+        pairs = np.frombuffer(indices, np.intp).reshape(-1, 2)
+        order = np.lexsort((pairs[:, 1], pairs[:, 0]))
+        pairs = pairs[order]
+        if distances:
+            return pairs, np.frombuffer(radii, np.float64)[order]
+        return pairs
+
+    def parent_index(self, level):
+        """Return the index of the parent entity of each atom.
+
+        Arguments:
+         - level - char (A, R, C, M, S)
+
+        Returns a tuple of a list of the entities at the given level, in the
+        order of their first atom in the atom list, and a NumPy array with
+        the index in this list of the entity containing each atom.
+        """
+        if level not in entity_levels:
+            raise PDBException(f"{level}: Unknown level")
+        atom_list = self.atom_list
+        if level == "A":
+            return list(atom_list), np.arange(len(atom_list))
+        steps = entity_levels.index(level)
+        entities = []
+        positions = {}
+        index = np.empty(len(atom_list), np.intp)
+        # consecutive atoms usually share their parent, so cache the lookup
+        previous = None
+        for i, atom in enumerate(atom_list):
+            parent = atom.get_parent()
+            if parent is not previous:
+                previous = parent
+                entity = parent
+                for _ in range(steps - 1):
+                    entity = entity.get_parent()
+                position = positions.get(id(entity))
+                if position is None:
+                    position = len(entities)
+                    positions[id(entity)] = position
+                    entities.append(entity)
+            index[i] = position
+        return entities, index
+
+    def contact_map(self, radius, level="R", distances=False):
+        """Return the contacts between entities as a sparse contact map.
+
+        Two entities are in contact if they have at least one pair of atoms
+        within radius of each other.
+
+        Arguments:
+         - radius - float
+         - level - char (A, R, C, M, S)
+         - distances - if True, also store the shortest distance between
+           the atoms of each pair of entities
+
+        Returns a ContactMap; its pairs attribute contains the same pairs as
+        returned by search_all, but as indices into its entities attribute.
+        """
+        entities, index = self.parent_index(level)
+        if distances:
+            pairs, dists = self.search_all_arrays(radius, distances=True)
+        else:
+            pairs, dists = self.search_all_arrays(radius), None
+        if level != "A":
+            pairs, dists = aggregate_pairs(pairs, index, dists)
+        return ContactMap(entities, pairs, dists)
+
+    def interface(self, radius, level="R", distances=False):
+        """Return the contacts between entities in different chains.
+
+        Arguments:
+         - radius - float
+         - level - char (A or R); the level of the interface entities
+         - distances - if True, also store the shortest distance between
+           the atoms of each pair of entities
+
+        Returns a ContactMap with the atoms or residues that have at least
+        one atom within radius of an atom in another chain. Only the pairs
+        between different chains are stored.
+        """
+        if level not in ("A", "R"):
+            raise PDBException(f"{level}: Interface level must be A or R")
+        entities, index = self.parent_index(level)
+        _, chain_index = self.parent_index("C")
+        if distances:
+            pairs, dists = self.search_all_arrays(radius, distances=True)
+        else:
+            pairs, dists = self.search_all_arrays(radius), None
+        mask = chain_index[pairs[:, 0]] != chain_index[pairs[:, 1]]
+        pairs = pairs[mask]
+        if dists is not None:
+            dists = dists[mask]
+        if level != "A":
+            pairs, dists = aggregate_pairs(pairs, index, dists)
+        return ContactMap(entities, pairs, dists)
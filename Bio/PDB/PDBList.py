@@ -219,6 +219,80 @@ class PDBList:
                 obsolete.append(pdb.decode())
         return obsolete
 
+    def _get_pdb_file_url(self, pdb_code, file_format, obsolete=False):
+        """Return the URL and archive file name of a PDB entry (PRIVATE).
+
+        The PDB code must be in lower case.
+        """
+        archive_dict = {
+            "pdb": f"pdb{pdb_code}.ent.gz",
+            "mmCif": f"{pdb_code}.cif.gz",
+            "xml": f"{pdb_code}.xml.gz",
+            "mmtf": f"{pdb_code}",
+            "bundle": f"{pdb_code}-pdb-bundle.tar.gz",
+        }
+
+        if file_format not in archive_dict:
+            raise ValueError(
+                f"Specified file_format {file_format} does not exist or is not supported. "
+                f"Please use one of the following: {', '.join(archive_dict)}."
+            )
+
+        archive = archive_dict[file_format]
+
+        if file_format in ("pdb", "mmCif", "xml"):
+            pdb_dir = "divided" if not obsolete else "obsolete"
+            file_type = (
+                "pdb"
+                if file_format == "pdb"
+                else "mmCIF" if file_format == "mmCif" else "XML"
+            )
+            url = (
+                self.pdb_server
+                + f"/pub/pdb/data/structures/{pdb_dir}/{file_type}/{pdb_code[1:3]}/{archive}"
+            )
+        elif file_format == "bundle":
+            url = (
+                self.pdb_server
+                + f"/pub/pdb/compatible/pdb_bundle/{pdb_code[1:3]}/{pdb_code}/{archive}"
+            )
+        else:
+            url = f"http://mmtf.rcsb.org/v1.0/full/{pdb_code}"
+        return url, archive
+
+    def _get_assembly_file_url(self, pdb_code, assembly_num, file_format):
+        """Return the URL and archive file name of an assembly (PRIVATE).
+
+        The PDB code and file format must be in lower case.
+        """
+        archive = {
+            "pdb": f"{pdb_code}.pdb{assembly_num}.gz",
+            "mmcif": f"{pdb_code}-assembly{assembly_num}.cif.gz",
+        }
+        if file_format not in archive:
+            raise Exception(
+                f"Specified file_format '{file_format}' is not supported. Use one of the "
+                "following: 'mmcif' or 'pdb'."
+            )
+
+        # Get the compressed assembly structure name
+        archive_fn = archive[file_format]
+
+        if file_format == "mmcif":
+            url = self.pdb_server + f"/pub/pdb/data/assemblies/mmCIF/all/{archive_fn}"
+        elif file_format == "pdb":
+            url = self.pdb_server + f"/pub/pdb/data/biounit/PDB/all/{archive_fn}"
+        else:  # better safe than sorry
+            raise ValueError(f"file_format '{file_format}' not supported")
+        return url, archive_fn
+
+    def _get_local_dir(self, pdb_code, obsolete=False):
+        """Return the local directory storing the files of a PDB entry (PRIVATE)."""
+        path = self.local_pdb if not obsolete else self.obsolete_pdb
+        if not self.flat_tree:  # Put in PDB-style directory tree
+            path = os.path.join(path, pdb_code[1:3])
+        return path
+
     def retrieve_pdb_file(
         self, pdb_code, obsolete=False, pdir=None, file_format=None, overwrite=False
     ):
@@ -269,46 +343,11 @@ class PDBList:
 
         # Get the compressed PDB structure
         pdb_code = pdb_code.lower()
-        archive_dict = {
-            "pdb": f"pdb{pdb_code}.ent.gz",
-            "mmCif": f"{pdb_code}.cif.gz",
-            "xml": f"{pdb_code}.xml.gz",
-            "mmtf": f"{pdb_code}",
-            "bundle": f"{pdb_code}-pdb-bundle.tar.gz",
-        }
-
-        if file_format not in archive_dict:
-            raise ValueError(
-                f"Specified file_format {file_format} does not exist or is not supported. "
-                f"Please use one of the following: {', '.join(archive_dict)}."
-            )
-
-        archive = archive_dict[file_format]
-
-        if file_format in ("pdb", "mmCif", "xml"):
-            pdb_dir = "divided" if not obsolete else "obsolete"
-            file_type = (
-                "pdb"
-                if file_format == "pdb"
-                else "mmCIF" if file_format == "mmCif" else "XML"
-            )
-            url = (
-                self.pdb_server
-                + f"/pub/pdb/data/structures/{pdb_dir}/{file_type}/{pdb_code[1:3]}/{archive}"
-            )
-        elif file_format == "bundle":
-            url = (
-                self.pdb_server
-                + f"/pub/pdb/compatible/pdb_bundle/{pdb_code[1:3]}/{pdb_code}/{archive}"
-            )
-        else:
-            url = f"http://mmtf.rcsb.org/v1.0/full/{pdb_code}"
+        url, archive = self._get_pdb_file_url(pdb_code, file_format, obsolete)
 
         # Where does the final PDB file get saved?
         if pdir is None:
-            path = self.local_pdb if not obsolete else self.obsolete_pdb
-            if not self.flat_tree:  # Put in PDB-style directory tree
-                path = os.path.join(path, pdb_code[1:3])
+            path = self._get_local_dir(pdb_code, obsolete)
         else:  # Put in specified directory
             path = pdir
         if not os.access(path, os.F_OK):
@@ -513,34 +552,16 @@ class PDBList:
         """
         pdb_code = pdb_code.lower()
         assembly_num = int(assembly_num)
-        archive = {
-            "pdb": f"{pdb_code}.pdb{assembly_num}.gz",
-            "mmcif": f"{pdb_code}-assembly{assembly_num}.cif.gz",
-        }
 
         file_format = self._print_default_format_warning(file_format)
         file_format = file_format.lower()  # we should standardize this.
-        if file_format not in archive:
-            raise Exception(
-                f"Specified file_format '{file_format}' is not supported. Use one of the "
-                "following: 'mmcif' or 'pdb'."
-            )
-
-        # Get the compressed assembly structure name
-        archive_fn = archive[file_format]
-
-        if file_format == "mmcif":
-            url = self.pdb_server + f"/pub/pdb/data/assemblies/mmCIF/all/{archive_fn}"
-        elif file_format == "pdb":
-            url = self.pdb_server + f"/pub/pdb/data/biounit/PDB/all/{archive_fn}"
-        else:  # better safe than sorry
-            raise ValueError(f"file_format '{file_format}' not supported")
+        url, archive_fn = self._get_assembly_file_url(
+            pdb_code, assembly_num, file_format
+        )
 
         # Where will the file be saved?
         if pdir is None:
-            path = self.local_pdb
-            if not self.flat_tree:  # Put in PDB-style directory tree
-                path = os.path.join(path, pdb_code[1:3])
+            path = self._get_local_dir(pdb_code)
         else:  # Put in specified directory
             path = pdir
         if not os.access(path, os.F_OK):
@@ -676,6 +697,97 @@ class PDBList:
             with open(listfile, "w") as outfile:
                 outfile.writelines(x + "\n" for x in entries)
 
+    def sync_mirror(
+        self,
+        pdb_codes: Optional[list[str]] = None,
+        file_format: Optional[str] = None,
+        obsolete: bool = False,
+        with_assemblies: bool = False,
+        modified: Optional[list[str]] = None,
+        manifest: Optional[str] = None,
+        max_connections: int = 8,
+        check_remote: bool = True,
+    ):
+        """Synchronize a local mirror of compressed PDB files with the server.
+
+        Unlike retrieve_pdb_file, the files are stored compressed, exactly as
+        they are on the server (e.g. ``a8/1a8o.cif.gz`` in the local PDB
+        directory tree). The state of each file is recorded in a SQLite
+        manifest, which is used to skip unchanged files and to resume
+        interrupted transfers; see Bio.PDB.mirror for details.
+
+        :param pdb_codes: PDB codes of the entries to mirror. By default, all
+            current entries (or all obsolete entries if obsolete is True).
+
+        :param file_format: "mmCif" (default), "pdb", "xml", or "bundle".
+            Assemblies are mirrored in mmCIF format, unless the file format is
+            "pdb".
+
+        :param obsolete: if True, mirror obsolete entries in the obsolete
+            directory tree.
+
+        :param with_assemblies: if True, also mirror the biological assemblies
+            of the (current) entries.
+
+        :param modified: PDB codes of entries that should be downloaded again
+            even if they appear to be unchanged, e.g. the entries listed as
+            modified in the weekly status files returned by get_recent_changes.
+
+        :param manifest: file name of the SQLite manifest (default:
+            ".pdb_mirror.sqlite" in the local PDB directory).
+
+        :param max_connections: maximum number of simultaneous downloads.
+
+        :param check_remote: if True (default), ask the server whether files
+            that were downloaded before have changed. If False, such files are
+            skipped without contacting the server.
+
+        :return: a MirrorStats object with the number of downloaded, unchanged
+            and failed files.
+        """
+        from Bio.PDB.mirror import PDBMirror
+
+        file_format = self._print_default_format_warning(file_format)
+        if file_format == "mmtf":
+            raise ValueError("The mmtf format cannot be mirrored")
+        if obsolete and with_assemblies:
+            raise ValueError("Obsolete entries have no assemblies")
+        if pdb_codes is None:
+            if obsolete:
+                pdb_codes = self.get_all_obsolete()
+            else:
+                pdb_codes = self.get_all_entries()
+        pdb_codes = [pdb_code.lower() for pdb_code in pdb_codes]
+        root = self.obsolete_pdb if obsolete else self.local_pdb
+        files = {}
+        for pdb_code in pdb_codes:
+            url, archive = self._get_pdb_file_url(pdb_code, file_format, obsolete)
+            path = os.path.join(self._get_local_dir(pdb_code, obsolete), archive)
+            files[pdb_code] = [(url, os.path.relpath(path, root))]
+        if with_assemblies:
+            assembly_format = "pdb" if file_format == "pdb" else "mmcif"
+            for pdb_code, assembly_num in self.get_all_assemblies():
+                if pdb_code in files:
+                    url, archive = self._get_assembly_file_url(
+                        pdb_code, int(assembly_num), assembly_format
+                    )
+                    path = os.path.join(self._get_local_dir(pdb_code), archive)
+                    files[pdb_code].append((url, os.path.relpath(path, root)))
+        force = set()
+        for pdb_code in modified or ():
+            for url, path in files.get(pdb_code.lower(), ()):
+                force.add(path)
+        with PDBMirror(
+            root,
+            manifest=manifest,
+            max_connections=max_connections,
+            check_remote=check_remote,
+            verbose=self._verbose,
+        ) as mirror:
+            return mirror.sync(
+                (item for items in files.values() for item in items), force
+            )
+
     def get_seqres_file(self, savefile="pdb_seqres.txt"):
         """Retrieve and save a (big) file containing all the sequences of PDB entries."""
         if self._verbose:
@@ -31,9 +31,12 @@ _atom_name_dict["O"] = 4
 class Residue(Entity["Chain", "Atom"]):
     """Represents a residue. A Residue object stores atoms."""
 
+    __slots__ = ("disordered", "resname", "segid", "internal_coord")
+
+    level = "R"
+
     def __init__(self, id, resname, segid):
         """Initialize the class."""
-        self.level = "R"
         self.disordered = 0
         self.resname = resname
         self.segid = segid
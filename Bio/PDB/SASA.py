@@ -19,6 +19,7 @@ Reference:
 import collections
 import math
 from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
@@ -73,7 +74,11 @@ ATOMIC_RADII.update(
 class ShrakeRupley:
     """Calculates SASAs using the Shrake-Rupley algorithm."""
 
-    def __init__(self, probe_radius=1.40, n_points=100, radii_dict=None):
+    # Maximum number of sphere points tested against neighboring atoms at once;
+    # this limits the size of the temporary arrays used by compute.
+    _chunk_size = 1 << 18
+
+    def __init__(self, probe_radius=1.40, n_points=100, radii_dict=None, threads=1):
         """Initialize the class.
 
         :param probe_radius: radius of the probe in A. Default is 1.40, roughly
@@ -90,6 +95,10 @@ class ShrakeRupley:
             default ATOMIC_RADII dictionary.
         :type radii_dict: dict
 
+        :param threads: number of threads used to test the sphere points of
+            different atoms in parallel. Default is 1.
+        :type threads: int
+
         >>> sr = ShrakeRupley()
         >>> sr = ShrakeRupley(n_points=960)
         >>> sr = ShrakeRupley(radii_dict={"O": 3.1415})
@@ -112,6 +121,10 @@ class ShrakeRupley:
         if radii_dict is not None:
             self.radii_dict.update(radii_dict)
 
+        if threads < 1:
+            raise ValueError(f"Number of threads must be at least 1: {threads}")
+        self.threads = threads
+
         # Pre-compute reference sphere
         self._sphere = self._compute_sphere()
 
@@ -141,6 +154,98 @@ class ShrakeRupley:
 
         return coords
 
+    def _find_neighbors(self, coords, radii):
+        """Return the overlapping neighbors of each atom (PRIVATE).
+
+        All pairs of atoms within twice the maximum radius are found in a
+        single KDTree search. The neighbors of atom i are returned as
+        neighbors[offsets[i]:offsets[i+1]].
+        """
+        n_atoms = len(coords)
+        twice_maxradii = np.max(radii) * 2
+        kdt = KDTree(coords, 10)
+        pairs = kdt.neighbor_search(twice_maxradii)
+        indices = np.array([(pair.index1, pair.index2) for pair in pairs], int)
+        indices = indices.reshape(-1, 2)
+        distances = np.array([pair.radius for pair in pairs], dtype=np.float64)
+        index1, index2 = indices.T
+        overlap = distances < radii[index1] + radii[index2]
+        index1 = index1[overlap]
+        index2 = index2[overlap]
+        atoms = np.concatenate([index1, index2])
+        neighbors = np.concatenate([index2, index1])
+        order = np.argsort(atoms, kind="stable")
+        atoms = atoms[order]
+        neighbors = neighbors[order]
+        offsets = np.searchsorted(atoms, np.arange(n_atoms + 1))
+        return offsets, neighbors
+
+    def _count_points(self, coords, radii, offsets, neighbors, start, end):
+        """Count the accessible sphere points of atoms start to end (PRIVATE).
+
+        A sphere point of atom i is buried if it lies within the radius of
+        any overlapping neighbor j. The sphere points of all pairs (i, j) are
+        tested at once, and the boolean masks of buried points of each atom
+        are then combined with a logical or.
+        """
+        n_points = self.n_points
+        sizes = np.diff(offsets[start : end + 1])
+        counts = np.full(end - start, n_points, np.int64)
+        if offsets[end] == offsets[start]:
+            return counts
+        sphere = self._sphere.astype(np.float64)
+        owners = np.repeat(np.arange(start, end), sizes)
+        others = neighbors[offsets[start] : offsets[end]]
+        radii1 = radii[owners]
+        radii2 = radii[others]
+        vectors = coords[others] - coords[owners]
+        # The point r1 * u + c1 on the sphere of atom i lies within radius r2
+        # of atom j if u . (c2 - c1) >= (r1 ** 2 + |c2 - c1| ** 2 - r2 ** 2) / 2 r1
+        thresholds = radii1 * radii1 + (vectors * vectors).sum(1) - radii2 * radii2
+        thresholds /= 2 * radii1
+        margins = np.dot(vectors, sphere.T)
+        margins -= thresholds[:, None]
+        buried = margins >= 0
+        # Use the distance between the point and atom j for points close to
+        # the surface of atom j, to avoid rounding errors.
+        pairs, indices = np.nonzero(np.abs(margins) < 1e-8)
+        if len(pairs):
+            points = sphere[indices] * radii1[pairs, None] + coords[owners[pairs]]
+            d = points - coords[others[pairs]]
+            d *= d
+            distances = d[:, 0] + d[:, 1] + d[:, 2]
+            buried[pairs, indices] = distances <= radii2[pairs] * radii2[pairs]
+        nonempty = sizes > 0
+        starts = offsets[start:end][nonempty] - offsets[start]
+        buried = np.logical_or.reduceat(buried, starts, axis=0)
+        counts[nonempty] -= buried.sum(1)
+        return counts
+
+    def _count_accessible_points(self, coords, radii):
+        """Return the number of accessible sphere points of each atom (PRIVATE)."""
+        n_atoms = len(coords)
+        offsets, neighbors = self._find_neighbors(coords, radii)
+        # Split the atoms into chunks with a limited number of neighbor pairs
+        max_pairs = max(1, self._chunk_size // self.n_points)
+        chunks = []
+        start = 0
+        while start < n_atoms:
+            end = np.searchsorted(offsets, offsets[start] + max_pairs, "right") - 1
+            end = min(max(end, start + 1), n_atoms)
+            chunks.append((start, end))
+            start = end
+
+        def count_points(chunk):
+            start, end = chunk
+            return self._count_points(coords, radii, offsets, neighbors, start, end)
+
+        if self.threads == 1 or len(chunks) == 1:
+            counts = [count_points(chunk) for chunk in chunks]
+        else:
+            with ThreadPoolExecutor(self.threads) as executor:
+                counts = list(executor.map(count_points, chunks))
+        return np.concatenate(counts)
+
     def compute(self, entity, level="A"):
         """Calculate surface accessibility surface area for an entity.
 
@@ -194,41 +299,13 @@ class ShrakeRupley:
         # We trust DisorderedAtom and friends to pick representatives.
         coords = np.array([a.coord for a in atoms], dtype=np.float64)
 
-        # Pre-compute atom neighbors using KDTree
-        kdt = KDTree(coords, 10)
-
         # Pre-compute radius * probe table
         radii_dict = self.radii_dict
         radii = np.array([radii_dict[a.element] for a in atoms], dtype=np.float64)
         radii += self.probe_radius
-        twice_maxradii = np.max(radii) * 2
 
         # Calculate ASAs
-        asa_array = np.zeros((n_atoms, 1), dtype=np.int64)
-        ptset = set(range(self.n_points))
-        for i in range(n_atoms):
-            r_i = radii[i]
-
-            # Move sphere to atom
-            s_on_i = (np.array(self._sphere, copy=True) * r_i) + coords[i]
-            available_set = ptset.copy()
-
-            # KDtree for sphere points
-            kdt_sphere = KDTree(s_on_i, 10)
-
-            # Iterate over neighbors of atom i
-            for jj in kdt.search(coords[i], twice_maxradii):
-                j = jj.index
-                if i == j:
-                    continue
-
-                if jj.radius < (r_i + radii[j]):
-                    # Remove overlapping points on sphere from available set
-                    available_set -= {
-                        pt.index for pt in kdt_sphere.search(coords[j], radii[j])
-                    }
-
-            asa_array[i] = len(available_set)  # update counts
+        asa_array = self._count_accessible_points(coords, radii)[:, np.newaxis]
 
         # Convert accessible point count to surface area in A**2
         f = radii * radii * (4 * np.pi / self.n_points)
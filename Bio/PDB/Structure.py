@@ -9,6 +9,8 @@
 
 from typing import TYPE_CHECKING
 
+import numpy as np
+
 from Bio.PDB.Entity import Entity
 
 if TYPE_CHECKING:
@@ -18,10 +20,9 @@ if TYPE_CHECKING:
 class Structure(Entity[None, "Model"]):
     """The Structure class contains a collection of Model instances."""
 
-    def __init__(self, id):
-        """Initialize the class."""
-        self.level = "S"
-        Entity.__init__(self, id)
+    __slots__ = ()
+
+    level = "S"
 
     def __repr__(self):
         """Return the structure identifier."""
@@ -46,6 +47,27 @@ class Structure(Entity[None, "Model"]):
         for r in self.get_residues():
             yield from r
 
+    def get_coords(self):
+        """Return the coordinates of the atoms as a NumPy array of shape (N, 3).
+
+        The coordinates of the atoms in all models are returned, in the same
+        order as returned by get_atoms. For a structure with a single model,
+        this returns a view of the coordinates of the model without copying
+        them (see Entity.get_coords).
+        """
+        if len(self.child_list) == 1:
+            return self.child_list[0].get_coords()
+        coords = [model.get_coords() for model in self]
+        if not coords:
+            return np.empty((0, 3), np.float32)
+        return np.concatenate(coords)
+
+    def _get_shared_coords(self, complete=False):
+        """Return a view of the shared coordinate array of the atoms (PRIVATE)."""
+        if len(self.child_list) == 1:
+            return self.child_list[0]._get_shared_coords(complete)
+        return None
+
     def atom_to_internal_coordinates(self, verbose: bool = False) -> None:
         """Create/update internal coordinates from Atom X,Y,Z coordinates.
 
@@ -315,6 +315,9 @@ class StructureBuilder:
         # self.structure.sort()
         # Add the header dict
         self.structure.header = self.header
+        # Store the atom coordinates of each model in a single array
+        for model in self.structure:
+            model._pack_coords()
         return self.structure
 
     def set_symmetry(self, spacegroup, cell):
@@ -9,6 +9,7 @@
 
 import numpy as np
 
+from Bio.PDB.Entity import _transform_atoms
 from Bio.PDB.PDBExceptions import PDBException
 from Bio.SVDSuperimposer import SVDSuperimposer
 
@@ -33,12 +34,8 @@ class Superimposer:
         """
         if not len(fixed) == len(moving):
             raise PDBException("Fixed and moving atom lists differ in size")
-        length = len(fixed)
-        fixed_coord = np.zeros((length, 3))
-        moving_coord = np.zeros((length, 3))
-        for i in range(length):
-            fixed_coord[i] = fixed[i].get_coord()
-            moving_coord[i] = moving[i].get_coord()
+        fixed_coord = np.array([atom.get_coord() for atom in fixed], np.float64)
+        moving_coord = np.array([atom.get_coord() for atom in moving], np.float64)
         sup = SVDSuperimposer()
         sup.set(fixed_coord, moving_coord)
         sup.run()
@@ -52,5 +49,4 @@ class Superimposer:
         rot, tran = self.rotran
         rot = rot.astype("f")
         tran = tran.astype("f")
-        for atom in atom_list:
-            atom.transform(rot, tran)
+        _transform_atoms(atom_list, rot, tran)
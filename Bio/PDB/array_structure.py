@@ -0,0 +1,623 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Structures with the atom data stored in NumPy columns.
+
+Building the full Structure/Model/Chain/Residue/Atom hierarchy creates
+several Python objects for each atom, which dominates the time and memory
+needed to load large structures. An ArrayStructureBuilder can be passed to
+the structure parsers instead of the default StructureBuilder; the parser
+then only fills contiguous NumPy columns with the atom coordinates,
+elements, B-factors, and residue, chain and model indices, and returns an
+ArrayStructure:
+
+>>> from Bio.PDB import PDBParser
+>>> from Bio.PDB.array_structure import ArrayStructureBuilder
+>>> parser = PDBParser(structure_builder=ArrayStructureBuilder())
+>>> structure = parser.get_structure("1A8O", "PDB/1A8O.pdb")
+>>> structure
+<ArrayStructure id=1A8O models=1 atoms=644>
+>>> structure.coord.shape
+(644, 3)
+>>> print(structure.name[:4].tolist(), structure.element[:4].tolist())
+['N', 'CA', 'C', 'O'] ['N', 'C', 'C', 'O']
+>>> print(structure.chain_id.tolist(), structure.resname[:3].tolist())
+['A'] ['MSE', 'ASP', 'ILE']
+
+The per-atom residue, chain and model indices can be used to select atoms
+without creating any Atom objects:
+
+>>> residues = structure.atom_index("R")
+>>> print(structure.name[residues == 1].tolist())
+['N', 'CA', 'C', 'O', 'CB', 'CG', 'OD1', 'OD2']
+
+The Model, Chain, Residue and Atom objects are created only when the
+hierarchy is accessed, one model at a time:
+
+>>> model = structure[0]
+>>> model["A"][152]["CA"].coord.tolist() == structure.coord[9].tolist()
+True
+"""
+
+import warnings
+
+import numpy as np
+
+from Bio.PDB.PDBExceptions import PDBConstructionException
+from Bio.PDB.PDBExceptions import PDBConstructionWarning
+from Bio.PDB.Structure import Structure
+from Bio.PDB.StructureBuilder import StructureBuilder
+
+
+def _float_column(values):
+    """Return the values as a float array, with None stored as NaN (PRIVATE)."""
+    return np.array([np.nan if value is None else value for value in values], float)
+
+
+def _column(values):
+    """Return the values as an array, of dtype object if their types differ (PRIVATE)."""
+    if len(set(map(type, values))) > 1:
+        column = np.empty(len(values), object)
+        column[:] = values
+        return column
+    return np.array(values)
+
+
+def _float_or_none(value):
+    """Return None for NaN values stored by _float_column (PRIVATE)."""
+    if value != value:
+        return None
+    return value
+
+
+class ArrayStructure:
+    """A macromolecular structure stored as NumPy columns.
+
+    An ArrayStructure is returned by the parsers if an ArrayStructureBuilder
+    is used as their structure builder. The atom data are stored in arrays
+    with one entry for each atom, in the order in which the atoms were read:
+
+     - coord - float32 array of shape (number of atoms, 3)
+     - name, fullname, altloc, element - atom names, alternative location
+       identifiers and elements
+     - serial_number - atom serial numbers
+     - bfactor, occupancy - B-factors and occupancies (NaN if missing)
+     - pqr_charge, radius - charges and radii (PQR files only, NaN otherwise)
+     - residue_index - index of the residue of each atom
+
+    The residues, chains and models are stored in the same way:
+
+     - resname, hetero_flag, resseq, icode, segid - residue names, hetero
+       flags (" ", "H", or "W"), sequence identifiers, insertion codes and
+       segment identifiers
+     - chain_index - index of the chain of each residue
+     - chain_id - chain identifiers
+     - model_index - index of the model of each chain
+     - model_id, model_serial_num - model identifiers and serial numbers
+
+    Iterating over the structure, or using model identifiers as keys as for
+    Structure objects, creates the Model objects on demand. Use the
+    to_structure method to obtain a regular Structure object.
+    """
+
+    level = "S"
+
+    def __init__(self, id, QUIET=False):
+        """Initialize an empty structure with the given identifier."""
+        self.id = id
+        self.header = {}
+        self.QUIET = QUIET
+        self._structure = None
+        self._models = {}
+
+    def __repr__(self):
+        """Return the structure identifier and size."""
+        return "<ArrayStructure id=%s models=%d atoms=%d>" % (
+            self.id,
+            len(self.model_id),
+            len(self.coord),
+        )
+
+    def __len__(self):
+        """Return the number of models."""
+        return len(self.model_id)
+
+    def __contains__(self, id):
+        """Check if there is a model with the given id."""
+        return id in self._model_indices
+
+    def __getitem__(self, id):
+        """Return the model with the given id, creating it if needed."""
+        return self._get_model(self._model_indices[id])
+
+    def __iter__(self):
+        """Iterate over the models, creating them if needed."""
+        for index in range(len(self.model_id)):
+            yield self._get_model(index)
+
+    def get_id(self):
+        """Return the structure identifier."""
+        return self.id
+
+    def get_level(self):
+        """Return the level in the hierarchy ("S")."""
+        return self.level
+
+    def get_models(self):
+        """Return models."""
+        yield from self
+
+    def get_chains(self):
+        """Return chains from models."""
+        for m in self.get_models():
+            yield from m
+
+    def get_residues(self):
+        """Return residues from chains."""
+        for c in self.get_chains():
+            yield from c
+
+    def get_atoms(self):
+        """Return atoms from residue."""
+        for r in self.get_residues():
+            yield from r
+
+    def atom_index(self, level):
+        """Return the index of the residue, chain, or model of each atom.
+
+        Arguments:
+         - level - "R" (residue), "C" (chain), or "M" (model)
+
+        """
+        if level == "R":
+            return self.residue_index
+        if level == "C":
+            return self.chain_index[self.residue_index]
+        if level == "M":
+            return self.model_index[self.chain_index[self.residue_index]]
+        raise ValueError(f"Invalid level '{level}'. Must be R, C, or M.")
+
+    def to_structure(self):
+        """Return a Structure object with all models.
+
+        The Model objects are shared with those returned by indexing or
+        iterating over the ArrayStructure.
+        """
+        for index in range(len(self.model_id)):
+            self._get_model(index)
+        return self._get_structure()
+
+    def _get_structure(self):
+        """Return the Structure object holding the models created so far (PRIVATE)."""
+        if self._structure is None:
+            self._structure = Structure(self.id)
+            self._structure.header = self.header
+        return self._structure
+
+    def _get_model(self, index):
+        """Return the model at the given index, creating it if needed (PRIVATE)."""
+        try:
+            return self._models[index]
+        except KeyError:
+            pass
+        with warnings.catch_warnings():
+            if self.QUIET:
+                warnings.filterwarnings("ignore", category=PDBConstructionWarning)
+            model = self._build_model(index)
+        self._models[index] = model
+        return model
+
+    def _build_model(self, index):
+        """Create a Model object by feeding the columns to a StructureBuilder (PRIVATE).
+
+        The StructureBuilder calls are the same as those made by the parser,
+        so the model is identical to the model created by the parser when
+        using the default structure builder.
+        """
+        structure = self._get_structure()
+        builder = StructureBuilder()
+        builder.structure = structure
+        builder.init_model(self._model_ids[index], self._model_serial_nums[index])
+        model = builder.model
+        # keep the models in the order in which they were read
+        structure.child_list.sort(key=lambda model: self._model_indices[model.id])
+        chain_start, chain_end = self._chain_offsets[index : index + 2]
+        residue_start = self._residue_offsets[chain_start]
+        residue_end = self._residue_offsets[chain_end]
+        start = self._atom_offsets[residue_start]
+        end = self._atom_offsets[residue_end]
+        residues = zip(
+            self.resname[residue_start:residue_end].tolist(),
+            self.hetero_flag[residue_start:residue_end].tolist(),
+            self.resseq[residue_start:residue_end].tolist(),
+            self.icode[residue_start:residue_end].tolist(),
+            self.segid[residue_start:residue_end].tolist(),
+            self._residue_lines[residue_start:residue_end].tolist(),
+        )
+        residues = list(residues)
+        is_pqr = self._is_pqr
+        atoms = list(
+            zip(
+                self.name[start:end].tolist(),
+                self.bfactor[start:end].tolist(),
+                self.occupancy[start:end].tolist(),
+                self.altloc[start:end].tolist(),
+                self.fullname[start:end].tolist(),
+                self.serial_number[start:end].tolist(),
+                self.element[start:end].tolist(),
+                self.pqr_charge[start:end].tolist(),
+                self.radius[start:end].tolist(),
+                self._atom_lines[start:end].tolist(),
+            )
+        )
+        coords = self.coord[start:end]
+        anisou = self._anisou
+        siguij = self._siguij
+        sigatm = self._sigatm
+        segid = None
+        residue_offsets = self._residue_offsets
+        atom_offsets = self._atom_offsets
+        chain_ids = self.chain_id.tolist()
+        chain_lines = self._chain_lines.tolist()
+        for i in range(chain_start, chain_end):
+            builder.set_line_counter(chain_lines[i])
+            builder.init_chain(chain_ids[i])
+            for j in range(residue_offsets[i], residue_offsets[i + 1]):
+                resname, field, resseq, icode, residue_segid, line = residues[
+                    j - residue_start
+                ]
+                if residue_segid != segid:
+                    segid = residue_segid
+                    builder.init_seg(segid)
+                builder.set_line_counter(line)
+                try:
+                    builder.init_residue(resname, field, resseq, icode)
+                except PDBConstructionException as message:
+                    self._handle_exception(message, line)
+                for k in range(atom_offsets[j], atom_offsets[j + 1]):
+                    (
+                        name,
+                        bfactor,
+                        occupancy,
+                        altloc,
+                        fullname,
+                        serial_number,
+                        element,
+                        pqr_charge,
+                        radius,
+                        line,
+                    ) = atoms[k - start]
+                    builder.set_line_counter(line)
+                    try:
+                        builder.init_atom(
+                            name,
+                            coords[k - start],
+                            _float_or_none(bfactor),
+                            _float_or_none(occupancy),
+                            altloc,
+                            fullname,
+                            serial_number,
+                            element,
+                            _float_or_none(pqr_charge),
+                            _float_or_none(radius),
+                            is_pqr,
+                        )
+                    except PDBConstructionException as message:
+                        self._handle_exception(message, line)
+                    if k in anisou:
+                        builder.set_anisou(anisou[k])
+                    if k in siguij:
+                        builder.set_siguij(siguij[k])
+                    if k in sigatm:
+                        builder.set_sigatm(sigatm[k])
+        model._pack_coords()
+        return model
+
+    def _handle_exception(self, message, line_counter):
+        """Warn about an exception raised while creating the hierarchy (PRIVATE).
+
+        As for the PDBParser in permissive mode, the offending residue or atom
+        is skipped.
+        """
+        warnings.warn(
+            "PDBConstructionException: %s\n"
+            "Exception ignored at line %i.\n"
+            "Some atoms or residues may be missing in the data structure."
+            % (message, line_counter),
+            PDBConstructionWarning,
+        )
+
+
+class ArrayStructureBuilder:
+    """Consumer class that stores a structure in NumPy columns.
+
+    The ArrayStructureBuilder can be used as the structure builder of the
+    PDBParser, MMCIFParser, FastMMCIFParser and BinaryCIFParser classes; the
+    parsers will then return an ArrayStructure object instead of a Structure
+    object. No Atom, Residue, Chain or Model objects are created while
+    parsing.
+
+    Arguments:
+     - QUIET - If True, suppress warnings issued when the Structure, Model,
+       Chain, Residue and Atom objects are created on demand. Default False.
+
+    """
+
+    def __init__(self, QUIET=False):
+        """Initialize this instance."""
+        self.QUIET = QUIET
+        self.header = {}
+        self.line_counter = 0
+        self.structure = None
+        self._clear()
+
+    def _clear(self):
+        """Remove all stored values (PRIVATE)."""
+        self._segid = None
+        self._model_ids = []
+        self._model_serial_nums = []
+        self._chain_ids = []
+        self._model_indices = []
+        self._chain_lines = []
+        self._resnames = []
+        self._hetero_flags = []
+        self._resseqs = []
+        self._icodes = []
+        self._segids = []
+        self._chain_indices = []
+        self._residue_lines = []
+        self._names = []
+        self._coords = []
+        self._bfactors = []
+        self._occupancies = []
+        self._altlocs = []
+        self._fullnames = []
+        self._serial_numbers = []
+        self._elements = []
+        self._pqr_charges = []
+        self._radii = []
+        self._residue_indices = []
+        self._atom_lines = []
+        self._anisou = {}
+        self._siguij = {}
+        self._sigatm = {}
+        self._is_pqr = False
+
+    # Public methods called by the Parser classes
+
+    def set_header(self, header):
+        """Set header."""
+        self.header = header
+
+    def set_line_counter(self, line_counter: int):
+        """Tracks line in the file that is being parsed."""
+        self.line_counter = line_counter
+
+    def init_structure(self, structure_id):
+        """Initialize a new ArrayStructure object with given id."""
+        self.structure = ArrayStructure(structure_id, self.QUIET)
+        self.header = {}
+        self._clear()
+
+    def init_model(self, model_id, serial_num=None):
+        """Start a new model with given id and serial number."""
+        self._model_ids.append(model_id)
+        self._model_serial_nums.append(serial_num)
+
+    def init_chain(self, chain_id):
+        """Start a new chain with given id."""
+        self._chain_ids.append(chain_id)
+        self._model_indices.append(len(self._model_ids) - 1)
+        self._chain_lines.append(self.line_counter)
+
+    def init_seg(self, segid):
+        """Flag a change in segid."""
+        self._segid = segid
+
+    def init_residue(self, resname, field, resseq, icode):
+        """Start a new residue.
+
+        Arguments:
+         - resname - string, e.g. "ASN"
+         - field - hetero flag, "W" for waters, "H" for
+           hetero residues, otherwise blank.
+         - resseq - int, sequence identifier
+         - icode - string, insertion code
+
+        """
+        self._resnames.append(resname)
+        self._hetero_flags.append(field)
+        self._resseqs.append(resseq)
+        self._icodes.append(icode)
+        self._segids.append(self._segid)
+        self._chain_indices.append(len(self._chain_ids) - 1)
+        self._residue_lines.append(self.line_counter)
+
+    def init_atom(
+        self,
+        name,
+        coord,
+        b_factor,
+        occupancy,
+        altloc,
+        fullname,
+        serial_number=None,
+        element=None,
+        pqr_charge=None,
+        radius=None,
+        is_pqr=False,
+    ):
+        """Add an atom to the columns of the current residue.
+
+        The arguments are the same as for StructureBuilder.init_atom.
+        """
+        if not self._resnames:
+            return
+        self._names.append(name)
+        self._coords.extend(coord)
+        self._bfactors.append(b_factor)
+        self._occupancies.append(occupancy)
+        self._altlocs.append(altloc)
+        self._fullnames.append(fullname)
+        self._serial_numbers.append(serial_number)
+        self._elements.append(element)
+        self._pqr_charges.append(pqr_charge)
+        self._radii.append(radius)
+        self._residue_indices.append(len(self._resnames) - 1)
+        self._atom_lines.append(self.line_counter)
+        if is_pqr:
+            self._is_pqr = True
+
+    def add_atoms(
+        self,
+        model_serial_nums,
+        chain_ids,
+        resnames,
+        hetero_flags,
+        resseqs,
+        icodes,
+        names,
+        coords,
+        b_factors,
+        occupancies,
+        altlocs,
+        serial_numbers,
+        elements,
+    ):
+        """Add a table of atoms, such as the mmCIF atom_site category.
+
+        All arguments are sequences with one value for each atom, except
+        coords, which is an array of shape (number of atoms, 3). A new model,
+        chain, or residue is started whenever the model serial number, the
+        chain id, or the residue name, hetero flag, sequence identifier or
+        insertion code differs from that of the previous atom.
+
+        This is used by the BinaryCIFParser to fill the columns directly from
+        the decoded columns in the file.
+        """
+        n = len(names)
+        if n == 0:
+            return
+        model_serial_nums = np.asarray(model_serial_nums)
+        chain_ids = np.asarray(chain_ids)
+        new_model = np.ones(n, bool)
+        new_model[1:] = model_serial_nums[1:] != model_serial_nums[:-1]
+        new_chain = new_model.copy()
+        new_chain[1:] |= chain_ids[1:] != chain_ids[:-1]
+        new_residue = new_chain.copy()
+        for values in (resnames, hetero_flags, resseqs, icodes):
+            values = np.asarray(values)
+            new_residue[1:] |= values[1:] != values[:-1]
+        model_starts = np.flatnonzero(new_model)
+        chain_starts = np.flatnonzero(new_chain)
+        residue_starts = np.flatnonzero(new_residue)
+        lines = self.line_counter
+        n_models = len(self._model_ids)
+        n_chains = len(self._chain_ids)
+        n_residues = len(self._resnames)
+        self._model_ids.extend(range(n_models, n_models + len(model_starts)))
+        self._model_serial_nums.extend(model_serial_nums[model_starts].tolist())
+        self._chain_ids.extend(chain_ids[chain_starts].tolist())
+        model_indices = np.cumsum(new_model)[chain_starts] - 1 + n_models
+        self._model_indices.extend(model_indices.tolist())
+        self._chain_lines.extend([lines] * len(chain_starts))
+        self._resnames.extend(np.asarray(resnames)[residue_starts].tolist())
+        self._hetero_flags.extend(np.asarray(hetero_flags)[residue_starts].tolist())
+        self._resseqs.extend(np.asarray(resseqs)[residue_starts].tolist())
+        self._icodes.extend(np.asarray(icodes)[residue_starts].tolist())
+        self._segids.extend([self._segid] * len(residue_starts))
+        chain_indices = np.cumsum(new_chain)[residue_starts] - 1 + n_chains
+        self._chain_indices.extend(chain_indices.tolist())
+        self._residue_lines.extend([lines] * len(residue_starts))
+        self._names.extend(names)
+        self._coords.extend(np.ravel(coords).tolist())
+        self._bfactors.extend(b_factors)
+        self._occupancies.extend(occupancies)
+        self._altlocs.extend(altlocs)
+        self._fullnames.extend(names)
+        self._serial_numbers.extend(serial_numbers)
+        self._elements.extend(elements)
+        self._pqr_charges.extend([None] * n)
+        self._radii.extend([None] * n)
+        residue_indices = np.cumsum(new_residue) - 1 + n_residues
+        self._residue_indices.extend(residue_indices.tolist())
+        self._atom_lines.extend([lines] * n)
+
+    def set_anisou(self, anisou_array):
+        """Set anisotropic B factor of current Atom."""
+        self._anisou[len(self._names) - 1] = anisou_array
+
+    def set_siguij(self, siguij_array):
+        """Set standard deviation of anisotropic B factor of current Atom."""
+        self._siguij[len(self._names) - 1] = siguij_array
+
+    def set_sigatm(self, sigatm_array):
+        """Set standard deviation of atom position of current Atom."""
+        self._sigatm[len(self._names) - 1] = sigatm_array
+
+    def set_symmetry(self, spacegroup, cell):
+        """Set symmetry."""
+
+    def get_structure(self):
+        """Convert the collected values to NumPy columns and return the structure."""
+        structure = self.structure
+        structure.header = self.header
+        structure.model_id = np.array(self._model_ids, int)
+        structure.model_serial_num = np.array(
+            [-1 if value is None else value for value in self._model_serial_nums],
+            int,
+        )
+        structure.chain_id = np.array(self._chain_ids, str)
+        structure.model_index = np.array(self._model_indices, int)
+        structure.resname = np.array(self._resnames, str)
+        structure.hetero_flag = np.array(self._hetero_flags, str)
+        structure.resseq = np.array(self._resseqs, int)
+        structure.icode = np.array(self._icodes, str)
+        structure.segid = np.array(self._segids)
+        structure.chain_index = np.array(self._chain_indices, int)
+        structure.coord = np.array(self._coords, "f").reshape(-1, 3)
+        structure.name = np.array(self._names, str)
+        structure.fullname = np.array(self._fullnames, str)
+        structure.altloc = np.array(self._altlocs, str)
+        structure.element = _column(self._elements)
+        structure.serial_number = _column(self._serial_numbers)
+        structure.bfactor = _float_column(self._bfactors)
+        structure.occupancy = _float_column(self._occupancies)
+        structure.pqr_charge = _float_column(self._pqr_charges)
+        structure.radius = _float_column(self._radii)
+        structure.residue_index = np.array(self._residue_indices, int)
+        # private values needed to create the hierarchy on demand
+        structure._model_ids = self._model_ids
+        structure._model_serial_nums = self._model_serial_nums
+        structure._model_indices = {
+            model_id: index for index, model_id in enumerate(self._model_ids)
+        }
+        n_models = len(self._model_ids)
+        n_chains = len(self._chain_ids)
+        n_residues = len(self._resnames)
+        structure._chain_offsets = np.searchsorted(
+            structure.model_index, np.arange(n_models + 1)
+        ).tolist()
+        structure._residue_offsets = np.searchsorted(
+            structure.chain_index, np.arange(n_chains + 1)
+        ).tolist()
+        structure._atom_offsets = np.searchsorted(
+            structure.residue_index, np.arange(n_residues + 1)
+        ).tolist()
+        structure._chain_lines = np.array(self._chain_lines, int)
+        structure._residue_lines = np.array(self._residue_lines, int)
+        structure._atom_lines = np.array(self._atom_lines, int)
+        structure._anisou = self._anisou
+        structure._siguij = self._siguij
+        structure._sigatm = self._sigatm
+        structure._is_pqr = self._is_pqr
+        self.structure = None
+        self._clear()
+        return structure
+
+
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+
+    run_doctest()
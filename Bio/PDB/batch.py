@@ -0,0 +1,350 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+
+"""Parse many structure files in parallel.
+
+BatchParser parses a directory or a list of PDB, mmCIF, and BinaryCIF files
+in a pool of worker processes, and applies a reducer function to each
+structure in the worker process. Only the (typically small) return values of
+the reducer are sent back to the main process, where they are yielded as
+soon as they are available::
+
+    from Bio.PDB.batch import BatchParser
+
+    def count_residues(structure):
+        return len(list(structure.get_residues()))
+
+    parser = BatchParser(count_residues, processes=8)
+    for result in parser.parse("AF-proteome/"):
+        if result.error is None:
+            print(result.path, result.value)
+        else:
+            print(result.path, "failed:", result.error)
+    print(parser.stats)
+
+The reducer must be picklable (e.g. a function defined at the top level of a
+module). An exception raised while parsing a file, or by the reducer, does not
+stop the batch, but is reported in the error attribute of the result for that
+file.
+"""
+
+import gzip
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+from typing import NamedTuple
+from typing import Optional
+
+from Bio._utils import call_worker
+from Bio._utils import initialize_worker
+
+_FORMATS = {
+    ".pdb": "pdb",
+    ".ent": "pdb",
+    ".cif": "mmcif",
+    ".mmcif": "mmcif",
+    ".bcif": "bcif",
+}
+
+
+def _get_format(path):
+    """Return the file format of a structure file from its extension (PRIVATE).
+
+    Returns None if the extension is not recognized.
+    """
+    name = os.path.basename(path).lower()
+    if name.endswith(".gz"):
+        name = name[:-3]
+    return _FORMATS.get(os.path.splitext(name)[1])
+
+
+def _get_id(path):
+    """Return the structure id for a file name, without extensions (PRIVATE)."""
+    name = os.path.basename(path)
+    if name.lower().endswith(".gz"):
+        name = name[:-3]
+    return os.path.splitext(name)[0]
+
+
+class BatchResult(NamedTuple):
+    """Result of parsing a single structure file.
+
+    Attributes:
+     - path  - the path of the file
+     - value - the value returned by the reducer (or the structure if no
+       reducer was used), or None if an error occurred
+     - error - None, or a string describing the exception that occurred
+       while parsing the file or applying the reducer
+     - time  - time in seconds spent parsing the file and applying the reducer
+
+    """
+
+    path: str
+    value: Any
+    error: Optional[str]
+    time: float
+
+
+class BatchStats:
+    """Counts and timings of the files parsed by a BatchParser.
+
+    Attributes:
+     - total     - number of files to be parsed
+     - done      - number of files parsed so far
+     - failed    - number of files for which an error occurred
+     - cpu_time  - total time in seconds spent on parsing the files and
+       applying the reducer, summed over the worker processes
+     - elapsed   - wall clock time in seconds since parsing started
+
+    """
+
+    def __init__(self, total=0):
+        """Initialize the counts."""
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.cpu_time = 0.0
+        self.elapsed = 0.0
+
+    def __repr__(self):
+        """Return a string summarizing the counts and timings."""
+        if self.elapsed > 0:
+            rate = self.done / self.elapsed
+        else:
+            rate = 0.0
+        return (
+            f"<BatchStats done={self.done}/{self.total} failed={self.failed} "
+            f"cpu_time={self.cpu_time:.2f}s elapsed={self.elapsed:.2f}s "
+            f"rate={rate:.1f} files/s>"
+        )
+
+
+class _FileParser:
+    """Parse a single structure file and apply the reducer to it (PRIVATE)."""
+
+    def __init__(self, reducer, file_format, QUIET):
+        self.reducer = reducer
+        self.file_format = file_format
+        self.QUIET = QUIET
+        self.parsers = {}
+
+    def get_parser(self, file_format):
+        try:
+            return self.parsers[file_format]
+        except KeyError:
+            pass
+        if file_format == "pdb":
+            from Bio.PDB.PDBParser import PDBParser
+
+            parser = PDBParser(QUIET=self.QUIET)
+        elif file_format == "mmcif":
+            from Bio.PDB.MMCIFParser import MMCIFParser
+
+            parser = MMCIFParser(QUIET=self.QUIET)
+        elif file_format == "bcif":
+            from Bio.PDB.binary_cif import BinaryCIFParser
+
+            parser = BinaryCIFParser()
+        else:
+            raise ValueError(f"Unknown file format '{file_format}'")
+        self.parsers[file_format] = parser
+        return parser
+
+    def parse(self, path):
+        file_format = self.file_format
+        if file_format is None:
+            file_format = _get_format(path)
+            if file_format is None:
+                raise ValueError(f"Cannot determine the file format of '{path}'")
+        parser = self.get_parser(file_format)
+        structure_id = _get_id(path)
+        if file_format != "bcif" and path.lower().endswith(".gz"):
+            with gzip.open(path, "rt") as handle:
+                return parser.get_structure(structure_id, handle)
+        return parser.get_structure(structure_id, path)
+
+    def __call__(self, path):
+        start = time.perf_counter()
+        try:
+            structure = self.parse(path)
+            if self.reducer is None:
+                value = structure
+            else:
+                value = self.reducer(structure)
+        except Exception as exception:
+            return BatchResult(
+                path, None, _format_exception(exception), time.perf_counter() - start
+            )
+        return BatchResult(path, value, None, time.perf_counter() - start)
+
+
+def _format_exception(exception):
+    """Return a string describing an exception (PRIVATE)."""
+    return f"{type(exception).__name__}: {exception}"
+
+
+class BatchParser:
+    """Parse structure files in parallel and apply a reducer to each structure."""
+
+    def __init__(self, reducer=None, processes=None, file_format=None, QUIET=True):
+        """Initialize the batch parser.
+
+        Arguments:
+         - reducer     - function called with each parsed structure in the
+           worker process; its return value is reported as the value of the
+           result. It must be picklable if more than one process is used.
+           If None (default), the structure itself is returned.
+         - processes   - number of worker processes. If None (default), the
+           number of processors on the machine is used. If 1, the files are
+           parsed in the current process.
+         - file_format - "pdb", "mmcif", or "bcif". If None (default), the
+           format of each file is determined from its extension (.pdb, .ent,
+           .cif, .mmcif, .bcif, optionally followed by .gz).
+         - QUIET       - if True (default), warnings issued while constructing
+           the structures are suppressed.
+
+        """
+        if processes is None:
+            processes = os.cpu_count() or 1
+        if processes < 1:
+            raise ValueError(f"Number of processes must be at least 1: {processes}")
+        if file_format is not None and file_format not in _FORMATS.values():
+            raise ValueError(f"Unknown file format '{file_format}'")
+        self.reducer = reducer
+        self.processes = processes
+        self.file_format = file_format
+        self.QUIET = QUIET
+        self.stats = BatchStats()
+
+    def _get_paths(self, source):
+        """Return the list of files to be parsed (PRIVATE).
+
+        Directories are searched recursively for files with a recognized
+        extension (or for all files if the file format was specified).
+        """
+        if isinstance(source, (str, os.PathLike)):
+            source = [source]
+        paths = []
+        for path in source:
+            path = os.fspath(path)
+            if not os.path.isdir(path):
+                paths.append(path)
+                continue
+            for directory, subdirectories, filenames in os.walk(path):
+                subdirectories.sort()
+                for filename in sorted(filenames):
+                    if self.file_format is not None or _get_format(filename):
+                        paths.append(os.path.join(directory, filename))
+        return paths
+
+    def parse(self, source, progress=None):
+        """Parse the files and yield a BatchResult for each of them.
+
+        Arguments:
+         - source   - a directory, a file name, or a list of directories and
+           file names
+         - progress - optional function called as progress(stats) with the
+           current BatchStats after each file is parsed
+
+        With multiple processes, results are yielded in the order in which
+        the files finish parsing, not in the order of the input. The stats
+        attribute is updated as results are yielded.
+        """
+        paths = self._get_paths(source)
+        stats = BatchStats(len(paths))
+        self.stats = stats
+        function = _FileParser(self.reducer, self.file_format, self.QUIET)
+        start = time.perf_counter()
+        if self.processes == 1:
+            results = map(function, paths)
+        else:
+            results = self._parse_in_pool(function, paths)
+        try:
+            for result in results:
+                stats.done += 1
+                if result.error is not None:
+                    stats.failed += 1
+                stats.cpu_time += result.time
+                stats.elapsed = time.perf_counter() - start
+                if progress is not None:
+                    progress(stats)
+                yield result
+        finally:
+            if self.processes > 1:
+                # shut down the worker processes if parsing was interrupted
+                results.close()
+
+    def _parse_in_pool(self, function, paths):
+        """Parse the files in a pool of worker processes (PRIVATE).
+
+        The number of files submitted to the pool at any time is limited, so
+        that results are reported while the remaining files are submitted.
+
+        If a worker process dies (e.g. by running out of memory), the pool is
+        restarted, and the files that were being parsed are parsed again one
+        at a time, so that only the file that caused the worker process to
+        die is reported as failed.
+        """
+        processes = self.processes
+        window = 4 * processes
+        paths = iter(paths)
+        suspects = []  # files that were being parsed when the pool broke
+        pending = {}
+        executor = None
+        try:
+            while True:
+                if executor is None:
+                    executor = ProcessPoolExecutor(
+                        processes,
+                        initializer=initialize_worker,
+                        initargs=(function,),
+                    )
+                isolated = bool(suspects)
+                if isolated:
+                    path = suspects.pop(0)
+                    pending[executor.submit(call_worker, path)] = path
+                else:
+                    for path in paths:
+                        pending[executor.submit(call_worker, path)] = path
+                        if len(pending) >= window:
+                            break
+                if not pending:
+                    break
+                if isolated:
+                    done = list(pending)
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                broken = False
+                for future in done:
+                    path = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool as exception:
+                        broken = True
+                        if not isolated:
+                            suspects.append(path)
+                            continue
+                        result = BatchResult(
+                            path, None, _format_exception(exception), 0.0
+                        )
+                    except Exception as exception:
+                        # e.g. a value returned by the reducer that cannot be
+                        # pickled
+                        result = BatchResult(
+                            path, None, _format_exception(exception), 0.0
+                        )
+                    yield result
+                if broken:
+                    suspects.extend(pending.values())
+                    pending.clear()
+                    executor.shutdown(wait=False)
+                    executor = None
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
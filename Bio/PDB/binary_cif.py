@@ -185,9 +185,18 @@ class BinaryCIFParser:
     See the `BinaryCIF specification <https://github.com/molstar/BinaryCIF>`_.
     """
 
-    def __init__(self):
-        """Initialize a BinaryCIF parser."""
-        self._structure_builder = StructureBuilder()
+    def __init__(self, structure_builder=None):
+        """Initialize a BinaryCIF parser.
+
+        Arguments:
+         - structure_builder - an optional user implemented StructureBuilder
+           class, such as an ArrayStructureBuilder.
+
+        """
+        if structure_builder is not None:
+            self._structure_builder = structure_builder
+        else:
+            self._structure_builder = StructureBuilder()
 
     def _get_hetero_field(self, atom_group: str, component_id: str) -> str:
         if atom_group == "HETATM":
@@ -211,7 +220,7 @@ class BinaryCIFParser:
 
         return list(zip(hetero_fields, sequence_ids, insertion_codes))
 
-    def _get_atoms(self, columns):
+    def _get_atom_columns(self, columns):
         names = _decode(columns["_atom_site.label_atom_id"])
         x_list = _decode(columns["_atom_site.Cartn_x"])
         y_list = _decode(columns["_atom_site.Cartn_y"])
@@ -225,6 +234,25 @@ class BinaryCIFParser:
         serial_numbers = _decode(columns["_atom_site.id"])
         type_symbols = _decode(columns["_atom_site.type_symbol"])
 
+        return {
+            "names": names,
+            "coords": coordinates_list,
+            "b_factors": b_factors,
+            "occupancies": occupancies,
+            "altlocs": alt_ids,
+            "serial_numbers": serial_numbers,
+            "elements": type_symbols,
+        }
+
+    def _get_atoms(self, atom_columns):
+        names = atom_columns["names"]
+        coordinates_list = atom_columns["coords"]
+        b_factors = atom_columns["b_factors"]
+        occupancies = atom_columns["occupancies"]
+        alt_ids = atom_columns["altlocs"]
+        serial_numbers = atom_columns["serial_numbers"]
+        type_symbols = atom_columns["elements"]
+
         return [
             {
                 "name": names[index],
@@ -269,10 +297,25 @@ class BinaryCIFParser:
         atom_chain_ids = _decode(columns["_atom_site.label_asym_id"])
         atom_residue_ids = self._get_residue_ids(columns)
         atom_component_ids = _decode(columns["_atom_site.label_comp_id"])
-        atoms = self._get_atoms(columns)
+        atom_columns = self._get_atom_columns(columns)
 
         entry_id = _decode(columns["_entry.id"])[0]
         self._structure_builder.init_structure(id or entry_id)
+        if hasattr(self._structure_builder, "add_atoms"):
+            # The structure builder accepts the columns directly
+            hetero_fields, sequence_ids, insertion_codes = zip(*atom_residue_ids)
+            self._structure_builder.add_atoms(
+                atom_model_numbers,
+                atom_chain_ids,
+                atom_component_ids,
+                hetero_fields,
+                sequence_ids,
+                insertion_codes,
+                **atom_columns,
+            )
+            return self._structure_builder.get_structure()
+
+        atoms = self._get_atoms(atom_columns)
         builder_model_count = 0
         builder_model_number = None
         builder_chain_id = None
@@ -366,44 +366,100 @@ static double calcZScore(
     return pToZ(zToP(z1) * zToP(z2));
 }
 
+// Read the coordinates from a Python object into a newly allocated array.
+// Accepts a C-contiguous buffer of doubles with shape (N, 3), such as a
+// NumPy array, or a sequence of sequences of three numbers.
+// Returns NULL and sets an exception on failure.
 static pcePoint
-getCoords(PyObject *L, int length)
+getCoords(PyObject *object, int *length)
 {
-    // Make space for the current coords
-    pcePoint coords = (pcePoint)PyMem_RawMalloc(sizeof(cePoint) * length);
+    pcePoint coords;
+    Py_buffer view;
+
+    if (PyObject_CheckBuffer(object) &&
+        PyObject_GetBuffer(object, &view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) == 0) {
+        if (view.ndim != 2 || view.shape[1] != 3 || view.itemsize != sizeof(double) ||
+            view.format == NULL || strcmp(view.format, "d") != 0) {
+            PyBuffer_Release(&view);
+            PyErr_SetString(PyExc_ValueError,
+                            "expected an array of doubles with shape (N, 3)");
+            return NULL;
+        }
+        if (view.shape[0] > INT_MAX) {
+            PyBuffer_Release(&view);
+            PyErr_SetString(PyExc_ValueError, "too many coordinates");
+            return NULL;
+        }
+        *length = (int)view.shape[0];
+        coords = (pcePoint)PyMem_RawMalloc(sizeof(cePoint) * (*length + 1));
+        if (!coords) {
+            PyBuffer_Release(&view);
+            PyErr_NoMemory();
+            return NULL;
+        }
+        memcpy(coords, view.buf, sizeof(cePoint) * (*length));
+        PyBuffer_Release(&view);
+        return coords;
+    }
+    PyErr_Clear();
 
-    if (!coords)
+    PyObject *sequence = PySequence_Fast(object,
+        "expected a sequence of coordinates or an array with shape (N, 3)");
+    if (!sequence)
+        return NULL;
+
+    const Py_ssize_t n = PySequence_Fast_GET_SIZE(sequence);
+    if (n > INT_MAX) {
+        Py_DECREF(sequence);
+        PyErr_SetString(PyExc_ValueError, "too many coordinates");
+        return NULL;
+    }
+    *length = (int)n;
+    coords = (pcePoint)PyMem_RawMalloc(sizeof(cePoint) * (n + 1));
+    if (!coords) {
+        Py_DECREF(sequence);
+        PyErr_NoMemory();
         return NULL;
+    }
 
     // loop through the arguments, pulling out the
     // XYZ coordinates.
-    for (int i = 0; i < length; i++) {
-        PyObject *curCoord = PyList_GetItem(L, i);
-        Py_INCREF(curCoord);
-
-        PyObject *curVal = PyList_GetItem(curCoord, 0);
-        Py_INCREF(curVal);
-        coords[i].x = PyFloat_AsDouble(curVal);
-        Py_DECREF(curVal);
-
-        curVal = PyList_GetItem(curCoord, 1);
-        Py_INCREF(curVal);
-        coords[i].y = PyFloat_AsDouble(curVal);
-        Py_DECREF(curVal);
-
-        curVal = PyList_GetItem(curCoord, 2);
-        Py_INCREF(curVal);
-        coords[i].z = PyFloat_AsDouble(curVal);
-
-        Py_DECREF(curVal);
+    for (Py_ssize_t i = 0; i < n; i++) {
+        PyObject *curCoord = PySequence_Fast(
+            PySequence_Fast_GET_ITEM(sequence, i),
+            "each coordinate must be a sequence of three numbers");
+        if (!curCoord)
+            goto error;
+        if (PySequence_Fast_GET_SIZE(curCoord) != 3) {
+            Py_DECREF(curCoord);
+            PyErr_SetString(PyExc_ValueError,
+                            "each coordinate must be a sequence of three numbers");
+            goto error;
+        }
+        coords[i].x = PyFloat_AsDouble(PySequence_Fast_GET_ITEM(curCoord, 0));
+        coords[i].y = PyFloat_AsDouble(PySequence_Fast_GET_ITEM(curCoord, 1));
+        coords[i].z = PyFloat_AsDouble(PySequence_Fast_GET_ITEM(curCoord, 2));
         Py_DECREF(curCoord);
+        if (PyErr_Occurred())
+            goto error;
     }
+    Py_DECREF(sequence);
 
     return coords;
+
+error:
+    Py_DECREF(sequence);
+    PyMem_RawFree(coords);
+    return NULL;
 }
 
-// Find the best N alignment paths
-static PyObject *
+// Find the best N alignment paths.
+//
+// This function does not use the Python C API, and is called without holding
+// the GIL. The paths are stored in pathBuffer, their lengths (in number of
+// AFPs) in lenBuffer, and their z-scores in zScoreBuffer. Returns the number
+// of paths found, or -1 if memory could not be allocated.
+static int
 findPath(
     double **S,
     double **dA,
@@ -411,7 +467,10 @@ findPath(
     const int lenA,
     const int lenB,
     const int fragmentSize,
-    const int gapMax)
+    const int gapMax,
+    int *lenBuffer,
+    path *pathBuffer,
+    double *zScoreBuffer)
 {
     const double D0 = -3.0;
     const double D1 = -4.0;
@@ -421,9 +480,7 @@ findPath(
 
     // For storing the best N paths
     int bufferSize = 0;
-    int lenBuffer[MAX_PATHS];
     double similarityBuffer[MAX_PATHS];
-    path pathBuffer[MAX_PATHS];
 
     for (int i = 0; i < MAX_PATHS; i++) {
         // Initialize the paths
@@ -449,6 +506,11 @@ findPath(
 
             // Initialize current path
             path curPath = (path)PyMem_RawMalloc(sizeof(afp) * smaller);
+            if (!curPath) {
+                for (int i = 0; i < bufferSize; i++)
+                    PyMem_RawFree(pathBuffer[i]);
+                return -1;
+            }
             int curPathLength = 1;
             double curPathSimilarity = S[iA][iB];
 
@@ -580,8 +642,6 @@ findPath(
         } // ROF -- end for iB
     }     // ROF -- end for iA
 
-    double zScoreBuffer[MAX_PATHS];
-
     for (int i = 0; i < bufferSize; i++) {
         const int pathLength = lenBuffer[i];
         const double pathSimilarity = similarityBuffer[i];
@@ -595,81 +655,100 @@ findPath(
         zScoreBuffer[i] = calcZScore(fragmentSize, pathLength, pathSimilarity, gapCount);
     }
 
-    // To make it simpler to use this code and more portable, we are decoupling
-    // the path finding (the actual CEAlign innovation) from the RMSD
-    // calculation.
-    //
-    // As such, we return the N best paths to Python-land. Since the paths are
-    // encoded as structs, it's simpler to return the each path as a list of
-    // lists with the corresponding atom indices. e.g. [path1, path2, path3,
-    // ..., pathN], where pathN is defined as,
-    // [[Ai, Aj, Ak, ...], [Bi, Bj, Bk, ...], where An and Bn are equivalent
-    // coordinates for structures A and B.
+    return bufferSize;
+}
 
+static PyTypeObject *CEAlignmentType = NULL;
+
+static PyStructSequence_Field CEAlignmentFields[] = {
+    {"path", "pair of lists with the indices of the aligned atoms"},
+    {"z_score", "z-score of the alignment"},
+    {"length", "number of aligned atoms"},
+    {NULL},
+};
+
+static PyStructSequence_Desc CEAlignmentDesc = {
+    "ccealign.CEAlignment",
+    "An alignment path found by CE.",
+    CEAlignmentFields,
+    3,
+};
+
+// To make it simpler to use this code and more portable, we are decoupling
+// the path finding (the actual CEAlign innovation) from the RMSD
+// calculation.
+//
+// As such, we return the N best paths to Python-land. Since the paths are
+// encoded as structs, it's simpler to return the each path as a list of
+// lists with the corresponding atom indices. e.g. [path1, path2, path3,
+// ..., pathN], where pathN is defined as,
+// [[Ai, Aj, Ak, ...], [Bi, Bj, Bk, ...], where An and Bn are equivalent
+// coordinates for structures A and B.
+static PyObject *
+buildPaths(
+    const int bufferSize,
+    const int *lenBuffer,
+    path *pathBuffer,
+    const double *zScoreBuffer,
+    const int fragmentSize)
+{
     // List to store all paths
     PyObject *result = PyList_New(bufferSize);
-    Py_INCREF(result);
+    if (!result)
+        return NULL;
 
     for (int o = 0; o < bufferSize; o++) {
+        const Py_ssize_t length = (Py_ssize_t)lenBuffer[o] * fragmentSize;
         // Make a new list to store this path
-        PyObject *pathAList = PyList_New(0);
-        PyObject *pathBList = PyList_New(0);
-        Py_INCREF(pathAList);
-        Py_INCREF(pathBList);
+        PyObject *pathAList = PyList_New(length);
+        PyObject *pathBList = PyList_New(length);
+        if (!pathAList || !pathBList) {
+            Py_XDECREF(pathAList);
+            Py_XDECREF(pathBList);
+            goto error;
+        }
 
+        Py_ssize_t index = 0;
         for (int j = 0; j < lenBuffer[o]; j++) {
             const int pA = pathBuffer[o][j].pA;
             const int pB = pathBuffer[o][j].pB;
 
             for (int k = 0; k < fragmentSize; k++) {
-                PyObject *v = Py_BuildValue("i", pA + k);
-                PyList_Append(pathAList, v);
-                Py_DECREF(v);
-                v = Py_BuildValue("i", pB + k);
-                PyList_Append(pathBList, v);
-                Py_DECREF(v);
+                PyObject *vA = PyLong_FromLong(pA + k);
+                PyObject *vB = PyLong_FromLong(pB + k);
+                if (!vA || !vB) {
+                    Py_XDECREF(vA);
+                    Py_XDECREF(vB);
+                    Py_DECREF(pathAList);
+                    Py_DECREF(pathBList);
+                    goto error;
+                }
+                PyList_SET_ITEM(pathAList, index, vA);
+                PyList_SET_ITEM(pathBList, index, vB);
+                index++;
             }
         }
 
-        const double zScore = zScoreBuffer[o];
-        const int length = lenBuffer[o];
-        PyObject *pairList = Py_BuildValue("[NN]", pathAList, pathBList);
-        Py_INCREF(pairList);
-
-        PyStructSequence_Field namedtupleFields[] = {
-            (PyStructSequence_Field) {
-                "path",
-                NULL,
-            },
-            (PyStructSequence_Field) {
-                "z_score",
-                NULL,
-            },
-            (PyStructSequence_Field) {
-                "length",
-                NULL,
-            },
-            {NULL},
-        };
-        PyStructSequence_Desc namedtupleDesc = (PyStructSequence_Desc) {
-            "ccealign.CEAlignment",
-            NULL,
-            namedtupleFields,
-            3,
-        };
-        PyTypeObject *namedtupleType =
-            PyStructSequence_NewType(&namedtupleDesc);
-        PyObject *namedtuple = PyStructSequence_New(namedtupleType);
-
-        PyStructSequence_SetItem(namedtuple, 0, pairList);
-        PyStructSequence_SetItem(namedtuple, 1, PyFloat_FromDouble(zScore));
-        PyStructSequence_SetItem(namedtuple, 2, PyLong_FromLong(length * fragmentSize));
-
+        PyObject *namedtuple = PyStructSequence_New(CEAlignmentType);
+        if (!namedtuple) {
+            Py_DECREF(pathAList);
+            Py_DECREF(pathBList);
+            goto error;
+        }
+        PyStructSequence_SetItem(namedtuple, 0,
+                                 Py_BuildValue("[NN]", pathAList, pathBList));
+        PyStructSequence_SetItem(namedtuple, 1, PyFloat_FromDouble(zScoreBuffer[o]));
+        PyStructSequence_SetItem(namedtuple, 2, PyLong_FromSsize_t(length));
         PyList_SET_ITEM(result, o, namedtuple);
-        Py_DECREF(namedtupleType);
+        if (PyErr_Occurred())
+            goto error;
     }
 
     return result;
+
+error:
+    Py_DECREF(result);
+    return NULL;
 }
 
 // Main Function
@@ -678,29 +757,59 @@ PyCealign(PyObject *Py_UNUSED(self), PyObject *args)
 {
     int fragmentSize = 8;
     int gapMax = 30;
+    int lenA, lenB;
 
-    PyObject *listA, *listB, *result;
+    PyObject *listA, *listB;
+    PyObject *result = NULL;
 
     /* Unpack the arguments from Python */
-    PyArg_ParseTuple(args, "OO|ii", &listA, &listB, &fragmentSize, &gapMax);
-
-    /* Get the list lengths */
-    const int lenA = (int)PyList_Size(listA);
-    const int lenB = (int)PyList_Size(listB);
+    if (!PyArg_ParseTuple(args, "OO|ii", &listA, &listB, &fragmentSize, &gapMax))
+        return NULL;
+    if (fragmentSize < 3) {
+        PyErr_SetString(PyExc_ValueError, "fragmentSize must be at least 3");
+        return NULL;
+    }
+    if (gapMax < 0) {
+        PyErr_SetString(PyExc_ValueError, "gapMax must be positive (or zero)");
+        return NULL;
+    }
 
     /* get the coodinates from the Python objects */
-    pcePoint coordsA = (pcePoint)getCoords(listA, lenA);
-    pcePoint coordsB = (pcePoint)getCoords(listB, lenB);
+    pcePoint coordsA = getCoords(listA, &lenA);
+    if (!coordsA)
+        return NULL;
+    pcePoint coordsB = getCoords(listB, &lenB);
+    if (!coordsB) {
+        PyMem_RawFree(coordsA);
+        return NULL;
+    }
+    if (lenA < fragmentSize || lenB < fragmentSize) {
+        PyMem_RawFree(coordsA);
+        PyMem_RawFree(coordsB);
+        PyErr_SetString(PyExc_ValueError,
+                        "each structure must have at least fragmentSize atoms");
+        return NULL;
+    }
+
+    int bufferSize;
+    int lenBuffer[MAX_PATHS];
+    path pathBuffer[MAX_PATHS];
+    double zScoreBuffer[MAX_PATHS];
+
+    // The alignment itself only uses the C arrays, so other Python threads
+    // can run in the meantime.
+    Py_BEGIN_ALLOW_THREADS
 
     /* calculate the distance matrix for each protein */
-    double **dA = (double **)calcDM(coordsA, lenA);
-    double **dB = (double **)calcDM(coordsB, lenB);
+    double **dA = calcDM(coordsA, lenA);
+    double **dB = calcDM(coordsB, lenB);
 
     /* calculate the CE Similarity matrix */
-    double **S = (double **)calcS(dA, dB, lenA, lenB, fragmentSize);
+    double **S = calcS(dA, dB, lenA, lenB, fragmentSize);
 
     // Calculate Top N Paths
-    result = (PyObject *)findPath(S, dA, dB, lenA, lenB, fragmentSize, gapMax);
+    bufferSize = findPath(S, dA, dB, lenA, lenB, fragmentSize, gapMax,
+                          lenBuffer, pathBuffer, zScoreBuffer);
 
     /* release memory */
     PyMem_RawFree(coordsA);
@@ -720,6 +829,16 @@ PyCealign(PyObject *Py_UNUSED(self), PyObject *args)
         PyMem_RawFree(S[i]);
     PyMem_RawFree(S);
 
+    Py_END_ALLOW_THREADS
+
+    if (bufferSize < 0)
+        return PyErr_NoMemory();
+
+    result = buildPaths(bufferSize, lenBuffer, pathBuffer, zScoreBuffer, fragmentSize);
+
+    for (int i = 0; i < bufferSize; i++)
+        PyMem_RawFree(pathBuffer[i]);
+
     return result;
 }
 
@@ -732,10 +851,14 @@ PyDoc_STRVAR(method_doc,
 Find the optimal alignments between two structures, using CEAlign.\
 \n\n\
 Arguments:\n\
-- listA: List of lists with coordinates for structure A.\n\
-- listB: List of lists with coordinates for structure B.\n\
+- coordsA: Coordinates of structure A, as a list of lists or as a\n\
+  C-contiguous array of doubles with shape (N, 3).\n\
+- coordsB: Coordinates of structure B, in the same format.\n\
 - fragmentSize: Size of fragments to be used in alignment.\n\
-- gapMax: Maximum gap allowed between two aligned fragment pairs.");
+- gapMax: Maximum gap allowed between two aligned fragment pairs.\
+\n\n\
+The global interpreter lock is released while the alignment is calculated,\n\
+so several alignments can run in parallel in different threads.");
 
 static PyMethodDef CEAlignMethods[] = {
     {"run_cealign", PyCealign, METH_VARARGS, method_doc},
@@ -759,5 +882,10 @@ PyObject *PyInit_ccealign(void)
                                            NULL,
                                            NULL,
                                            NULL};
+    if (CEAlignmentType == NULL) {
+        CEAlignmentType = PyStructSequence_NewType(&CEAlignmentDesc);
+        if (CEAlignmentType == NULL)
+            return NULL;
+    }
     return PyModule_Create(&moduledef);
 }
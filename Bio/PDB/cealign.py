@@ -16,17 +16,84 @@ Reference
 Shindyalov, I.N., Bourne P.E. (1998).
 "Protein structure alignment by incremental combinatorial extension (CE)
 of the optimal path". Protein Engineering. 11 (9): 739–747. PMID 9796821.
+
+Many structures can be compared in one call using the align_all method,
+which extracts the guide atom coordinates of each structure only once, and
+runs the pairwise alignments in parallel threads::
+
+    aligner = CEAligner()
+    scores = aligner.align_all(structures)
+    print(scores.tm_score)
+
+The C code releases the global interpreter lock while searching for the
+alignment paths, so the threads run concurrently.
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
 import numpy as np
 
 from Bio.PDB.ccealign import run_cealign
 from Bio.PDB.PDBExceptions import PDBException
-from Bio.PDB.qcprot import QCPSuperimposer
+from Bio.PDB.qcprot import _qcp
 
 _RESID_SORTER = lambda r: r.id[1]  # noqa: E731
 
 
+def _superimpose(reference_coords, coords):
+    """Superimpose K pairs of coordinate sets with QCP (PRIVATE).
+
+    Both arguments are arrays of shape KxNx3. Returns the RMSDs (an array of
+    length K), and the rotation matrices and translation vectors that move
+    each set of coords onto the corresponding reference coordinates.
+    """
+    com_coords = np.mean(coords, axis=1)
+    com_ref = np.mean(reference_coords, axis=1)
+    natoms = coords.shape[1]
+    rms, rot, _ = _qcp(
+        reference_coords - com_ref[:, np.newaxis],
+        coords - com_coords[:, np.newaxis],
+        natoms,
+    )
+    tran = com_ref - np.matmul(com_coords[:, np.newaxis], rot)[:, 0]
+    return rms, rot, tran
+
+
+def _tm_score(distances, length):
+    """Return the TM-score of a superposition (PRIVATE).
+
+    The distances between the aligned atoms are normalized by d0, which
+    depends on the length of the structure the score is normalized by.
+    """
+    if length > 21:
+        d0 = 1.24 * (length - 15) ** (1 / 3) - 1.8
+    else:
+        d0 = 0.5
+    return np.sum(1 / (1 + (distances / d0) ** 2)) / length
+
+
+class CEScores(NamedTuple):
+    """Pairwise scores calculated by CEAligner.align_all.
+
+    Each attribute is a two-dimensional array; element [i, j] describes the
+    alignment of structure j onto reference structure i.
+
+    Attributes:
+     - rms      - RMSD of the aligned guide atoms after superposition
+     - length   - number of aligned guide atoms
+     - tm_score - TM-score of the superposition, normalized by the number
+       of guide atoms in the reference structure (so that the matrix of an
+       all-vs-all comparison is not symmetric)
+
+    """
+
+    rms: np.ndarray
+    length: np.ndarray
+    tm_score: np.ndarray
+
+
 class CEAligner:
     """Protein Structure Alignment by Combinatorial Extension."""
 
@@ -54,7 +121,6 @@ class CEAligner:
         self._rigid_motion = None
         self.refcoord = None
         self._coord = None
-        self._superimposer = QCPSuperimposer()
 
     def get_guide_coord_from_structure(self, structure):
         """Return the coordinates of guide atoms in the structure.
@@ -89,6 +155,17 @@ class CEAligner:
             )
             raise PDBException(msg)
 
+    def _get_guide_array(self, structure, name):
+        """Return the guide atom coordinates as an Nx3 array (PRIVATE)."""
+        coord = np.array(self.get_guide_coord_from_structure(structure), dtype=float)
+        if len(coord) < self.window_size * 2:
+            msg = (
+                f"Too few atoms in the {name} structure ({len(coord)}). "
+                "Try reducing the window_size parameter."
+            )
+            raise PDBException(msg)
+        return coord
+
     def align(self, structure, transform=True, *, final_optimization=True):
         """Align the input structure onto the reference structure.
 
@@ -106,88 +183,184 @@ class CEAligner:
         self.rms = None  # clear before aligning
         self._rigid_motion = None
 
-        coord = self.get_guide_coord_from_structure(structure)
+        coord = self._get_guide_array(structure, "mobile")
         self._coord = coord
 
-        if len(coord) < self.window_size * 2:
-            n_atoms = len(coord)
-            msg = (
-                f"Too few atoms in the mobile structure ({n_atoms}). "
-                "Try reducing the window_size parameter."
-            )
-            raise PDBException(msg)
+        refcoord = np.asarray(self.refcoord, dtype=float)
+        rms, rotmtx, trvec, path = self._align_coords(
+            refcoord, coord, final_optimization
+        )
+        self.rms = rms
+        self._rigid_motion = (rotmtx, trvec)
 
+        if transform:
+            # Transform all atoms
+            for chain in structure.get_chains():
+                for resid in chain.get_unpacked_list():
+                    for atom in resid.get_unpacked_list():
+                        atom.transform(rotmtx, trvec)
+
+    def _align_coords(self, refcoord, coord, final_optimization):
+        """Align two arrays of guide atom coordinates (PRIVATE).
+
+        Returns the RMSD, the rotation matrix and translation vector that
+        superimpose coord onto refcoord, and the alignment path. This method
+        does not modify the aligner, so it can be called from several
+        threads at the same time.
+        """
         # Run CEAlign
         # CEAlign returns the best N paths, sorted descending by length,
         # where each path is a pair of lists with aligned atom indices.
-        alignments = run_cealign(self.refcoord, coord, self.window_size, self.max_gap)
+        alignments = run_cealign(refcoord, coord, self.window_size, self.max_gap)
+        if not alignments:
+            raise RuntimeError("Failed to find a suitable alignment.")
         longest_alignments = [
             alignment
             for alignment in alignments
             if alignment.length == alignments[0].length
         ]
 
-        # Iterate over paths and find the one that gives the lowest
-        # corresponding RMSD. Use QCP to align the molecules.
-        self.rms = float("inf")
-        superimposer = self._superimposer
-        best_alignment = None
-        for alignment in longest_alignments:
-            idxA, idxB = alignment.path
-
-            coordsA = np.array([self.refcoord[i] for i in idxA])
-            coordsB = np.array([coord[i] for i in idxB])
-
-            superimposer.set(coordsA, coordsB)
-            superimposer.run()
-            if superimposer.rms < self.rms:
-                best_alignment = alignment
-                self.rms = superimposer.rms
-                self._rigid_motion = (superimposer.rot, superimposer.tran)
-
-        if best_alignment is None:
-            raise RuntimeError("Failed to find a suitable alignment.")
+        # Find the path that gives the lowest corresponding RMSD. All paths
+        # have the same length, so they are superimposed together with QCP.
+        paths = np.array([alignment.path for alignment in longest_alignments])
+        rms, rot, tran = _superimpose(refcoord[paths[:, 0]], coord[paths[:, 1]])
+        best = np.argmin(rms)
+        best_alignment = longest_alignments[best]
+        rms, rotmtx, trvec = rms[best], rot[best], tran[best]
 
         # Gap optimization
+        path = best_alignment.path
         if final_optimization and best_alignment.z_score >= 3.5:
-            self._optimize(best_alignment)
+            optimized_rms = self._optimize(path, refcoord, coord, rms)
+            if optimized_rms < rms:
+                rms, rotmtx, trvec = (
+                    value[0]
+                    for value in _superimpose(
+                        refcoord[np.newaxis, path[0]], coord[np.newaxis, path[1]]
+                    )
+                )
 
-        if transform:
-            # Transform all atoms
-            rotmtx, trvec = self._rigid_motion
-            for chain in structure.get_chains():
-                for resid in chain.get_unpacked_list():
-                    for atom in resid.get_unpacked_list():
-                        atom.transform(rotmtx, trvec)
+        return float(rms), rotmtx, trvec, path
 
-    def _optimize(self, alignment):
-        best_path = alignment.path
-        superimposer = self._superimposer
+    def _optimize(self, best_path, refcoord, coord, rms):
+        """Shift the aligned atoms of a path to improve the RMSD (PRIVATE).
 
+        The path is modified in place; returns the new RMSD.
+        """
+        coords = (refcoord, coord)
         for ab_index in [0, 1]:
-            for index in range(1, len(best_path[ab_index]) - 1):
-                best_shift = 0
-                left = best_path[ab_index][index - 1]
-                center = best_path[ab_index][index]
-                right = best_path[ab_index][index + 1]
-
-                for shift in range(
+            fixed = coords[1 - ab_index][best_path[1 - ab_index]]
+            indices = np.array(best_path[ab_index])
+            for index in range(1, len(indices) - 1):
+                left = indices[index - 1]
+                center = indices[index]
+                right = indices[index + 1]
+
+                shifts = np.arange(
                     max(-self.window_size // 2, left - center + 1),
                     min(self.window_size // 2 + 1, right - center),
-                ):
-                    best_path[ab_index][index] += shift
-                    idxA, idxB = best_path
+                )
+                if len(shifts) == 0:
+                    continue
+                # Superimpose the paths for all shifts at once. The RMSD
+                # does not depend on which structure is the reference.
+                candidates = np.repeat(indices[np.newaxis], len(shifts), axis=0)
+                candidates[:, index] += shifts
+                moving = coords[ab_index][candidates]
+                shift_rms, _, _ = _superimpose(
+                    np.broadcast_to(fixed, moving.shape), moving
+                )
+                best = np.argmin(shift_rms)
+                if shift_rms[best] < rms:
+                    rms = shift_rms[best]
+                    indices[index] += shifts[best]
+            best_path[ab_index][:] = indices.tolist()
+        return rms
+
+    def align_all(
+        self, structures, references=None, threads=None, *, final_optimization=True
+    ):
+        """Align each structure onto each reference structure.
 
-                    coordsA = np.array([self.refcoord[i] for i in idxA])
-                    coordsB = np.array([self._coord[i] for i in idxB])
-
-                    superimposer.set(coordsA, coordsB)
-                    superimposer.run()
-                    best_path[ab_index][index] -= shift
+        Parameters
+        ----------
+        structures: list
+            Structures to be aligned. The structures are not modified.
+        references: list, optional
+            Reference structures. If None (default), all structures are
+            compared to each other. The reference set with set_reference
+            is not used.
+        threads: int, optional
+            Number of threads used to calculate the alignments. If None
+            (default), the number of processors on the machine is used. If 1,
+            the alignments are calculated in the current thread.
+        final_optimization: bool, optional
+            If True (default), apply additional optimization to statistically
+            significant alignments.
 
-                    if superimposer.rms < self.rms:
-                        best_shift = shift
-                        self.rms = superimposer.rms
-                        self._rigid_motion = (superimposer.rot, superimposer.tran)
+        Returns a CEScores named tuple of arrays with one row per reference
+        structure and one column per structure. The guide atoms of each
+        structure are extracted only once. For an all-vs-all comparison,
+        each pair of structures is aligned once; the diagonal describes the
+        trivial alignment of each structure onto itself.
 
-                best_path[ab_index][index] += best_shift
+        The TM-score is calculated from the distances between the aligned
+        guide atoms after the superposition that minimizes their RMSD, with
+        d0 = 1.24 * (L - 15) ** (1/3) - 1.8 for a reference structure with
+        L guide atoms (d0 = 0.5 if L <= 21).
+        """
+        if threads is None:
+            threads = os.cpu_count() or 1
+        if threads < 1:
+            raise ValueError(f"Number of threads must be at least 1: {threads}")
+        coords = [
+            self._get_guide_array(structure, "mobile") for structure in structures
+        ]
+        if references is None:
+            refcoords = coords
+            pairs = [
+                (i, j) for i in range(len(coords)) for j in range(i + 1, len(coords))
+            ]
+        else:
+            refcoords = [
+                self._get_guide_array(structure, "reference")
+                for structure in references
+            ]
+            pairs = [(i, j) for i in range(len(refcoords)) for j in range(len(coords))]
+
+        def align_pair(pair):
+            i, j = pair
+            refcoord, coord = refcoords[i], coords[j]
+            rms, rotmtx, trvec, path = self._align_coords(
+                refcoord, coord, final_optimization
+            )
+            moved = coord[path[1]] @ rotmtx + trvec
+            distances = np.sqrt(np.sum((moved - refcoord[path[0]]) ** 2, axis=1))
+            return rms, len(path[0]), distances
+
+        shape = (len(refcoords), len(coords))
+        rms = np.zeros(shape)
+        length = np.zeros(shape, int)
+        tm_score = np.zeros(shape)
+        if references is None:
+            for i, coord in enumerate(coords):
+                length[i, i] = len(coord)
+                tm_score[i, i] = 1.0
+        if threads == 1:
+            results = map(align_pair, pairs)
+        else:
+            executor = ThreadPoolExecutor(threads)
+            results = executor.map(align_pair, pairs)
+        try:
+            for (i, j), (pair_rms, pair_length, distances) in zip(pairs, results):
+                rms[i, j] = pair_rms
+                length[i, j] = pair_length
+                tm_score[i, j] = _tm_score(distances, len(refcoords[i]))
+                if references is None:
+                    rms[j, i] = pair_rms
+                    length[j, i] = pair_length
+                    tm_score[j, i] = _tm_score(distances, len(coords[j]))
+        finally:
+            if threads > 1:
+                executor.shutdown(cancel_futures=True)
+        return CEScores(rms, length, tm_score)
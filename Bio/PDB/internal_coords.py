@@ -442,6 +442,9 @@ class IC_Chain:
         angle signs.
     make_extended:
         Arbitrarily sets all psi and phi backbone angles to 123 and -104 degrees.
+    batch_rebuilder:
+        Compile chain di/hedra to compute atom coordinates for many sets of
+        dihedral angles at once, see :class:`IC_BatchRebuilder`.
 
     """
 
@@ -2216,6 +2219,172 @@ class IC_Chain:
             ric.set_angle("psi", 123)
             ric.set_angle("phi", -104)
 
+    def batch_rebuilder(self) -> "IC_BatchRebuilder":
+        """Return an :class:`IC_BatchRebuilder` for this chain.
+
+        See :class:`IC_BatchRebuilder` to compute atom coordinates for many
+        sets of dihedral angles at once.
+        """
+        return IC_BatchRebuilder(self)
+
+
+class IC_BatchRebuilder:
+    """Compute atom coordinates for many sets of dihedral angles at once.
+
+    The hedra and dihedra topology of an :class:`IC_Chain` is compiled once
+    into index arrays, in the order in which :meth:`IC_Chain.assemble_residues`
+    places the atoms of the chain when starting from the initial N-CA-C atoms
+    of each chain segment.  :meth:`rebuild` then computes the atom
+    coordinates for K sets of dihedral angles in one vectorized pass over
+    this order, without using or modifying the Residue, Atom, Hedron and
+    Dihedron objects of the chain.  This is useful e.g. for sampling many
+    backbone or sidechain perturbations of a structure::
+
+        chain.atom_to_internal_coordinates()
+        cic = chain.internal_coord
+        rebuilder = cic.batch_rebuilder()
+        angles = np.tile(cic.dihedraAngle, (1000, 1))
+        psi = [ric.pick_angle("psi") for ric in cic.ordered_aa_ic_list]
+        psi = [d.ndx for d in psi if d is not None]
+        angles[:, psi] += np.random.normal(0, 10, (1000, len(psi)))
+        coords = rebuilder.rebuild(angles)  # 1000 x cic.AAsiz x 3
+
+    Bond lengths and angles (hedra), and the coordinates of the initial
+    N-CA-C atoms of each chain segment, are taken from the chain when the
+    IC_BatchRebuilder is created; create a new one if these change.
+    Atoms that cannot be placed from the internal coordinates (e.g. due to
+    missing atoms) keep the coordinates they have in the chain.
+
+    Attributes
+    ----------
+    cic: IC_Chain
+        The IC_Chain this rebuilder was created from
+    dihedraAngle: numpy array
+        Copy of the dihedral angles (degrees) of the chain, used for dihedra
+        not selected by the indices argument of :meth:`rebuild`
+    steps: list
+        For each assembly step, the dihedra processed and the atomArray
+        indexes of their four atoms
+
+    """
+
+    def __init__(self, cic: IC_Chain) -> None:
+        """Compile the di/hedra of an IC_Chain into index arrays.
+
+        :param IC_Chain cic: chain with internal coordinates, e.g. after
+            :meth:`IC_Chain.atom_to_internal_coordinates`
+        """
+        if not hasattr(cic, "dAtoms_needs_update") or cic.dihedraLen == 0:
+            raise ValueError("Chain has no internal coordinates")
+        self.cic = cic
+        # bring hedra and initial NCaC coordinates up to date
+        cic.init_atom_coords()
+
+        self.dihedraAngle = cic.dihedraAngle.copy()
+        # 4th atom of each dihedron before rotation by the dihedral angle
+        self.a4_pre_rotation = cic.a4_pre_rotation[:, :3].copy()
+        # start from the current coordinates, so atoms that cannot be placed
+        # keep them
+        self.initCoords = cic.atomArray[:, :3].copy()
+
+        d2a_map = cic.d2a_map
+        valid = np.zeros(cic.AAsiz, dtype=bool)
+        for iNCaC in cic.initNCaCs:
+            valid[[cic.atomArrayIndex[ak] for ak in iNCaC]] = True
+
+        # same dihedra selection as in IC_Chain.assemble_residues
+        self.steps = []
+        workSelector = valid[d2a_map[:, :3]].all(axis=1) & ~valid[d2a_map[:, 3]]
+        while np.any(workSelector):
+            dndx = np.nonzero(workSelector)[0]
+            atoms = d2a_map[dndx]
+            self.steps.append(
+                (dndx, atoms[:, 0], atoms[:, 1], atoms[:, 2], atoms[:, 3])
+            )
+            valid[atoms[:, 3]] = True
+            workSelector = valid[d2a_map[:, :3]].all(axis=1) & ~valid[d2a_map[:, 3]]
+
+    def rebuild(
+        self, angles: np.ndarray, indices: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Compute atom coordinates for K sets of dihedral angles.
+
+        :param angles: K x dihedraLen array of dihedral angles in degrees,
+            indexed as :data:`IC_Chain.dihedraAngle`, or K x len(indices) if
+            indices is given.  A 1-dimensional array is a single set.
+        :param indices: optional array of dihedraNdx indexes (e.g.
+            :attr:`Dihedron.ndx`) of the dihedra given in angles; other
+            dihedra keep the angles of :attr:`dihedraAngle`.
+        :returns: K x AAsiz x 3 array of atom coordinates, in
+            :data:`IC_Chain.atomArray` order (see
+            :data:`IC_Chain.atomArrayIndex`)
+        """
+        angles = np.asarray(angles, dtype=np.float64)
+        if angles.ndim == 1:
+            angles = angles[np.newaxis]
+        k = angles.shape[0]
+        if indices is not None:
+            full = np.empty((k, len(self.dihedraAngle)))
+            full[:] = self.dihedraAngle
+            full[:, indices] = angles
+            angles = full
+        elif angles.shape[1] != len(self.dihedraAngle):
+            raise ValueError(
+                f"Expected {len(self.dihedraAngle)} dihedral angles, "
+                f"got {angles.shape[1]}"
+            )
+
+        # rotate the 4th atom of each dihedron about Z by its dihedral angle
+        rads = np.deg2rad(angles)
+        cos = np.cos(rads)
+        sin = np.sin(rads)
+        x, y, z = self.a4_pre_rotation.T
+        a4 = np.empty((k, len(x), 3))
+        a4[:, :, 0] = cos * x - sin * y
+        a4[:, :, 1] = sin * x + cos * y
+        a4[:, :, 2] = z
+
+        coords = np.empty((k,) + self.initCoords.shape)
+        coords[:] = self.initCoords
+        for dndx, a0, a1, a2, a3 in self.steps:
+            # coordinate space with 2nd atom at the origin, 3rd atom on +Z
+            # and 1st atom on the XZ plane (+X), as in multi_coord_space
+            p1 = coords[:, a1]
+            ez = coords[:, a2] - p1
+            ez /= np.linalg.norm(ez, axis=2, keepdims=True)
+            ex = coords[:, a0] - p1
+            ex -= np.sum(ex * ez, axis=2, keepdims=True) * ez
+            ex /= np.linalg.norm(ex, axis=2, keepdims=True)
+            ey = np.cross(ez, ex)
+            a4d = a4[:, dndx]
+            coords[:, a3] = (
+                p1 + a4d[:, :, 0:1] * ex + a4d[:, :, 1:2] * ey + a4d[:, :, 2:3] * ez
+            )
+        return coords
+
+    def dihedral_angles(self, coords: np.ndarray) -> np.ndarray:
+        """Compute the dihedral angles for K sets of atom coordinates.
+
+        This is the inverse of :meth:`rebuild`, computing the dihedral angles
+        as :meth:`IC_Chain.atom_to_internal_coordinates` does.
+
+        :param coords: K x AAsiz x 3 array of atom coordinates (or AAsiz x 3)
+        :returns: K x dihedraLen array of dihedral angles in degrees
+        """
+        coords = np.asarray(coords, dtype=np.float64)
+        if coords.ndim == 2:
+            coords = coords[np.newaxis]
+        d2a_map = self.cic.d2a_map
+        p0, p1, p2, p3 = (coords[:, d2a_map[:, i]] for i in range(4))
+        ez = p2 - p1
+        ez /= np.linalg.norm(ez, axis=2, keepdims=True)
+        ex = p0 - p1
+        ex -= np.sum(ex * ez, axis=2, keepdims=True) * ez
+        ex /= np.linalg.norm(ex, axis=2, keepdims=True)
+        ey = np.cross(ez, ex)
+        v = p3 - p1
+        return np.rad2deg(np.arctan2(np.sum(v * ey, axis=2), np.sum(v * ex, axis=2)))
+
 
 class IC_Residue:
     """Class to extend Biopython Residue with internal coordinate data.
@@ -298,7 +298,9 @@ typedef struct
 static Region* Region_create(const double *left, const double *right)
 {
     int i;
-    Region* region = PyMem_Malloc(sizeof(Region));
+    /* use the raw allocator, as regions are also created during neighbor
+     * searches that run without holding the GIL */
+    Region* region = PyMem_RawMalloc(sizeof(Region));
     if (region == NULL) return NULL;
 
     if (left == NULL || right == NULL)
@@ -321,7 +323,7 @@ static Region* Region_create(const double *left, const double *right)
 
 static void Region_destroy(Region* region)
 {
-    if (region) PyMem_Free(region);
+    if (region) PyMem_RawFree(region);
 }
 
 static int Region_encloses(Region* region, double *coord)
@@ -435,11 +437,63 @@ typedef struct {
     /* The following are temporary variables used during a search only. */
     double _radius;
     double _radius_sq;
-    double _neighbor_radius;
-    double _neighbor_radius_sq;
     double _center_coord[DIM];
 } KDTree;
 
+/* Neighbors */
+
+typedef struct {
+    double radius;
+    double radius_sq;
+    /* If list is not NULL, Neighbor objects are appended to it; otherwise,
+     * the indices and (optionally) the radii of the point pairs are stored
+     * in the C arrays below, which does not require the GIL. */
+    PyObject* list;
+    Py_ssize_t* indices;
+    double* radii;
+    int store_radii;
+    Py_ssize_t size;
+    Py_ssize_t allocated;
+} Neighbors;
+
+static void Neighbors_clear(Neighbors* neighbors)
+{
+    PyMem_RawFree(neighbors->indices);
+    PyMem_RawFree(neighbors->radii);
+    neighbors->indices = NULL;
+    neighbors->radii = NULL;
+    neighbors->size = 0;
+    neighbors->allocated = 0;
+}
+
+static int
+Neighbors_append(Neighbors* neighbors, Py_ssize_t index1, Py_ssize_t index2, double r)
+{
+    Py_ssize_t n = neighbors->size;
+    if (n == neighbors->allocated) {
+        Py_ssize_t* indices;
+        Py_ssize_t allocated = neighbors->allocated ? 2 * neighbors->allocated : 1024;
+        if (allocated > PY_SSIZE_T_MAX / (Py_ssize_t)(2 * sizeof(Py_ssize_t)))
+            return 0;
+        indices = PyMem_RawRealloc(neighbors->indices,
+                                   2 * allocated * sizeof(Py_ssize_t));
+        if (!indices) return 0;
+        neighbors->indices = indices;
+        if (neighbors->store_radii) {
+            double* radii = PyMem_RawRealloc(neighbors->radii,
+                                             allocated * sizeof(double));
+            if (!radii) return 0;
+            neighbors->radii = radii;
+        }
+        neighbors->allocated = allocated;
+    }
+    neighbors->indices[2*n] = index1;
+    neighbors->indices[2*n+1] = index2;
+    if (neighbors->store_radii) neighbors->radii[n] = sqrt(r);
+    neighbors->size = n + 1;
+    return 1;
+}
+
 static double KDTree_dist(double *coord1, double *coord2)
 {
     /* returns the SQUARE of the distance between two points */
@@ -475,29 +529,29 @@ KDTree_report_point(KDTree* self, DataPoint* data_point, PyObject* points)
 }
 
 static int
-KDTree_test_neighbors(KDTree* self, DataPoint* p1, DataPoint* p2, PyObject* neighbors)
+KDTree_test_neighbors(KDTree* self, DataPoint* p1, DataPoint* p2, Neighbors* neighbors)
 {
     int ok;
     const double r = KDTree_dist(p1->_coord, p2->_coord);
-    if (r <= self->_neighbor_radius_sq)
+    if (r <= neighbors->radius_sq)
     {
         /* we found a neighbor pair! */
         Neighbor* neighbor;
         Py_ssize_t index1, index2;
-        neighbor = (Neighbor*) NeighborType.tp_alloc(&NeighborType, 0);
-        if (!neighbor) return 0;
         index1 = p1->_index;
         index2 = p2->_index;
-        if (index1 < index2) {
-            neighbor->index1 = index1;
-            neighbor->index2 = index2;
-        }
-        else {
-            neighbor->index1 = index2;
-            neighbor->index2 = index1;
+        if (index1 > index2) {
+            index1 = index2;
+            index2 = p1->_index;
         }
+        if (neighbors->list == NULL)
+            return Neighbors_append(neighbors, index1, index2, r);
+        neighbor = (Neighbor*) NeighborType.tp_alloc(&NeighborType, 0);
+        if (!neighbor) return 0;
+        neighbor->index1 = index1;
+        neighbor->index2 = index2;
         neighbor->radius = sqrt(r); /* note sqrt */
-        ok = PyList_Append(neighbors, (PyObject*)neighbor);
+        ok = PyList_Append(neighbors->list, (PyObject*)neighbor);
         Py_DECREF(neighbor);
         if (ok == -1) return 0;
     }
@@ -506,7 +560,7 @@ KDTree_test_neighbors(KDTree* self, DataPoint* p1, DataPoint* p2, PyObject* neig
 }
 
 static int
-KDTree_search_neighbors_in_bucket(KDTree* self, Node *node, PyObject* neighbors)
+KDTree_search_neighbors_in_bucket(KDTree* self, Node *node, Neighbors* neighbors)
 {
     Py_ssize_t i;
     int ok;
@@ -527,7 +581,7 @@ KDTree_search_neighbors_in_bucket(KDTree* self, Node *node, PyObject* neighbors)
     return 1;
 }
 
-static int KDTree_search_neighbors_between_buckets(KDTree* self, Node *node1, Node *node2, PyObject* neighbors)
+static int KDTree_search_neighbors_between_buckets(KDTree* self, Node *node1, Node *node2, Neighbors* neighbors)
 {
     Py_ssize_t i;
     int ok;
@@ -549,7 +603,7 @@ static int KDTree_search_neighbors_between_buckets(KDTree* self, Node *node1, No
     return 1;
 }
 
-static int KDTree_neighbor_search_pairs(KDTree* self, Node *down, Region *down_region, Node *up, Region *up_region, int depth, PyObject* neighbors)
+static int KDTree_neighbor_search_pairs(KDTree* self, Node *down, Region *down_region, Node *up, Region *up_region, int depth, Neighbors* neighbors)
 {
     int down_is_leaf, up_is_leaf;
     int localdim;
@@ -562,7 +616,7 @@ static int KDTree_neighbor_search_pairs(KDTree* self, Node *down, Region *down_r
         return ok;
     }
 
-    if (Region_test_intersection(down_region, up_region, self->_neighbor_radius)== 0)
+    if (Region_test_intersection(down_region, up_region, neighbors->radius)== 0)
     {
         /* regions cannot contain neighbors */
         return ok;
@@ -706,7 +760,7 @@ static int KDTree_neighbor_search_pairs(KDTree* self, Node *down, Region *down_r
     return ok;
 }
 
-static int KDTree_neighbor_search(KDTree* self, Node *node, Region *region, int depth, PyObject* neighbors)
+static int KDTree_neighbor_search(KDTree* self, Node *node, Region *region, int depth, Neighbors* neighbors)
 {
     Node *left, *right;
     Region *left_region = NULL;
@@ -1200,12 +1254,32 @@ index1, index2 corresponding to the indices of the point pair,\n\
 and an attribute radius with the radius between them.");
 
 
+static int
+KDTree_find_neighbors(KDTree* self, Neighbors* neighbors)
+{
+    int ok = 0;
+    if (Node_is_leaf(self->_root)) {
+        /* this is a boundary condition */
+        /* bucket_size > nr of points */
+        ok = KDTree_search_neighbors_in_bucket(self, self->_root, neighbors);
+    }
+    else {
+        /* "normal" situation */
+        /* start with [-INF, INF] */
+        Region *region = Region_create(NULL, NULL);
+        if (region) {
+            ok = KDTree_neighbor_search(self, self->_root, region, 0, neighbors);
+            Region_destroy(region);
+        }
+    }
+    return ok;
+}
+
 static PyObject*
 PyKDTree_neighbor_search(KDTree* self, PyObject* args)
 {
-    int ok = 0;
     double radius;
-    PyObject* neighbors;
+    Neighbors neighbors = {0};
 
     if (!PyArg_ParseTuple(args, "d:neighbor_search", &radius))
         return NULL;
@@ -1215,31 +1289,92 @@ PyKDTree_neighbor_search(KDTree* self, PyObject* args)
         return NULL;
     }
 
-    neighbors = PyList_New(0);
+    neighbors.list = PyList_New(0);
+    if (!neighbors.list) return NULL;
 
     /* note the use of r^2 to avoid use of sqrt */
-    self->_neighbor_radius = radius;
-    self->_neighbor_radius_sq = radius*radius;
+    neighbors.radius = radius;
+    neighbors.radius_sq = radius*radius;
 
-    if (Node_is_leaf(self->_root)) {
-        /* this is a boundary condition */
-        /* bucket_size > nr of points */
-        ok = KDTree_search_neighbors_in_bucket(self, self->_root, neighbors);
+    if (!KDTree_find_neighbors(self, &neighbors)) {
+        Py_DECREF(neighbors.list);
+        return PyErr_NoMemory();
     }
-    else {
-        /* "normal" situation */
-        /* start with [-INF, INF] */
-        Region *region = Region_create(NULL, NULL);
-        if (region) {
-            ok = KDTree_neighbor_search(self, self->_root, region, 0, neighbors);
-            Region_destroy(region);
-        }
+    return neighbors.list;
+}
+
+PyDoc_STRVAR(PyKDTree_neighbor_search_arrays__doc__,
+"All fixed neighbor search, returning the point pairs as arrays.\n\
+\n\
+Find all point pairs that are within radius of each other.\n\
+\n\
+Arguments:\n\
+ - radius: float (>0)\n\
+ - radii: boolean; if True, also return the radius between each pair\n\
+   of points (default: False).\n\
+\n\
+Returns a tuple (indices, radii), where indices is a bytearray storing\n\
+the indices index1, index2 (with index1 < index2) of each point pair as\n\
+consecutive Py_ssize_t values, and radii is a bytearray storing the\n\
+radius of each point pair as a double, or None if radii is False.\n\
+The order of the point pairs is arbitrary.\n\
+\n\
+No Python objects are created during the search, which runs without\n\
+holding the global interpreter lock.");
+
+static PyObject*
+PyKDTree_neighbor_search_arrays(KDTree* self, PyObject* args, PyObject* kwds)
+{
+    int ok;
+    double radius;
+    int radii = 0;
+    Neighbors neighbors = {0};
+    PyObject* indices = NULL;
+    PyObject* distances = NULL;
+    PyObject* result = NULL;
+    static char* kwlist[] = {"radius", "radii", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "d|p:neighbor_search_arrays",
+                                     kwlist, &radius, &radii))
+        return NULL;
+
+    if (radius <= 0) {
+        PyErr_SetString(PyExc_ValueError, "Radius must be positive.");
+        return NULL;
     }
+
+    neighbors.radius = radius;
+    neighbors.radius_sq = radius*radius;
+    neighbors.store_radii = radii;
+
+    Py_BEGIN_ALLOW_THREADS
+    ok = KDTree_find_neighbors(self, &neighbors);
+    Py_END_ALLOW_THREADS
+
     if (!ok) {
-        Py_DECREF(neighbors);
+        Neighbors_clear(&neighbors);
         return PyErr_NoMemory();
     }
-    return neighbors;
+
+    indices = PyByteArray_FromStringAndSize((const char*)neighbors.indices,
+                         2 * neighbors.size * sizeof(Py_ssize_t));
+    if (!indices) goto exit;
+    if (radii) {
+        distances = PyByteArray_FromStringAndSize((const char*)neighbors.radii,
+                                           neighbors.size * sizeof(double));
+        if (!distances) goto exit;
+    }
+    else {
+        distances = Py_None;
+        Py_INCREF(distances);
+    }
+    result = PyTuple_Pack(2, indices, distances);
+
+exit:
+    Neighbors_clear(&neighbors);
+    Py_XDECREF(indices);
+    Py_XDECREF(distances);
+    return result;
 }
 
 PyDoc_STRVAR(PyKDTree_neighbor_simple_search__doc__,
@@ -1261,7 +1396,7 @@ PyKDTree_neighbor_simple_search(KDTree* self, PyObject* args)
 {
     int ok;
     double radius;
-    PyObject* neighbors;
+    Neighbors neighbors = {0};
     Py_ssize_t i;
 
     if (!PyArg_ParseTuple(args, "d:neighbor_simple_search", &radius))
@@ -1272,11 +1407,11 @@ PyKDTree_neighbor_simple_search(KDTree* self, PyObject* args)
         return NULL;
     }
 
-    neighbors = PyList_New(0);
-    if (!neighbors) return NULL;
+    neighbors.list = PyList_New(0);
+    if (!neighbors.list) return NULL;
 
-    self->_neighbor_radius = radius;
-    self->_neighbor_radius_sq = radius*radius;
+    neighbors.radius = radius;
+    neighbors.radius_sq = radius*radius;
 
     DataPoint_sort(self->_data_point_list, self->_data_point_list_size, 0);
 
@@ -1293,8 +1428,11 @@ PyKDTree_neighbor_simple_search(KDTree* self, PyObject* args)
             double x2 = p2._coord[0];
             if (fabs(x2-x1) <= radius)
             {
-                ok = KDTree_test_neighbors(self, &p1, &p2, neighbors);
-                if (!ok) return PyErr_NoMemory();
+                ok = KDTree_test_neighbors(self, &p1, &p2, &neighbors);
+                if (!ok) {
+                    Py_DECREF(neighbors.list);
+                    return PyErr_NoMemory();
+                }
             }
             else
             {
@@ -1302,7 +1440,7 @@ PyKDTree_neighbor_simple_search(KDTree* self, PyObject* args)
             }
         }
     }
-    return neighbors;
+    return neighbors.list;
 }
 
 static PyMethodDef KDTree_methods[] = {
@@ -1314,6 +1452,10 @@ static PyMethodDef KDTree_methods[] = {
      (PyCFunction)PyKDTree_neighbor_search,
       METH_VARARGS,
       PyKDTree_neighbor_search__doc__},
+    {"neighbor_search_arrays",
+     (PyCFunction)PyKDTree_neighbor_search_arrays,
+      METH_VARARGS | METH_KEYWORDS,
+      PyKDTree_neighbor_search_arrays__doc__},
     {"neighbor_simple_search",
      (PyCFunction)PyKDTree_neighbor_simple_search,
       METH_VARARGS,
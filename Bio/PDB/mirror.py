@@ -0,0 +1,369 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+
+"""Keep a local mirror of files on the PDB server up to date.
+
+PDBMirror downloads files concurrently, using a bounded number of HTTP
+connections, and records the size, modification time, HTTP validators
+(ETag and Last-Modified), and SHA-256 checksum of each downloaded file in a
+local SQLite manifest. This is used to:
+
+ - skip files that are unchanged on the server, using conditional requests
+   (or without contacting the server at all if check_remote is False);
+ - resume interrupted transfers, using HTTP range requests;
+ - detect local files that were modified or removed since they were
+   downloaded.
+
+Files are downloaded to a temporary ".part" file next to their final
+location, which is replaced atomically once the download is complete, so a
+file in the mirror is never seen partially written.
+
+The PDBList class uses PDBMirror in its sync_mirror method; PDBMirror can
+also be used directly with any list of URLs::
+
+    from Bio.PDB.mirror import PDBMirror
+
+    mirror = PDBMirror("pdb-mirror", max_connections=8)
+    files = [
+        ("https://files.wwpdb.org/pub/pdb/data/structures/divided/mmCIF/a8/1a8o.cif.gz",
+         "a8/1a8o.cif.gz"),
+    ]
+    stats = mirror.sync(files)
+    print(stats)
+"""
+
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.request import build_opener
+from urllib.request import Request
+
+try:
+    import sqlite3
+except ImportError:
+    # May be missing if Python was compiled from source without its dependencies
+    sqlite3 = None  # type: ignore
+
+
+_CHUNK_SIZE = 1 << 16
+
+
+class MirrorStats:
+    """Counts of the files processed by PDBMirror.sync.
+
+    Attributes:
+     - downloaded - number of files downloaded (including resumed downloads)
+     - resumed    - number of downloads that continued an interrupted transfer
+     - unchanged  - number of files that were already up to date
+     - failed     - list of (path, error message) tuples for the files that
+       could not be downloaded
+     - bytes      - number of bytes received
+     - elapsed    - wall clock time in seconds
+
+    """
+
+    def __init__(self):
+        """Initialize the counts."""
+        self.downloaded = 0
+        self.resumed = 0
+        self.unchanged = 0
+        self.failed = []
+        self.bytes = 0
+        self.elapsed = 0.0
+
+    def __repr__(self):
+        """Return a string summarizing the counts."""
+        return (
+            f"<MirrorStats downloaded={self.downloaded} resumed={self.resumed} "
+            f"unchanged={self.unchanged} failed={len(self.failed)} "
+            f"bytes={self.bytes} elapsed={self.elapsed:.2f}s>"
+        )
+
+
+class _Manifest:
+    """SQLite database storing the state of each file in the mirror (PRIVATE).
+
+    The database is shared by the download threads; access is serialized by
+    a lock.
+    """
+
+    def __init__(self, filename):
+        if sqlite3 is None:
+            # Python was compiled without sqlite3 support
+            from Bio import MissingPythonDependencyError
+
+            raise MissingPythonDependencyError(
+                "Python was compiled without the sqlite3 module"
+            )
+        self.lock = threading.Lock()
+        self.con = sqlite3.connect(filename, check_same_thread=False)
+        self.con.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, "
+            "url TEXT NOT NULL, "
+            "complete INTEGER NOT NULL, "
+            "size INTEGER, "
+            "mtime REAL, "
+            "etag TEXT, "
+            "last_modified TEXT, "
+            "sha256 TEXT, "
+            "synced REAL);"
+        )
+        self.con.commit()
+
+    def get(self, path):
+        with self.lock:
+            row = self.con.execute(
+                "SELECT url, complete, size, mtime, etag, last_modified, sha256 "
+                "FROM files WHERE path=?;",
+                (path,),
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ("url", "complete", "size", "mtime", "etag", "last_modified", "sha256")
+        return dict(zip(keys, row))
+
+    def start(self, path, url, etag, last_modified):
+        """Record the validators of a transfer that is about to start."""
+        with self.lock:
+            self.con.execute(
+                "INSERT OR REPLACE INTO files "
+                "(path, url, complete, etag, last_modified) VALUES (?, ?, 0, ?, ?);",
+                (path, url, etag, last_modified),
+            )
+            self.con.commit()
+
+    def finish(self, path, size, mtime, sha256):
+        """Record a completed transfer."""
+        with self.lock:
+            self.con.execute(
+                "UPDATE files SET complete=1, size=?, mtime=?, sha256=?, synced=? "
+                "WHERE path=?;",
+                (size, mtime, sha256, time.time(), path),
+            )
+            self.con.commit()
+
+    def paths(self):
+        with self.lock:
+            return [
+                row[0]
+                for row in self.con.execute(
+                    "SELECT path FROM files WHERE complete=1 ORDER BY path;"
+                )
+            ]
+
+    def close(self):
+        self.con.close()
+
+
+class PDBMirror:
+    """Concurrent, resumable mirror of files on the PDB server."""
+
+    def __init__(
+        self,
+        local,
+        manifest=None,
+        max_connections=8,
+        check_remote=True,
+        timeout=60,
+        verbose=False,
+    ):
+        """Initialize the mirror.
+
+        Arguments:
+         - local           - local directory storing the mirror
+         - manifest        - file name of the SQLite manifest; by default,
+           ".pdb_mirror.sqlite" in the local directory
+         - max_connections - maximum number of simultaneous downloads
+         - check_remote    - if True (default), ask the server if a file
+           was modified since it was downloaded (using a conditional
+           request). If False, files that are present in the manifest and
+           unchanged locally are skipped without contacting the server.
+         - timeout         - timeout in seconds for each HTTP connection
+         - verbose         - if True, print each file as it is downloaded
+
+        """
+        if max_connections < 1:
+            raise ValueError(
+                f"Number of connections must be at least 1: {max_connections}"
+            )
+        os.makedirs(local, exist_ok=True)
+        if manifest is None:
+            manifest = os.path.join(local, ".pdb_mirror.sqlite")
+        self.local = local
+        self.manifest = _Manifest(manifest)
+        self.max_connections = max_connections
+        self.check_remote = check_remote
+        self.timeout = timeout
+        self.verbose = verbose
+        # like urlopen, but without using the global opener
+        self._opener = build_opener()
+
+    def close(self):
+        """Close the manifest database."""
+        self.manifest.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _is_intact(self, path, record):
+        """Check if the local file matches the manifest record (PRIVATE)."""
+        if record is None or not record["complete"]:
+            return False
+        try:
+            stat = os.stat(os.path.join(self.local, path))
+        except OSError:
+            return False
+        return stat.st_size == record["size"] and stat.st_mtime == record["mtime"]
+
+    def _fetch(self, url, path, force):
+        """Download a single file if needed (PRIVATE).
+
+        Returns a tuple of the status ("downloaded", "resumed", or
+        "unchanged") and the number of bytes received.
+        """
+        record = self.manifest.get(path)
+        filename = os.path.join(self.local, path)
+        part = filename + ".part"
+        headers = {}
+        if not force and record is not None and record["url"] == url:
+            if self._is_intact(path, record):
+                if not self.check_remote:
+                    return "unchanged", 0
+                if record["etag"]:
+                    headers["If-None-Match"] = record["etag"]
+                if record["last_modified"]:
+                    headers["If-Modified-Since"] = record["last_modified"]
+            elif not record["complete"] and os.path.exists(part):
+                validator = record["etag"] or record["last_modified"]
+                if validator:
+                    offset = os.path.getsize(part)
+                    headers["Range"] = f"bytes={offset}-"
+                    headers["If-Range"] = validator
+        try:
+            response = self._opener.open(
+                Request(url, headers=headers), timeout=self.timeout
+            )
+        except HTTPError as exception:
+            if exception.code == 304:
+                return "unchanged", 0
+            raise
+        with response:
+            if response.status == 206:
+                if "Range" not in headers:
+                    raise OSError("Unexpected partial content for a full request")
+                # The server is sending the remainder of the file
+                offset = int(headers["Range"][6:-1])
+                content_range = response.headers.get("Content-Range", "")
+                if not content_range.startswith(f"bytes {offset}-"):
+                    raise OSError(f"Unexpected Content-Range '{content_range}'")
+                total = int(content_range.rsplit("/", 1)[1])
+                mode = "ab"
+                status = "resumed"
+            else:
+                offset = 0
+                length = response.headers.get("Content-Length")
+                total = None if length is None else int(length)
+                mode = "wb"
+                status = "downloaded"
+                self.manifest.start(
+                    path,
+                    url,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                )
+            os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+            checksum = hashlib.sha256()
+            if offset:
+                with open(part, "rb") as stream:
+                    for chunk in iter(lambda: stream.read(_CHUNK_SIZE), b""):
+                        checksum.update(chunk)
+            received = 0
+            with open(part, mode) as stream:
+                while True:
+                    chunk = response.read(_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    stream.write(chunk)
+                    checksum.update(chunk)
+                    received += len(chunk)
+        size = offset + received
+        if total is not None and size != total:
+            # keep the partial file, so that the transfer can be resumed
+            raise OSError(f"Incomplete transfer ({size} of {total} bytes)")
+        os.replace(part, filename)
+        stat = os.stat(filename)
+        self.manifest.finish(path, stat.st_size, stat.st_mtime, checksum.hexdigest())
+        if self.verbose:
+            print(f"Downloaded '{path}'")
+        return status, received
+
+    def _call(self, args):
+        """Download a single file, catching any exception (PRIVATE)."""
+        url, path, force = args
+        try:
+            status, received = self._fetch(url, path, force)
+        except Exception as exception:
+            return path, "failed", 0, f"{type(exception).__name__}: {exception}"
+        return path, status, received, None
+
+    def sync(self, files, force=()):
+        """Bring the local copies of the given files up to date.
+
+        Arguments:
+         - files - iterable of (url, path) tuples, where path is the location
+           of the file relative to the local directory of the mirror
+         - force - collection of paths that should be downloaded again even
+           if they appear to be unchanged (e.g. entries listed as modified
+           in the weekly PDB status files)
+
+        Returns a MirrorStats object. A failed download does not stop the
+        synchronization, but is reported in the failed attribute; a partially
+        transferred file is resumed by the next call to sync.
+        """
+        force = set(force)
+        stats = MirrorStats()
+        start = time.perf_counter()
+        tasks = ((url, path, path in force) for url, path in files)
+        with ThreadPoolExecutor(self.max_connections) as executor:
+            for path, status, received, error in executor.map(self._call, tasks):
+                stats.bytes += received
+                if status == "unchanged":
+                    stats.unchanged += 1
+                elif status == "failed":
+                    stats.failed.append((path, error))
+                else:
+                    stats.downloaded += 1
+                    if status == "resumed":
+                        stats.resumed += 1
+        stats.elapsed = time.perf_counter() - start
+        return stats
+
+    def verify(self):
+        """Return the paths of files that do not match their SHA-256 checksum.
+
+        Files recorded as complete in the manifest are checked; a missing
+        file is also reported.
+        """
+        corrupted = []
+        for path in self.manifest.paths():
+            record = self.manifest.get(path)
+            checksum = hashlib.sha256()
+            try:
+                with open(os.path.join(self.local, path), "rb") as stream:
+                    for chunk in iter(lambda: stream.read(_CHUNK_SIZE), b""):
+                        checksum.update(chunk)
+            except OSError:
+                corrupted.append(path)
+                continue
+            if checksum.hexdigest() != record["sha256"]:
+                corrupted.append(path)
+        return corrupted
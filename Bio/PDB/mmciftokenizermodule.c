@@ -0,0 +1,487 @@
+/* This file is part of the Biopython distribution and governed by your
+ * choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+ * Please see the LICENSE file that should have been included as part of this
+ * package.
+ *
+ * mmciftokenizermodule.c
+ *
+ * Split the text of an mmCIF file into tokens, and store the tokens in a
+ * dictionary in the same way as the Python code in MMCIF2Dict.py does.
+ * Only ASCII text is accepted.
+ *
+ * Used by MMCIF2Dict.py
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <string.h>
+
+
+typedef struct {
+    PyObject *dict;         /* the dictionary being filled */
+    PyObject *categories;   /* set of categories to be stored, or NULL */
+    int started;            /* 1 after the first (data_) token was seen */
+    int loop_flag;          /* 1 inside a loop */
+    PyObject *keys;         /* keys of the current loop */
+    PyObject *lists;        /* value lists (or None) of the current loop */
+    Py_ssize_t i;           /* number of values read in the current loop */
+    Py_ssize_t n;           /* number of keys in the current loop */
+    PyObject *key;          /* key waiting for its value, or NULL */
+} Builder;
+
+
+static int
+is_whitespace(char c)
+{
+    /* Same as str.isspace for ASCII characters */
+    switch (c) {
+        case ' ': case '\t': case '\n': case '\r': case '\x0b': case '\x0c':
+        case '\x1c': case '\x1d': case '\x1e': case '\x1f':
+            return 1;
+        default:
+            return 0;
+    }
+}
+
+static PyObject *
+make_string(const char *s, Py_ssize_t size)
+{
+    PyObject *string;
+
+    if (size <= 1) {
+        /* returns a cached object */
+        return PyUnicode_FromStringAndSize(s, size);
+    }
+    string = PyUnicode_New(size, 127);
+    if (!string) return NULL;
+    memcpy(PyUnicode_1BYTE_DATA(string), s, size);
+    return string;
+}
+
+/* Return 1 if the key is in one of the requested categories, 0 if not, and
+ * -1 on error. */
+static int
+is_selected(Builder *builder, PyObject *key)
+{
+    int result;
+    Py_ssize_t size;
+    Py_ssize_t end;
+    PyObject *category;
+
+    if (!builder->categories) return 1;
+    size = PyUnicode_GET_LENGTH(key);
+    end = PyUnicode_FindChar(key, '.', 0, size, 1);
+    if (end == -2) return -1;
+    if (end == -1) end = size;
+    category = PyUnicode_Substring(key, 0, end);
+    if (!category) return -1;
+    result = PySet_Contains(builder->categories, category);
+    Py_DECREF(category);
+    return result;
+}
+
+static int
+store_value(Builder *builder, PyObject *key, const char *s, Py_ssize_t size)
+{
+    int result;
+    PyObject *value;
+    PyObject *list;
+
+    result = is_selected(builder, key);
+    if (result != 1) return result;
+    value = make_string(s, size);
+    if (!value) return -1;
+    list = PyList_New(1);
+    if (!list) {
+        Py_DECREF(value);
+        return -1;
+    }
+    PyList_SET_ITEM(list, 0, value);
+    result = PyDict_SetItem(builder->dict, key, list);
+    Py_DECREF(list);
+    return result;
+}
+
+static int
+start_data_block(Builder *builder, const char *s, Py_ssize_t size)
+{
+    int result;
+    Py_ssize_t n = size < 5 ? size : 5;
+    PyObject *key;
+    PyObject *value;
+
+    key = make_string(s, n);
+    if (!key) return -1;
+    value = make_string(s + n, size - n);
+    if (!value) {
+        Py_DECREF(key);
+        return -1;
+    }
+    result = PyDict_SetItem(builder->dict, key, value);
+    Py_DECREF(key);
+    Py_DECREF(value);
+    if (result == -1) return -1;
+    if (n < 5 || strncmp(s, "data_", 5) != 0) {
+        PyErr_SetString(PyExc_ValueError,
+                        "The input mmCIF file must begin with a 'data_' directive.");
+        return -1;
+    }
+    return 0;
+}
+
+static int
+add_loop_key(Builder *builder, const char *s, Py_ssize_t size)
+{
+    int result;
+    PyObject *key;
+    PyObject *list;
+
+    key = make_string(s, size);
+    if (!key) return -1;
+    result = is_selected(builder, key);
+    if (result == 1) {
+        list = PyList_New(0);
+        if (!list) {
+            Py_DECREF(key);
+            return -1;
+        }
+        result = PyDict_SetItem(builder->dict, key, list);
+        Py_DECREF(list);
+    }
+    if (result != -1) result = PyList_Append(builder->keys, key);
+    Py_DECREF(key);
+    if (result == -1) return -1;
+    builder->n++;
+    return 0;
+}
+
+static int
+add_loop_value(Builder *builder, const char *s, Py_ssize_t size)
+{
+    int result;
+    Py_ssize_t j;
+    PyObject *key;
+    PyObject *list;
+    PyObject *value;
+
+    if (builder->n == 0) {
+        /* same exception as raised by the Python code */
+        PyErr_SetString(PyExc_ZeroDivisionError, "integer modulo by zero");
+        return -1;
+    }
+    if (builder->i == 0) {
+        /* Find the lists storing the values of each key */
+        Py_XDECREF(builder->lists);
+        builder->lists = PyList_New(builder->n);
+        if (!builder->lists) return -1;
+        for (j = 0; j < builder->n; j++) {
+            key = PyList_GET_ITEM(builder->keys, j);
+            result = is_selected(builder, key);
+            if (result == -1) return -1;
+            if (result == 1) {
+                list = PyDict_GetItemWithError(builder->dict, key);
+                if (!list) {
+                    if (!PyErr_Occurred())
+                        PyErr_SetObject(PyExc_KeyError, key);
+                    return -1;
+                }
+            }
+            else list = Py_None;
+            Py_INCREF(list);
+            PyList_SET_ITEM(builder->lists, j, list);
+        }
+    }
+    list = PyList_GET_ITEM(builder->lists, builder->i % builder->n);
+    builder->i++;
+    if (list == Py_None) return 0;
+    value = make_string(s, size);
+    if (!value) return -1;
+    result = PyList_Append(list, value);
+    Py_DECREF(value);
+    return result;
+}
+
+/* Process a token; this follows the code in MMCIF2Dict.__init__. */
+static int
+add_token(Builder *builder, const char *s, Py_ssize_t size)
+{
+    int result;
+
+    if (!builder->started) {
+        builder->started = 1;
+        return start_data_block(builder, s, size);
+    }
+    if (size == 5
+     && (s[0] == 'l' || s[0] == 'L')
+     && (s[1] == 'o' || s[1] == 'O')
+     && (s[2] == 'o' || s[2] == 'O')
+     && (s[3] == 'p' || s[3] == 'P')
+     && s[4] == '_') {
+        builder->loop_flag = 1;
+        Py_DECREF(builder->keys);
+        builder->keys = PyList_New(0);
+        if (!builder->keys) return -1;
+        builder->i = 0;
+        builder->n = 0;
+        return 0;
+    }
+    else if (builder->loop_flag) {
+        /* The second condition checks we are in the first column.
+         * Some mmCIF files (e.g. 4q9r) have values in later columns
+         * starting with an underscore and we don't want to read
+         * these as keys */
+        if (size > 0 && s[0] == '_'
+         && (builder->n == 0 || builder->i % builder->n == 0)) {
+            if (builder->i > 0) builder->loop_flag = 0;
+            else return add_loop_key(builder, s, size);
+        }
+        else return add_loop_value(builder, s, size);
+    }
+    if (builder->key == NULL) {
+        builder->key = make_string(s, size);
+        if (!builder->key) return -1;
+    }
+    else {
+        result = store_value(builder, builder->key, s, size);
+        Py_CLEAR(builder->key);
+        return result;
+    }
+    return 0;
+}
+
+static Py_ssize_t
+strip_start(const char *text, Py_ssize_t start, Py_ssize_t end)
+{
+    while (start < end && is_whitespace(text[start])) start++;
+    return start;
+}
+
+static Py_ssize_t
+strip_end(const char *text, Py_ssize_t start, Py_ssize_t end)
+{
+    while (end > start && is_whitespace(text[end-1])) end--;
+    return end;
+}
+
+/* Split a (stripped) line into tokens; this follows MMCIF2Dict._splitline. */
+static int
+split_line(Builder *builder, const char *text, Py_ssize_t start, Py_ssize_t end)
+{
+    Py_ssize_t i;
+    Py_ssize_t token_start = start;
+    int in_token = 0;
+    char quote_open_char = '\0';
+    char c;
+    PyObject *line;
+
+    for (i = start; i < end; i++) {
+        c = text[i];
+        if (c == ' ' || c == '\t') {
+            if (in_token && !quote_open_char) {
+                in_token = 0;
+                if (add_token(builder, text + token_start, i - token_start) == -1)
+                    return -1;
+            }
+        }
+        else if (c == '\'' || c == '"') {
+            if (!quote_open_char && !in_token) {
+                quote_open_char = c;
+                in_token = 1;
+                token_start = i + 1;
+            }
+            else if (c == quote_open_char
+                  && (i + 1 == end || text[i+1] == ' ' || text[i+1] == '\t')) {
+                quote_open_char = '\0';
+                in_token = 0;
+                if (add_token(builder, text + token_start, i - token_start) == -1)
+                    return -1;
+            }
+        }
+        else if (c == '#' && !in_token) {
+            /* Skip comments. "#" is a valid non-comment char inside of a
+             * quote and inside of an unquoted token, so we need to check
+             * that the current char is not in a token. */
+            return 0;
+        }
+        else if (!in_token) {
+            in_token = 1;
+            token_start = i;
+        }
+    }
+    if (in_token) {
+        if (add_token(builder, text + token_start, end - token_start) == -1)
+            return -1;
+    }
+    if (quote_open_char) {
+        line = make_string(text + start, end - start);
+        if (line) {
+            PyErr_Format(PyExc_ValueError,
+                         "Line ended with quote open: %U", line);
+            Py_DECREF(line);
+        }
+        return -1;
+    }
+    return 0;
+}
+
+/* Find the end of the line starting at start, excluding the newline. */
+static Py_ssize_t
+find_line_end(const char *text, Py_ssize_t start, Py_ssize_t size)
+{
+    const char *p = memchr(text + start, '\n', size - start);
+    if (p) return p - text;
+    return size;
+}
+
+/* Tokenize the text; this follows MMCIF2Dict._tokenize. */
+static int
+tokenize(Builder *builder, const char *text, Py_ssize_t size)
+{
+    int result;
+    Py_ssize_t start;
+    Py_ssize_t end;
+    Py_ssize_t next = 0;
+    Py_ssize_t length;
+    Py_ssize_t capacity;
+    Py_ssize_t buffer_size;
+    char *buffer;
+    char *p;
+
+    if (size == 0) {
+        PyErr_SetString(PyExc_ValueError, "Empty file.");
+        return -1;
+    }
+    while (next < size) {
+        start = next;
+        end = find_line_end(text, start, size);
+        next = end + 1;
+        if (text[start] == '#') continue;
+        if (text[start] == ';') {
+            /* The spec says that leading whitespace on each line must be
+             * preserved while trailing whitespace may be stripped. The
+             * trailing newline must be stripped. */
+            length = strip_end(text, start + 1, end) - (start + 1);
+            capacity = length + 256;
+            buffer = PyMem_Malloc(capacity);
+            if (!buffer) {
+                PyErr_NoMemory();
+                return -1;
+            }
+            memcpy(buffer, text + start + 1, length);
+            buffer_size = length;
+            for (;;) {
+                if (next >= size) {
+                    PyMem_Free(buffer);
+                    PyErr_SetString(PyExc_ValueError,
+                                    "Missing closing semicolon");
+                    return -1;
+                }
+                start = next;
+                end = find_line_end(text, start, size);
+                next = end + 1;
+                end = strip_end(text, start, end);
+                if (end > start && text[start] == ';') {
+                    result = add_token(builder, buffer, buffer_size);
+                    PyMem_Free(buffer);
+                    if (result == -1) return -1;
+                    start++;
+                    if (start < end && text[start] != ' ' && text[start] != '\t') {
+                        PyErr_SetString(PyExc_ValueError, "Missing whitespace");
+                        return -1;
+                    }
+                    break;
+                }
+                length = end - start;
+                if (buffer_size + length + 1 > capacity) {
+                    capacity = 2 * (buffer_size + length + 1);
+                    p = PyMem_Realloc(buffer, capacity);
+                    if (!p) {
+                        PyMem_Free(buffer);
+                        PyErr_NoMemory();
+                        return -1;
+                    }
+                    buffer = p;
+                }
+                buffer[buffer_size] = '\n';
+                memcpy(buffer + buffer_size + 1, text + start, length);
+                buffer_size += length + 1;
+            }
+        }
+        end = strip_end(text, start, end);
+        start = strip_start(text, start, end);
+        if (split_line(builder, text, start, end) == -1) return -1;
+    }
+    return 0;
+}
+
+static char parse__doc__[] =
+"parse(text, dictionary, categories)\n"
+"\n"
+"Parse the text of an mmCIF file, and store its contents in the dictionary.\n"
+"\n"
+"The text must be an ASCII string. If categories is a set of category\n"
+"names, only the keys in these categories are stored; if categories is\n"
+"None, all keys are stored.\n";
+
+static PyObject *
+mmcif_tokenizer_parse(PyObject *self, PyObject *args)
+{
+    int result;
+    PyObject *text;
+    PyObject *dict;
+    PyObject *categories;
+    Builder builder;
+
+    if (!PyArg_ParseTuple(args, "UO!O:parse",
+                          &text, &PyDict_Type, &dict, &categories))
+        return NULL;
+    if (!PyUnicode_IS_ASCII(text)) {
+        PyErr_SetString(PyExc_ValueError, "text must be an ASCII string");
+        return NULL;
+    }
+    if (categories == Py_None) categories = NULL;
+    else if (!PyAnySet_Check(categories)) {
+        PyErr_SetString(PyExc_TypeError, "categories must be a set or None");
+        return NULL;
+    }
+
+    builder.dict = dict;
+    builder.categories = categories;
+    builder.started = 0;
+    builder.loop_flag = 0;
+    builder.keys = PyList_New(0);
+    if (!builder.keys) return NULL;
+    builder.lists = NULL;
+    builder.i = 0;
+    builder.n = 0;
+    builder.key = NULL;
+
+    result = tokenize(&builder,
+                      (const char *)PyUnicode_1BYTE_DATA(text),
+                      PyUnicode_GET_LENGTH(text));
+
+    Py_XDECREF(builder.keys);
+    Py_XDECREF(builder.lists);
+    Py_XDECREF(builder.key);
+    if (result == -1) return NULL;
+    Py_RETURN_NONE;
+}
+
+static PyMethodDef MMCIFTokenizerMethods[] = {
+    {"parse", mmcif_tokenizer_parse, METH_VARARGS, parse__doc__},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef moduledef = {
+    PyModuleDef_HEAD_INIT,
+    "_mmcif_tokenizer",
+    "Fast tokenizer for mmCIF files.",
+    -1,
+    MMCIFTokenizerMethods
+};
+
+PyMODINIT_FUNC
+PyInit__mmcif_tokenizer(void)
+{
+    return PyModule_Create(&moduledef);
+}
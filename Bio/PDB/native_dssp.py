@@ -0,0 +1,620 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+
+"""Secondary structure assignment following DSSP, without the DSSP program.
+
+This module implements the hydrogen bond energy and the secondary structure
+assignment of Kabsch and Sander (the algorithm used by the DSSP program)
+using NumPy, so that no external executable, temporary file, or subprocess
+is needed:
+
+    Kabsch W, Sander C (1983). "Dictionary of protein secondary structure:
+    pattern recognition of hydrogen-bonded and geometrical features".
+    Biopolymers. 22 (12): 2577-2637. https://doi.org/10.1002/bip.360221211
+
+The rules follow those of DSSP 2.x, with the same codes for the secondary
+structure (H, B, E, G, I, T, S, and - for none), the same numbering of the
+residues (with a gap at each chain break), and the same two best hydrogen
+bond partners of each residue. The solvent accessibility is calculated with
+the Shrake-Rupley algorithm in Bio.PDB.SASA, using the atomic radii of DSSP,
+so it is close to, but not identical to, the value reported by DSSP.
+
+The NativeDSSP class provides the same per-residue tuples as the DSSP class,
+and stores the same values in the xtra dictionary of each residue::
+
+    from Bio.PDB import PDBParser
+    from Bio.PDB.native_dssp import NativeDSSP
+    p = PDBParser()
+    structure = p.get_structure("1MOT", "/local-pdb/1mot.pdb")
+    dssp = NativeDSSP(structure[0])
+    a_key = list(dssp.keys())[2]
+    dssp[a_key]
+
+The dssp_dicts_from_models function processes a batch of models together,
+calculating the hydrogen bond energies of all models in a single vectorized
+step, and returns dictionaries in the format of dssp_dict_from_pdb_file.
+"""
+
+import numpy as np
+
+from Bio.Data.PDBData import protein_letters_3to1
+from Bio.Data.PDBData import residue_sasa_scales
+from Bio.PDB.AbstractPropertyMap import AbstractResiduePropertyMap
+from Bio.PDB.DSSP import _get_dssp_values
+from Bio.PDB.kdtrees import KDTree
+from Bio.PDB.SASA import ShrakeRupley
+
+# Parameters of the DSSP program
+_COUPLING_CONSTANT = -27.888  # -332 * 0.42 * 0.2
+_MIN_HBOND_ENERGY = -9.9
+_MAX_HBOND_ENERGY = -0.5
+_MIN_DISTANCE = 0.5
+_MAX_CA_DISTANCE = 9.0
+_MAX_PEPTIDE_BOND_LENGTH = 2.5
+
+# Atomic radii used by DSSP for the accessibility
+_BACKBONE_RADII = {"N": 1.65, "CA": 1.87, "C": 1.76, "O": 1.4}
+_SIDE_CHAIN_RADIUS = 1.8
+
+_BACKBONE = ("N", "CA", "C", "O")
+
+
+def _get_backbone(model):
+    """Return the residues of a model with a complete backbone (PRIVATE).
+
+    Returns the list of residues, the list of their chain identifiers, and
+    an array of shape Nx4x3 with the coordinates of the N, CA, C, and O
+    atoms. Water molecules are skipped.
+    """
+    residues = []
+    chain_ids = []
+    coords = []
+    for chain in model:
+        for residue in chain:
+            if residue.id[0] == "W":
+                continue
+            try:
+                atoms = [residue[name] for name in _BACKBONE]
+            except KeyError:
+                continue
+            residues.append(residue)
+            chain_ids.append(chain.id)
+            coords.append([atom.coord for atom in atoms])
+    coords = np.array(coords, dtype=float).reshape(-1, 4, 3)
+    return residues, chain_ids, coords
+
+
+def _get_segments(chain_ids, coords):
+    """Return the segment number of each residue (PRIVATE).
+
+    A new segment starts at each chain break, i.e. when the chain changes,
+    or when the peptide bond between consecutive residues is too long.
+    """
+    n = len(chain_ids)
+    breaks = np.zeros(n, bool)
+    if n > 0:
+        breaks[0] = True
+        chain_ids = np.array(chain_ids, dtype=object)
+        breaks[1:] = chain_ids[1:] != chain_ids[:-1]
+        bond_lengths = np.linalg.norm(coords[1:, 0] - coords[:-1, 2], axis=1)
+        breaks[1:] |= bond_lengths > _MAX_PEPTIDE_BOND_LENGTH
+    return np.cumsum(breaks) - 1
+
+
+def _dihedrals(p0, p1, p2, p3):
+    """Return the dihedral angles in degrees defined by arrays of points (PRIVATE)."""
+    b0 = p0 - p1
+    b1 = p2 - p1
+    b2 = p3 - p2
+    b1 = b1 / np.linalg.norm(b1, axis=1)[:, np.newaxis]
+    v = b0 - np.sum(b0 * b1, axis=1)[:, np.newaxis] * b1
+    w = b2 - np.sum(b2 * b1, axis=1)[:, np.newaxis] * b1
+    x = np.sum(v * w, axis=1)
+    y = np.sum(np.cross(b1, v) * w, axis=1)
+    return np.degrees(np.arctan2(y, x))
+
+
+def _round_energies(energies):
+    """Round the hydrogen bond energies as DSSP does (PRIVATE)."""
+    energies = np.sign(energies) * np.floor(np.abs(energies) * 1000 + 0.5) / 1000
+    return np.maximum(energies, _MIN_HBOND_ENERGY)
+
+
+def _hbond_energies(coords, hydrogens, pairs, proline):
+    """Calculate the hydrogen bond energies of donor/acceptor pairs (PRIVATE).
+
+    The pairs are given as an array of shape Kx2 of (donor, acceptor)
+    indices. Proline residues are never donors.
+    """
+    donors, acceptors = pairs.T
+    N = coords[donors, 0]
+    H = hydrogens[donors]
+    C = coords[acceptors, 2]
+    O = coords[acceptors, 3]  # noqa: E741
+    dHO = np.linalg.norm(H - O, axis=1)
+    dHC = np.linalg.norm(H - C, axis=1)
+    dNC = np.linalg.norm(N - C, axis=1)
+    dNO = np.linalg.norm(N - O, axis=1)
+    with np.errstate(divide="ignore"):
+        energies = _COUPLING_CONSTANT * (1 / dHO - 1 / dHC + 1 / dNC - 1 / dNO)
+    too_close = np.minimum(np.minimum(dHO, dHC), np.minimum(dNC, dNO))
+    energies[too_close < _MIN_DISTANCE] = _MIN_HBOND_ENERGY
+    energies = _round_energies(energies)
+    energies[proline[donors]] = 0.0
+    return energies
+
+
+def _best_two(owners, partners, energies, n):
+    """Keep the two strongest hydrogen bonds of each residue (PRIVATE).
+
+    Returns an array of shape Nx2 with the partner indices (-1 if none), and
+    an array of shape Nx2 with the energies (0 if none). As in DSSP, ties are
+    resolved in favor of the partner with the lowest index.
+    """
+    best = np.full((n, 2), -1)
+    best_energies = np.zeros((n, 2))
+    mask = energies < 0
+    owners = owners[mask]
+    partners = partners[mask]
+    energies = energies[mask]
+    order = np.lexsort((partners, energies, owners))
+    owners = owners[order]
+    partners = partners[order]
+    energies = energies[order]
+    # rank of each bond among the bonds of the same residue
+    starts = np.searchsorted(owners, owners, "left")
+    rank = np.arange(len(owners)) - starts
+    keep = rank < 2
+    best[owners[keep], rank[keep]] = partners[keep]
+    best_energies[owners[keep], rank[keep]] = energies[keep]
+    return best, best_energies
+
+
+class _Batch:
+    """Backbone coordinates of several models, concatenated (PRIVATE).
+
+    All arrays are indexed by the position of the residue in the batch; the
+    models are separated by chain breaks, so that residues of different
+    models never interact.
+    """
+
+    def __init__(self, models):
+        self.residues = []
+        self.chain_ids = []
+        self.bounds = [0]
+        coords = [np.zeros((0, 4, 3))]
+        segments = [np.zeros(0, int)]
+        model_indices = [np.zeros(0, int)]
+        offset = 0
+        for index, model in enumerate(models):
+            residues, chain_ids, model_coords = _get_backbone(model)
+            model_segments = _get_segments(chain_ids, model_coords) + offset
+            if len(model_segments):
+                offset = model_segments[-1] + 1
+            self.residues.extend(residues)
+            self.chain_ids.extend(chain_ids)
+            self.bounds.append(len(self.residues))
+            coords.append(model_coords)
+            segments.append(model_segments)
+            model_indices.append(np.full(len(residues), index))
+        self.coords = np.concatenate(coords)
+        self.segments = np.concatenate(segments)
+        self.model_indices = np.concatenate(model_indices)
+        n = len(self.residues)
+        self.n = n
+        self.proline = np.array(
+            [residue.get_resname() == "PRO" for residue in self.residues], bool
+        )
+        # The amide hydrogen is placed on the N atom, opposite to the
+        # carbonyl O atom of the previous residue.
+        hydrogens = self.coords[:, 0].copy()
+        linked = np.zeros(n, bool)
+        linked[1:] = self.segments[1:] == self.segments[:-1]
+        previous = self.coords[np.flatnonzero(linked) - 1]
+        CO = previous[:, 2] - previous[:, 3]
+        hydrogens[linked] += CO / np.linalg.norm(CO, axis=1)[:, np.newaxis]
+        self.hydrogens = hydrogens
+        self.linked = linked
+
+    def same_segment(self, i, j):
+        """Check if residues i and j are in the same segment.
+
+        Indices outside the batch are never in the same segment.
+        """
+        i = np.asarray(i)
+        j = np.asarray(j)
+        valid = (i >= 0) & (i < self.n) & (j >= 0) & (j < self.n)
+        result = np.zeros(np.broadcast(i, j).shape, bool)
+        result[valid] = (
+            self.segments[np.where(valid, i, 0)[valid]]
+            == self.segments[np.where(valid, j, 0)[valid]]
+        )
+        return result
+
+    def calculate_hbonds(self):
+        """Find the two best hydrogen bonds of each residue."""
+        pairs = []
+        for start, end in zip(self.bounds[:-1], self.bounds[1:]):
+            if end - start < 2:
+                continue
+            kdt = KDTree(self.coords[start:end, 1].copy(), 10)
+            buffer, _ = kdt.neighbor_search_arrays(_MAX_CA_DISTANCE)
+            model_pairs = np.frombuffer(buffer, dtype=np.intp).reshape(-1, 2)
+            pairs.append(np.sort(model_pairs, axis=1) + start)
+        if pairs:
+            pairs = np.concatenate(pairs)
+        else:
+            pairs = np.zeros((0, 2), int)
+        # Both residues act as donor and as acceptor, except that the
+        # N-H group of a residue is not bonded to the C=O group of the
+        # preceding residue.
+        reverse = pairs[pairs[:, 1] != pairs[:, 0] + 1][:, ::-1]
+        pairs = np.concatenate([pairs, reverse])
+        energies = _hbond_energies(self.coords, self.hydrogens, pairs, self.proline)
+        donors, acceptors = pairs.T
+        # acceptors of the N-H group of each residue (N-H-->O)
+        self.nho, self.nho_energies = _best_two(donors, acceptors, energies, self.n)
+        # donors to the C=O group of each residue (O-->H-N)
+        self.ohn, self.ohn_energies = _best_two(acceptors, donors, energies, self.n)
+
+    def test_bond(self, donor, acceptor):
+        """Check for a hydrogen bond from the N-H of donor to the O of acceptor."""
+        donor = np.asarray(donor)
+        acceptor = np.asarray(acceptor)
+        valid = (donor >= 0) & (donor < self.n)
+        index = np.where(valid, donor, 0)
+        bonded = (self.nho[index] == acceptor[..., np.newaxis]) & (
+            self.nho_energies[index] < _MAX_HBOND_ENERGY
+        )
+        return valid & bonded.any(axis=-1)
+
+    def find_bridges(self):
+        """Return the beta bridges as (i, j, type) tuples, sorted as in DSSP."""
+        n = self.n
+        # Candidate partners j of residue i, from the hydrogen bonds of
+        # residues i and i + 1.
+        i = np.arange(n)
+        candidates = np.concatenate(
+            [
+                np.stack([i, self.nho[i, k] + shift], axis=1)
+                for k in (0, 1)
+                for shift in (0, 1)
+            ]
+            + [
+                np.stack([i[:-1], self.nho[i[1:], k] + shift], axis=1)
+                for k in (0, 1)
+                for shift in (0, 1)
+            ]
+        )
+        candidates = candidates[candidates[:, 1] >= candidates[:, 0] + 3]
+        candidates = np.unique(candidates, axis=0)
+        i, j = candidates.T
+        valid = self.same_segment(i - 1, i + 1) & self.same_segment(j - 1, j + 1)
+        i = i[valid]
+        j = j[valid]
+        parallel = (self.test_bond(i + 1, j) & self.test_bond(j, i - 1)) | (
+            self.test_bond(j + 1, i) & self.test_bond(i, j - 1)
+        )
+        antiparallel = (self.test_bond(i + 1, j - 1) & self.test_bond(j + 1, i - 1)) | (
+            self.test_bond(j, i) & self.test_bond(i, j)
+        )
+        antiparallel &= ~parallel
+        found = parallel | antiparallel
+        # np.unique sorted the pairs by i, then by j, as in the DSSP loops
+        return [
+            (int(a), int(b), "parallel" if p else "antiparallel")
+            for a, b, p in zip(i[found], j[found], parallel[found])
+        ]
+
+    def assign_strands(self, ss):
+        """Assign the beta strands and isolated bridges (E and B)."""
+        ladders = []
+        for i, j, bridge_type in self.find_bridges():
+            for ladder in ladders:
+                if bridge_type != ladder["type"] or i != ladder["i"][-1] + 1:
+                    continue
+                if bridge_type == "parallel" and ladder["j"][-1] + 1 == j:
+                    ladder["i"].append(i)
+                    ladder["j"].append(j)
+                    break
+                if bridge_type == "antiparallel" and ladder["j"][0] - 1 == j:
+                    ladder["i"].append(i)
+                    ladder["j"].insert(0, j)
+                    break
+            else:
+                ladders.append({"type": bridge_type, "i": [i], "j": [j]})
+        chain_ids = self.chain_ids
+        ladders.sort(key=lambda ladder: (chain_ids[ladder["i"][0]], ladder["i"][0]))
+
+        def gap(a, b):
+            # unsigned difference, as in the DSSP code
+            return a - b if a >= b else np.inf
+
+        # Link the ladders separated by a beta bulge
+        index = 0
+        while index < len(ladders):
+            first = ladders[index]
+            other = index + 1
+            while other < len(ladders):
+                second = ladders[other]
+                ibi, iei = first["i"][0], first["i"][-1]
+                jbi, jei = first["j"][0], first["j"][-1]
+                ibj, iej = second["i"][0], second["i"][-1]
+                jbj, jej = second["j"][0], second["j"][-1]
+                if (
+                    first["type"] != second["type"]
+                    or chain_ids[min(ibi, ibj)] != chain_ids[max(iei, iej)]
+                    or chain_ids[min(jbi, jbj)] != chain_ids[max(jei, jej)]
+                    or self.model_indices[ibi] != self.model_indices[ibj]
+                    or gap(ibj, iei) >= 6
+                    or (iei >= ibj and ibi <= iej)
+                ):
+                    other += 1
+                    continue
+                if first["type"] == "parallel":
+                    bulge = (gap(jbj, jei) < 6 and gap(ibj, iei) < 3) or gap(
+                        jbj, jei
+                    ) < 3
+                else:
+                    bulge = (gap(jbi, jej) < 6 and gap(ibj, iei) < 3) or gap(
+                        jbi, jej
+                    ) < 3
+                if bulge:
+                    first["i"].extend(second["i"])
+                    if first["type"] == "parallel":
+                        first["j"].extend(second["j"])
+                    else:
+                        first["j"][:0] = second["j"]
+                    del ladders[other]
+                else:
+                    other += 1
+            index += 1
+
+        for ladder in ladders:
+            code = "E" if len(ladder["i"]) > 1 else "B"
+            for positions in (ladder["i"], ladder["j"]):
+                for k in range(positions[0], positions[-1] + 1):
+                    if ss[k] != "E":
+                        ss[k] = code
+
+    def helix_starts(self, stride):
+        """Find the residues i with a hydrogen bond from i + stride to i."""
+        i = np.arange(self.n)
+        return self.same_segment(i, i + stride) & self.test_bond(i + stride, i)
+
+    def assign(self):
+        """Return the secondary structure codes as an array."""
+        n = self.n
+        ss = np.full(n, "-", dtype="U1")
+        self.assign_strands(ss)
+        starts = {stride: self.helix_starts(stride) for stride in (3, 4, 5)}
+        # A minimal helix is defined by two consecutive n-turns; the helix
+        # types are assigned in the order H, G, I, so that a residue is
+        # only assigned to a 3-10 or pi helix if it is not yet assigned.
+        for stride, code, allowed in ((4, "H", None), (3, "G", "-G"), (5, "I", "-I")):
+            consecutive = np.flatnonzero(starts[stride][1:] & starts[stride][:-1]) + 1
+            if len(consecutive) == 0:
+                continue
+            positions = consecutive[:, np.newaxis] + np.arange(stride)
+            if allowed is not None:
+                empty = np.isin(ss[positions], list(allowed)).all(axis=1)
+                positions = positions[empty]
+            ss[positions.ravel()] = code
+        # Turns
+        turn = np.zeros(n, bool)
+        for stride in (3, 4, 5):
+            for k in range(1, stride):
+                turn[k:] |= starts[stride][: n - k]
+        loop = ss == "-"
+        ss[loop & turn] = "T"
+        # Bends
+        loop = ss == "-"
+        ss[loop & self.bends()] = "S"
+        return ss
+
+    def bends(self):
+        """Find the residues with a CA virtual bond angle above 70 degrees."""
+        n = self.n
+        i = np.arange(2, n - 2)
+        bends = np.zeros(n, bool)
+        i = i[self.same_segment(i - 2, i + 2)]
+        CA = self.coords[:, 1]
+        v1 = CA[i] - CA[i - 2]
+        v2 = CA[i + 2] - CA[i]
+        cosine = np.sum(v1 * v2, axis=1) / (
+            np.linalg.norm(v1, axis=1) * np.linalg.norm(v2, axis=1)
+        )
+        kappa = np.degrees(np.arccos(np.clip(cosine, -1, 1)))
+        bends[i] = kappa > 70
+        return bends
+
+    def torsions(self):
+        """Return the phi and psi angles, or 360 if they are undefined."""
+        n = self.n
+        coords = self.coords
+        phi = np.full(n, 360.0)
+        psi = np.full(n, 360.0)
+        linked = np.flatnonzero(self.linked)
+        phi[linked] = _dihedrals(
+            coords[linked - 1, 2],
+            coords[linked, 0],
+            coords[linked, 1],
+            coords[linked, 2],
+        )
+        linked -= 1
+        psi[linked] = _dihedrals(
+            coords[linked, 0],
+            coords[linked, 1],
+            coords[linked, 2],
+            coords[linked + 1, 0],
+        )
+        return phi, psi
+
+    def numbers(self):
+        """Return the DSSP number of each residue, counting the chain breaks."""
+        numbers = np.zeros(self.n, int)
+        for start, end in zip(self.bounds[:-1], self.bounds[1:]):
+            breaks = np.ones(end - start, int)
+            breaks[1:] += ~self.linked[start + 1 : end]
+            numbers[start:end] = np.cumsum(breaks)
+        return numbers
+
+
+def _accessibility(model, residues):
+    """Return the solvent accessibility of each residue, as in DSSP (PRIVATE)."""
+    atoms = []
+    radii = []
+    owners = []
+    for index, residue in enumerate(residues):
+        for atom in residue:
+            if atom.element == "H" or atom.element == "D":
+                continue
+            atoms.append(atom.coord)
+            radii.append(_BACKBONE_RADII.get(atom.get_id(), _SIDE_CHAIN_RADIUS))
+            owners.append(index)
+    if not atoms:
+        return np.zeros(len(residues), int)
+    sr = ShrakeRupley(n_points=200)
+    coords = np.array(atoms, dtype=float)
+    radii = np.array(radii) + sr.probe_radius
+    counts = sr._count_accessible_points(coords, radii)
+    areas = counts * radii * radii * (4 * np.pi / sr.n_points)
+    acc = np.bincount(owners, weights=areas, minlength=len(residues))
+    return np.round(acc).astype(int)
+
+
+def dssp_dicts_from_models(models, accessibility=True):
+    """Assign the secondary structure of a batch of models.
+
+    Parameters
+    ----------
+    models : iterable of Model
+        The models to be processed. Residues with N, CA, C, and O atoms
+        are included; water molecules are skipped.
+    accessibility : bool
+        If True (default), the solvent accessibility of each residue is
+        calculated. If False, the accessibility is reported as 0, which
+        saves most of the calculation time.
+
+    Returns
+    -------
+    list of (out_dict, keys) tuples
+        One tuple per model, in the format returned by
+        dssp_dict_from_pdb_file. Each dictionary maps (chain id, residue id)
+        to a tuple of the amino acid, secondary structure code,
+        accessibility, phi, psi, DSSP index, and the relative indices and
+        energies of the hydrogen bonds. Unlike the DSSP program, the
+        residue id includes the hetero flag of the residue.
+
+    """
+    models = list(models)
+    batch = _Batch(models)
+    n = batch.n
+    if n:
+        batch.calculate_hbonds()
+        ss = batch.assign()
+        phi, psi = batch.torsions()
+    else:
+        batch.nho = batch.ohn = np.zeros((0, 2), int)
+        batch.nho_energies = batch.ohn_energies = np.zeros((0, 2))
+        ss = np.zeros(0, "U1")
+        phi = psi = np.zeros(0)
+    numbers = batch.numbers()
+    # relative indices of the hydrogen bond partners
+    nho_relidx = np.where(batch.nho >= 0, numbers[batch.nho] - numbers[:, None], 0)
+    ohn_relidx = np.where(batch.ohn >= 0, numbers[batch.ohn] - numbers[:, None], 0)
+    results = []
+    for model, start, end in zip(models, batch.bounds[:-1], batch.bounds[1:]):
+        residues = batch.residues[start:end]
+        if accessibility:
+            acc = _accessibility(model, residues)
+        else:
+            acc = np.zeros(len(residues), int)
+        out_dict = {}
+        keys = []
+        for k, residue in enumerate(residues):
+            index = start + k
+            key = (batch.chain_ids[index], residue.id)
+            out_dict[key] = (
+                protein_letters_3to1.get(residue.get_resname(), "X"),
+                str(ss[index]),
+                int(acc[k]),
+                round(float(phi[index]), 1),
+                round(float(psi[index]), 1),
+                int(numbers[index]),
+                int(nho_relidx[index, 0]),
+                round(float(batch.nho_energies[index, 0]), 1),
+                int(ohn_relidx[index, 0]),
+                round(float(batch.ohn_energies[index, 0]), 1),
+                int(nho_relidx[index, 1]),
+                round(float(batch.nho_energies[index, 1]), 1),
+                int(ohn_relidx[index, 1]),
+                round(float(batch.ohn_energies[index, 1]), 1),
+            )
+            keys.append(key)
+        results.append((out_dict, keys))
+    return results
+
+
+def dssp_dict_from_model(model, accessibility=True):
+    """Assign the secondary structure of a model.
+
+    Returns a (out_dict, keys) tuple in the format of
+    dssp_dict_from_pdb_file; see dssp_dicts_from_models for details.
+    """
+    return dssp_dicts_from_models([model], accessibility)[0]
+
+
+class NativeDSSP(AbstractResiduePropertyMap):
+    """Assign secondary structure and accessibility like DSSP, without DSSP.
+
+    This class provides the same per-residue tuples as the DSSP class, and
+    stores the same values in the xtra dictionary of each residue, but does
+    not run the DSSP program.
+
+    Examples
+    --------
+    How NativeDSSP could be used::
+
+        from Bio.PDB import PDBParser
+        from Bio.PDB.native_dssp import NativeDSSP
+        p = PDBParser()
+        structure = p.get_structure("1MOT", "/local-pdb/1mot.pdb")
+        model = structure[0]
+        dssp = NativeDSSP(model)
+        # (dssp index, amino acid, secondary structure, relative ASA, phi, psi,
+        # NH_O_1_relidx, NH_O_1_energy, O_NH_1_relidx, O_NH_1_energy,
+        # NH_O_2_relidx, NH_O_2_energy, O_NH_2_relidx, O_NH_2_energy)
+        a_key = list(dssp.keys())[2]
+        dssp[a_key]
+
+    """
+
+    def __init__(self, model, acc_array="Sander", accessibility=True):
+        """Create a NativeDSSP object.
+
+        Parameters
+        ----------
+        model : Model
+            The model to be processed.
+        acc_array : string
+            Accessible surface area (ASA) from either Miller et al. (1987),
+            Sander & Rost (1994), Wilke: Tien et al. 2013, or Ahmad et al.
+            (2003) as string Sander/Wilke/Miller/Ahmad. Defaults to Sander.
+        accessibility : bool
+            If False, the accessibility is not calculated, and reported as 0.
+
+        """
+        self.residue_max_acc = residue_sasa_scales[acc_array]
+        dssp_dict, dssp_keys = dssp_dict_from_model(model, accessibility)
+        dssp_map = {}
+        dssp_list = []
+        for key in dssp_keys:
+            chain_id, res_id = key
+            res = model[chain_id][res_id]
+            dssp_vals = _get_dssp_values(res, dssp_dict[key], self.residue_max_acc)
+            dssp_map[key] = dssp_vals
+            dssp_list.append(dssp_vals)
+        AbstractResiduePropertyMap.__init__(self, dssp_map, dssp_keys, dssp_list)
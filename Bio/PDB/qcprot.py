@@ -23,6 +23,8 @@ Epub 2005 Jun 23. PMID: 15973002.
 
 import numpy as np
 
+from Bio.PDB.Entity import _transform_atoms
+from Bio.PDB.Entity import Entity
 from Bio.PDB.PDBExceptions import PDBException
 
 
@@ -34,14 +36,30 @@ def qcp(coords1, coords2, natoms):
 
     Variable names match (as much as possible) the C implementation.
     """
+    rmsd, rot, q = _qcp(coords1, coords2[np.newaxis], natoms)
+    return rmsd[0], rot[0], tuple(q[0])
+
+
+def _qcp(coords1, coords2, natoms):
+    """Run the QCP algorithm on a stack of coordinate sets (PRIVATE).
+
+    coords1 is the reference, with shape Nx3 or KxNx3, and coords2 contains
+    the K mobile coordinate sets, with shape KxNx3. All coordinate sets must
+    be centered at the origin. All calculations are done on arrays of
+    length K, so the K superpositions are calculated without a Python loop.
+
+    Returns the RMSDs (an array of length K), the right multiplying rotation
+    matrices (a Kx3x3 array), and the quaternions (a Kx4 array).
+    """
     # Original code has coords1 be the mobile. I think it makes more sense
     # for it to be the reference, so I swapped here.
-    G1 = np.trace(np.dot(coords2, coords2.T))
-    G2 = np.trace(np.dot(coords1, coords1.T))
-    A = np.dot(coords2.T, coords1)  # referred to as M in the original paper.
+    G1 = np.sum(coords2 * coords2, axis=(-2, -1))
+    G2 = np.sum(coords1 * coords1, axis=(-2, -1))
+    # referred to as M in the original paper.
+    A = np.matmul(np.swapaxes(coords2, -1, -2), coords1)
     E0 = (G1 + G2) * 0.5
 
-    Sxx, Sxy, Sxz, Syx, Syy, Syz, Szx, Szy, Szz = A.flatten()
+    Sxx, Sxy, Sxz, Syx, Syy, Syz, Szx, Szy, Szz = A.reshape(-1, 9).T
 
     Sxx2 = Sxx * Sxx
     Syy2 = Syy * Syy
@@ -102,22 +120,27 @@ def qcp(coords1, coords2, natoms):
     # using Newton-Rhapson and E0 as initial guess. Liu et al. mentions 5
     # iterations are sufficient (on average) for convergence up to 1e-6
     # precision but original code writes 50, which we keep.
+    # Only the coordinate sets that have not converged yet are iterated.
     nr_it = 50
-    mxEigenV = E0  # starting guess (x in eqs above)
+    mxEigenV = np.array(np.broadcast_to(E0, C0.shape))  # starting guess
     evalprec = 1e-11  # convergence criterion
+    active = np.arange(len(mxEigenV))
     for _ in range(nr_it):
-        oldg = mxEigenV
+        x = mxEigenV[active]
+        oldg = x
 
-        x2 = mxEigenV * mxEigenV
-        b = (x2 + C2) * mxEigenV
-        a = b + C1
+        x2 = x * x
+        b = (x2 + C2[active]) * x
+        a = b + C1[active]
 
-        f = a * mxEigenV + C0
-        f_prime = 2.0 * x2 * mxEigenV + b + a
+        f = a * x + C0[active]
+        f_prime = 2.0 * x2 * x + b + a
 
         delta = f / (f_prime + evalprec)  # avoid division by zero
-        mxEigenV = abs(mxEigenV - delta)
-        if (mxEigenV - oldg) < (evalprec * mxEigenV):
+        x = abs(x - delta)
+        mxEigenV[active] = x
+        active = active[(x - oldg) >= (evalprec * x)]
+        if len(active) == 0:
             break  # convergence
     else:
         print(f"Newton-Rhapson did not converge after {nr_it} iterations")
@@ -152,47 +175,53 @@ def qcp(coords1, coords2, natoms):
     q2 = -a21 * a3344_4334 + a23 * a3144_4134 - a24 * a3143_4133
     q3 = a21 * a3244_4234 - a22 * a3144_4134 + a24 * a3142_4132
     q4 = -a21 * a3243_4233 + a22 * a3143_4133 - a23 * a3142_4132
+    q = np.array([q1, q2, q3, q4])
 
-    qsqr = q1 * q1 + q2 * q2 + q3 * q3 + q4 * q4
+    qsqr = np.sum(q * q, axis=0)
 
+    # If the quaternion is too small, fall back to the other columns of
+    # the adjoint matrix, for those coordinate sets only.
     evecprec = 1e-6
-    if qsqr < evecprec:
+    small = qsqr < evecprec
+    if small.any():
         q1 = a12 * a3344_4334 - a13 * a3244_4234 + a14 * a3243_4233
         q2 = -a11 * a3344_4334 + a13 * a3144_4134 - a14 * a3143_4133
         q3 = a11 * a3244_4234 - a12 * a3144_4134 + a14 * a3142_4132
         q4 = -a11 * a3243_4233 + a12 * a3143_4133 - a13 * a3142_4132
-        qsqr = q1 * q1 + q2 * q2 + q3 * q3 + q4 * q4
-
-        if qsqr < evecprec:
-            a1324_1423 = a13 * a24 - a14 * a23
-            a1224_1422 = a12 * a24 - a14 * a22
-            a1223_1322 = a12 * a23 - a13 * a22
-            a1124_1421 = a11 * a24 - a14 * a21
-            a1123_1321 = a11 * a23 - a13 * a21
-            a1122_1221 = a11 * a22 - a12 * a21
-
-            q1 = a42 * a1324_1423 - a43 * a1224_1422 + a44 * a1223_1322
-            q2 = -a41 * a1324_1423 + a43 * a1124_1421 - a44 * a1123_1321
-            q3 = a41 * a1224_1422 - a42 * a1124_1421 + a44 * a1122_1221
-            q4 = -a41 * a1223_1322 + a42 * a1123_1321 - a43 * a1122_1221
-            qsqr = q1 * q1 + q2 * q2 + q3 * q3 + q4 * q4
-
-            if qsqr < evecprec:
-                q1 = a32 * a1324_1423 - a33 * a1224_1422 + a34 * a1223_1322
-                q2 = -a31 * a1324_1423 + a33 * a1124_1421 - a34 * a1123_1321
-                q3 = a31 * a1224_1422 - a32 * a1124_1421 + a34 * a1122_1221
-                q4 = -a31 * a1223_1322 + a32 * a1123_1321 - a33 * a1122_1221
-                qsqr = q1 * q1 + q2 * q2 + q3 * q3 + q4 * q4
-
-                if qsqr < evecprec:
-                    rot = np.eye(3)
-                    return rmsd, rot, [q1, q2, q3, q4]
-
-    normq = qsqr**0.5
-    q1 /= normq
-    q2 /= normq
-    q3 /= normq
-    q4 /= normq
+        q[:, small] = np.array([q1, q2, q3, q4])[:, small]
+        qsqr = np.sum(q * q, axis=0)
+        small = qsqr < evecprec
+
+    if small.any():
+        a1324_1423 = a13 * a24 - a14 * a23
+        a1224_1422 = a12 * a24 - a14 * a22
+        a1223_1322 = a12 * a23 - a13 * a22
+        a1124_1421 = a11 * a24 - a14 * a21
+        a1123_1321 = a11 * a23 - a13 * a21
+        a1122_1221 = a11 * a22 - a12 * a21
+
+        q1 = a42 * a1324_1423 - a43 * a1224_1422 + a44 * a1223_1322
+        q2 = -a41 * a1324_1423 + a43 * a1124_1421 - a44 * a1123_1321
+        q3 = a41 * a1224_1422 - a42 * a1124_1421 + a44 * a1122_1221
+        q4 = -a41 * a1223_1322 + a42 * a1123_1321 - a43 * a1122_1221
+        q[:, small] = np.array([q1, q2, q3, q4])[:, small]
+        qsqr = np.sum(q * q, axis=0)
+        small = qsqr < evecprec
+
+        if small.any():
+            q1 = a32 * a1324_1423 - a33 * a1224_1422 + a34 * a1223_1322
+            q2 = -a31 * a1324_1423 + a33 * a1124_1421 - a34 * a1123_1321
+            q3 = a31 * a1224_1422 - a32 * a1124_1421 + a34 * a1122_1221
+            q4 = -a31 * a1223_1322 + a32 * a1123_1321 - a33 * a1122_1221
+            q[:, small] = np.array([q1, q2, q3, q4])[:, small]
+            qsqr = np.sum(q * q, axis=0)
+            small = qsqr < evecprec
+
+    # Coordinate sets for which no quaternion was found get the identity
+    # rotation and keep their unnormalized quaternion.
+    normq = np.where(small, 1.0, qsqr**0.5)
+    q /= normq
+    q1, q2, q3, q4 = q
 
     a2 = q1 * q1
     x2 = q2 * q2
@@ -206,19 +235,21 @@ def qcp(coords1, coords2, natoms):
     yz = q3 * q4
     ax = q1 * q2
 
-    rot = np.zeros((3, 3))
+    rot = np.empty((len(q1), 3, 3))
+
+    rot[:, 0, 0] = a2 + x2 - y2 - z2
+    rot[:, 0, 1] = 2 * (xy + az)
+    rot[:, 0, 2] = 2 * (zx - ay)
+    rot[:, 1, 0] = 2 * (xy - az)
+    rot[:, 1, 1] = a2 - x2 + y2 - z2
+    rot[:, 1, 2] = 2 * (yz + ax)
+    rot[:, 2, 0] = 2 * (zx + ay)
+    rot[:, 2, 1] = 2 * (yz - ax)
+    rot[:, 2, 2] = a2 - x2 - y2 + z2
 
-    rot[0][0] = a2 + x2 - y2 - z2
-    rot[0][1] = 2 * (xy + az)
-    rot[0][2] = 2 * (zx - ay)
-    rot[1][0] = 2 * (xy - az)
-    rot[1][1] = a2 - x2 + y2 - z2
-    rot[1][2] = 2 * (yz + ax)
-    rot[2][0] = 2 * (zx + ay)
-    rot[2][1] = 2 * (yz - ax)
-    rot[2][2] = a2 - x2 - y2 + z2
+    rot[small] = np.eye(3)
 
-    return rmsd, rot, (q1, q2, q3, q4)
+    return rmsd, rot, q.T
 
 
 class QCPSuperimposer:
@@ -283,8 +314,7 @@ class QCPSuperimposer:
             raise PDBException("No transformation has been calculated yet")
 
         rot, tran = self.rotran
-        for atom in atom_list:
-            atom.transform(rot, tran)
+        _transform_atoms(atom_list, rot, tran)
 
     # Low(er) level functions
     def set(self, reference_coords, coords):
@@ -361,3 +391,210 @@ class QCPSuperimposer:
         if self.rms is None:
             raise PDBException("Nothing superimposed yet.")
         return self.rms
+
+
+class QCPBatchSuperimposer:
+    """Superimpose many coordinate sets on a reference in one vectorized call.
+
+    QCPBatchSuperimposer uses the QCP algorithm to find the best rotation
+    and translation to put each of K coordinate sets on top of a single
+    reference coordinate set, for example the models of an NMR ensemble or
+    the frames of a trajectory. The K superpositions are calculated at once
+    using NumPy array operations, and the rotation matrices, translation
+    vectors and RMSDs are returned as arrays of length K.
+
+    >>> from Bio.PDB import PDBParser
+    >>> from Bio.PDB.qcprot import QCPBatchSuperimposer
+    >>> parser = PDBParser(QUIET=True)
+    >>> structure = parser.get_structure("1LCD", "PDB/1LCD.pdb")
+    >>> models = list(structure)
+    >>> fixed = [models[0]["A"][i]["CA"] for i in range(1, 52)]
+    >>> moving = [[model["A"][i]["CA"] for i in range(1, 52)] for model in models]
+    >>> sup = QCPBatchSuperimposer()
+    >>> sup.set_atoms(fixed, moving)
+    >>> print(sup.get_rms().round(2))
+    [0.   0.78 1.12]
+    >>> rot, tran = sup.get_rotran()
+    >>> rot.shape, tran.shape
+    ((3, 3, 3), (3, 3))
+
+    The models can then be superimposed on the first model:
+
+    >>> sup.apply(models)
+    """
+
+    def __init__(self):
+        """Initialize the class."""
+        self._reset_properties()
+
+    # Private methods
+
+    def _reset_properties(self):
+        """Reset all relevant properties to None to avoid conflicts between runs."""
+        self.reference_coords = None
+        self.coords = None
+        self.transformed_coords = None
+        self.rot = None
+        self.tran = None
+        self.rms = None
+        self.init_rms = None
+        self.rotran = None
+
+    # Public methods
+    def set_atoms(self, fixed, moving):
+        """Prepare alignment of K atom lists on a fixed atom list.
+
+        Put (translate/rotate) the atoms in each list in moving on the atoms
+        in fixed, in such a way that the RMSD is minimized.
+
+        :param fixed: list of (fixed) atoms
+        :param moving: list of K lists of (moving) atoms, each of the same
+            length as fixed
+        """
+        fix_coord = np.array([a.get_coord() for a in fixed], dtype=np.float64)
+        mov_coord = [[a.get_coord() for a in atoms] for atoms in moving]
+        if any(len(atoms) != len(fixed) for atoms in mov_coord):
+            raise PDBException("Fixed and moving atom lists differ in size")
+        mov_coord = np.array(mov_coord, dtype=np.float64)
+
+        self.set(fix_coord, mov_coord)
+        self.run()
+
+    def set_entities(self, fixed, moving, indices=None):
+        """Prepare alignment of K entities on a fixed entity.
+
+        The coordinates of the atoms in each entity are obtained with the
+        get_coords method, which does not copy the coordinates of models,
+        chains, and residues created by the parsers. All entities must
+        therefore contain equivalent atoms in the same order, as is the case
+        for the models of an NMR ensemble.
+
+        :param fixed: the fixed entity, e.g. a Model
+        :param moving: list of K (moving) entities
+        :param indices: optional array of indices of the atoms (in the order
+            of get_atoms) used for the superposition, for example the indices
+            of the CA atoms. By default, all atoms are used.
+        """
+        fix_coord = np.asarray(fixed.get_coords(), dtype=np.float64)
+        mov_coord = [entity.get_coords() for entity in moving]
+        if any(len(coords) != len(fix_coord) for coords in mov_coord):
+            raise PDBException("Fixed and moving entities differ in size")
+        mov_coord = np.array(mov_coord, dtype=np.float64).reshape(-1, *fix_coord.shape)
+        if indices is not None:
+            fix_coord = fix_coord[indices]
+            mov_coord = mov_coord[:, indices]
+
+        self.set(fix_coord, mov_coord)
+        self.run()
+
+    def apply(self, moving, in_place=True):
+        """Apply the K rotations/translations to K entities or atom lists.
+
+        The k-th rotation matrix and translation vector are applied to the
+        k-th item in moving, which is either an entity (e.g. a Model) or a
+        list of atoms.
+
+        If in_place is True (default) and the coordinates of the atoms of an
+        entity are stored in a single array shared by its model (see
+        Entity.get_coords), this array is transformed in place, without
+        looping over the atoms; the coordinates then keep the data type of
+        the array. Otherwise, the coordinates of the atoms are replaced as
+        done by Entity.transform.
+        """
+        if self.rotran is None:
+            raise PDBException("No transformation has been calculated yet")
+
+        rot, tran = self.rotran
+        if len(moving) != len(rot):
+            raise PDBException(
+                f"Expected {len(rot)} entities or atom lists, found {len(moving)}"
+            )
+        for item, r, t in zip(moving, rot, tran):
+            if isinstance(item, Entity):
+                coords = item._get_shared_coords(complete=True) if in_place else None
+                if coords is None:
+                    item.transform(r, t)
+                else:
+                    coords[:] = np.dot(coords, r) + t
+            else:
+                _transform_atoms(item, r, t)
+
+    # Low(er) level functions
+    def set(self, reference_coords, coords):
+        """Set the coordinates to be superimposed.
+
+        Each of the K coordinate sets in coords will be put on top of
+        reference_coords.
+
+        - reference_coords: an Nx3 array
+        - coords: a KxNx3 array
+
+        N is the number of points to be superimposed.
+        """
+        self._reset_properties()
+
+        # store coordinates
+        self.reference_coords = reference_coords
+        self.coords = coords
+
+        if coords.ndim != 3 or coords.shape[1:] != reference_coords.shape:
+            raise PDBException("Coordinates must have the same dimensions.")
+        if coords.shape[2] != 3:
+            raise PDBException("Coordinates must be KxNx3 arrays.")
+        self._natoms = coords.shape[1]
+
+    def run(self):
+        """Superimpose the coordinate sets."""
+        if self.coords is None or self.reference_coords is None:
+            raise PDBException("No coordinates set.")
+
+        # Center Coordinates
+        com_coords = np.mean(self.coords, axis=1)
+        com_ref = np.mean(self.reference_coords, axis=0)
+
+        coords = self.coords - com_coords[:, np.newaxis]
+        coords_ref = self.reference_coords - com_ref
+
+        (self.rms, self.rot, _) = _qcp(coords_ref, coords, self._natoms)
+        self.tran = com_ref - np.matmul(com_coords[:, np.newaxis], self.rot)[:, 0]
+        self.rotran = (self.rot, self.tran)
+
+    # Getters
+    def get_transformed(self):
+        """Get the K transformed coordinate sets as a KxNx3 array."""
+        if self.coords is None or self.reference_coords is None:
+            raise PDBException("No coordinates set.")
+
+        if self.rot is None:
+            raise PDBException("Nothing is superimposed yet.")
+
+        self.transformed_coords = (
+            np.matmul(self.coords, self.rot) + self.tran[:, np.newaxis]
+        )
+        return self.transformed_coords
+
+    def get_rotran(self):
+        """Return right multiplying rotation matrices and translation vectors.
+
+        The rotation matrices are returned as a Kx3x3 array, and the
+        translation vectors as a Kx3 array.
+        """
+        if self.rot is None:
+            raise PDBException("Nothing is superimposed yet.")
+        return self.rot, self.tran
+
+    def get_init_rms(self):
+        """Return the RMSDs of the untransformed coordinates as an array."""
+        if self.coords is None:
+            raise PDBException("No coordinates set yet.")
+
+        if self.init_rms is None:
+            diff = self.coords - self.reference_coords
+            self.init_rms = np.sqrt(np.sum(diff * diff, axis=(1, 2)) / self._natoms)
+        return self.init_rms
+
+    def get_rms(self):
+        """Return the RMSDs of the superimposed coordinates as an array."""
+        if self.rms is None:
+            raise PDBException("Nothing superimposed yet.")
+        return self.rms
@@ -10,6 +10,12 @@
 import itertools
 import copy
 import numbers
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from Bio._utils import call_worker
+from Bio._utils import initialize_worker
 from Bio.Phylo import BaseTree
 from Bio.Align import Alignment, MultipleSeqAlignment
 from Bio.Align import substitution_matrices
@@ -36,8 +42,9 @@ class _Matrix:
     :Parameters:
         names : list
             names of elements, used for indexing
-        matrix : list
-            nested list of numerical lists in lower triangular format
+        matrix : list or numpy array
+            nested list of numerical lists in lower triangular format, or a
+            square NumPy array (of which the lower triangle is used)
 
     Examples
     --------
@@ -103,6 +110,14 @@ class _Matrix:
             # create a new one with 0 if matrix is not assigned
             matrix = [[0] * i for i in range(1, len(self) + 1)]
             self.matrix = matrix
+        elif isinstance(matrix, np.ndarray):
+            if matrix.shape != (len(names), len(names)):
+                raise ValueError("'names' and 'matrix' should be the same size")
+            if not np.issubdtype(matrix.dtype, np.number):
+                raise TypeError("'matrix' should be a numerical array")
+            # the rows are views of the lower triangle of a copy of the array
+            matrix = np.array(matrix, float)
+            self.matrix = [row[: i + 1] for i, row in enumerate(matrix)]
         else:
             # check if all elements are numbers
             if (
@@ -150,8 +165,8 @@ class _Matrix:
             # check index
             if index > len(self) - 1:
                 raise IndexError("Index out of range.")
-            return [self.matrix[index][i] for i in range(0, index)] + [
-                self.matrix[i][index] for i in range(index, len(self))
+            return [self._value(index, i) for i in range(0, index)] + [
+                self._value(i, index) for i in range(index, len(self))
             ]
         # Handle double indexing
         elif len(item) == 2:
@@ -172,12 +187,20 @@ class _Matrix:
             if row_index > len(self) - 1 or col_index > len(self) - 1:
                 raise IndexError("Index out of range.")
             if row_index > col_index:
-                return self.matrix[row_index][col_index]
+                return self._value(row_index, col_index)
             else:
-                return self.matrix[col_index][row_index]
+                return self._value(col_index, row_index)
         else:
             raise TypeError("Invalid index type.")
 
+    def _value(self, row_index, col_index):
+        """Return the value in the lower triangle as a Python number (PRIVATE)."""
+        value = self.matrix[row_index][col_index]
+        if isinstance(value, np.generic):
+            # the row is a view of a NumPy array
+            value = value.item()
+        return value
+
     def __setitem__(self, item, value):
         """Set value by the index(s) or name(s).
 
@@ -244,8 +267,17 @@ class _Matrix:
         else:
             raise TypeError("Invalid index type.")
 
+    def _to_lists(self):
+        """Convert the rows of a matrix backed by a NumPy array to lists (PRIVATE)."""
+        if any(isinstance(row, np.ndarray) for row in self.matrix):
+            self.matrix = [
+                row.tolist() if isinstance(row, np.ndarray) else row
+                for row in self.matrix
+            ]
+
     def __delitem__(self, item):
         """Delete related distances by the index or name."""
+        self._to_lists()
         index = None
         if isinstance(item, int):
             index = item
@@ -276,6 +308,7 @@ class _Matrix:
                 index = len(self)
             if not isinstance(index, int):
                 raise TypeError("Invalid index type.")
+            self._to_lists()
             # insert name
             self.names.insert(index, name)
             # insert elements of 0, to be assigned
@@ -293,8 +326,11 @@ class _Matrix:
 
     def __repr__(self):
         """Return Matrix as a string."""
+        matrix = [
+            row.tolist() if isinstance(row, np.ndarray) else row for row in self.matrix
+        ]
         return self.__class__.__name__ + "(names=%s, matrix=%s)" % tuple(
-            map(repr, (self.names, self.matrix))
+            map(repr, (self.names, matrix))
         )
 
     def __str__(self):
@@ -361,6 +397,75 @@ class DistanceMatrix(_Matrix):
 _DistanceMatrix = DistanceMatrix
 
 
+class _PairwiseDistances:
+    """Calculate the distances between two blocks of sequences (PRIVATE).
+
+    The sequences are stored as a matrix of letter codes, with one row for
+    each sequence and one column for each column of the alignment; letters
+    to be skipped have code ``size``. The columns are processed in chunks.
+    Each chunk is converted to one-hot encoded matrices, so that the
+    identity or substitution scores of all pairs of sequences are obtained
+    by matrix multiplication.
+    """
+
+    # maximum number of elements of the one-hot encoded matrices
+    max_elements = 2**22
+
+    def __init__(self, codes, size, scores=None):
+        self.codes = codes
+        self.size = size
+        if scores is None:
+            self.scores = None
+        else:
+            # add a row of zeros for the letters to be skipped
+            self.scores = np.zeros((size + 1, size))
+            self.scores[:size] = scores
+            self.diagonal = np.append(np.diagonal(scores), 0.0)
+
+    def _one_hot(self, codes):
+        """Return the one-hot encoding of a chunk of letter codes (PRIVATE)."""
+        letters = np.arange(self.size)
+        return (codes[:, :, None] == letters).reshape(len(codes), -1).astype(float)
+
+    def __call__(self, block):
+        """Return the distances between the sequences in the block."""
+        start1, end1, start2, end2 = block
+        codes1 = self.codes[start1:end1]
+        codes2 = self.codes[start2:end2]
+        n1 = len(codes1)
+        n2 = len(codes2)
+        length = self.codes.shape[1]
+        step = max(1, self.max_elements // (max(n1, n2, 1) * max(self.size, 1)))
+        score = np.zeros((n1, n2))
+        if self.scores is None:
+            for start in range(0, length, step):
+                end = start + step
+                onehot1 = self._one_hot(codes1[:, start:end])
+                onehot2 = self._one_hot(codes2[:, start:end])
+                score += onehot1 @ onehot2.T
+            # Score by character identity, not skipping any special letters
+            max_score = np.full((n1, n2), float(length))
+        else:
+            max_score1 = np.zeros((n1, n2))
+            max_score2 = np.zeros((n1, n2))
+            for start in range(0, length, step):
+                end = start + step
+                chunk1 = codes1[:, start:end]
+                chunk2 = codes2[:, start:end]
+                scores1 = self.scores[chunk1].reshape(n1, -1)
+                score += scores1 @ self._one_hot(chunk2).T
+                valid1 = (chunk1 < self.size).astype(float)
+                valid2 = (chunk2 < self.size).astype(float)
+                max_score1 += self.diagonal[chunk1] @ valid2.T
+                max_score2 += valid1 @ self.diagonal[chunk2].T
+            # Take the higher score if the matrix is asymmetrical
+            max_score = np.maximum(max_score1, max_score2)
+        distances = np.ones((n1, n2))
+        np.divide(score, max_score, out=distances, where=max_score != 0)
+        # max possible scaled distance if max_score is 0
+        return np.where(max_score != 0, 1 - distances, 1.0)
+
+
 class DistanceCalculator:
     """Calculates the distance matrix from a DNA or protein sequence alignment.
 
@@ -546,32 +651,83 @@ class DistanceCalculator:
             return 1  # max possible scaled distance
         return 1 - (score / max_score)
 
-    def get_distance(self, msa):
+    def get_distance(self, msa, processes=1):
         """Return a DistanceMatrix for an Alignment or MultipleSeqAlignment object.
 
         :Parameters:
             msa : Alignment or MultipleSeqAlignment object representing a
                 DNA or protein multiple sequence alignment.
-
+            processes : int
+                Number of worker processes used to calculate the distances
+                between blocks of sequences in parallel (default 1). If
+                None, the number of processors on the machine is used.
+
+        The alignment is encoded once as a matrix of letter codes, and the
+        distances between all pairs of sequences are calculated with NumPy.
+        The returned DistanceMatrix is backed by a NumPy array.
         """
         if isinstance(msa, Alignment):
             names = [s.id for s in msa.sequences]
-            dm = DistanceMatrix(names)
-            n = len(names)
-            for i1 in range(n):
-                for i2 in range(i1):
-                    dm[names[i1], names[i2]] = self._pairwise(msa[i1], msa[i2])
+            data, gaps = msa._get_matrix()
         elif isinstance(msa, MultipleSeqAlignment):
             names = [s.id for s in msa]
-            dm = DistanceMatrix(names)
-            for seq1, seq2 in itertools.combinations(msa, 2):
-                dm[seq1.id, seq2.id] = self._pairwise(seq1, seq2)
+            data = b"".join(bytes(s.seq) for s in msa)
+            data = np.frombuffer(data, np.uint8)
         else:
             raise TypeError(
                 "Must provide an Alignment object or a MultipleSeqAlignment object."
             )
-
-        return dm
+        n = len(names)
+        if n == 0:
+            return DistanceMatrix(names)
+        data = data.reshape(n, -1)
+        skip = np.zeros(256, bool)
+        skip[[ord(letter) for letter in self.skip_letters]] = True
+        if self.scoring_matrix is None:
+            alphabet = np.unique(data[~skip[data]])
+        else:
+            alphabet = [ord(letter) for letter in self.scoring_matrix.alphabet]
+        size = len(alphabet)
+        # code size for letters to be skipped, and size + 1 for bad letters
+        table = np.full(256, size + 1, np.intp)
+        table[alphabet] = np.arange(size)
+        table[skip] = size
+        codes = table[data]
+        bad = codes == size + 1
+        if bad.any():
+            # a bad letter is only used if it is aligned to a valid letter
+            bad &= (codes != size).sum(0) > 1
+            if bad.any():
+                index, position = np.argwhere(bad)[0]
+                letter = chr(data[index, position])
+                raise ValueError(
+                    f"Bad letter '{letter}' in sequence '{names[index]}' at position '{position}'"
+                )
+            codes[codes == size + 1] = size
+        if self.scoring_matrix is None:
+            function = _PairwiseDistances(codes, size)
+        else:
+            function = _PairwiseDistances(codes, size, np.array(self.scoring_matrix))
+        # calculate the lower triangle of the distance matrix in square blocks
+        step = 512
+        blocks = [
+            (start1, min(start1 + step, n), start2, min(start2 + step, n))
+            for start1 in range(0, n, step)
+            for start2 in range(0, start1 + 1, step)
+        ]
+        if processes == 1:
+            results = map(function, blocks)
+        else:
+            executor = ProcessPoolExecutor(
+                processes, initializer=initialize_worker, initargs=(function,)
+            )
+            with executor:
+                results = list(executor.map(call_worker, blocks))
+        matrix = np.zeros((n, n))
+        for (start1, end1, start2, end2), distances in zip(blocks, results):
+            matrix[start1:end1, start2:end2] = distances
+            matrix[start2:end2, start1:end1] = distances.T
+        return DistanceMatrix(names, matrix)
 
 
 class TreeConstructor:
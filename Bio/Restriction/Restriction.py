@@ -82,9 +82,12 @@ Notes about the diverses class of the restriction enzyme implementation::
 
 """
 
+import hashlib
 import itertools
+import math
 import re
 import string
+import threading
 import warnings
 
 from Bio import BiopythonWarning
@@ -625,7 +628,7 @@ class AbstractCut(RestrictionType):
         Equischizomer: same site, same position of restriction.
         """
         if not batch:
-            batch = AllEnzymes
+            batch = _all_enzymes()
         r = [x for x in batch if not cls != x]
         i = r.index(cls)
         del r[i]
@@ -642,7 +645,7 @@ class AbstractCut(RestrictionType):
         Neoschizomer: same site, different position of restriction.
         """
         if not batch:
-            batch = AllEnzymes
+            batch = _all_enzymes()
         r = sorted(x for x in batch if cls >> x)
         return r
 
@@ -654,7 +657,7 @@ class AbstractCut(RestrictionType):
         If batch is supplied it is used instead of the default AllEnzymes.
         """
         if not batch:
-            batch = AllEnzymes
+            batch = _all_enzymes()
         r = [x for x in batch if (cls >> x) or (not cls != x)]
         i = r.index(cls)
         del r[i]
@@ -970,7 +973,18 @@ class Palindromic(AbstractCut):
         Implement the search method for palindromic enzymes.
         """
         siteloc = cls.dna.finditer(cls.compsite, cls.size)
-        cls.results = [r for s, g in siteloc for r in cls._modify(s)]
+        return cls._cut_sites([s for s, g in siteloc])
+
+    @classmethod
+    def _cut_sites(cls, sites):
+        """Return the cutting sites for the given site locations (PRIVATE).
+
+        For internal use only.
+
+        sites is the sorted list of the locations of the recognition site in
+        cls.dna; this is also used by RestrictionBatch.search.
+        """
+        cls.results = [r for s in sites for r in cls._modify(s)]
         if cls.results:
             cls._drop()
         return cls.results
@@ -999,17 +1013,30 @@ class NonPalindromic(AbstractCut):
         Implement the search method for non palindromic enzymes.
         """
         iterator = cls.dna.finditer(cls.compsite, cls.size)
-        cls.results = []
-        modif = cls._modify
-        revmodif = cls._rev_modify
         s = str(cls)
-        cls.on_minus = []
-
+        sites = []
+        minus_sites = []
         for start, group in iterator:
             if group(s):
-                cls.results += list(modif(start))
+                sites.append(start)
             else:
-                cls.on_minus += list(revmodif(start))
+                minus_sites.append(start)
+        return cls._cut_sites(sites, minus_sites)
+
+    @classmethod
+    def _cut_sites(cls, sites, minus_sites):
+        """Return the cutting sites for the given site locations (PRIVATE).
+
+        For internal use only.
+
+        sites and minus_sites are the locations of the recognition site in
+        cls.dna on the current and the antiparallel strand, respectively;
+        this is also used by RestrictionBatch.search.
+        """
+        modif = cls._modify
+        revmodif = cls._rev_modify
+        cls.results = [r for start in sites for r in modif(start)]
+        cls.on_minus = [r for start in minus_sites for r in revmodif(start)]
         cls.results += cls.on_minus
 
         if cls.results:
@@ -1232,8 +1259,8 @@ class Blunt(AbstractCut):
     def compatible_end(cls, batch=None):
         """List all enzymes that produce compatible ends for the enzyme."""
         if not batch:
-            batch = AllEnzymes
-        r = sorted(x for x in iter(AllEnzymes) if x.is_blunt())
+            batch = _all_enzymes()
+        r = sorted(x for x in iter(_all_enzymes()) if x.is_blunt())
         return r
 
     @staticmethod
@@ -1362,8 +1389,8 @@ class Ov5(AbstractCut):
     def compatible_end(cls, batch=None):
         """List all enzymes that produce compatible ends for the enzyme."""
         if not batch:
-            batch = AllEnzymes
-        r = sorted(x for x in iter(AllEnzymes) if x.is_5overhang() and x % cls)
+            batch = _all_enzymes()
+        r = sorted(x for x in iter(_all_enzymes()) if x.is_5overhang() and x % cls)
         return r
 
     @classmethod
@@ -1495,8 +1522,8 @@ class Ov3(AbstractCut):
     def compatible_end(cls, batch=None):
         """List all enzymes that produce compatible ends for the enzyme."""
         if not batch:
-            batch = AllEnzymes
-        r = sorted(x for x in iter(AllEnzymes) if x.is_3overhang() and x % cls)
+            batch = _all_enzymes()
+        r = sorted(x for x in iter(_all_enzymes()) if x.is_3overhang() and x % cls)
         return r
 
     @classmethod
@@ -1983,13 +2010,203 @@ class Not_available(AbstractCut):
 ###############################################################################
 
 
+class _SiteFinder:
+    """Find the recognition sites of many enzymes in a single pass (PRIVATE).
+
+    The regular expression of each recognition site (and of its reverse
+    complement for non-palindromic enzymes) is compiled into a list of
+    allowed letters at each position. For each site, the most specific run
+    of up to eight non-N positions is used as an anchor; the anchors of all
+    sites are collected in one lookup table per anchor length, keyed by the
+    k-mer code of the anchor. The sequence is encoded once, the k-mers at
+    all positions are looked up in the tables, and each candidate location
+    is then checked against the remaining positions of the site.
+
+    Enzymes with a recognition site that cannot be compiled in this way are
+    searched with their own search method.
+    """
+
+    _max_anchor = 8
+    _max_variants = 16
+    _site_pattern = re.compile(r"\(\?=\(\?P<(\w+)>([ACGT.\[\]]+)\)\)")
+    _site_element = re.compile(r"\[([ACGT]+)\]|([ACGT.])")
+
+    def __init__(self, enzymes):
+        """Compile the recognition sites of the enzymes."""
+        self.enzymes = frozenset(enzymes)
+        self.other = []
+        self.sites = {}
+        # per anchor length, map the k-mer code to (pattern, offset) pairs
+        self.anchors = {}
+        self.patterns = []
+        for enzyme in self.enzymes:
+            patterns = self._compile(enzyme)
+            if patterns is None:
+                self.other.append(enzyme)
+                continue
+            indices = ([], [])
+            for name, elements in patterns:
+                anchor = self._select_anchor(elements)
+                if anchor is None:
+                    break
+                forward = name == enzyme.__name__ or issubclass(enzyme, Palindromic)
+                indices[not forward].append(len(self.patterns))
+                self.patterns.append((enzyme, elements, anchor))
+            else:
+                self.sites[enzyme] = indices
+                continue
+            # undo the patterns of this enzyme, and use its own search method
+            del self.patterns[len(self.patterns) - len(indices[0]) - len(indices[1]) :]
+            self.other.append(enzyme)
+        for index, (enzyme, elements, (start, end)) in enumerate(self.patterns):
+            table = self.anchors.setdefault(end - start, {})
+            for letters in itertools.product(*elements[start:end]):
+                code = 0
+                for letter in letters:
+                    code = 4 * code + "ACGT".index(letter)
+                table.setdefault(code, []).append((index, start))
+
+    @classmethod
+    def _compile(cls, enzyme):
+        """Return the site patterns of the enzyme, or None (PRIVATE).
+
+        Each pattern is a tuple of the group name in the regular expression
+        and the list of allowed letters at each position ("." for any).
+        """
+        try:
+            compsite = enzyme.compsite.pattern
+        except AttributeError:
+            return None
+        if not issubclass(enzyme, (Palindromic, NonPalindromic)):
+            return None
+        patterns = []
+        for alternative in compsite.split("|"):
+            match = cls._site_pattern.fullmatch(alternative)
+            if match is None:
+                return None
+            name, regex = match.groups()
+            elements = []
+            position = 0
+            for element in cls._site_element.finditer(regex):
+                if element.start() != position:
+                    return None
+                position = element.end()
+                elements.append(element.group(1) or element.group(2))
+            if position != len(regex) or not elements:
+                return None
+            patterns.append((name, elements))
+        return patterns
+
+    @classmethod
+    def _select_anchor(cls, elements):
+        """Return the start and end of the most specific anchor (PRIVATE)."""
+        best = None
+        for start in range(len(elements)):
+            variants = 1
+            score = 0
+            for end in range(start, min(start + cls._max_anchor, len(elements))):
+                letters = elements[end]
+                variants *= len(letters)
+                if letters == "." or variants > cls._max_variants:
+                    break
+                score += 2 - math.log2(len(letters))
+                if best is None or score > best[0]:
+                    best = (score, start, end + 1)
+        if best is None:
+            return None
+        return best[1:]
+
+    def search(self, dna):
+        """Return a dictionary with the cutting sites of each enzyme."""
+        # NumPy is imported here, as it is not needed to use single enzymes
+        import numpy as np
+
+        size = max((enzyme.size for enzyme in self.sites), default=1)
+        if dna.is_linear():
+            data = dna.data
+        else:
+            data = dna.data + dna.data[1:size]
+        codes = np.full(256, 4, np.uint8)
+        codes[list(b"ACGT")] = range(4)
+        codes = codes[np.frombuffer(data.encode("ASCII"), np.uint8)]
+        length = len(dna.data)
+        candidates = [[] for pattern in self.patterns]
+        invalid = codes == 4
+        letters = np.where(invalid, 0, codes).astype(np.int64)
+        kmers = letters
+        for k in range(1, max(self.anchors, default=0) + 1):
+            if k > 1:
+                # k-mers starting at each position, and if they contain
+                # letters other than A, C, G, T
+                kmers = 4 * kmers[:-1] + letters[k - 1 :]
+                invalid = invalid[:-1] | (codes[k - 1 :] == 4)
+            try:
+                table = self.anchors[k]
+            except KeyError:
+                continue
+            lookup = np.zeros(4**k, bool)
+            lookup[list(table)] = True
+            positions = np.flatnonzero(lookup[kmers] & ~invalid)
+            found = kmers[positions]
+            order = np.argsort(found, kind="stable")
+            positions = positions[order]
+            found = found[order]
+            values, starts = np.unique(found, return_index=True)
+            for code, group in zip(values.tolist(), np.split(positions, starts[1:])):
+                for index, offset in table[code]:
+                    candidates[index].append(group - offset)
+        locations = []
+        for (enzyme, elements, anchor), found in zip(self.patterns, candidates):
+            if found:
+                found = np.sort(np.concatenate(found))
+            else:
+                found = np.zeros(0, np.int64)
+            # last location of the site, as in FormattedSeq.finditer
+            if dna.is_linear():
+                end = length - len(elements)
+            else:
+                end = length + min(enzyme.size, length) - 1 - len(elements)
+            found = found[(found >= 0) & (found <= end)]
+            for position, letters in enumerate(elements):
+                if letters == "." or anchor[0] <= position < anchor[1]:
+                    continue
+                allowed = np.zeros(5, bool)
+                allowed[["ACGT".index(letter) for letter in letters]] = True
+                found = found[allowed[codes[found + position]]]
+            locations.append(found)
+        mapping = {}
+        for enzyme, (forward, reverse) in self.sites.items():
+            enzyme.dna = dna
+            sites = [locations[index] for index in forward]
+            if len(sites) == 1:
+                sites = sites[0]
+            elif sites:
+                sites = np.unique(np.concatenate(sites))
+            else:
+                sites = np.zeros(0, int)
+            if issubclass(enzyme, Palindromic):
+                mapping[enzyme] = enzyme._cut_sites(sites.tolist())
+            else:
+                minus_sites = [locations[index] for index in reverse]
+                if minus_sites:
+                    minus_sites = np.unique(np.concatenate(minus_sites))
+                    # a location matching both strands is only reported once
+                    minus_sites = minus_sites[~np.isin(minus_sites, sites)]
+                mapping[enzyme] = enzyme._cut_sites(
+                    sites.tolist(), np.asarray(minus_sites, int).tolist()
+                )
+        for enzyme in self.other:
+            mapping[enzyme] = enzyme.search(dna)
+        return mapping
+
+
 class RestrictionBatch(set):
     """Class for operations on more than one enzyme."""
 
     def __init__(self, first=(), suppliers=()):
         """Initialize empty RB or pre-fill with enzymes (from supplier)."""
         first = [self.format(x) for x in first]
-        first += [eval(x) for n in suppliers for x in suppliers_dict[n][1]]
+        first += [_get_enzyme(x) for n in suppliers for x in suppliers_dict[n][1]]
         set.__init__(self, first)
         self.mapping = dict.fromkeys(self)
         self.already_mapped = None
@@ -2077,7 +2294,7 @@ class RestrictionBatch(set):
         supplier = suppliers_dict[letter]
         self.suppliers.append(letter)
         for x in supplier[1]:
-            self.add_nocheck(eval(x))
+            self.add_nocheck(_get_enzyme(x))
 
     def current_suppliers(self):
         """List the current suppliers for the restriction batch.
@@ -2138,6 +2355,8 @@ class RestrictionBatch(set):
         try:
             if isinstance(y, RestrictionType):
                 return y
+            elif str(y) in enzymedict:
+                return _get_enzyme(str(y))
             elif isinstance(eval(str(y)), RestrictionType):
                 return eval(y)
         except (NameError, SyntaxError):
@@ -2149,8 +2368,10 @@ class RestrictionBatch(set):
 
         True if y or eval(y) is a RestrictionType.
         """
-        return isinstance(y, RestrictionType) or isinstance(
-            eval(str(y)), RestrictionType
+        return (
+            isinstance(y, RestrictionType)
+            or str(y) in enzymedict
+            or isinstance(eval(str(y)), RestrictionType)
         )
 
     def split(self, *classes, **bool):
@@ -2212,32 +2433,35 @@ class RestrictionBatch(set):
         """Return a dic of cutting sites in the seq for the batch enzymes."""
         #
         #   here we replace the search method of the individual enzymes
-        #   with one unique testing method.
+        #   with one unique testing method, which finds the sites of all
+        #   enzymes in a single pass over the sequence.
         #
-        if not hasattr(self, "already_mapped"):
-            # TODO - Why does this happen!
-            # Try the "doctest" at the start of PrintFormat.py
-            self.already_mapped = None
         if isinstance(dna, DNA):
-            # For the searching, we just care about the sequence as a string,
-            # if that is the same we can use the cached search results.
-            # At the time of writing, Seq == method isn't implemented,
-            # and therefore does object identity which is stricter.
-            if (str(dna), linear) == self.already_mapped:
-                return self.mapping
-            else:
-                self.already_mapped = str(dna), linear
-                fseq = FormattedSeq(dna, linear)
-                self.mapping = {x: x.search(fseq) for x in self}
-                return self.mapping
+            # For the searching, we just care about the sequence, so if it
+            # is the same we can use the cached search results. Only a
+            # checksum of the sequence is kept, not a copy.
+            key = hashlib.sha256(bytes(dna)).digest(), linear
         elif isinstance(dna, FormattedSeq):
-            if (str(dna), dna.linear) == self.already_mapped:
-                return self.mapping
-            else:
-                self.already_mapped = str(dna), dna.linear
-                self.mapping = {x: x.search(dna) for x in self}
-                return self.mapping
-        raise TypeError(f"Expected Seq or MutableSeq instance, got {type(dna)} instead")
+            key = hashlib.sha256(dna.data.encode("ASCII")).digest(), dna.linear
+        else:
+            raise TypeError(
+                f"Expected Seq or MutableSeq instance, got {type(dna)} instead"
+            )
+        # The attributes may be missing if the batch was created by a set
+        # operation, which does not call __init__.
+        mapping = getattr(self, "mapping", None)
+        if key == getattr(self, "already_mapped", None) and mapping.keys() == self:
+            return mapping
+        finder = getattr(self, "_finder", None)
+        if finder is None or finder.enzymes != self:
+            finder = _SiteFinder(self)
+            self._finder = finder
+        if isinstance(dna, DNA):
+            dna = FormattedSeq(dna, linear)
+        mapping = finder.search(dna)
+        self.mapping = {x: mapping[x] for x in self}
+        self.already_mapped = key
+        return self.mapping
 
 
 ###############################################################################
@@ -2432,7 +2656,7 @@ class Analysis(RestrictionBatch, PrintFormat):
     def with_name(self, names, dct=None):
         """Return only results from enzymes which names are listed."""
         for i, enzyme in enumerate(names):
-            if enzyme not in AllEnzymes:
+            if enzyme not in _all_enzymes():
                 warnings.warn(f"no data for the enzyme: {enzyme}", BiopythonWarning)
                 del names[i]
         if not dct:
@@ -2552,8 +2776,8 @@ class Analysis(RestrictionBatch, PrintFormat):
 
 
 #
-#   The restriction enzyme classes are created dynamically when the module is
-#   imported. Here is the magic which allow the creation of the
+#   The restriction enzyme classes are created dynamically, when they are
+#   first used. Here is the magic which allow the creation of the
 #   restriction-enzyme classes.
 #
 #   The reason for the two dictionaries in Restriction_Dictionary
@@ -2562,69 +2786,124 @@ class Analysis(RestrictionBatch, PrintFormat):
 #   and one for the enzymes is efficiency as the bases are evaluated
 #   once per pseudo-type.
 #
-#   However Restriction is still a very inefficient module at import. But
-#   remember that around 660 classes (which is more or less the size of Rebase)
-#   have to be created dynamically. However, this processing take place only
-#   once.
-#   This inefficiency is however largely compensated by the use of metaclass
-#   which provide a very efficient layout for the class themselves mostly
-#   alleviating the need of if/else loops in the class methods.
+#   Creating around 1000 classes (which is more or less the size of Rebase)
+#   and compiling their regular expressions is slow, so an enzyme class is
+#   only created when it is first accessed as an attribute of this module
+#   (via the module __getattr__ function), and the AllEnzymes, CommOnly and
+#   NonComm batches are only created when they are first used. The enzyme
+#   data itself is loaded from the (byte-compiled) Restriction_Dictionary.
+#   The use of metaclass provides a very efficient layout for the class
+#   themselves mostly alleviating the need of if/else loops in the class
+#   methods.
 #
-#   It is essential to run Restriction with doc string optimisation (-OO
-#   switch) as the doc string of 660 classes take a lot of processing.
+#   The pseudo-type of each enzyme:
+_enzyme_types = {
+    k: TYPE for TYPE, (bases, enzymes) in typedict.items() for k in enzymes
+}
+_pseudo_types = {}
 #
-CommOnly = RestrictionBatch()  # commercial enzymes
-NonComm = RestrictionBatch()  # not available commercially
-for TYPE, (bases, enzymes) in typedict.items():
-    #
-    #   The keys are the pseudo-types TYPE (stored as type1, type2...)
-    #   The names are not important and are only present to differentiate
-    #   the keys in the dict. All the pseudo-types are in fact RestrictionType.
-    #   These names will not be used after and the pseudo-types are not
-    #   kept in the locals() dictionary. It is therefore impossible to
-    #   import them.
-    #   Now, if you have look at the dictionary, you will see that not all the
-    #   types are present as those without corresponding enzymes have been
-    #   removed by Dictionary_Builder().
-    #
-    #   The values are tuples which contain
-    #   as first element a tuple of bases (as string) and
-    #   as second element the names of the enzymes.
-    #
-    #   First eval the bases.
-    #
-    bases2 = tuple(eval(x) for x in bases)
-    #
-    #   now create the particular value of RestrictionType for the classes
-    #   in enzymes.
-    #
-    T = type.__new__(RestrictionType, "RestrictionType", bases2, {})
-    for k in enzymes:
-        #
-        #   Now, we go through all the enzymes and assign them their type.
-        #   enzymedict[k] contains the values of the attributes for this
-        #   particular class (self.site, self.ovhg,....).
+#   The enzymes and batches are created while holding this lock, so that
+#   threads accessing them for the first time get the same objects.
+#
+_lock = threading.RLock()
+#
+#   The batches of enzymes, created by _all_enzymes:
+#
+AllEnzymes: "RestrictionBatch"
+CommOnly: "RestrictionBatch"
+NonComm: "RestrictionBatch"
+
+
+def _get_enzyme(name):
+    """Return the enzyme class with the given name, creating it if needed (PRIVATE).
+
+    Raises a KeyError if there is no enzyme with this name.
+    """
+    try:
+        return globals()[name]
+    except KeyError:
+        pass
+    with _lock:
+        try:
+            return globals()[name]
+        except KeyError:
+            return _create_enzyme(name)
+
+
+def _create_enzyme(name):
+    """Create the enzyme class with the given name (PRIVATE)."""
+    TYPE = _enzyme_types[name]
+    try:
+        T, bases2 = _pseudo_types[TYPE]
+    except KeyError:
         #
-        newenz = T(k, bases2, enzymedict[k])
+        #   The values of typedict are tuples which contain as first element
+        #   a tuple of bases (as string) and as second element the names of
+        #   the enzymes. The pseudo-types are not placed in the module, so it
+        #   is impossible to import them.
         #
-        #   we add the enzymes to the corresponding batch.
+        bases = typedict[TYPE][0]
+        bases2 = tuple(globals()[x] for x in bases)
+        T = type.__new__(RestrictionType, "RestrictionType", bases2, {})
+        _pseudo_types[TYPE] = T, bases2
+    #
+    #   enzymedict[name] contains the values of the attributes for this
+    #   particular class (self.site, self.ovhg,....).
+    #
+    newenz = T(name, bases2, enzymedict[name])
+    globals()[name] = newenz
+    return newenz
+
+
+def _all_enzymes():
+    """Return the AllEnzymes batch, creating the batches if needed (PRIVATE)."""
+    try:
+        return globals()["AllEnzymes"]
+    except KeyError:
+        pass
+    with _lock:
+        try:
+            return globals()["AllEnzymes"]
+        except KeyError:
+            pass
+        CommOnly = RestrictionBatch()  # commercial enzymes
+        NonComm = RestrictionBatch()  # not available commercially
+        for bases, enzymes in typedict.values():
+            for k in enzymes:
+                newenz = _get_enzyme(k)
+                #
+                #   No need to verify the enzyme is a RestrictionType -> add_nocheck
+                #
+                if newenz.is_comm():
+                    CommOnly.add_nocheck(newenz)
+                else:
+                    NonComm.add_nocheck(newenz)
         #
-        #   No need to verify the enzyme is a RestrictionType -> add_nocheck
+        #   AllEnzymes is a RestrictionBatch with all the enzymes from Rebase.
         #
-        if newenz.is_comm():
-            CommOnly.add_nocheck(newenz)
-        else:
-            NonComm.add_nocheck(newenz)
-#
-#   AllEnzymes is a RestrictionBatch with all the enzymes from Rebase.
-#
-AllEnzymes = RestrictionBatch(CommOnly)
-AllEnzymes.update(NonComm)
-#
-#   Now, place the enzymes in locals so they can be imported.
-#
-names = [str(x) for x in AllEnzymes]
-locals().update(dict(zip(names, AllEnzymes)))
+        AllEnzymes = RestrictionBatch(CommOnly)
+        AllEnzymes.update(NonComm)
+        globals().update(CommOnly=CommOnly, NonComm=NonComm)
+        # AllEnzymes is stored last, as it marks the batches as created
+        globals()["AllEnzymes"] = AllEnzymes
+        return AllEnzymes
+
+
+def __getattr__(name):
+    """Create the enzyme classes and batches when they are first used."""
+    if name in ("AllEnzymes", "CommOnly", "NonComm"):
+        _all_enzymes()
+        return globals()[name]
+    if name in _enzyme_types:
+        return _get_enzyme(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    """Include the enzymes that were not created yet."""
+    return sorted(set(globals()) | set(__all__))
+
+
 __all__ = (
     "FormattedSeq",
     "Analysis",
@@ -2632,5 +2911,4 @@ __all__ = (
     "AllEnzymes",
     "CommOnly",
     "NonComm",
-) + tuple(names)
-del k, enzymes, TYPE, bases, bases2, names
+) + tuple(_enzyme_types)
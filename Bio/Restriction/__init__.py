@@ -50,7 +50,26 @@ Examples
 
 """  # noqa: W291, W293
 
-from Bio.Restriction.Restriction import *  # noqa (legacy module arrangement)
+from Bio.Restriction import Restriction
+from Bio.Restriction.Restriction import Analysis
+from Bio.Restriction.Restriction import FormattedSeq
+from Bio.Restriction.Restriction import RestrictionBatch
+
+# The enzymes and the AllEnzymes, CommOnly and NonComm batches are created by
+# the Restriction module when they are first used (legacy module arrangement).
+__all__ = Restriction.__all__
+
+
+def __getattr__(name):
+    """Return the enzymes and batches from the Restriction module."""
+    if name in __all__:
+        return getattr(Restriction, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    """Include the enzymes that were not created yet."""
+    return sorted(set(globals()) | set(__all__))
 
 
 #
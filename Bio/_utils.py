@@ -88,5 +88,26 @@ def run_doctest(target_dir: Optional[str] = None, *args: Any, **kwargs: Any) ->
     print("Done")
 
 
+_worker_function: Optional[Callable[..., Any]] = None
+
+
+def initialize_worker(function: Callable[..., Any]) -> None:
+    """Store the function to be called by a worker process.
+
+    Use this as the initializer of a ProcessPoolExecutor, with the function
+    as its only argument, and submit call_worker to the executor. The
+    function is then pickled once for each worker process instead of once
+    for each task.
+    """
+    global _worker_function
+    _worker_function = function
+
+
+def call_worker(*args: Any) -> Any:
+    """Call the function stored by initialize_worker in this worker process."""
+    assert _worker_function is not None
+    return _worker_function(*args)
+
+
 if __name__ == "__main__":
     run_doctest()
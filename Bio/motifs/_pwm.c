@@ -188,12 +188,288 @@ py_calculate(PyObject* self, PyObject* args, PyObject* keywords)
     return result;
 }
 
+/* Code of each letter used by scan; 4 means an ambiguous or invalid letter.
+ * Initialized when the module is imported. */
+static signed char table[256];
+
+/* Hits found by scan, stored in arrays that grow as needed. */
+typedef struct {
+    Py_ssize_t* positions;
+    int* motifs;
+    float* scores;
+    Py_ssize_t size;
+    Py_ssize_t allocated;
+} Hits;
+
+static int
+Hits_append(Hits* hits, Py_ssize_t position, int motif, float score)
+{
+    if (hits->size == hits->allocated) {
+        Py_ssize_t allocated = hits->allocated ? 2 * hits->allocated : 1024;
+        Py_ssize_t* positions;
+        int* motifs;
+        float* scores;
+        positions = PyMem_RawRealloc(hits->positions,
+                                     allocated * sizeof(Py_ssize_t));
+        if (!positions) return 0;
+        hits->positions = positions;
+        motifs = PyMem_RawRealloc(hits->motifs, allocated * sizeof(int));
+        if (!motifs) return 0;
+        hits->motifs = motifs;
+        scores = PyMem_RawRealloc(hits->scores, allocated * sizeof(float));
+        if (!scores) return 0;
+        hits->scores = scores;
+        hits->allocated = allocated;
+    }
+    hits->positions[hits->size] = position;
+    hits->motifs[hits->size] = motif;
+    hits->scores[hits->size] = score;
+    hits->size++;
+    return 1;
+}
+
+static void
+Hits_clear(Hits* hits)
+{
+    PyMem_RawFree(hits->positions);
+    PyMem_RawFree(hits->motifs);
+    PyMem_RawFree(hits->scores);
+}
+
+/* Scan the sequence for all motifs, for starting positions in the range
+ * [start, end). The log-odds scores of the motifs are stored consecutively
+ * in matrix, with motif k starting at row offsets[k] and ending before row
+ * offsets[k+1]. Returns 0 if memory could not be allocated.
+ *
+ * The sequence is encoded only once. For each position in a motif, the
+ * highest score that can still be obtained for the remaining positions is
+ * precomputed, so that the score calculation can stop as soon as the
+ * threshold can no longer be reached.
+ *
+ * This function does not use the Python C API, and is called without
+ * holding the GIL. */
+static int
+scan(const char sequence[], Py_ssize_t length, Py_ssize_t start,
+     Py_ssize_t end, const double* matrix, const Py_ssize_t* offsets,
+     const float* thresholds, int nmotifs, Hits* hits)
+{
+    signed char* codes;
+    double* bounds;
+    Py_ssize_t i, j, n, m, maxlen = 0;
+    Py_ssize_t total = offsets[nmotifs];
+    int k, ok = 1;
+
+    for (k = 0; k < nmotifs; k++) {
+        m = offsets[k+1] - offsets[k];
+        if (m > maxlen) maxlen = m;
+    }
+    n = end + maxlen - 1;
+    if (n > length) n = length;
+    if (n <= start) return 1;
+    n -= start;
+    codes = PyMem_RawMalloc(n);
+    bounds = PyMem_RawMalloc((total + nmotifs) * sizeof(double));
+    if (!codes || !bounds) {
+        ok = 0;
+        goto exit;
+    }
+    /* Handling mixed case input here rather than converting it to uppercase
+       first, since doing so could use too much memory if the sequence is
+       too long (e.g. chromosome or plasmid). */
+    for (i = 0; i < n; i++)
+        codes[i] = table[(unsigned char)sequence[start+i]];
+    for (k = 0; k < nmotifs; k++) {
+        /* bounds[offsets[k] + k + j] is the highest score of positions j
+           and beyond of motif k */
+        double* bound = bounds + offsets[k] + k;
+        m = offsets[k+1] - offsets[k];
+        bound[m] = 0.0;
+        for (j = m - 1; j >= 0; j--) {
+            const double* row = matrix + 4 * (offsets[k] + j);
+            double best = row[0];
+            if (row[1] > best) best = row[1];
+            if (row[2] > best) best = row[2];
+            if (row[3] > best) best = row[3];
+            bound[j] = bound[j+1] + best;
+        }
+    }
+    for (k = 0; k < nmotifs; k++) {
+        const double* motif = matrix + 4 * offsets[k];
+        const double* bound = bounds + offsets[k] + k;
+        const float threshold = thresholds[k];
+        /* allow for the rounding of the score to single precision */
+        const double cutoff = threshold - 1e-5 * (fabs(threshold) + 1.0);
+        Py_ssize_t last;
+        m = offsets[k+1] - offsets[k];
+        last = n - m + 1;
+        if (last > end - start) last = end - start;
+        if (bound[0] < cutoff) continue;
+        for (i = 0; i < last; i++) {
+            const signed char* c = codes + i;
+            double score = 0.0;
+            for (j = 0; j < m; j++) {
+                if (c[j] == 4) break;
+                score += motif[4*j+c[j]];
+                if (score + bound[j+1] < cutoff) break;
+            }
+            if (j < m) continue;
+            if ((float)score >= threshold) {
+                if (!Hits_append(hits, start + i, k, (float)score)) {
+                    ok = 0;
+                    goto exit;
+                }
+            }
+        }
+    }
+exit:
+    PyMem_RawFree(codes);
+    PyMem_RawFree(bounds);
+    return ok;
+}
+
+static char scan__doc__[] =
+"    scan(sequence, matrix, lengths, thresholds, start, end)\n"
+"\n"
+"This function finds the hits of several position-weight matrices along\n"
+"the sequence, for starting positions from start up to end. The rows of\n"
+"the matrices are stored consecutively in matrix, with one row per motif\n"
+"position and four columns (A, C, G, T); lengths and thresholds are lists\n"
+"with the length and the score threshold of each motif. Positions with an\n"
+"ambiguous letter are skipped. The GIL is released during the scan.\n"
+"\n"
+"Returns three bytearrays with the start positions (Py_ssize_t), the\n"
+"motif indices (int), and the scores (float) of the hits.\n";
+
+static PyObject*
+py_scan(PyObject* self, PyObject* args, PyObject* keywords)
+{
+    static char* kwlist[] = {"sequence", "matrix", "lengths", "thresholds",
+                             "start", "end", NULL};
+    Py_buffer sequence;
+    Py_buffer matrix;
+    PyObject* lengths;
+    PyObject* thresholds;
+    PyObject* items;
+    Py_ssize_t start;
+    Py_ssize_t end;
+    Py_ssize_t* offsets = NULL;
+    float* cutoffs = NULL;
+    Py_ssize_t i, nmotifs;
+    Hits hits = {NULL, NULL, NULL, 0, 0};
+    PyObject* result = NULL;
+    PyObject* positions = NULL;
+    PyObject* motifs = NULL;
+    PyObject* scores = NULL;
+    int ok;
+
+    sequence.obj = NULL;
+    matrix.obj = NULL;
+    if (!PyArg_ParseTupleAndKeywords(args, keywords, "y*O&OOnn", kwlist,
+                                     &sequence,
+                                     matrix_converter, &matrix,
+                                     &lengths, &thresholds,
+                                     &start, &end)) return NULL;
+
+    items = PySequence_Fast(lengths, "lengths should be a sequence");
+    if (!items) goto exit;
+    nmotifs = PySequence_Fast_GET_SIZE(items);
+    if (nmotifs > INT_MAX) {
+        Py_DECREF(items);
+        PyErr_SetString(PyExc_ValueError, "too many motifs");
+        goto exit;
+    }
+    offsets = PyMem_RawMalloc((nmotifs + 1) * sizeof(Py_ssize_t));
+    cutoffs = PyMem_RawMalloc((nmotifs + 1) * sizeof(float));
+    if (!offsets || !cutoffs) {
+        Py_DECREF(items);
+        PyErr_NoMemory();
+        goto exit;
+    }
+    offsets[0] = 0;
+    for (i = 0; i < nmotifs; i++) {
+        Py_ssize_t m = PyNumber_AsSsize_t(PySequence_Fast_GET_ITEM(items, i),
+                                          PyExc_OverflowError);
+        if (m == -1 && PyErr_Occurred()) {
+            Py_DECREF(items);
+            goto exit;
+        }
+        if (m < 1) {
+            Py_DECREF(items);
+            PyErr_SetString(PyExc_ValueError,
+                            "motif lengths should be positive");
+            goto exit;
+        }
+        offsets[i+1] = offsets[i] + m;
+    }
+    Py_DECREF(items);
+    if (offsets[nmotifs] != matrix.shape[0]) {
+        PyErr_Format(PyExc_ValueError,
+            "matrix has %zd rows, but the motif lengths add up to %zd",
+            matrix.shape[0], offsets[nmotifs]);
+        goto exit;
+    }
+    items = PySequence_Fast(thresholds, "thresholds should be a sequence");
+    if (!items) goto exit;
+    if (PySequence_Fast_GET_SIZE(items) != nmotifs) {
+        Py_DECREF(items);
+        PyErr_SetString(PyExc_ValueError,
+                        "number of thresholds and motifs differ");
+        goto exit;
+    }
+    for (i = 0; i < nmotifs; i++) {
+        cutoffs[i] = (float)PyFloat_AsDouble(PySequence_Fast_GET_ITEM(items, i));
+        if (PyErr_Occurred()) {
+            Py_DECREF(items);
+            goto exit;
+        }
+    }
+    Py_DECREF(items);
+    if (start < 0) start = 0;
+    if (end > sequence.len) end = sequence.len;
+
+    Py_BEGIN_ALLOW_THREADS
+    ok = scan(sequence.buf, sequence.len, start, end, matrix.buf, offsets,
+              cutoffs, (int)nmotifs, &hits);
+    Py_END_ALLOW_THREADS
+    if (!ok) {
+        PyErr_NoMemory();
+        goto exit;
+    }
+
+    positions = PyByteArray_FromStringAndSize((const char*)hits.positions,
+                                              hits.size * sizeof(Py_ssize_t));
+    if (!positions) goto exit;
+    motifs = PyByteArray_FromStringAndSize((const char*)hits.motifs,
+                                           hits.size * sizeof(int));
+    if (!motifs) goto exit;
+    scores = PyByteArray_FromStringAndSize((const char*)hits.scores,
+                                           hits.size * sizeof(float));
+    if (!scores) goto exit;
+    result = PyTuple_Pack(3, positions, motifs, scores);
+
+exit:
+    Py_XDECREF(positions);
+    Py_XDECREF(motifs);
+    Py_XDECREF(scores);
+    Hits_clear(&hits);
+    PyMem_RawFree(offsets);
+    PyMem_RawFree(cutoffs);
+    PyBuffer_Release(&sequence);
+    matrix_converter(NULL, &matrix);
+    return result;
+}
+
 static struct PyMethodDef methods[] = {
    {"calculate",
     (PyCFunction)py_calculate,
     METH_VARARGS | METH_KEYWORDS,
     PyDoc_STR(calculate__doc__),
    },
+   {"scan",
+    (PyCFunction)py_scan,
+    METH_VARARGS | METH_KEYWORDS,
+    PyDoc_STR(scan__doc__),
+   },
    {NULL, NULL, 0, NULL} /* sentinel */
 };
 
@@ -212,5 +488,10 @@ static struct PyModuleDef moduledef = {
 PyObject*
 PyInit__pwm(void)
 {
+    memset(table, 4, sizeof(table));
+    table['A'] = table['a'] = 0;
+    table['C'] = table['c'] = 1;
+    table['G'] = table['g'] = 2;
+    table['T'] = table['t'] = 3;
     return PyModule_Create(&moduledef);
 }
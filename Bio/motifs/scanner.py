@@ -0,0 +1,185 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+
+"""Scan sequences for many motifs at once.
+
+The search method of a PositionSpecificScoringMatrix scans a sequence for a
+single motif, and scans the reverse complement in a separate pass. The
+MotifScanner class compiles a collection of motifs (and their reverse
+complements) into a single score matrix, and scans each chunk of the
+sequence only once for all motifs on both strands. The scan is done in C,
+with the global interpreter lock released, so that chunks can be scanned in
+parallel threads. Hits are reported as NumPy arrays, one set of arrays per
+chunk of the sequence::
+
+    from Bio import motifs
+    from Bio.motifs.scanner import MotifScanner
+
+    with open("JASPAR2024_CORE_vertebrates.jaspar") as handle:
+        collection = motifs.parse(handle, "jaspar")
+    scanner = MotifScanner(collection, thresholds=10.0)
+    for hits in scanner.search(chromosome, threads=4):
+        for motif, position, score in zip(*hits):
+            print(collection[motif].name, position, score)
+
+As in the search method, hits on the reverse strand are reported with a
+negative position, equal to the start position minus the sequence length.
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+
+from Bio.motifs import _pwm  # type: ignore
+from Bio.Seq import MutableSeq
+from Bio.Seq import Seq
+
+
+class MotifHits(NamedTuple):
+    """Hits found by MotifScanner in a chunk of a sequence.
+
+    Attributes:
+     - motifs    - index of the motif of each hit, in the order in which the
+       motifs were given to the scanner
+     - positions - start position of each hit in the sequence; hits on the
+       reverse strand have a negative position, equal to the start
+       position minus the sequence length
+     - scores    - score of each hit (as a 32-bit float)
+
+    The hits are sorted by start position, then by strand (forward first),
+    and then by motif.
+    """
+
+    motifs: np.ndarray
+    positions: np.ndarray
+    scores: np.ndarray
+
+
+class MotifScanner:
+    """Find the hits of a collection of motifs in DNA sequences."""
+
+    def __init__(self, motifs, thresholds=0.0, both=True):
+        """Compile the motifs into a single score matrix.
+
+        Arguments:
+         - motifs     - list of Motif objects (whose pssm is used) or of
+           PositionSpecificScoringMatrix objects, all with the DNA alphabet
+         - thresholds - minimum score of a hit; either a single number used
+           for all motifs, or a list with one threshold for each motif
+         - both       - if True (default), both strands are scanned
+
+        """
+        pssms = [getattr(motif, "pssm", motif) for motif in motifs]
+        for pssm in pssms:
+            if sorted(pssm.alphabet) != ["A", "C", "G", "T"]:
+                raise ValueError(
+                    "PSSM has wrong alphabet: %s - Use only with DNA motifs"
+                    % pssm.alphabet
+                )
+        n = len(pssms)
+        if np.ndim(thresholds) == 0:
+            thresholds = [float(thresholds)] * n
+        else:
+            thresholds = [float(threshold) for threshold in thresholds]
+            if len(thresholds) != n:
+                raise ValueError(
+                    f"Expected {n} thresholds, one for each motif, "
+                    f"but found {len(thresholds)}"
+                )
+        matrices = [
+            np.array([pssm[letter] for letter in "ACGT"], float).T for pssm in pssms
+        ]
+        if both:
+            # the reverse complement of each motif is included as motif i + n
+            matrices += [matrix[::-1, ::-1] for matrix in matrices]
+            thresholds = thresholds * 2
+        self.n = n
+        self.both = both
+        self.lengths = [len(matrix) for matrix in matrices]
+        self.thresholds = thresholds
+        if matrices:
+            self.matrix = np.ascontiguousarray(np.concatenate(matrices))
+        else:
+            self.matrix = np.zeros((0, 4))
+        self.max_length = max(self.lengths, default=1)
+
+    def _scan(self, sequence, length, start, end):
+        """Scan the sequence for starting positions from start to end (PRIVATE)."""
+        positions, motifs, scores = _pwm.scan(
+            sequence, self.matrix, self.lengths, self.thresholds, start, end
+        )
+        positions = np.frombuffer(positions, np.intp)
+        motifs = np.frombuffer(motifs, np.intc)
+        scores = np.frombuffer(scores, np.float32)
+        order = np.lexsort((motifs, positions))
+        positions = positions[order].astype(np.int64)
+        motifs = motifs[order]
+        scores = scores[order]
+        reverse = motifs >= self.n
+        positions[reverse] -= length
+        motifs = np.where(reverse, motifs - self.n, motifs)
+        return MotifHits(motifs, positions, scores)
+
+    def search(self, sequence, chunksize=10**6, threads=1):
+        """Find the hits of the motifs in the sequence.
+
+        Arguments:
+         - sequence  - a Seq, MutableSeq, string, or bytes-like object;
+           lower case letters are allowed, and positions with ambiguous
+           letters are skipped
+         - chunksize - number of start positions in each chunk
+         - threads   - number of threads used to scan the chunks
+
+        A generator function, yielding a MotifHits tuple of arrays for each
+        chunk of the sequence, in the order of the chunks. The sequence is
+        scanned in place, without copying it, except for strings, which are
+        encoded to bytes once, and partially defined Seq objects.
+        """
+        if threads < 1:
+            raise ValueError(f"Number of threads must be at least 1: {threads}")
+        if isinstance(sequence, str):
+            try:
+                sequence = sequence.encode("ASCII")
+            except UnicodeEncodeError:
+                raise ValueError(
+                    "sequence should contain ASCII characters only"
+                ) from None
+        elif isinstance(sequence, (Seq, MutableSeq)):
+            try:
+                sequence = memoryview(sequence._data)
+            except TypeError:
+                # partially defined sequence
+                sequence = bytes(sequence)
+        else:
+            try:
+                sequence = memoryview(sequence).cast("B")
+            except TypeError:
+                raise ValueError(
+                    "sequence should be a Seq, MutableSeq, string, or bytes-like object"
+                ) from None
+        length = len(sequence)
+        starts = range(0, length, chunksize)
+        if threads == 1:
+            for start in starts:
+                yield self._scan(sequence, length, start, start + chunksize)
+            return
+        executor = ThreadPoolExecutor(threads)
+        try:
+            # limit the number of chunks scanned ahead of the consumer
+            pending = deque()
+            for start in starts:
+                pending.append(
+                    executor.submit(
+                        self._scan, sequence, length, start, start + chunksize
+                    )
+                )
+                if len(pending) >= 2 * threads:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -3,7 +3,73 @@
 # This code is part of the Biopython distribution and governed by its
 # license.  Please see the LICENSE file that should have been included
 # as part of this package.
-"""Approximate calculation of appropriate thresholds for motif finding."""
+"""Approximate calculation of appropriate thresholds for motif finding.
+
+The score distributions are calculated by dynamic programming over the
+positions of the motif, using NumPy arrays. Distributions calculated for a
+PositionSpecificScoringMatrix are cached, keyed by the scores, background,
+and precision, so that thresholds can be recalculated cheaply. The
+thresholds_for function calculates thresholds for a collection of motifs.
+"""
+
+import functools
+
+import numpy as np
+
+
+def _shift_add(density, shifts, probabilities):
+    """Return the density of the score after adding one position (PRIVATE).
+
+    Each letter shifts the density by the given number of points, weighted by
+    its probability; scores outside the range are clipped to the first or
+    last point.
+    """
+    n = len(density)
+    new = np.zeros(n)
+    for d, p in zip(shifts, probabilities):
+        if d >= n or d <= -n:
+            # the complete density ends up at one of the ends
+            new[-1 if d > 0 else 0] += density.sum() * p
+        elif d >= 0:
+            new[d:] += density[: n - d] * p
+            new[-1] += density[n - d :].sum() * p
+        else:
+            new[: n + d] += density[-d:] * p
+            new[0] += density[:-d].sum() * p
+    return new
+
+
+@functools.lru_cache(maxsize=128)
+def _pssm_densities(scores, background, precision):
+    """Calculate the motif and background score densities of a PSSM (PRIVATE).
+
+    Arguments:
+     - scores     - tuple with a tuple of log-odds scores for each letter
+     - background - tuple of background probabilities for each letter
+     - precision  - number of points per position of the motif
+
+    Returns a tuple (min_score, step, mo_density, bg_density); the densities
+    are read-only arrays, as they are shared by the cache.
+    """
+    scores = np.array(scores, float)
+    background = np.array(background, float)
+    length = scores.shape[1]
+    min_score = min(0.0, sum(scores.min(axis=0).tolist()))
+    interval = max(0.0, sum(scores.max(axis=0).tolist())) - min_score
+    n_points = precision * length
+    step = interval / (n_points - 1)
+    shifts = np.floor_divide(scores + 0.5 * step, step).astype(int)
+    mo_probs = np.power(2, scores) * background[:, None]
+    mo_density = np.zeros(n_points)
+    mo_density[-int((min_score + 0.5 * step) // step)] = 1.0
+    bg_density = mo_density.copy()
+    for position in range(length):
+        d = shifts[:, position]
+        mo_density = _shift_add(mo_density, d, mo_probs[:, position])
+        bg_density = _shift_add(bg_density, d, background)
+    mo_density.flags.writeable = False
+    bg_density.flags.writeable = False
+    return min_score, step, mo_density, bg_density
 
 
 class ScoreDistribution:
@@ -21,33 +87,22 @@ class ScoreDistribution:
             self.interval = max(0.0, motif.max_score()) - self.min_score
             self.n_points = precision * motif.length
             self.ic = motif.ic()
-        else:
-            self.min_score = min(0.0, pssm.min)
-            self.interval = max(0.0, pssm.max) - self.min_score
-            self.n_points = precision * pssm.length
-            self.ic = pssm.mean(background)
-        self.step = self.interval / (self.n_points - 1)
-        self.mo_density = [0.0] * self.n_points
-        self.mo_density[-self._index_diff(self.min_score)] = 1.0
-        self.bg_density = [0.0] * self.n_points
-        self.bg_density[-self._index_diff(self.min_score)] = 1.0
-        if pssm is None:
+            self.step = self.interval / (self.n_points - 1)
+            self.mo_density = np.zeros(self.n_points)
+            self.mo_density[-self._index_diff(self.min_score)] = 1.0
+            self.bg_density = self.mo_density.copy()
             for lo, mo in zip(motif.log_odds(), motif.pwm()):
                 self.modify(lo, mo, motif.background)
         else:
-            for position in range(pssm.length):
-                mo_new = [0.0] * self.n_points
-                bg_new = [0.0] * self.n_points
-                lo = pssm[:, position]
-                for letter, score in lo.items():
-                    bg = background[letter]
-                    mo = pow(2, pssm[letter, position]) * bg
-                    d = self._index_diff(score)
-                    for i in range(self.n_points):
-                        mo_new[self._add(i, d)] += self.mo_density[i] * mo
-                        bg_new[self._add(i, d)] += self.bg_density[i] * bg
-                self.mo_density = mo_new
-                self.bg_density = bg_new
+            letters = pssm.alphabet
+            scores = tuple(tuple(pssm[letter]) for letter in letters)
+            probabilities = tuple(background[letter] for letter in letters)
+            self.min_score, self.step, self.mo_density, self.bg_density = (
+                _pssm_densities(scores, probabilities, precision)
+            )
+            self.n_points = precision * pssm.length
+            self.interval = self.step * (self.n_points - 1)
+            self.ic = pssm.mean(background)
 
     def _index_diff(self, x, y=0.0):
         return int((x - y + 0.5 * self.step) // self.step)
@@ -57,45 +112,47 @@ class ScoreDistribution:
 
     def modify(self, scores, mo_probs, bg_probs):
         """Modify motifs and background density."""
-        mo_new = [0.0] * self.n_points
-        bg_new = [0.0] * self.n_points
-        for k, v in scores.items():
-            d = self._index_diff(v)
-            for i in range(self.n_points):
-                mo_new[self._add(i, d)] += self.mo_density[i] * mo_probs[k]
-                bg_new[self._add(i, d)] += self.bg_density[i] * bg_probs[k]
-        self.mo_density = mo_new
-        self.bg_density = bg_new
+        letters = list(scores)
+        shifts = [self._index_diff(scores[letter]) for letter in letters]
+        self.mo_density = _shift_add(
+            self.mo_density, shifts, [mo_probs[letter] for letter in letters]
+        )
+        self.bg_density = _shift_add(
+            self.bg_density, shifts, [bg_probs[letter] for letter in letters]
+        )
 
     def threshold_fpr(self, fpr):
         """Approximate the log-odds threshold which makes the type I error (false positive rate)."""
-        i = self.n_points
-        prob = 0.0
-        while prob < fpr:
-            i -= 1
-            prob += self.bg_density[i]
+        # probability of a score at or above each point, summed from the top
+        tail = np.add.accumulate(self.bg_density[::-1])[::-1]
+        indices = np.flatnonzero(tail >= fpr)
+        if len(indices) == 0:
+            i = 0
+        elif fpr > 0:
+            i = int(indices[-1])
+        else:
+            i = self.n_points
         return self.min_score + i * self.step
 
     def threshold_fnr(self, fnr):
         """Approximate the log-odds threshold which makes the type II error (false negative rate)."""
-        i = -1
-        prob = 0.0
-        while prob < fnr:
-            i += 1
-            prob += self.mo_density[i]
+        if fnr <= 0:
+            i = -1
+        else:
+            head = np.add.accumulate(self.mo_density)
+            i = min(int(np.searchsorted(head >= fnr, True)), self.n_points - 1)
         return self.min_score + i * self.step
 
     def threshold_balanced(self, rate_proportion=1.0, return_rate=False):
         """Approximate log-odds threshold making FNR equal to FPR times rate_proportion."""
-        i = self.n_points
-        fpr = 0.0
-        fnr = 1.0
-        while fpr * rate_proportion < fnr:
-            i -= 1
-            fpr += self.bg_density[i]
-            fnr -= self.mo_density[i]
+        fpr = np.add.accumulate(np.append(0.0, self.bg_density[::-1]))
+        fnr = np.subtract.accumulate(np.append(1.0, self.mo_density[::-1]))
+        # number of points, counted from the top, included in the threshold
+        k = np.flatnonzero(fpr * rate_proportion >= fnr)
+        k = int(k[0]) if len(k) else self.n_points
+        i = self.n_points - k
         if return_rate:
-            return self.min_score + i * self.step, fpr
+            return self.min_score + i * self.step, float(fpr[k])
         else:
             return self.min_score + i * self.step
 
@@ -107,3 +164,42 @@ class ScoreDistribution:
         are not directly comparable.
         """
         return self.threshold_fpr(fpr=2**-self.ic)
+
+
+def thresholds_for(motifs, fpr=None, fnr=None, background=None, precision=10**3):
+    """Calculate a score threshold for each motif in a collection.
+
+    Arguments:
+     - motifs     - list of Motif objects or PositionSpecificScoringMatrix
+       objects
+     - fpr        - requested false positive rate
+     - fnr        - requested false negative rate
+     - background - background distribution of the letters; by default the
+       background of each Motif object is used, or a uniform background for
+       PositionSpecificScoringMatrix objects
+     - precision  - number of points per position of the motif used to
+       approximate the score distribution
+
+    Exactly one of fpr and fnr should be given. Returns a list of thresholds,
+    in the same order as the motifs, which can be used as the thresholds of
+    a MotifScanner. The score distributions are cached, so calculating
+    thresholds for a different rate is fast.
+    """
+    if (fpr is None) == (fnr is None):
+        raise ValueError("Exactly one of fpr and fnr should be given")
+    thresholds = []
+    for motif in motifs:
+        pssm = getattr(motif, "pssm", None)
+        if pssm is None:
+            pssm = motif
+            motif_background = background
+        elif background is None:
+            motif_background = motif.background
+        else:
+            motif_background = background
+        distribution = pssm.distribution(motif_background, precision)
+        if fpr is not None:
+            thresholds.append(distribution.threshold_fpr(fpr))
+        else:
+            thresholds.append(distribution.threshold_fnr(fnr))
+    return thresholds
@@ -20,6 +20,7 @@ except ImportError:
 
 from Bio import Align
 from Bio import SeqIO
+from Bio.Seq import MutableSeq
 from Bio.Seq import reverse_complement
 from Bio.Seq import Seq
 from Bio.Seq import translate
@@ -3624,6 +3625,87 @@ rn7.chr2  174256650
         )
 
 
+class TestAlign_counting(unittest.TestCase):
+    lines = [
+        "ACGT-TACG-ATTGCA",
+        "AC-TGTACGGATT--A",
+        "-CGTTTAC-GATAGCA",
+        "ACCT-TTCGGA-TGCA",
+        "ACGTGTACGGATTGCT",
+    ]
+
+    def setUp(self):
+        lines = [line.encode() for line in self.lines]
+        sequences, coordinates = Align.Alignment.parse_printed_alignment(lines)
+        records = [
+            SeqRecord(Seq(sequence), id=f"seq{i}")
+            for i, sequence in enumerate(sequences)
+        ]
+        self.alignment = Align.Alignment(records, coordinates)
+
+    def test_frequencies(self):
+        alignment = self.alignment
+        for i, record in enumerate(alignment.sequences):
+            record.annotations["weight"] = 0.5 + i
+        frequencies = alignment.frequencies
+        self.assertEqual(list(frequencies), ["A", "C", "G", "T", "-"])
+        for letter, values in frequencies.items():
+            expected = np.zeros(len(self.lines[0]))
+            for i, line in enumerate(self.lines):
+                for j, c in enumerate(line):
+                    if c == letter:
+                        expected[j] += 0.5 + i
+            self.assertTrue(np.array_equal(values, expected))
+
+    def test_substitutions(self):
+        m = self.alignment.substitutions
+        self.assertEqual(m.alphabet, "ACGT")
+        expected = np.zeros((4, 4))
+        for i1, line1 in enumerate(self.lines):
+            for line2 in self.lines[i1 + 1 :]:
+                for c1, c2 in zip(line1, line2):
+                    if c1 != "-" and c2 != "-":
+                        expected["ACGT".index(c1), "ACGT".index(c2)] += 1
+        self.assertTrue(np.array_equal(m, expected))
+
+    def test_counts(self):
+        counts = self.alignment.counts()
+        gaps = identities = mismatches = 0
+        for i1, line1 in enumerate(self.lines):
+            for line2 in self.lines[i1 + 1 :]:
+                for c1, c2 in zip(line1, line2):
+                    if c1 == "-" or c2 == "-":
+                        gaps += 1
+                    elif c1 == c2:
+                        identities += 1
+                    else:
+                        mismatches += 1
+        self.assertEqual(counts.gaps, gaps)
+        self.assertEqual(counts.identities, identities)
+        self.assertEqual(counts.mismatches, mismatches)
+
+    def test_modified(self):
+        alignment = self.alignment
+        self.assertEqual(alignment.counts().gaps, 35)
+        # The character matrix reflects the current coordinates and sequences
+        alignment.coordinates = alignment.coordinates[:, :2]
+        self.assertEqual(alignment.counts().gaps, 4)
+        self.assertEqual(alignment.frequencies["A"].tolist(), [4.0])
+        alignment.sequences[0] = SeqRecord(Seq("TCGTTACGATTGCA"), id="seq0")
+        self.assertEqual(alignment.frequencies["A"].tolist(), [3.0])
+        alignment.sequences[1].seq = Seq("TCTGTACGGATTA")
+        self.assertEqual(alignment.frequencies["A"].tolist(), [2.0])
+        self.assertEqual(alignment.counts().identities, 2)
+        alignment.sequences[3].seq = MutableSeq(alignment.sequences[3].seq)
+        self.assertEqual(alignment.counts().identities, 2)
+        alignment.sequences[3].seq[0] = "T"
+        self.assertEqual(alignment.counts().identities, 3)
+        self.assertEqual(alignment.frequencies["T"].tolist(), [3.0])
+        self.assertEqual(
+            np.array(alignment)[:, 0].tolist(), [b"T", b"T", b"-", b"T", b"A"]
+        )
+
+
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
     unittest.main(testRunner=runner)
@@ -0,0 +1,204 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+"""Tests for Align.bam module."""
+import os
+import tempfile
+import unittest
+from io import BytesIO
+
+from Bio import Align
+
+try:
+    import numpy as np
+except ImportError:
+    from Bio import MissingPythonDependencyError
+
+    raise MissingPythonDependencyError(
+        "Install numpy if you want to use Bio.Align.bam."
+    ) from None
+
+from Bio.Align import bam
+
+
+class TestAlign_bam(unittest.TestCase):
+    def check_alignments(self, alignments1, alignments2):
+        n = 0
+        for alignment1, alignment2 in zip(alignments1, alignments2):
+            self.assertEqual(alignment1.query.id, alignment2.query.id)
+            self.assertEqual(alignment1.query.seq, alignment2.query.seq)
+            self.assertEqual(
+                alignment1.query.letter_annotations,
+                alignment2.query.letter_annotations,
+            )
+            self.assertEqual(alignment1.flag, alignment2.flag)
+            if alignment1.coordinates is None:
+                self.assertIsNone(alignment2.coordinates)
+                self.assertIsNone(alignment2.target)
+            else:
+                self.assertEqual(alignment1.target.id, alignment2.target.id)
+                self.assertTrue(
+                    np.array_equal(alignment1.coordinates, alignment2.coordinates)
+                )
+            for key in ("mapq", "rnext", "pnext", "tlen", "annotations"):
+                self.assertEqual(
+                    getattr(alignment1, key, None), getattr(alignment2, key, None)
+                )
+            n += 1
+        return n
+
+    def test_ex1(self):
+        alignments1 = Align.parse("SamBam/ex1.sam", "sam")
+        alignments2 = Align.parse("SamBam/ex1.bam", "bam")
+        self.assertEqual(alignments2.metadata, {})
+        self.assertEqual(len(alignments2.targets), 2)
+        self.assertEqual(alignments2.targets[0].id, "chr1")
+        self.assertEqual(len(alignments2.targets[0]), 1575)
+        self.assertEqual(alignments2.targets[1].id, "chr2")
+        self.assertEqual(len(alignments2.targets[1]), 1584)
+        n = self.check_alignments(alignments1, alignments2)
+        self.assertEqual(n, 3270)
+
+    def test_ex1_header(self):
+        alignments1 = Align.parse("SamBam/ex1_header.sam", "sam")
+        alignments2 = Align.parse("SamBam/ex1_header.bam", "bam")
+        self.assertEqual(alignments2.metadata["HD"], {"VN": "1.3", "SO": "coordinate"})
+        self.assertEqual(len(alignments2.targets), 2)
+        self.assertEqual(alignments2.targets[0].id, "chr1")
+        self.assertEqual(len(alignments2.targets[0]), 1575)
+        n = self.check_alignments(alignments1, alignments2)
+        self.assertEqual(n, 3270)
+
+    def test_stream(self):
+        with open("SamBam/ex1_refresh.bam", "rb") as stream:
+            with Align.parse(stream, "bam") as alignments:
+                alignment = next(alignments)
+                self.assertEqual(alignment.query.id, "EAS56_57:6:190:289:82")
+                self.assertEqual(alignment.flag, 69)
+                self.assertIsNone(alignment.coordinates)
+                self.assertEqual(len(alignments), 3270)
+            self.assertFalse(stream.closed)
+
+    def test_lightweight(self):
+        with open("SamBam/ex1.sam") as stream:
+            lines = [line.rstrip("\n") for line in stream]
+        alignments = bam.AlignmentIterator("SamBam/ex1.bam", lightweight=True)
+        records = list(alignments)
+        self.assertEqual(len(records), len(lines))
+        for record, line in zip(records, lines):
+            self.assertEqual(str(record), line)
+        record = records[-1]
+        self.assertEqual(record.qname, "EAS114_26:7:37:79:581")
+        self.assertEqual(record.flag, 83)
+        self.assertEqual(record.rname, "chr2")
+        self.assertEqual(record.pos, 1532)
+        self.assertEqual(record.end, 1567)
+        self.assertEqual(record.mapq, 68)
+        self.assertEqual(record.cigar, "35M")
+        self.assertEqual(record.rnext, "chr2")
+        self.assertEqual(record.pnext, 1348)
+        self.assertEqual(record.tlen, -219)
+        self.assertEqual(record.seq, "TTTTTTTTTTTTTTTTTTTTTTTCATGCCAGAAAA")
+        self.assertEqual(record.qual, "3,,,===6===<===<;=====-============")
+        self.assertEqual(
+            record.tags,
+            ["MF:i:18", "Aq:i:27", "NM:i:2", "UQ:i:23", "H0:i:0", "H1:i:1"],
+        )
+
+    def test_write(self):
+        alignments = Align.parse("SamBam/ex1_header.bam", "bam")
+        stream = BytesIO()
+        n = Align.write(alignments, stream, "bam")
+        self.assertEqual(n, 3270)
+        stream.seek(0)
+        alignments1 = Align.parse("SamBam/ex1_header.sam", "sam")
+        alignments2 = Align.parse(stream, "bam")
+        self.assertEqual(alignments2.metadata["HD"], {"VN": "1.3", "SO": "coordinate"})
+        self.assertEqual(
+            [target.id for target in alignments2.targets], ["chr1", "chr2"]
+        )
+        n = self.check_alignments(alignments1, alignments2)
+        self.assertEqual(n, 3270)
+
+    def test_write_without_targets(self):
+        alignments = list(Align.parse("SamBam/ex1.sam", "sam"))[:100]
+        stream = BytesIO()
+        n = Align.write(alignments, stream, "bam")
+        self.assertEqual(n, 100)
+        stream.seek(0)
+        alignments2 = Align.parse(stream, "bam")
+        self.assertEqual([target.id for target in alignments2.targets], ["chr1"])
+        n = self.check_alignments(alignments, alignments2)
+        self.assertEqual(n, 100)
+
+
+class TestAlign_bam_index(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        records = bam.AlignmentIterator("SamBam/ex1.bam", lightweight=True)
+        cls.records = list(records)
+
+    def check_search(self, index):
+        alignments = bam.AlignmentIterator(
+            "SamBam/ex1.bam", index=index, lightweight=True
+        )
+        for chromosome, start, end in (
+            ("chr1", 0, 1),
+            ("chr1", 99, 100),
+            ("chr1", 500, 700),
+            ("chr1", 1500, 1575),
+            ("chr2", 0, 1584),
+            ("chr2", 1000, 1001),
+            ("chr2", 1532, 1600),
+        ):
+            records = list(alignments.search(chromosome, start, end))
+            expected = [
+                record
+                for record in self.records
+                if record.rname == chromosome
+                and record.pos < end
+                and record.end > start
+            ]
+            self.assertEqual(
+                [str(record) for record in records],
+                [str(record) for record in expected],
+            )
+        self.assertEqual(len(list(alignments.search("chr1"))), 1464)
+        self.assertEqual(len(list(alignments.search("chr2", 1000))), 62)
+        alignments = bam.AlignmentIterator("SamBam/ex1.bam", index=index)
+        alignment = next(alignments.search("chr2", 1566, 1567))
+        self.assertEqual(alignment.query.id, "EAS114_26:7:37:79:581")
+        self.assertTrue(
+            np.array_equal(alignment.coordinates, np.array([[1532, 1567], [35, 0]]))
+        )
+
+    def test_bai(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "ex1.bam.bai")
+            self.assertEqual(bam.create_index("SamBam/ex1.bam", path), path)
+            with open(path, "rb") as stream:
+                self.assertEqual(stream.read(4), b"BAI\x01")
+            self.check_search(path)
+
+    def test_csi(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "ex1.bam.csi")
+            bam.create_index("SamBam/ex1.bam", path, fmt="csi", min_shift=10, depth=6)
+            self.check_search(path)
+
+    def test_missing_index(self):
+        with open("SamBam/ex1.bam", "rb") as stream:
+            alignments = bam.AlignmentIterator(stream)
+            with self.assertRaises(ValueError):
+                next(alignments.search("chr1", 100, 200))
+
+    def test_unsorted(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bam2.bam.bai")
+            with self.assertRaises(ValueError):
+                bam.create_index("SamBam/bam2.bam", path)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
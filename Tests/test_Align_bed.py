@@ -8051,6 +8051,82 @@ class TestAlign_searching(unittest.TestCase):
             self.check_alignments(alignments)
 
 
+class TestAlign_batches(unittest.TestCase):
+    def test_bed12(self):
+        batches = Align.parse_batches("Blat/bed12.bed", "bed")
+        batch = next(batches)
+        self.assertEqual(len(batch), 2)
+        self.assertEqual(len(batch.names), 12)
+        self.assertEqual(list(batch["chrom"]), ["chr22", "chr22"])
+        self.assertEqual(list(batch["chromStart"]), [1000, 2000])
+        self.assertEqual(list(batch["chromEnd"]), [5000, 6000])
+        self.assertEqual(list(batch["name"]), ["mRNA1", "mRNA2"])
+        self.assertEqual(list(batch["score"]), [960.0, 900.0])
+        self.assertEqual(list(batch["strand"]), ["+", "-"])
+        self.assertEqual(list(batch["blockCount"]), [2, 2])
+        self.assertEqual(list(batch["chromStarts"]), ["0,3512,", "0,3601,"])
+        self.assertEqual(
+            batch[1],
+            {
+                "chrom": "chr22",
+                "chromStart": 2000,
+                "chromEnd": 6000,
+                "name": "mRNA2",
+                "score": 900.0,
+                "strand": "-",
+                "thickStart": 2300,
+                "thickEnd": 5960,
+                "itemRgb": "0,255,0",
+                "blockCount": 2,
+                "blockSizes": "433,399,",
+                "chromStarts": "0,3601,",
+            },
+        )
+        with self.assertRaises(StopIteration):
+            next(batches)
+
+    def test_bed3(self):
+        alignments = list(Align.parse("Blat/bed3.bed", "bed"))
+        batches = list(Align.parse_batches("Blat/bed3.bed", "bed", 1))
+        self.assertEqual(len(batches), len(alignments))
+        for batch, alignment in zip(batches, alignments):
+            self.assertEqual(batch.names, ("chrom", "chromStart", "chromEnd"))
+            self.assertEqual(batch["chrom"][0], alignment.target.id)
+            self.assertEqual(batch["chromStart"][0], alignment.coordinates[0, 0])
+            self.assertEqual(batch["chromEnd"][0], alignment.coordinates[0, -1])
+
+    def test_bigbedtest(self):
+        # the last line in this file uses spaces instead of tabs
+        alignments = list(Align.parse("Blat/bigbedtest.bed", "bed"))
+        batch = next(Align.parse_batches("Blat/bigbedtest.bed", "bed"))
+        self.assertEqual(len(batch), len(alignments))
+        self.assertEqual(len(batch.names), 6)
+        self.assertEqual(
+            list(batch["chrom"]), [alignment.target.id for alignment in alignments]
+        )
+        self.assertEqual(
+            list(batch["name"]), [alignment.query.id for alignment in alignments]
+        )
+        self.assertEqual(
+            list(batch["chromStart"]),
+            [alignment.coordinates[0, 0] for alignment in alignments],
+        )
+        self.assertEqual(
+            list(batch["score"]), [alignment.score for alignment in alignments]
+        )
+        self.assertEqual(
+            batch[-1],
+            {
+                "chrom": "chr3",
+                "chromStart": 0,
+                "chromEnd": 0,
+                "name": "name8",
+                "score": 7.0,
+                "strand": "-",
+            },
+        )
+
+
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
     unittest.main(testRunner=runner)
@@ -2531,6 +2531,72 @@ table hg18KGchr7
             data = output.read()
         self.assertEqual(correct, data)
 
+    def write(self, alignments, **kwargs):
+        with open("Blat/bedExample2.as") as stream:
+            autosql_data = stream.read()
+        declaration = bigbed.AutoSQLTable.from_string(autosql_data)
+        with tempfile.TemporaryFile() as output:
+            Align.write(
+                alignments,
+                output,
+                "bigbed",
+                bedN=9,
+                declaration=declaration,
+                extraIndex=["name", "geneSymbol"],
+                **kwargs,
+            )
+            output.flush()
+            output.seek(0)
+            return output.read()
+
+    def test_writing_threads(self):
+        """Test writing bigbed_extended.bb using multiple threads."""
+        byteorder = sys.byteorder  # "little" or "big"
+        path = f"Blat/bigbed_extended.{byteorder}endian.bb"
+        with open(path, "rb") as stream:
+            correct = stream.read()
+        alignments = Align.parse(path, "bigbed")
+        data = self.write(alignments, threads=4)
+        self.assertEqual(correct, data)
+        # use small blocks to have many blocks compressed concurrently
+        alignments = Align.parse(path, "bigbed")
+        correct = self.write(alignments, itemsPerSlot=2)
+        alignments = Align.parse(path, "bigbed")
+        data = self.write(alignments, itemsPerSlot=2, threads=3)
+        self.assertEqual(correct, data)
+
+    def test_writing_sort(self):
+        """Test writing unsorted alignments to a bigBed file."""
+        byteorder = sys.byteorder  # "little" or "big"
+        path = f"Blat/bigbed_extended.{byteorder}endian.bb"
+        alignments = Align.parse(path, "bigbed")
+        targets = alignments.targets
+        alignments = list(alignments)
+        order = [7, 2, 9, 0, 4, 1, 8, 3, 6, 5]
+        unsorted_alignments = Align.Alignments(alignments[i] for i in order)
+        unsorted_alignments.targets = targets
+        with self.assertRaises(ValueError):
+            self.write(unsorted_alignments)
+        # Alignments with the same target and start position keep their order.
+        sorted_alignments = Align.Alignments(
+            sorted(
+                unsorted_alignments,
+                key=lambda alignment: (
+                    alignment.target.id,
+                    alignment.coordinates[0, 0],
+                ),
+            )
+        )
+        sorted_alignments.targets = targets
+        correct = self.write(sorted_alignments)
+        data = self.write(unsorted_alignments, sort=True)
+        self.assertEqual(correct, data)
+        # Sort in runs of three alignments, stored in temporary files
+        data = self.write(unsorted_alignments, sort=True, sortBufferSize=3)
+        self.assertEqual(correct, data)
+        data = self.write(unsorted_alignments, sort=True, sortBufferSize=3, threads=2)
+        self.assertEqual(correct, data)
+
 
 class TestAlign_searching(unittest.TestCase):
     path = "Blat/bigbedtest.bb"
@@ -2724,6 +2790,52 @@ table bed
         names = [alignment.query.id for alignment in selected_alignments]
         self.assertEqual(names, ["name3"])
 
+    def test_search_many(self):
+        alignments = Align.parse(self.path, "bigbed")
+        regions = [("chr2", 200, 220), ("chr1", 250, None), ("chr2", 40, 50)]
+        selected_alignments = alignments.search_many(regions)
+        names = [alignment.query.id for alignment in selected_alignments]
+        self.assertEqual(names, ["name3", "name4", "name6", "name7"])
+        # overlapping regions; each alignment is returned only once
+        regions = [("chr2", 105, 1000), ("chr2", 50, 200), ("chr1", 30, 31)]
+        selected_alignments = alignments.search_many(regions)
+        names = [alignment.query.id for alignment in selected_alignments]
+        self.assertEqual(names, ["name1", "name2", "name4", "name5", "name6", "name7"])
+        regions = [("chr2", 220, 220), ("chr2", 50, 50), ("chr3", None, None)]
+        selected_alignments = alignments.search_many(regions)
+        names = [alignment.query.id for alignment in selected_alignments]
+        self.assertEqual(names, ["name4", "name7", "name8"])
+        selected_alignments = alignments.search_many([])
+        self.assertEqual(list(selected_alignments), [])
+        with self.assertRaises(ValueError):
+            next(alignments.search_many([("chr4", 0, 10)]))
+
+    def test_search_many_blocks(self):
+        # Use small blocks so that the index has several levels.
+        alignments = Align.parse(self.path, "bigbed")
+        with tempfile.TemporaryFile() as output:
+            Align.write(
+                alignments, output, "bigbed", bedN=6, itemsPerSlot=1, blockSize=4
+            )
+            output.flush()
+            output.seek(0)
+            alignments = Align.parse(output, "bigbed")
+            alignments.blockCacheSize = 2
+            for regions in (
+                [("chr1", 0, 20), ("chr2", 100, 210)],
+                [("chr1", 35, 250), ("chr2", 50, 50), ("chr2", 215, 300)],
+                [("chr3", 0, 0), ("chr1", 100, 200)],
+            ):
+                expected = []
+                for region in regions:
+                    for alignment in alignments.search(*region):
+                        if alignment.query.id not in expected:
+                            expected.append(alignment.query.id)
+                selected_alignments = alignments.search_many(regions)
+                names = [alignment.query.id for alignment in selected_alignments]
+                self.assertEqual(names, sorted(expected))
+                self.assertLessEqual(len(alignments._blocks), 2)
+
     def test_three_iterators(self):
         """Create three iterators and use them concurrently."""
         alignments1 = Align.parse(self.path, "bigbed")
@@ -8382,6 +8382,36 @@ gi|6478867|gb|M37394.2|RATEGFR      AGAGTACCTGCGGGTGGCACCGCCAAGCAGTGAGTTTAGTGGAG
         for ds_cal, ds_corr in zip(ds_list, ds_correct):
             self.assertAlmostEqual(ds_cal, ds_corr, places=4)
 
+    def test_dn_ds_matrix(self):
+        lines = [
+            b"ATGGCTAAACCC---GGTTTACTGAGC",
+            b"ATGGCAAAG---CCAGGTTTGCTAAGC",
+            b"ATGGCCAGACCCCCTGGATTACTG---",
+            b"---GCTAAACCACCAGGCTTACTCTCC",
+        ]
+        # add a conserved region
+        lines = [line + b"GATGAATTCAAACGTATGCCATGGTACGAAACTATTGTCCAT" for line in lines]
+        sequences, coordinates = Alignment.parse_printed_alignment(lines)
+        records = [
+            SeqRecord(Seq(sequence), id=f"seq{i}")
+            for i, sequence in enumerate(sequences)
+        ]
+        alignment = Alignment(records, coordinates)
+        for method in ("NG86", "LWL85"):
+            dn, ds = calculate_dn_ds_matrix(alignment, method=method)
+            for i in range(len(records)):
+                for j in range(i):
+                    pairwise_alignment = Alignment(
+                        [records[i], records[j]], coordinates[(i, j), :]
+                    )
+                    dN, dS = calculate_dn_ds(pairwise_alignment, method=method)
+                    self.assertAlmostEqual(dn[i, j], dN, places=12)
+                    self.assertAlmostEqual(ds[i, j], dS, places=12)
+            # calculating the matrix in parallel gives the same result
+            dn2, ds2 = calculate_dn_ds_matrix(alignment, method=method, processes=2)
+            self.assertEqual(dn2.matrix, dn.matrix)
+            self.assertEqual(ds2.matrix, ds.matrix)
+
 
 class Test_MK(unittest.TestCase):
     def test_mk(self):
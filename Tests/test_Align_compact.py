@@ -0,0 +1,156 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+"""Tests for Align.compact module."""
+import os
+import tempfile
+import unittest
+from io import StringIO
+
+from Bio import Align
+
+try:
+    import numpy as np
+except ImportError:
+    from Bio import MissingPythonDependencyError
+
+    raise MissingPythonDependencyError(
+        "Install numpy if you want to use Bio.Align.compact."
+    ) from None
+
+from Bio.Align.compact import CompactAlignment
+from Bio.Seq import Seq
+from Bio.SeqRecord import SeqRecord
+
+
+class TestAlign_compact(unittest.TestCase):
+    lines = [
+        "ACGT-TACG-ATTGCA",
+        "AC-TGTACGGATT--A",
+        "-CGTTTAC-GATAGCA",
+        "ACCT-TTCGGA-TGCA",
+        "ACGTGTACGGATTGCT",
+    ]
+    ids = ["seq0", "seq1", "seq2", "seq3", "seq4"]
+
+    def setUp(self):
+        self.compact = CompactAlignment(self.lines, self.ids)
+
+    def test_init(self):
+        compact = self.compact
+        self.assertEqual(len(compact), 5)
+        self.assertEqual(compact.length, 16)
+        self.assertEqual(compact.shape, (5, 16))
+        self.assertEqual(compact.data.dtype, np.uint8)
+        self.assertEqual(compact.ids.tolist(), self.ids)
+        data = np.array([list(line) for line in self.lines], "S1")
+        compact = CompactAlignment(data)
+        self.assertTrue(np.shares_memory(compact.data, data))
+        self.assertEqual(compact.ids.tolist(), [""] * 5)
+        self.assertTrue(np.array_equal(np.array(compact), data))
+        with self.assertRaises(ValueError):
+            CompactAlignment(["ACGT", "ACG"])
+        with self.assertRaises(ValueError):
+            CompactAlignment(self.lines, self.ids[:3])
+        with self.assertRaises(ValueError):
+            CompactAlignment(np.zeros((5, 16), int))
+
+    def test_indexing(self):
+        compact = self.compact
+        self.assertEqual(compact[1], "AC-TGTACGGATT--A")
+        self.assertEqual(compact[-1], "ACGTGTACGGATTGCT")
+        self.assertEqual(compact[1, 2], "-")
+        self.assertEqual(compact[1, 3:7], "TGTA")
+        subalignment = compact[1:4, 2:10]
+        self.assertIsInstance(subalignment, CompactAlignment)
+        self.assertTrue(np.shares_memory(subalignment.data, compact.data))
+        self.assertEqual(subalignment.ids.tolist(), ["seq1", "seq2", "seq3"])
+        self.assertEqual(
+            [subalignment[i] for i in range(3)],
+            [line[2:10] for line in self.lines[1:4]],
+        )
+        subalignment = compact[[4, 0], ::-1]
+        self.assertFalse(np.shares_memory(subalignment.data, compact.data))
+        self.assertEqual(subalignment.ids.tolist(), ["seq4", "seq0"])
+        self.assertEqual(subalignment[0], self.lines[4][::-1])
+        self.assertEqual(subalignment[1], self.lines[0][::-1])
+
+    def test_alignment(self):
+        compact = self.compact
+        alignment = compact.alignment
+        self.assertEqual([record.id for record in alignment.sequences], self.ids)
+        self.assertEqual(alignment.shape, (5, 16))
+        self.assertEqual(
+            [alignment[i] for i in range(len(alignment))],
+            self.lines,
+        )
+        self.assertEqual(str(compact), str(alignment))
+        self.assertEqual(format(compact, "fasta"), format(alignment, "fasta"))
+        # All-gap columns are removed
+        subalignment = compact[1:2, 12:16]
+        self.assertEqual(subalignment.alignment.shape, (1, 2))
+        self.assertEqual(subalignment.alignment[0], "TA")
+        compact = CompactAlignment.from_alignment(alignment)
+        self.assertTrue(np.array_equal(compact.data, self.compact.data))
+        self.assertEqual(compact.ids.tolist(), self.ids)
+        msa = Align.MultipleSeqAlignment(
+            SeqRecord(Seq(line), id=identifier)
+            for line, identifier in zip(self.lines, self.ids)
+        )
+        compact = CompactAlignment.from_alignment(msa)
+        self.assertTrue(np.array_equal(compact.data, self.compact.data))
+
+    def test_counting(self):
+        compact = self.compact
+        alignment = Align.read(StringIO(format(compact, "fasta")), "fasta")
+        frequencies = compact.frequencies
+        expected = alignment.frequencies
+        self.assertEqual(list(frequencies), list(expected))
+        for letter in expected:
+            self.assertTrue(np.array_equal(frequencies[letter], expected[letter]))
+        m = compact.substitutions
+        expected = alignment.substitutions
+        self.assertEqual(m.alphabet, expected.alphabet)
+        self.assertTrue(np.array_equal(m, expected))
+        self.assertEqual(compact.counts(), alignment.counts())
+
+    def test_fasta(self):
+        stream = StringIO()
+        for identifier, line in zip(self.ids, self.lines):
+            stream.write(f">{identifier} description\n{line[:10]}\n{line[10:]}\n")
+        stream.seek(0)
+        compact = CompactAlignment.from_fasta(stream)
+        self.assertTrue(np.array_equal(compact.data, self.compact.data))
+        self.assertEqual(compact.ids.tolist(), self.ids)
+        stream = StringIO(">seq1\nACGT\n>seq2\nACG\n")
+        with self.assertRaises(ValueError):
+            CompactAlignment.from_fasta(stream)
+        path = os.path.join("Clustalw", "clustalw.fa")
+        compact = CompactAlignment.from_fasta(path)
+        alignment = Align.read(path, "fasta")
+        self.assertEqual(compact.shape, alignment.shape)
+        self.assertEqual(
+            [compact[i] for i in range(len(compact))],
+            [alignment[i] for i in range(len(alignment))],
+        )
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "alignment.npy")
+            self.compact.save(path)
+            compact = CompactAlignment.load(path)
+            self.assertNotIsInstance(compact.data, np.memmap)
+            self.assertTrue(np.array_equal(compact.data, self.compact.data))
+            self.assertEqual(compact.ids.tolist(), self.ids)
+            compact = CompactAlignment.load(path, mmap_mode="r")
+            self.assertIsInstance(compact.data, np.memmap)
+            self.assertTrue(np.array_equal(compact.data, self.compact.data))
+            self.assertEqual(compact.ids.tolist(), self.ids)
+            self.assertEqual(compact[2:4, 1:5][0], "CGTT")
+            self.assertEqual(compact.counts(), self.compact.counts())
+            del compact
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
@@ -6779,6 +6779,44 @@ query             0 --TTC-GCTAGC-TG--- 11
         self.assertEqual(format(alignment, "psl"), line)
 
 
+class TestAlign_batches(unittest.TestCase):
+    def check_batches(self, path, batch_size, ncols):
+        alignments = list(Align.parse(path, "psl"))
+        batches = list(Align.parse_batches(path, "psl", batch_size))
+        self.assertEqual(
+            [len(batch) for batch in batches[:-1]], [batch_size] * (len(batches) - 1)
+        )
+        self.assertEqual(sum(len(batch) for batch in batches), len(alignments))
+        i = 0
+        for batch in batches:
+            self.assertEqual(len(batch.names), ncols)
+            for j, record in enumerate(batch["qName"]):
+                alignment = alignments[i + j]
+                self.assertEqual(record, alignment.query.id)
+                self.assertEqual(batch["tName"][j], alignment.target.id)
+                self.assertEqual(batch["matches"][j], alignment.matches)
+                self.assertEqual(batch["misMatches"][j], alignment.misMatches)
+                self.assertEqual(batch["tStart"][j], min(alignment.coordinates[0]))
+                self.assertEqual(batch["tEnd"][j], max(alignment.coordinates[0]))
+            i += len(batch)
+
+    def test_psl(self):
+        self.check_batches("Blat/psl_34_001.psl", 5, 21)
+
+    def test_pslx(self):
+        self.check_batches("Blat/pslx_34_001.pslx", 100, 23)
+        batch = next(Align.parse_batches("Blat/pslx_34_001.pslx", "psl"))
+        self.assertEqual(batch[0]["tSeqs"], "aggtaaactgccttca,")
+
+    def test_filter(self):
+        batch = next(Align.parse_batches("Blat/psl_34_001.psl", "psl"))
+        selected = batch[(batch["strand"] == "-") & (batch["matches"] > 30)]
+        self.assertEqual(
+            selected["tName"].tolist(),
+            ["chr22", "chr2", "chr19", "chr19", "chr10", "chr1", "chr1"],
+        )
+
+
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
     unittest.main(testRunner=runner)
@@ -23967,6 +23967,56 @@ gi|296147         0 LFNISMDLSLAWRMVEFLLFDSEDKERNSASSCLCMES 38
                 next(alignments)
 
 
+class TestBatches(unittest.TestCase):
+    def test_2226_tblastn_005(self):
+        path = "Blast/tab_2226_tblastn_005.txt"
+        alignments = list(Align.parse(path, "tabular"))
+        batches = list(Align.parse_batches(path, "tabular", 5))
+        self.assertEqual([len(batch) for batch in batches], [5, 5, 2])
+        i = 0
+        for batch in batches:
+            self.assertEqual(len(batch.names), 12)
+            for j in range(len(batch)):
+                alignment = alignments[i + j]
+                self.assertEqual(batch["query id"][j], alignment.query.id)
+                self.assertEqual(batch["subject id"][j], alignment.target.id)
+                self.assertAlmostEqual(
+                    batch["evalue"][j], alignment.annotations["evalue"]
+                )
+                self.assertAlmostEqual(
+                    batch["bit score"][j], alignment.annotations["bit score"]
+                )
+                self.assertEqual(
+                    batch["mismatches"][j], alignment.annotations["mismatches"]
+                )
+            i += len(batch)
+        self.assertEqual(i, len(alignments))
+
+    def test_2228_tblastx_001(self):
+        path = "Blast/tab_2228_tblastx_001.txt"
+        batches = Align.parse_batches(path, "tabular")
+        batch = next(batches)
+        self.assertEqual(len(batch), 243)
+        self.assertEqual(batch[0]["subject strand"], "N/A")
+        selected = batch[batch["evalue"] < 1e-50]
+        self.assertEqual(len(selected), 7)
+        with self.assertRaises(StopIteration):
+            next(batches)
+
+    def test_fasta_m8CB(self):
+        path = "Fasta/protein_m8CB.txt"
+        batch = next(Align.parse_batches(path, "tabular"))
+        self.assertEqual(batch.names[-1], "BTOP")
+        alignments = Align.parse(path, "tabular")
+        for btop, alignment in zip(batch["BTOP"], alignments):
+            self.assertTrue(
+                np.array_equal(
+                    alignments.parse_btop(btop) + alignment.coordinates[:, :1],
+                    alignment.coordinates,
+                )
+            )
+
+
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
     unittest.main(testRunner=runner)
@@ -19,6 +19,7 @@ except ImportError:
 
 from Bio.PDB import CEAligner
 from Bio.PDB import MMCIFParser
+from Bio.PDB.ccealign import run_cealign
 
 
 class CEAlignerTests(unittest.TestCase):
@@ -105,6 +106,58 @@ class CEAlignerTests(unittest.TestCase):
 
         self.assertAlmostEqual(aligner.rms, 0.0, places=3)
 
+    def test_cealigner_align_all(self):
+        """Test comparing 6WQA and 7CFN in batch mode."""
+        parser = MMCIFParser(QUIET=1)
+        s1 = parser.get_structure("6wqa", "PDB/6WQA.cif")
+        s2 = parser.get_structure("7cfn", "PDB/7CFN.cif")
+        s2_original_coords = [list(a.coord) for a in s2.get_atoms()]
+
+        aligner = CEAligner()
+        n1 = len(aligner.get_guide_coord_from_structure(s1))
+        n2 = len(aligner.get_guide_coord_from_structure(s2))
+        for threads in (1, 2):
+            scores = aligner.align_all([s1, s2], threads=threads)
+            self.assertEqual(scores.rms.shape, (2, 2))
+            self.assertAlmostEqual(scores.rms[0, 1], 3.66, places=2)
+            self.assertEqual(scores.rms[1, 0], scores.rms[0, 1])
+            self.assertEqual(scores.rms[0, 0], 0.0)
+            self.assertEqual(scores.length[0, 0], n1)
+            self.assertEqual(scores.length[1, 1], n2)
+            self.assertEqual(scores.length[0, 1], scores.length[1, 0])
+            self.assertEqual(scores.tm_score[0, 0], 1.0)
+            # normalized by the length of the reference structure
+            self.assertLess(n1, n2)
+            self.assertGreater(scores.tm_score[0, 1], scores.tm_score[1, 0])
+            self.assertTrue(0 < scores.tm_score[0, 1] < 1)
+        self.assertEqual([list(a.coord) for a in s2.get_atoms()], s2_original_coords)
+
+        scores = aligner.align_all([s2], references=[s1], final_optimization=False)
+        self.assertEqual(scores.rms.shape, (1, 1))
+        self.assertAlmostEqual(scores.rms[0, 0], 3.74, places=2)
+        aligner.set_reference(s1)
+        aligner.align(s2, transform=False, final_optimization=False)
+        self.assertAlmostEqual(scores.rms[0, 0], aligner.rms)
+
+        self.assertRaises(ValueError, aligner.align_all, [s1, s2], threads=0)
+
+    def test_run_cealign_arrays(self):
+        """Test passing the coordinates to run_cealign as arrays."""
+        parser = MMCIFParser(QUIET=1)
+        s1 = parser.get_structure("6wqa", "PDB/6WQA.cif")
+        aligner = CEAligner()
+        coords = aligner.get_guide_coord_from_structure(s1)
+        array = np.array(coords)
+        expected = run_cealign(coords, coords[10:], 8, 30)
+        for mobile in (array[10:], coords[10:]):
+            alignments = run_cealign(array, mobile, 8, 30)
+            self.assertEqual(alignments, expected)
+        self.assertEqual(expected[0].length, len(expected[0].path[0]))
+        self.assertRaises(ValueError, run_cealign, array[:, :2], array, 8, 30)
+        self.assertRaises(ValueError, run_cealign, array.astype(np.float32), array)
+        self.assertRaises(ValueError, run_cealign, [[1, 2]] * 20, array)
+        self.assertRaises(ValueError, run_cealign, array[:5], array)
+
 
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
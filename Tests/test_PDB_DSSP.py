@@ -34,6 +34,9 @@ from Bio.PDB import DSSP
 from Bio.PDB import make_dssp_dict
 from Bio.PDB import MMCIFParser
 from Bio.PDB import PDBParser
+from Bio.PDB.native_dssp import dssp_dict_from_model
+from Bio.PDB.native_dssp import dssp_dicts_from_models
+from Bio.PDB.native_dssp import NativeDSSP
 
 VERSION_2_2_0 = (2, 2, 0)
 
@@ -270,6 +273,71 @@ class DSSP_test(unittest.TestCase):
                     i += 1
 
 
+class NativeDSSP_test(unittest.TestCase):
+    """Tests for the secondary structure assignment without the DSSP program."""
+
+    @classmethod
+    def setUpClass(cls):
+        parser = PDBParser(QUIET=True)
+        cls.model = parser.get_structure("2BEG", "PDB/2BEG.pdb")[0]
+        cls.helical = parser.get_structure("1A8O", "PDB/1A8O.pdb")[0]
+
+    def test_dssp_dict(self):
+        """Compare to the output of the DSSP program."""
+        expected, expected_keys = make_dssp_dict("PDB/2BEG.dssp")
+        dssp, keys = dssp_dict_from_model(self.model)
+        self.assertEqual(keys, expected_keys)
+        for key in keys:
+            # everything except the accessibility is identical
+            self.assertEqual(dssp[key][:2], expected[key][:2])
+            self.assertEqual(dssp[key][3:], expected[key][3:])
+            self.assertAlmostEqual(dssp[key][2], expected[key][2], delta=40)
+
+    def test_helices(self):
+        """Test the assignment of alpha helices."""
+        dssp, keys = dssp_dict_from_model(self.helical, accessibility=False)
+        ss = "".join(dssp[key][1] for key in keys)
+        # the residue id includes the hetero flag
+        self.assertEqual(keys[0], ("A", ("H_MSE", 151, " ")))
+        # HELIX records 161-175 and 179-187 in the PDB file
+        self.assertEqual(ss[11:23], "H" * 12)
+        self.assertEqual(ss[28:36], "H" * 8)
+        self.assertEqual({dssp[key][2] for key in keys}, {0})
+        self.assertEqual(dssp[keys[0]][3], 360.0)
+        self.assertEqual(dssp[keys[-1]][4], 360.0)
+
+    def test_batch(self):
+        """Test processing several models at once."""
+        results = dssp_dicts_from_models(
+            [self.model, self.helical, self.model], accessibility=False
+        )
+        self.assertEqual(len(results), 3)
+        self.assertEqual(
+            results[0], dssp_dict_from_model(self.model, accessibility=False)
+        )
+        self.assertEqual(
+            results[1], dssp_dict_from_model(self.helical, accessibility=False)
+        )
+        self.assertEqual(results[2], results[0])
+        self.assertEqual(dssp_dicts_from_models([]), [])
+
+    def test_native_dssp(self):
+        """Test the residue properties of the NativeDSSP class."""
+        dssp = NativeDSSP(self.model)
+        self.assertEqual(len(dssp), 130)
+        key = ("A", (" ", 18, " "))
+        values = dssp[key]
+        self.assertEqual(values[:3], (2, "V", "E"))
+        self.assertEqual(
+            values[4:], (-105.3, 155.5, 26, -1.4, 28, -2.9, 2, -0.0, 2, -0.5)
+        )
+        residue = self.model["A"][18]
+        self.assertEqual(residue.xtra["SS_DSSP"], "E")
+        self.assertEqual(residue.xtra["NH_O_1_ENERGY_DSSP"], -1.4)
+        self.assertAlmostEqual(residue.xtra["EXP_DSSP_RASA"], values[3])
+        self.assertTrue(0 < values[3] <= 1)
+
+
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
     unittest.main(testRunner=runner)
@@ -35,7 +35,10 @@ except ImportError:
         "C module Bio.PDB.kdtrees not compiled"
     ) from None
 
+from Bio.PDB import PDBParser
+from Bio.PDB.NeighborSearch import aggregate_pairs
 from Bio.PDB.NeighborSearch import NeighborSearch
+from Bio.PDB.PDBExceptions import PDBException
 
 
 class NeighborTest(unittest.TestCase):
@@ -65,6 +68,88 @@ class NeighborTest(unittest.TestCase):
         self.assertEqual([], ns.search(x, 5.0, "M"))
         self.assertEqual([], ns.search(x, 5.0, "S"))
 
+    def test_search_all_arrays(self):
+        structure = PDBParser(QUIET=True).get_structure("1LCD", "PDB/1LCD.pdb")
+        atoms = list(structure[0].get_atoms())
+        ns = NeighborSearch(atoms)
+        pairs, distances = ns.search_all_arrays(4.0, distances=True)
+        self.assertEqual(pairs.shape, (9515, 2))
+        self.assertEqual(distances.shape, (9515,))
+        self.assertTrue((pairs[:, 0] < pairs[:, 1]).all())
+        self.assertTrue((distances <= 4.0).all())
+        serial = {atom: i for i, atom in enumerate(atoms)}
+        expected = sorted(
+            tuple(sorted((serial[atom1], serial[atom2])))
+            for atom1, atom2 in ns.search_all(4.0)
+        )
+        self.assertEqual(pairs.tolist(), [list(pair) for pair in expected])
+        for (i, j), distance in zip(pairs[:100], distances[:100]):
+            self.assertAlmostEqual(distance, atoms[i] - atoms[j], places=5)
+        self.assertTrue((ns.search_all_arrays(4.0) == pairs).all())
+        self.assertEqual(ns.search_all_arrays(0.1).shape, (0, 2))
+
+    def test_contact_map(self):
+        structure = PDBParser(QUIET=True).get_structure("1LCD", "PDB/1LCD.pdb")
+        ns = NeighborSearch(list(structure[0].get_atoms()))
+        for level in "ARC":
+            contacts = ns.contact_map(4.0, level, distances=True)
+            entities = contacts.entities
+            found = {frozenset((entities[i], entities[j])) for i, j in contacts.pairs}
+            expected = {frozenset(pair) for pair in ns.search_all(4.0, level)}
+            self.assertEqual(found, expected)
+            self.assertEqual(len(found), len(contacts.pairs))
+            self.assertEqual(len(contacts.distances), len(contacts.pairs))
+        self.assertEqual([chain.id for chain in contacts.entities], ["B", "C", "A"])
+        self.assertEqual(contacts.pairs.tolist(), [[0, 1], [0, 2], [1, 2]])
+        matrix = contacts.to_dense()
+        self.assertEqual(matrix.sum(), 6)
+        self.assertFalse(matrix.diagonal().any())
+        # the shortest distance between two residues
+        contacts = ns.contact_map(4.0, "R", distances=True)
+        i, j = contacts.pairs[0]
+        residue1, residue2 = contacts.entities[i], contacts.entities[j]
+        distance = min(atom1 - atom2 for atom1 in residue1 for atom2 in residue2)
+        self.assertAlmostEqual(contacts.distances[0], distance, places=5)
+
+    def test_interface(self):
+        structure = PDBParser(QUIET=True).get_structure("1LCD", "PDB/1LCD.pdb")
+        ns = NeighborSearch(list(structure[0].get_atoms()))
+        interface = ns.interface(4.0, distances=True)
+        expected = {
+            frozenset(pair)
+            for pair in ns.search_all(4.0, "R")
+            if pair[0].get_parent() is not pair[1].get_parent()
+        }
+        entities = interface.entities
+        self.assertEqual(
+            {frozenset((entities[i], entities[j])) for i, j in interface.pairs},
+            expected,
+        )
+        self.assertTrue((interface.distances <= 4.0).all())
+        atoms = ns.interface(4.0, "A")
+        chains = {
+            (
+                atoms.entities[i].get_parent().get_parent().id,
+                atoms.entities[j].get_parent().get_parent().id,
+            )
+            for i, j in atoms.pairs
+        }
+        self.assertFalse(any(chain1 == chain2 for chain1, chain2 in chains))
+        self.assertRaises(PDBException, ns.interface, 4.0, "C")
+
+    def test_aggregate_pairs(self):
+        pairs = array([[0, 1], [1, 2], [0, 3], [2, 3], [1, 3]])
+        distances = array([1.0, 2.0, 3.0, 1.5, 0.5])
+        index = array([1, 1, 0, 0])
+        parents, shortest = aggregate_pairs(pairs, index, distances)
+        self.assertEqual(parents.tolist(), [[0, 1]])
+        self.assertEqual(shortest.tolist(), [0.5])
+        parents, shortest = aggregate_pairs(pairs, index)
+        self.assertEqual(parents.tolist(), [[0, 1]])
+        self.assertIsNone(shortest)
+        parents, _ = aggregate_pairs(pairs, array([0, 1, 2, 2]))
+        self.assertEqual(parents.tolist(), [[0, 1], [0, 2], [1, 2]])
+
 
 class KDTreeTest(unittest.TestCase):
     nr_points = 5000  # number of points used in test
@@ -187,6 +272,38 @@ class KDTreeTest(unittest.TestCase):
                     self.assertEqual(neighbor1.index2, neighbor2.index2)
                     self.assertAlmostEqual(neighbor1.radius, neighbor2.radius)
 
+    def test_KDTree_neighbor_search_arrays(self):
+        """Test all fixed radius neighbor search returning arrays.
+
+        Compare the index pairs and radii stored in the arrays to the
+        Neighbor objects returned by neighbor_search.
+        """
+        from numpy import frombuffer
+        from numpy import intp
+
+        bucket_size = self.bucket_size
+        nr_points = self.nr_points
+        for radius in (self.radius, 2 * self.radius):
+            coords = random((nr_points, 3))
+            kdt = kdtrees.KDTree(coords, bucket_size)
+            neighbors = kdt.neighbor_search(radius)
+            indices, radii = kdt.neighbor_search_arrays(radius, radii=True)
+            indices = frombuffer(indices, intp).reshape(-1, 2)
+            radii = frombuffer(radii)
+            self.assertEqual(len(indices), len(neighbors))
+            self.assertEqual(len(radii), len(neighbors))
+            expected = {
+                (neighbor.index1, neighbor.index2): neighbor.radius
+                for neighbor in neighbors
+            }
+            for (index1, index2), r in zip(indices.tolist(), radii):
+                self.assertAlmostEqual(expected[index1, index2], r)
+            indices2, radii2 = kdt.neighbor_search_arrays(radius)
+            self.assertIsNone(radii2)
+            self.assertEqual(bytes(indices2), indices.tobytes())
+        with self.assertRaises(ValueError):
+            kdt.neighbor_search_arrays(-1)
+
 
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
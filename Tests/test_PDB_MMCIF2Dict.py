@@ -23,7 +23,9 @@ except ImportError:
 
 import io
 import textwrap
+from unittest import mock
 
+from Bio.PDB import MMCIF2Dict as MMCIF2Dict_module
 from Bio.PDB.MMCIF2Dict import MMCIF2Dict
 
 
@@ -346,6 +348,58 @@ class MMCIF2dictTests(unittest.TestCase):
         self.assertRaises(ValueError, MMCIF2Dict, file)
         self.assertRaises(ValueError, MMCIF2Dict, file2)
 
+    def test_categories(self):
+        filename = "PDB/1A8O.cif"
+        mmcif = MMCIF2Dict(filename)
+        categories = ["_atom_site", "struct", "_exptl"]
+        selected = MMCIF2Dict(filename, categories=categories)
+        expected = {
+            key: value
+            for key, value in mmcif.items()
+            if key == "data_"
+            or key.split(".")[0] in ("_atom_site", "_struct", "_exptl")
+        }
+        self.assertEqual(dict(selected), expected)
+        self.assertIn("_atom_site.Cartn_x", selected)
+        self.assertIn("_struct.title", selected)
+        self.assertNotIn("_atom_site_anisotrop.id", selected)
+        self.assertNotIn("_struct_keywords.text", selected)
+
+    def test_python_tokenizer(self):
+        """Compare the C tokenizer to the Python tokenizer."""
+        if MMCIF2Dict_module._mmcif_tokenizer is None:
+            self.skipTest("C extension not available")
+        texts = [
+            "data_test _key1\n;foo bar\n; _key2 'value 2'\n",
+            "data_test\n_a 'x'y' _b \"q\"\n#c\nloop_\n_l.a\n_l.b\n1 2 3 '4' # c\n",
+            "data_test\r\n_key1\r\n;foo  \r\n  bar\r\n;\r\n_key2 x#y\r\n",
+            "data_test\n_a é\n",
+        ]
+        for filename in ["PDB/1A8O.cif", "PDB/4Q9R_min.cif", "PDB/1MOM_min.cif"]:
+            with open(filename) as stream:
+                texts.append(stream.read())
+        for text in texts:
+            for categories in (None, ["_l", "_atom_site"]):
+                mmcif = MMCIF2Dict(io.StringIO(text), categories)
+                with mock.patch.object(MMCIF2Dict_module, "_mmcif_tokenizer", None):
+                    expected = MMCIF2Dict(io.StringIO(text), categories)
+                self.assertEqual(mmcif, expected)
+        for text, message in [
+            ("", "Empty file."),
+            ("data_test\n_key1\n;foo bar\n", "Missing closing semicolon"),
+            ("data_test _key1\n;foo\n;# x", "Missing whitespace"),
+            (
+                "data_test _key 'value\n",
+                "Line ended with quote open: data_test _key 'value",
+            ),
+            ("error_test\n", "must begin with a 'data_' directive"),
+        ]:
+            with self.assertRaisesRegex(ValueError, message):
+                MMCIF2Dict(io.StringIO(text))
+            with mock.patch.object(MMCIF2Dict_module, "_mmcif_tokenizer", None):
+                with self.assertRaisesRegex(ValueError, message):
+                    MMCIF2Dict(io.StringIO(text))
+
 
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
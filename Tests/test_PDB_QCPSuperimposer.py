@@ -19,7 +19,11 @@ except ImportError:
 
 from Bio.PDB import PDBParser
 from Bio.PDB import Selection
+from Bio.PDB.PDBExceptions import PDBException
+from Bio.PDB.qcprot import QCPBatchSuperimposer
 from Bio.PDB.qcprot import QCPSuperimposer
+from Bio.PDB.vectors import rotaxis2m
+from Bio.PDB.vectors import Vector
 from Bio.SVDSuperimposer import SVDSuperimposer
 
 
@@ -149,6 +153,128 @@ class QCPSuperimposerTest(unittest.TestCase):
         self.assertAlmostEqual(sup.rms, 0.0, places=6)
 
 
+class QCPBatchSuperimposerTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1234)
+        self.x = rng.normal(scale=10.0, size=(20, 3))
+        rotations = [
+            rotaxis2m(angle, Vector(*axis))
+            for angle, axis in zip(
+                [0.1, 1.0, 2.5, 3.0], rng.normal(size=(4, 3)).tolist()
+            )
+        ]
+        self.y = np.array(
+            [np.dot(self.x, rot) + rng.normal(size=3) for rot in rotations]
+        )
+        self.y += rng.normal(scale=0.1, size=self.y.shape)
+
+    def test_run(self):
+        """Compare the batched superposition to QCPSuperimposer."""
+        sup = QCPBatchSuperimposer()
+        sup.set(self.x, self.y)
+        self.assertIsNone(sup.rms)
+        sup.run()
+        rot, tran = sup.get_rotran()
+        self.assertEqual(rot.shape, (4, 3, 3))
+        self.assertEqual(tran.shape, (4, 3))
+        self.assertEqual(sup.get_rms().shape, (4,))
+        transformed = sup.get_transformed()
+        self.assertEqual(transformed.shape, (4, 20, 3))
+        for k, y in enumerate(self.y):
+            single = QCPSuperimposer()
+            single.set(self.x, y)
+            single.run()
+            self.assertAlmostEqual(sup.rms[k], single.rms, places=6)
+            self.assertTrue(np.allclose(rot[k], single.rot, atol=1e-6))
+            self.assertTrue(np.allclose(tran[k], single.tran, atol=1e-6))
+            self.assertTrue(
+                np.allclose(transformed[k], single.get_transformed(), atol=1e-6)
+            )
+            self.assertAlmostEqual(sup.get_init_rms()[k], single.get_init_rms())
+
+    def test_identical(self):
+        """Superimpose coordinates on themselves."""
+        sup = QCPBatchSuperimposer()
+        sup.set(self.x, np.array([self.x, self.x + 1.0]))
+        sup.run()
+        self.assertTrue(np.allclose(sup.rms, 0.0, atol=1e-6))
+        self.assertTrue(np.allclose(sup.rot, np.eye(3), atol=1e-6))
+        self.assertTrue(np.allclose(sup.tran, [[0, 0, 0], [-1, -1, -1]], atol=1e-6))
+
+    def test_errors(self):
+        """Test the checks of the input coordinates."""
+        sup = QCPBatchSuperimposer()
+        self.assertRaises(PDBException, sup.run)
+        self.assertRaises(PDBException, sup.set, self.x, self.y[0])
+        self.assertRaises(PDBException, sup.set, self.x, self.y[:, :10])
+        self.assertRaises(PDBException, sup.apply, [])
+        self.assertRaises(PDBException, sup.get_rms)
+
+    def test_on_pdb(self):
+        """Superimpose transformed copies of a structure on it."""
+        p = PDBParser()
+        fixed = p.get_structure("FIXED", "PDB/1A8O.pdb")[0]
+        models = [p.get_structure("MOVING", "PDB/1A8O.pdb")[0] for _ in range(3)]
+        for angle, model in zip([0.5, 1.5, 2.5], models):
+            model.transform(rotaxis2m(angle, Vector(1, 2, 3)), np.array([1, 2, 3]))
+
+        sup = QCPBatchSuperimposer()
+        sup.set_entities(fixed, models)
+        self.assertTrue(np.allclose(sup.rms, 0.0, atol=1e-3))
+        # The models were transformed atom by atom, so their coordinates
+        # are no longer stored in a shared array
+        self.assertIsNone(models[0]._get_shared_coords())
+        sup.apply(models)
+        for model in models:
+            self.assertTrue(
+                np.allclose(model.get_coords(), fixed.get_coords(), atol=1e-3)
+            )
+
+        # Only use the CA atoms to superimpose the models
+        models = [p.get_structure("MOVING", "PDB/1A8O.pdb")[0] for _ in range(2)]
+        models[1].get_coords()[:] += 5.0
+        atoms = list(fixed.get_atoms())
+        indices = [i for i, atom in enumerate(atoms) if atom.get_id() == "CA"]
+        sup.set_entities(fixed, models, indices)
+        self.assertEqual(sup.reference_coords.shape, (len(indices), 3))
+        coords = [model.get_coords() for model in models]
+        sup.apply(models)
+        # The shared coordinate arrays were transformed in place
+        for model, model_coords in zip(models, coords):
+            self.assertIs(model._get_shared_coords(), model_coords)
+            self.assertTrue(np.allclose(model_coords, fixed.get_coords(), atol=1e-3))
+
+        # Atom lists
+        moving = [list(model.get_atoms()) for model in models]
+        models[0].get_coords()[:] -= 5.0
+        sup.set_atoms(atoms, moving)
+        sup.apply(moving)
+        for model in models:
+            self.assertTrue(
+                np.allclose(model.get_coords(), fixed.get_coords(), atol=1e-3)
+            )
+        self.assertRaises(PDBException, sup.set_atoms, atoms, [atoms[:10]])
+
+    def test_disordered(self):
+        """Apply the transformation to all alternative locations of atoms."""
+        p = PDBParser(QUIET=True)
+        fixed = p.get_structure("FIXED", "PDB/disordered.pdb")[0]
+        moving = p.get_structure("MOVING", "PDB/disordered.pdb")[0]
+        rot = rotaxis2m(1.0, Vector(0, 0, 1))
+        tran = np.array([1.0, 0.0, 0.0])
+        moving.transform(rot, tran)
+        sup = QCPBatchSuperimposer()
+        sup.set_entities(fixed, [moving])
+        sup.apply([moving])
+        for atom1, atom2 in zip(fixed.get_atoms(), moving.get_atoms()):
+            if atom1.is_disordered():
+                for child1, child2 in zip(
+                    atom1.disordered_get_list(), atom2.disordered_get_list()
+                ):
+                    self.assertTrue(np.allclose(child1.coord, child2.coord, atol=1e-3))
+            self.assertTrue(np.allclose(atom1.coord, atom2.coord, atol=1e-3))
+
+
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
     unittest.main(testRunner=runner)
@@ -8,6 +8,7 @@
 """Unit tests for the Bio.PDB.SASA module: Surface Accessibility Calculations."""
 
 import copy
+import math
 import pathlib
 import unittest
 import warnings
@@ -81,6 +82,32 @@ class TestShrakeRupley(unittest.TestCase):
         for a, b in zip(result, expected):
             self.assertAlmostEqual(a, b, places=2)
 
+    def test_threads(self):
+        """Run Shrake-Rupley with multiple threads and small chunks."""
+        m = copy.deepcopy(self.model)  # modifies atom.sasa
+
+        sasa = ShrakeRupley()
+        sasa.compute(m)
+        expected = [a.sasa for a in m.get_atoms()]
+
+        sasa = ShrakeRupley(threads=3)
+        sasa._chunk_size = 1000  # test the sphere points of a few atoms at a time
+        sasa.compute(m)
+        result = [a.sasa for a in m.get_atoms()]
+        self.assertEqual(result, expected)
+
+    def test_single_atom(self):
+        """Run Shrake-Rupley on a residue with a single atom."""
+        r = copy.deepcopy(self.model["A"].child_list[0])
+        for a in list(r)[1:]:
+            r.detach_child(a.name)
+
+        sasa = ShrakeRupley()
+        sasa.compute(r)
+        atom = r.child_list[0]
+        radius = sasa.radii_dict[atom.element] + sasa.probe_radius
+        self.assertAlmostEqual(atom.sasa, 4 * math.pi * radius**2, places=6)
+
     # Compute parameters
     def test_level_R(self):
         """Run Shrake-Rupley with level R."""
@@ -115,6 +142,11 @@ class TestShrakeRupley(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, "must be larger than 1"):
             sasa = ShrakeRupley(n_points=0)
 
+    def test_fail_threads(self):
+        """Raise exception on bad threads parameter."""
+        with self.assertRaisesRegex(ValueError, "must be at least 1"):
+            sasa = ShrakeRupley(threads=0)
+
     def test_fail_compute_entity_type(self):
         """Raise exception on unsupported entity type."""
         with self.assertRaisesRegex(ValueError, "Invalid entity type"):
@@ -567,6 +567,116 @@ class CenterOfMassTests(unittest.TestCase):
             s.center_of_mass()
 
 
+class CoordinateStorageTests(unittest.TestCase):
+    """Tests the shared coordinate storage of models."""
+
+    def setUp(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", PDBConstructionWarning)
+            self.s = PDBParser(PERMISSIVE=True).get_structure("X", "PDB/1LCD.pdb")
+
+    def test_slots(self):
+        atom = next(self.s.get_atoms())
+        self.assertNotIn("coord", vars(atom))
+        self.assertNotIn("_id", vars(self.s[0]))
+        # Additional attributes can still be set
+        atom.sasa = 1.0
+        self.s[0].sasa = 2.0
+        self.assertEqual(atom.sasa, 1.0)
+        self.assertEqual(self.s[0].sasa, 2.0)
+        self.assertEqual(atom.xtra, {})
+        atom.xtra["key"] = "value"
+        self.assertEqual(atom.copy().xtra, {"key": "value"})
+
+    def test_get_coords(self):
+        model = self.s[0]
+        atoms = list(model.get_atoms())
+        coords = model.get_coords()
+        self.assertEqual(coords.shape, (len(atoms), 3))
+        self.assertTrue(np.array_equal(coords, [atom.coord for atom in atoms]))
+        # No copies are made
+        self.assertIs(model.get_coords(), coords)
+        self.assertTrue(np.shares_memory(atoms[0].coord, coords))
+        for entity in (model["B"], model["C"][("H_NA", 12, " ")], self.s):
+            entity_coords = entity.get_coords()
+            self.assertTrue(np.shares_memory(entity_coords, coords) or entity is self.s)
+            self.assertTrue(
+                np.array_equal(
+                    entity_coords, [atom.coord for atom in entity.get_atoms()]
+                )
+            )
+        # Modifying the coordinates modifies the atoms, and vice versa
+        coords[0] = (1, 2, 3)
+        self.assertEqual(atoms[0].coord.tolist(), [1, 2, 3])
+        atoms[1].coord += 1
+        self.assertTrue(np.array_equal(coords[1], atoms[1].coord))
+        self.assertIs(model.get_coords(), coords)
+
+    def test_invalidation(self):
+        model = self.s[0]
+        coords = model.get_coords()
+        atom = next(model.get_atoms())
+        atom.coord = np.array((1, 2, 3), "f")
+        new_coords = model.get_coords()
+        self.assertFalse(np.shares_memory(new_coords, coords))
+        self.assertEqual(new_coords[0].tolist(), [1, 2, 3])
+        # Changes in the hierarchy are taken into account
+        s = self.s.copy()
+        self.assertFalse(np.shares_memory(s[0].get_coords(), self.s.get_coords()))
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", PDBConstructionWarning)
+            s = PDBParser(PERMISSIVE=True).get_structure("X", "PDB/1LCD.pdb")
+        model = s[0]
+        n = len(model.get_coords())
+        residue = model["A"].child_list[0]
+        residue.detach_child("N")
+        self.assertEqual(len(model.get_coords()), n - 1)
+        model.detach_child("C")
+        self.assertEqual(len(model.get_coords()), len(list(model.get_atoms())))
+        # Transformations give the same results as before
+        rotation = rotmat(Vector(1, 0, 0), Vector(0, 1, 0))
+        model.transform(rotation, np.array((1, 2, 3), "f"))
+        self.assertTrue(
+            np.array_equal(
+                model.get_coords(), [atom.coord for atom in model.get_atoms()]
+            )
+        )
+
+    def test_pickle(self):
+        import pickle
+
+        s = pickle.loads(pickle.dumps(self.s))
+        atom = next(s.get_atoms())
+        atom.coord[0] = 100
+        self.assertEqual(s[0].get_coords()[0, 0], 100)
+        self.assertTrue(
+            np.array_equal(s[0].get_coords()[1:], self.s[0].get_coords()[1:])
+        )
+        s = deepcopy(self.s)
+        self.assertTrue(np.array_equal(s.get_coords(), self.s.get_coords()))
+
+    def test_pickle_protocols(self):
+        import pickle
+
+        parser = PDBParser(QUIET=True)
+        structure = parser.get_structure("X", "PDB/disordered.pdb")
+        atoms = list(structure.get_atoms())
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            with self.subTest(protocol=protocol):
+                atom = pickle.loads(pickle.dumps(atoms[0], protocol))
+                self.assertEqual(atom.get_full_id(), atoms[0].get_full_id())
+                self.assertEqual(atom.coord.tolist(), atoms[0].coord.tolist())
+                self.assertEqual(atom.serial_number, atoms[0].serial_number)
+                s = pickle.loads(pickle.dumps(structure, protocol))
+                new_atoms = list(s.get_atoms())
+                self.assertEqual(len(new_atoms), len(atoms))
+                for new_atom, old_atom in zip(new_atoms, atoms):
+                    self.assertIs(type(new_atom), type(old_atom))
+                    self.assertEqual(new_atom.get_full_id(), old_atom.get_full_id())
+                    self.assertEqual(new_atom.altloc, old_atom.altloc)
+                self.assertTrue(np.array_equal(s.get_coords(), structure.get_coords()))
+
+
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
     unittest.main(testRunner=runner)
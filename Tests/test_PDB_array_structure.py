@@ -0,0 +1,215 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+"""Tests for the Bio.PDB.array_structure module."""
+
+import unittest
+import warnings
+
+try:
+    import numpy as np
+except ImportError:
+    from Bio import MissingPythonDependencyError
+
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.PDB."
+    ) from None
+
+from Bio.PDB import FastMMCIFParser
+from Bio.PDB import MMCIFParser
+from Bio.PDB import PDBParser
+from Bio.PDB.array_structure import ArrayStructure
+from Bio.PDB.array_structure import ArrayStructureBuilder
+from Bio.PDB.PDBExceptions import PDBConstructionWarning
+
+
+class TestArrayStructure(unittest.TestCase):
+    def assertSameAtom(self, atom1, atom2):
+        self.assertEqual(atom1.get_full_id(), atom2.get_full_id())
+        self.assertEqual(atom1.fullname, atom2.fullname)
+        self.assertEqual(atom1.altloc, atom2.altloc)
+        self.assertEqual(atom1.serial_number, atom2.serial_number)
+        self.assertEqual(
+            isinstance(atom1.serial_number, str), isinstance(atom2.serial_number, str)
+        )
+        self.assertEqual(atom1.element, atom2.element)
+        self.assertEqual(atom1.bfactor, atom2.bfactor)
+        self.assertEqual(atom1.occupancy, atom2.occupancy)
+        self.assertEqual(atom1.pqr_charge, atom2.pqr_charge)
+        self.assertEqual(atom1.radius, atom2.radius)
+        self.assertTrue(np.allclose(atom1.coord, atom2.coord))
+        for anisou1, anisou2 in (
+            (atom1.anisou_array, atom2.anisou_array),
+            (atom1.siguij_array, atom2.siguij_array),
+            (atom1.sigatm_array, atom2.sigatm_array),
+        ):
+            if anisou1 is None:
+                self.assertIsNone(anisou2)
+            else:
+                self.assertTrue(np.array_equal(anisou1, anisou2))
+
+    def assertSameStructure(self, structure1, structure2):
+        self.assertEqual(structure1.id, structure2.id)
+        self.assertEqual(structure1.header, structure2.header)
+        self.assertEqual(len(structure1), len(structure2))
+        for model1, model2 in zip(structure1, structure2):
+            self.assertEqual(model1.serial_num, model2.serial_num)
+            self.assertEqual(
+                [chain.id for chain in model1], [chain.id for chain in model2]
+            )
+            residues1 = list(model1.get_residues())
+            residues2 = list(model2.get_residues())
+            self.assertEqual(len(residues1), len(residues2))
+            for residue1, residue2 in zip(residues1, residues2):
+                self.assertEqual(residue1.get_full_id(), residue2.get_full_id())
+                self.assertEqual(residue1.resname, residue2.resname)
+                self.assertEqual(residue1.segid, residue2.segid)
+                self.assertEqual(residue1.is_disordered(), residue2.is_disordered())
+                atoms1 = residue1.get_unpacked_list()
+                atoms2 = residue2.get_unpacked_list()
+                self.assertEqual(len(atoms1), len(atoms2))
+                for atom1, atom2 in zip(atoms1, atoms2):
+                    self.assertSameAtom(atom1, atom2)
+
+    def compare(self, parser_class, filename, **kwargs):
+        parser = parser_class(QUIET=True, **kwargs)
+        structure = parser.get_structure("example", filename)
+        builder = ArrayStructureBuilder(QUIET=True)
+        parser = parser_class(structure_builder=builder, QUIET=True, **kwargs)
+        array_structure = parser.get_structure("example", filename)
+        self.assertIsInstance(array_structure, ArrayStructure)
+        self.assertSameStructure(structure, array_structure.to_structure())
+        return structure, array_structure
+
+    def test_pdb(self):
+        for filename in [
+            "PDB/1A8O.pdb",
+            "PDB/1LCD.pdb",
+            "PDB/2XHE.pdb",
+            "PDB/disordered.pdb",
+            "PDB/occupancy.pdb",
+            "PDB/a_structure.pdb",
+        ]:
+            with self.subTest(filename=filename):
+                self.compare(PDBParser, filename)
+
+    def test_pqr(self):
+        structure, array_structure = self.compare(
+            PDBParser, "PQR/1A80.pqr", is_pqr=True
+        )
+        atoms = list(structure.get_atoms())
+        self.assertEqual(
+            array_structure.pqr_charge.tolist(), [atom.pqr_charge for atom in atoms]
+        )
+        self.assertEqual(
+            array_structure.radius.tolist(), [atom.radius for atom in atoms]
+        )
+
+    def test_mmcif(self):
+        for filename in [
+            "PDB/1A8O.cif",
+            "PDB/1LCD.cif",
+            "PDB/2XHE.cif",
+            "PDB/a_structure.cif",
+        ]:
+            with self.subTest(filename=filename):
+                self.compare(MMCIFParser, filename)
+                self.compare(FastMMCIFParser, filename)
+
+    def test_binary_cif(self):
+        try:
+            from Bio.PDB.binary_cif import BinaryCIFParser
+        except ImportError:
+            self.skipTest("msgpack is not installed")
+        for entry in ["1gbt", "6wg6", "3jqh"]:
+            with self.subTest(entry=entry):
+                filename = f"PDB/{entry}.bcif.gz"
+                structure = BinaryCIFParser().get_structure(entry, filename)
+                parser = BinaryCIFParser(structure_builder=ArrayStructureBuilder())
+                array_structure = parser.get_structure(entry, filename)
+                self.assertIsInstance(array_structure, ArrayStructure)
+                self.assertSameStructure(structure, array_structure.to_structure())
+
+    def test_columns(self):
+        structure, array_structure = self.compare(PDBParser, "PDB/1LCD.pdb")
+        # Chains are discontinuous in this file, so the atoms in the columns
+        # are in a different order than in the hierarchy.
+        atoms = sorted(
+            structure.get_atoms(),
+            key=lambda atom: (atom.get_full_id()[1], atom.serial_number),
+        )
+        model_index = array_structure.atom_index("M")
+        order = np.lexsort((array_structure.serial_number, model_index))
+        self.assertTrue(np.array_equal(order, np.arange(len(atoms))))
+        self.assertEqual(array_structure.coord.dtype, np.float32)
+        self.assertEqual(array_structure.coord.shape, (len(atoms), 3))
+        self.assertTrue(
+            np.array_equal(array_structure.coord, [atom.coord for atom in atoms])
+        )
+        self.assertEqual(array_structure.name.tolist(), [atom.name for atom in atoms])
+        self.assertEqual(
+            array_structure.element.tolist(), [atom.element for atom in atoms]
+        )
+        self.assertEqual(
+            array_structure.bfactor.tolist(), [atom.bfactor for atom in atoms]
+        )
+        self.assertEqual(
+            array_structure.serial_number.tolist(),
+            [atom.serial_number for atom in atoms],
+        )
+        self.assertEqual(array_structure.model_id.tolist(), [0, 1, 2])
+        self.assertEqual(array_structure.model_serial_num.tolist(), [1, 2, 3])
+        self.assertEqual(
+            model_index.tolist(), [atom.get_full_id()[1] for atom in atoms]
+        )
+        chain_index = array_structure.atom_index("C")
+        self.assertEqual(
+            array_structure.chain_id[chain_index].tolist(),
+            [atom.get_full_id()[2] for atom in atoms],
+        )
+        residue_index = array_structure.atom_index("R")
+        self.assertEqual(
+            array_structure.resseq[residue_index].tolist(),
+            [atom.get_full_id()[3][1] for atom in atoms],
+        )
+        self.assertRaises(ValueError, array_structure.atom_index, "A")
+
+    def test_lazy_hierarchy(self):
+        parser = PDBParser(structure_builder=ArrayStructureBuilder(QUIET=True))
+        structure = parser.get_structure("1LCD", "PDB/1LCD.pdb")
+        self.assertEqual(
+            repr(structure), "<ArrayStructure id=1LCD models=3 atoms=3384>"
+        )
+        self.assertEqual(len(structure), 3)
+        self.assertEqual(structure._models, {})
+        self.assertIn(2, structure)
+        self.assertNotIn(3, structure)
+        model = structure[2]
+        self.assertEqual(model.id, 2)
+        self.assertEqual(list(structure._models), [2])
+        self.assertIs(structure[2], model)
+        self.assertIs(model.get_parent(), structure[0].get_parent())
+        self.assertEqual([model.id for model in structure], [0, 1, 2])
+        self.assertEqual([m.id for m in structure.to_structure()], [0, 1, 2])
+        self.assertEqual(len(list(structure.get_atoms())), len(structure.coord))
+        # The builder can be reused
+        other = parser.get_structure("1A8O", "PDB/1A8O.pdb")
+        self.assertEqual(repr(other), "<ArrayStructure id=1A8O models=1 atoms=644>")
+        self.assertEqual(len(structure.coord), 3384)
+
+    def test_warnings(self):
+        parser = PDBParser(structure_builder=ArrayStructureBuilder(), QUIET=True)
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always", PDBConstructionWarning)
+            structure = parser.get_structure("1LCD", "PDB/1LCD.pdb")
+            self.assertEqual(len(w), 0)
+            structure.to_structure()
+        self.assertTrue(w)
+        self.assertTrue(
+            all(issubclass(warning.category, PDBConstructionWarning) for warning in w)
+        )
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
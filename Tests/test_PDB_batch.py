@@ -0,0 +1,164 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+"""Tests for the Bio.PDB.batch module."""
+
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    import numpy as np  # noqa: F401
+except ImportError:
+    from Bio import MissingPythonDependencyError
+
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.PDB."
+    ) from None
+
+from Bio.PDB import PDBParser
+from Bio.PDB.batch import BatchParser
+from Bio.PDB.batch import BatchResult
+from Bio.PDB.Structure import Structure
+
+
+def count_residues(structure):
+    """Return the number of residues in the first model."""
+    return len(list(structure[0].get_residues()))
+
+
+def fail_on_1lcd(structure):
+    """Raise an exception for 1LCD."""
+    if structure.id == "1LCD":
+        raise RuntimeError("no 1LCD please")
+    return structure.id
+
+
+def crash_on_1lcd(structure):
+    """Terminate the worker process for 1LCD."""
+    if structure.id == "1LCD":
+        os._exit(1)
+    return structure.id
+
+
+class TestBatchParser(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        shutil.copy("PDB/1A8O.pdb", cls.directory)
+        shutil.copy("PDB/1LCD.cif", cls.directory)
+        os.mkdir(os.path.join(cls.directory, "sub"))
+        with open("PDB/2XHE.pdb", "rb") as source:
+            path = os.path.join(cls.directory, "sub", "2XHE.pdb.gz")
+            with gzip.open(path, "wb") as target:
+                shutil.copyfileobj(source, target)
+        with open(os.path.join(cls.directory, "broken.cif"), "w") as stream:
+            stream.write("this is not an mmCIF file\n")
+        with open(os.path.join(cls.directory, "README.txt"), "w") as stream:
+            stream.write("ignored\n")
+        parser = PDBParser(QUIET=True)
+        cls.expected = {
+            "1A8O.pdb": count_residues(parser.get_structure("1A8O", "PDB/1A8O.pdb")),
+            "1LCD.cif": count_residues(parser.get_structure("1LCD", "PDB/1LCD.pdb")),
+            "2XHE.pdb.gz": count_residues(parser.get_structure("2XHE", "PDB/2XHE.pdb")),
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def check_results(self, parser, results):
+        results = {os.path.basename(result.path): result for result in results}
+        self.assertEqual(
+            sorted(results), ["1A8O.pdb", "1LCD.cif", "2XHE.pdb.gz", "broken.cif"]
+        )
+        for name, value in self.expected.items():
+            result = results[name]
+            self.assertIsInstance(result, BatchResult)
+            self.assertIsNone(result.error)
+            self.assertEqual(result.value, value)
+            self.assertGreater(result.time, 0)
+        result = results["broken.cif"]
+        self.assertIsNone(result.value)
+        self.assertTrue(result.error.startswith("ValueError: "))
+        stats = parser.stats
+        self.assertEqual(stats.total, 4)
+        self.assertEqual(stats.done, 4)
+        self.assertEqual(stats.failed, 1)
+        self.assertGreater(stats.cpu_time, 0)
+        self.assertGreater(stats.elapsed, 0)
+        self.assertIn("done=4/4 failed=1", repr(stats))
+
+    def test_serial(self):
+        parser = BatchParser(count_residues, processes=1)
+        progress = []
+        results = list(
+            parser.parse(
+                self.directory, progress=lambda stats: progress.append(stats.done)
+            )
+        )
+        self.assertEqual(
+            [os.path.basename(result.path) for result in results][:2],
+            ["1A8O.pdb", "1LCD.cif"],
+        )
+        self.assertEqual(progress, [1, 2, 3, 4])
+        self.check_results(parser, results)
+
+    def test_processes(self):
+        parser = BatchParser(count_residues, processes=2)
+        results = list(parser.parse(self.directory))
+        self.check_results(parser, results)
+
+    def test_structures(self):
+        paths = [os.path.join(self.directory, "1A8O.pdb"), "PDB/1A8O.cif"]
+        parser = BatchParser(processes=1)
+        results = list(parser.parse(paths))
+        self.assertEqual([result.path for result in results], paths)
+        for result in results:
+            self.assertIsInstance(result.value, Structure)
+            self.assertEqual(result.value.id, "1A8O")
+        parser = BatchParser(file_format="pdb", processes=1)
+        (result,) = parser.parse("PDB/1A8O.cif")
+        self.assertIsNotNone(result.error)
+        self.assertRaises(ValueError, BatchParser, file_format="xyz")
+        self.assertRaises(ValueError, BatchParser, processes=0)
+
+    def test_reducer_errors(self):
+        paths = ["PDB/1A8O.pdb", "PDB/1LCD.pdb", "PDB/missing.pdb"]
+        for processes in (1, 2):
+            with self.subTest(processes=processes):
+                parser = BatchParser(fail_on_1lcd, processes=processes)
+                results = {result.path: result for result in parser.parse(paths)}
+                self.assertEqual(results["PDB/1A8O.pdb"].value, "1A8O")
+                self.assertEqual(
+                    results["PDB/1LCD.pdb"].error, "RuntimeError: no 1LCD please"
+                )
+                self.assertTrue(
+                    results["PDB/missing.pdb"].error.startswith("FileNotFoundError")
+                )
+                self.assertEqual(parser.stats.failed, 2)
+
+    def test_worker_crash(self):
+        paths = ["PDB/1A8O.pdb", "PDB/1LCD.pdb", "PDB/2XHE.pdb", "PDB/1A8O.cif"]
+        parser = BatchParser(crash_on_1lcd, processes=2)
+        results = {result.path: result for result in parser.parse(paths)}
+        self.assertEqual(len(results), 4)
+        self.assertTrue(results["PDB/1LCD.pdb"].error.startswith("BrokenProcessPool"))
+        self.assertEqual(results["PDB/1A8O.pdb"].value, "1A8O")
+        self.assertEqual(results["PDB/2XHE.pdb"].value, "2XHE")
+        self.assertEqual(results["PDB/1A8O.cif"].value, "1A8O")
+        self.assertEqual(parser.stats.failed, 1)
+
+    def test_interrupted(self):
+        parser = BatchParser(count_residues, processes=2)
+        results = parser.parse(self.directory)
+        next(results)
+        results.close()
+        self.assertEqual(parser.stats.done, 1)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
@@ -28,6 +28,7 @@ from Bio.PDB.ic_rebuild import IC_duplicate
 from Bio.PDB.ic_rebuild import structure_rebuild_test
 from Bio.PDB.internal_coords import AtomKey
 from Bio.PDB.internal_coords import Dihedron
+from Bio.PDB.internal_coords import IC_BatchRebuilder
 from Bio.PDB.internal_coords import IC_Chain
 from Bio.PDB.internal_coords import IC_Residue
 from Bio.PDB.MMCIFParser import MMCIFParser
@@ -658,6 +659,51 @@ class Rebuild(unittest.TestCase):
         assert Dihedron.angle_avg(np.array([90.0, -90.0])) == 0.0
         assert Dihedron.angle_avg(np.array([91.0, -91.0])) == 180.0
 
+    def test_batch_rebuild(self):
+        """Rebuild many sets of dihedral angles with IC_BatchRebuilder."""
+        structure = self.PDB_parser.get_structure("1A8O", "PDB/1A8O.pdb")
+        chain = structure[0]["A"]
+        chain.atom_to_internal_coordinates()
+        cic = chain.internal_coord
+        rebuilder = cic.batch_rebuilder()
+        self.assertIsInstance(rebuilder, IC_BatchRebuilder)
+
+        # same coordinates and angles for the current dihedral angles
+        coords = rebuilder.rebuild(cic.dihedraAngle)
+        self.assertEqual(coords.shape, (1, cic.AAsiz, 3))
+        self.assertTrue(np.allclose(coords[0], cic.atomArray[:, :3], atol=1e-8))
+        angles = rebuilder.dihedral_angles(cic.atomArray[:, :3])
+        self.assertTrue(np.allclose(angles[0], cic.dihedraAngle, atol=1e-8))
+
+        # perturb the psi angles
+        rng = np.random.default_rng(0)
+        psi = [ric.pick_angle("psi") for ric in cic.ordered_aa_ic_list]
+        psi = [d.ndx for d in psi if d is not None]
+        psi_angles = cic.dihedraAngle[psi] + rng.uniform(-20, 20, (5, len(psi)))
+        coords = rebuilder.rebuild(psi_angles, indices=psi)
+        self.assertEqual(coords.shape, (5, cic.AAsiz, 3))
+        angles = rebuilder.dihedral_angles(coords)
+        self.assertTrue(
+            np.allclose(Dihedron.angle_dif(angles[:, psi], psi_angles), 0, atol=1e-8)
+        )
+        # the object graph is not modified
+        self.assertTrue(np.allclose(rebuilder.dihedraAngle, cic.dihedraAngle))
+
+        # same coordinates as internal_to_atom_coordinates
+        dihedra = {ndx: key for key, ndx in cic.dihedraNdx.items()}
+        for ndx, angle in zip(psi, psi_angles[2]):
+            cic.dihedra[dihedra[ndx]].angle = angle
+        ndxs = [cic.atomArrayIndex[ak] for iNCaC in cic.initNCaCs for ak in iNCaC]
+        cic.atomArrayValid[:] = False
+        cic.atomArrayValid[ndxs] = True
+        chain.internal_to_atom_coordinates()
+        self.assertTrue(np.allclose(coords[2], cic.atomArray[:, :3], atol=1e-8))
+        atom = chain[162]["CB"]
+        self.assertTrue(
+            np.allclose(coords[2, cic.atomArrayIndex[AtomKey("162_R_CB")]], atom.coord)
+        )
+        self.assertRaises(ValueError, rebuilder.rebuild, np.zeros(3))
+
 
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
@@ -0,0 +1,226 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+"""Tests for the Bio.PDB.mirror module, using a local HTTP server."""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+from Bio.PDB.mirror import PDBMirror
+from Bio.PDB.PDBList import PDBList
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serve files from a dictionary, with ETag and Range support."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, dict(self.headers)))
+        try:
+            data = server.files[self.path]
+        except KeyError:
+            self.send_error(404)
+            return
+        etag = '"%s"' % hashlib.md5(data).hexdigest()
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        start = 0
+        byte_range = self.headers.get("Range")
+        if self.path in server.partial:
+            # a broken server sending partial content for a full request
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes 0-{len(data) - 1}/{len(data)}")
+        elif byte_range and self.headers.get("If-Range") == etag:
+            start = int(byte_range[6:-1])
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}"
+            )
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(data) - start))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        body = data[start:]
+        if self.path in server.truncate:
+            # simulate a connection that breaks during the transfer
+            server.truncate.discard(self.path)
+            self.wfile.write(body[: len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+class TestPDBMirror(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        cls.server.daemon_threads = True
+        cls.url = "http://127.0.0.1:%d" % cls.server.server_address[1]
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.server.files = {
+            f"/files/{name}.gz": os.urandom(size)
+            for name, size in (("a", 100000), ("b", 5000), ("c", 0))
+        }
+        self.server.requests = []
+        self.server.truncate = set()
+        self.server.partial = set()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def get_files(self):
+        return [
+            (self.url + path, "sub/" + path.rsplit("/", 1)[1])
+            for path in sorted(self.server.files)
+        ]
+
+    def check_files(self):
+        for path, data in self.server.files.items():
+            filename = os.path.join(self.directory, "sub", path.rsplit("/", 1)[1])
+            with open(filename, "rb") as stream:
+                self.assertEqual(stream.read(), data)
+        # no temporary files are left behind
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.directory, "sub"))),
+            ["a.gz", "b.gz", "c.gz"],
+        )
+
+    def test_sync(self):
+        with PDBMirror(self.directory, max_connections=2) as mirror:
+            stats = mirror.sync(self.get_files())
+            self.assertEqual(stats.downloaded, 3)
+            self.assertEqual(stats.unchanged, 0)
+            self.assertEqual(stats.failed, [])
+            self.assertEqual(stats.bytes, 105000)
+            self.check_files()
+            self.assertTrue(
+                os.path.isfile(os.path.join(self.directory, ".pdb_mirror.sqlite"))
+            )
+            # second run: the server reports that nothing changed
+            self.server.requests.clear()
+            stats = mirror.sync(self.get_files())
+            self.assertEqual(stats.downloaded, 0)
+            self.assertEqual(stats.unchanged, 3)
+            self.assertEqual(stats.bytes, 0)
+            self.assertEqual(len(self.server.requests), 3)
+            for path, headers in self.server.requests:
+                self.assertIn("If-None-Match", headers)
+            # a file modified on the server, and a file removed locally
+            self.server.files["/files/b.gz"] = os.urandom(6000)
+            os.remove(os.path.join(self.directory, "sub", "c.gz"))
+            stats = mirror.sync(self.get_files())
+            self.assertEqual(stats.downloaded, 2)
+            self.assertEqual(stats.unchanged, 1)
+            self.check_files()
+            # forced download
+            stats = mirror.sync(self.get_files(), force=["sub/a.gz"])
+            self.assertEqual(stats.downloaded, 1)
+            self.assertEqual(stats.unchanged, 2)
+        # without contacting the server
+        self.server.requests.clear()
+        with PDBMirror(self.directory, check_remote=False) as mirror:
+            stats = mirror.sync(self.get_files())
+            self.assertEqual(stats.unchanged, 3)
+            self.assertEqual(self.server.requests, [])
+
+    def test_resume(self):
+        self.server.truncate.add("/files/a.gz")
+        with PDBMirror(self.directory) as mirror:
+            stats = mirror.sync(self.get_files())
+            self.assertEqual(stats.downloaded, 2)
+            self.assertEqual(len(stats.failed), 1)
+            path, error = stats.failed[0]
+            self.assertEqual(path, "sub/a.gz")
+            filename = os.path.join(self.directory, "sub", "a.gz")
+            # the incomplete file is never moved to its final location
+            self.assertFalse(os.path.exists(filename))
+            self.assertEqual(os.path.getsize(filename + ".part"), 50000)
+            self.server.requests.clear()
+            stats = mirror.sync(self.get_files())
+            self.assertEqual(stats.downloaded, 1)
+            self.assertEqual(stats.resumed, 1)
+            self.assertEqual(stats.unchanged, 2)
+            self.assertEqual(stats.bytes, 50000)
+            self.assertFalse(os.path.exists(filename + ".part"))
+            self.check_files()
+            headers = dict(self.server.requests)["/files/a.gz"]
+            self.assertEqual(headers["Range"], "bytes=50000-")
+            self.assertEqual(mirror.verify(), [])
+            # the file changed on the server since the transfer started
+            self.server.truncate.add("/files/a.gz")
+            self.server.files["/files/a.gz"] = os.urandom(100)
+            mirror.sync(self.get_files(), force=["sub/a.gz"])
+            self.server.files["/files/a.gz"] = os.urandom(200)
+            stats = mirror.sync(self.get_files())
+            self.assertEqual(stats.downloaded, 1)
+            self.assertEqual(stats.resumed, 0)
+            self.check_files()
+            # local corruption is detected by the checksums
+            with open(os.path.join(self.directory, "sub", "b.gz"), "r+b") as stream:
+                stream.write(b"x")
+            self.assertEqual(mirror.verify(), ["sub/b.gz"])
+
+    def test_errors(self):
+        files = self.get_files() + [(self.url + "/missing.gz", "missing.gz")]
+        with PDBMirror(self.directory) as mirror:
+            stats = mirror.sync(files)
+            self.assertEqual(stats.downloaded, 3)
+            self.assertEqual(len(stats.failed), 1)
+            self.assertEqual(stats.failed[0][0], "missing.gz")
+            self.assertTrue(stats.failed[0][1].startswith("HTTPError"))
+            self.assertIn("failed=1", repr(stats))
+            self.server.partial.add("/files/b.gz")
+            stats = mirror.sync(files, force=["sub/b.gz"])
+            self.assertEqual(stats.unchanged, 2)
+            self.assertEqual(len(stats.failed), 2)
+            self.assertEqual(
+                dict(stats.failed)["sub/b.gz"],
+                "OSError: Unexpected partial content for a full request",
+            )
+        self.assertRaises(ValueError, PDBMirror, self.directory, max_connections=0)
+
+    def test_pdblist(self):
+        self.server.files = {
+            "/pub/pdb/data/structures/divided/mmCIF/a8/1a8o.cif.gz": b"1A8O",
+            "/pub/pdb/data/structures/divided/mmCIF/lc/1lcd.cif.gz": b"1LCD",
+        }
+        pdblist = PDBList(server=self.url, pdb=self.directory, verbose=False)
+        stats = pdblist.sync_mirror(["1A8O", "1lcd"], file_format="mmCif")
+        self.assertEqual(stats.downloaded, 2)
+        with open(os.path.join(self.directory, "a8", "1a8o.cif.gz"), "rb") as stream:
+            self.assertEqual(stream.read(), b"1A8O")
+        stats = pdblist.sync_mirror(["1a8o", "1lcd"], "mmCif", modified=["1LCD"])
+        self.assertEqual(stats.downloaded, 1)
+        self.assertEqual(stats.unchanged, 1)
+        pdblist.flat_tree = True
+        stats = pdblist.sync_mirror(["1a8o"], "mmCif", check_remote=False)
+        self.assertEqual(stats.downloaded, 1)
+        self.assertTrue(os.path.isfile(os.path.join(self.directory, "1a8o.cif.gz")))
+        self.assertRaises(ValueError, pdblist.sync_mirror, ["1a8o"], "mmtf")
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
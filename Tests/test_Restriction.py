@@ -5,8 +5,11 @@
 
 """Testing code for Restriction enzyme classes of Biopython."""
 
+import subprocess
+import sys
 import unittest
 
+import Bio.Restriction
 from Bio import BiopythonWarning
 from Bio.Restriction import AanI
 from Bio.Restriction import Acc65I
@@ -76,6 +79,71 @@ class SequenceTesting(unittest.TestCase):
         self.assertTrue(linear_seq.is_linear())
 
 
+class LazyLoading(unittest.TestCase):
+    """Tests for the enzymes created when they are first used."""
+
+    def test_import(self):
+        """Test that importing an enzyme does not create the others."""
+        code = (
+            "from Bio.Restriction import Restriction, EcoRI; "
+            "print(EcoRI.site, 'BamHI' in vars(Restriction), "
+            "'AllEnzymes' in vars(Restriction))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        self.assertEqual(output, "GAATTC False False\n")
+
+    def test_attributes(self):
+        """Test access to the enzymes and batches as module attributes."""
+        self.assertIs(Restriction.EcoRI, EcoRI)
+        self.assertIs(Bio.Restriction.AllEnzymes, AllEnzymes)
+        self.assertIn(Restriction.ZraI, AllEnzymes)
+        self.assertIn("ZraI", Restriction.__all__)
+        self.assertIn("ZraI", dir(Bio.Restriction))
+        self.assertEqual(len(Restriction.__all__), len(AllEnzymes) + 6)
+        with self.assertRaises(AttributeError):
+            Restriction.NotAnEnzyme
+        with self.assertRaises(AttributeError):
+            Bio.Restriction.NotAnEnzyme
+        self.assertEqual(RestrictionBatch(["ZraI", EcoRI]), {Restriction.ZraI, EcoRI})
+        self.assertIn(EcoRI, RestrictionBatch(suppliers=["B"]))
+
+    def test_threads(self):
+        """Test that threads creating the enzymes get the same objects."""
+        code = """
+import threading
+from Bio.Restriction import Restriction
+names = Restriction.__all__[6:]
+barrier = threading.Barrier(8)
+results = []
+def run():
+    barrier.wait()
+    enzymes = [getattr(Restriction, name) for name in names]
+    results.append((enzymes, Restriction.AllEnzymes))
+threads = [threading.Thread(target=run) for i in range(8)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+enzymes, batch = results[0]
+print(all(
+    all(x is y for x, y in zip(enzymes, other)) and other_batch is batch
+    for other, other_batch in results
+), all(enzyme in batch for enzyme in enzymes))
+"""
+        output = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        self.assertEqual(output, "True True\n")
+
+
 class SimpleEnzyme(unittest.TestCase):
     """Tests for dealing with basic enzymes using the Restriction package."""
 
@@ -504,6 +572,30 @@ class RestrictionBatches(unittest.TestCase):
         self.assertEqual(hits[EcoRV], [8])
         self.assertEqual(hits[EcoRI], [16])
 
+    def test_batch_search(self):
+        """Batch search gives the same sites as the individual enzymes."""
+        letters = "ACGTACGTACGTNRYacgt"
+        random = 12345
+        sequence = []
+        for i in range(3000):
+            random = (1103515245 * random + 12345) % 2**31
+            sequence.append(letters[random % len(letters)])
+        seq = Seq("".join(sequence))
+        for linear in (True, False):
+            hits = AllEnzymes.search(seq, linear=linear)
+            self.assertEqual(len(hits), len(AllEnzymes))
+            for enzyme in AllEnzymes:
+                self.assertEqual(
+                    hits[enzyme], enzyme.search(seq, linear=linear), msg=enzyme
+                )
+        # the cached results are updated if the batch changes
+        seq = Seq("AAAA" + EcoRV.site + "AAAA" + EcoRI.site + "AAAA")
+        batch = RestrictionBatch([EcoRV])
+        self.assertEqual(batch.search(seq), {EcoRV: [8]})
+        batch.add(EcoRI)
+        self.assertEqual(batch.search(seq), {EcoRV: [8], EcoRI: [16]})
+        self.assertEqual(batch.search(seq, linear=False), {EcoRV: [8], EcoRI: [16]})
+
     def test_premade_batches(self):
         """Test content of premade batches CommOnly, NoComm, AllEnzymes."""
         self.assertEqual(len(AllEnzymes), (len(CommOnly) + len(NonComm)))
@@ -10,6 +10,8 @@ import tempfile
 import unittest
 from io import StringIO
 
+import numpy as np
+
 from Bio import Align
 from Bio import AlignIO
 from Bio import Phylo
@@ -46,6 +48,29 @@ class DistanceMatrixTest(unittest.TestCase):
             "matrix=[[0], [1, 0], [2, 3, 0], [4, 5, 6, 0]])",
         )
 
+    def test_numpy_construction(self):
+        array = np.array(
+            [[0, 1, 2, 4], [1, 0, 3, 5], [2, 3, 0, 6], [4, 5, 6, 0]], float
+        )
+        dm = DistanceMatrix(self.names, array)
+        self.assertEqual(dm["Gamma", "Beta"], 3)
+        self.assertIsInstance(dm["Gamma", "Beta"], float)
+        self.assertEqual(dm["Delta"], [4, 5, 6, 0])
+        self.assertEqual(
+            repr(dm),
+            "DistanceMatrix(names=['Alpha', 'Beta', 'Gamma', 'Delta'], "
+            "matrix=[[0.0], [1.0, 0.0], [2.0, 3.0, 0.0], [4.0, 5.0, 6.0, 0.0]])",
+        )
+        dm["Alpha", "Beta"] = 7
+        self.assertEqual(dm["Beta", "Alpha"], 7)
+        # the array given is not modified
+        self.assertEqual(array[1, 0], 1)
+        del dm["Beta"]
+        self.assertEqual(dm.matrix, [[0], [2, 0], [4, 6, 0]])
+        dm.insert("Beta", [7, 0, 3, 5], 1)
+        self.assertEqual(dm.matrix, [[0], [7, 0], [2, 3, 0], [4, 5, 6, 0]])
+        self.assertRaises(ValueError, DistanceMatrix, self.names, array[:3, :3])
+
     def test_bad_construction(self):
         self.assertRaises(
             TypeError,
@@ -202,6 +227,31 @@ class DistanceCalculatorTest(unittest.TestCase):
         self.assertEqual(dmat["Alpha", "Alpha"], 0.0)
         self.assertAlmostEqual(dmat["Alpha", "Gamma"], 4.0 / 5.0)
 
+    def test_pairwise(self):
+        msa = AlignIO.read("TreeConstruction/msa.phy", "phylip")
+        for model in ("identity", "blastn", "trans", "blosum62"):
+            calculator = DistanceCalculator(model)
+            for processes in (1, 2):
+                dm = calculator.get_distance(msa, processes=processes)
+                for record1 in msa:
+                    for record2 in msa:
+                        if record1 is record2:
+                            distance = 0
+                        else:
+                            distance = calculator._pairwise(record1, record2)
+                        self.assertAlmostEqual(
+                            dm[record1.id, record2.id], distance, places=12
+                        )
+
+    def test_bad_letter(self):
+        aln = AlignIO.read(StringIO(">Alpha\nAC-J\n>Beta\nACJA"), "fasta")
+        calculator = DistanceCalculator("blosum62")
+        with self.assertRaises(ValueError) as cm:
+            calculator.get_distance(aln)
+        self.assertEqual(
+            str(cm.exception), "Bad letter 'J' in sequence 'Alpha' at position '3'"
+        )
+
 
 class DistanceTreeConstructorTest(unittest.TestCase):
     """Test DistanceTreeConstructor."""
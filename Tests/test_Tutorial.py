@@ -45,6 +45,11 @@
 #
 # .. doctest . internet
 #
+# The special keyword 'tmp' runs the test in a temporary copy of the
+# working directory, for examples which write output files, e.g.
+#
+# .. doctest ../Tests/PhyloXML tmp
+#
 # TODO: Adding bin:XXX for checking binary XXX is on $PATH?
 #
 # See also "Writing doctests in the Tutorial" in the Tutorial
@@ -55,7 +60,9 @@
 
 import doctest
 import os
+import shutil
 import sys
+import tempfile
 import unittest
 import warnings
 
@@ -79,6 +86,9 @@ if "--offline" in sys.argv:
 # Cache this to restore the cwd at the end of the tests
 original_path = os.path.abspath(".")
 
+# Temporary directories created by the tests, removed at the end
+temp_dirs = []
+
 if os.path.basename(sys.argv[0]) == "test_Tutorial.py":
     # sys.argv[0] will be (relative) path to test_Tutorial.py - use this to allow, e.g.
     # [base]$ python Tests/test_Tutorial.py
@@ -202,7 +212,9 @@ def check_deps(dependencies):
     """Check 'lib:XXX' and 'internet' dependencies are met."""
     missing = []
     for dep in dependencies:
-        if dep == "internet":
+        if dep == "tmp":
+            pass
+        elif dep == "internet":
             if not online:
                 missing.append("internet")
         else:
@@ -216,6 +228,13 @@ def check_deps(dependencies):
     return missing
 
 
+def chdir_temp_copy(folder):
+    """Copy the folder to a new temporary directory, and change to it."""
+    temp_dir = tempfile.mkdtemp()
+    temp_dirs.append(temp_dir)
+    os.chdir(shutil.copytree(folder, os.path.join(temp_dir, os.path.basename(folder))))
+
+
 # Create dummy methods on the object purely to hold doctests
 missing_deps = set()
 for rst in files:
@@ -227,10 +246,13 @@ for rst in files:
             missing_deps.update(missing)
             continue
 
-        def funct(n, d, f):
+        def funct(n, d, f, tmp):
             global tutorial_base
             method = lambda x: None  # noqa: E731
-            if f:
+            if tmp:
+                p = os.path.join(tutorial_base, f)
+                method.__doc__ = f"{n}\n\n>>> chdir_temp_copy({p!r})\n{d}\n"
+            elif f:
                 p = os.path.join(tutorial_base, f)
                 method.__doc__ = f"{n}\n\n>>> import os\n>>> os.chdir({p!r})\n{d}\n"
             else:
@@ -241,7 +263,7 @@ for rst in files:
         setattr(
             TutorialDocTestHolder,
             f"doctest_{name.replace(' ', '_')}",
-            funct(name, example, folder),
+            funct(name, example, folder, "tmp" in deps),
         )
         del funct
 
@@ -273,12 +295,9 @@ class TutorialTestCase(unittest.TestCase):
     def tearDown(self):
         global original_path
         os.chdir(original_path)
-        # files currently don't get created during test with python3.5 and pypy
-        # remove files created from chapter_phylo.tex
-        delete_phylo_tutorial = ["examples/tree1.nwk", "examples/other_trees.xml"]
-        for file in delete_phylo_tutorial:
-            if os.path.exists(os.path.join(tutorial_base, file)):
-                os.remove(os.path.join(tutorial_base, file))
+        # remove the temporary copies used by tests writing files
+        while temp_dirs:
+            shutil.rmtree(temp_dirs.pop())
         # remove files created from chapter_cluster.tex
         tutorial_cluster_base = os.path.abspath("../Tests/")
         delete_cluster_tutorial = [
@@ -23,6 +23,9 @@ except ImportError:
 
 from Bio import BiopythonDeprecationWarning
 from Bio import motifs
+from Bio.motifs.scanner import MotifScanner
+from Bio.motifs.thresholds import thresholds_for
+from Bio.Seq import MutableSeq
 from Bio.Seq import Seq
 
 
@@ -6311,6 +6314,124 @@ class MotifTestPWM(unittest.TestCase):
         self.assertAlmostEqual(pseudocounts["T"], 1.695582495781317, places=5)
 
 
+class TestMotifScanner(unittest.TestCase):
+    """Tests for scanning a sequence for several motifs at once."""
+
+    def setUp(self):
+        with open("motifs/SRF.pfm") as stream:
+            m1 = motifs.read(stream, "pfm")
+        with open("motifs/REB1.pfm") as stream:
+            m2 = motifs.read(stream, "pfm")
+        m3 = motifs.create(["TACAA", "TACGC", "TACAC"])
+        self.motifs = [m1, m2, m3]
+        for motif in self.motifs:
+            motif.pseudocounts = 0.5
+        self.thresholds = [2.0, 3.0, 1.0]
+        rng = np.random.default_rng(7)
+        letters = np.frombuffer(b"ACGTacgtN", "S1")
+        self.sequence = rng.choice(letters, 5000).tobytes().decode()
+
+    def get_expected(self):
+        sequence = Seq(self.sequence.upper())
+        expected = []
+        for index, (motif, threshold) in enumerate(zip(self.motifs, self.thresholds)):
+            for position, score in motif.pssm.search(sequence, threshold):
+                expected.append((position, index, score))
+        return sorted(expected, key=lambda hit: (hit[0] < 0, abs(hit[0]), hit[1]))
+
+    def check_hits(self, results, expected):
+        motifs = np.concatenate([hits.motifs for hits in results])
+        positions = np.concatenate([hits.positions for hits in results])
+        scores = np.concatenate([hits.scores for hits in results])
+        self.assertEqual(len(positions), len(expected))
+        # hits are sorted by start position, then by strand
+        starts = np.where(positions < 0, positions + len(self.sequence), positions)
+        self.assertTrue(np.all(np.diff(starts) >= 0))
+        found = sorted(zip(positions.tolist(), motifs.tolist(), scores.tolist()))
+        for (position, index, score), hit in zip(sorted(expected), found):
+            self.assertEqual(position, hit[0])
+            self.assertEqual(index, hit[1])
+            self.assertAlmostEqual(score, hit[2], places=5)
+
+    def test_search(self):
+        scanner = MotifScanner(self.motifs, self.thresholds)
+        expected = self.get_expected()
+        self.assertGreater(len(expected), 0)
+        data = self.sequence.encode()
+        for sequence in (
+            self.sequence,
+            Seq(self.sequence),
+            MutableSeq(self.sequence),
+            data,
+            bytearray(data),
+            memoryview(data),
+        ):
+            results = list(scanner.search(sequence))
+            self.assertEqual(len(results), 1)
+            self.check_hits(results, expected)
+        for threads in (1, 2):
+            results = list(
+                scanner.search(self.sequence, chunksize=333, threads=threads)
+            )
+            self.assertEqual(len(results), 16)
+            self.check_hits(results, expected)
+        # PSSMs can be used directly
+        scanner = MotifScanner([motif.pssm for motif in self.motifs], self.thresholds)
+        self.check_hits(list(scanner.search(self.sequence)), expected)
+
+    def test_forward(self):
+        scanner = MotifScanner(self.motifs, self.thresholds, both=False)
+        expected = [hit for hit in self.get_expected() if hit[0] >= 0]
+        self.check_hits(list(scanner.search(self.sequence, chunksize=1000)), expected)
+
+    def test_errors(self):
+        self.assertRaises(ValueError, MotifScanner, self.motifs, [1.0, 2.0])
+        protein = motifs.create(["ACDE", "ACDF"], alphabet="ACDEF")
+        self.assertRaises(ValueError, MotifScanner, [protein])
+        scanner = MotifScanner(self.motifs)
+        with self.assertRaises(ValueError):
+            next(scanner.search(self.sequence, threads=0))
+        with self.assertRaises(ValueError):
+            next(scanner.search(12345))
+
+
+class TestScoreDistribution(unittest.TestCase):
+    """Tests for the thresholds calculated from score distributions."""
+
+    def setUp(self):
+        with open("motifs/SRF.pfm") as stream:
+            self.m1 = motifs.read(stream, "pfm")
+        self.m1.pseudocounts = 0.5
+        self.m2 = motifs.create(["TACAA", "TACGC", "TACAC"])
+        self.m2.pseudocounts = 1.0
+
+    def test_thresholds(self):
+        background = {"A": 0.3, "C": 0.2, "G": 0.2, "T": 0.3}
+        distribution = self.m1.pssm.distribution(background, precision=10**3)
+        self.assertAlmostEqual(sum(distribution.bg_density), 1.0)
+        self.assertAlmostEqual(distribution.threshold_fpr(0.01), -2.869964, places=5)
+        self.assertAlmostEqual(distribution.threshold_fnr(0.1), 9.582095, places=5)
+        threshold, rate = distribution.threshold_balanced(1000, return_rate=True)
+        self.assertAlmostEqual(threshold, 8.841474, places=5)
+        self.assertAlmostEqual(rate, 0.000111, places=6)
+        self.assertAlmostEqual(distribution.threshold_patser(), 12.418129, places=5)
+        # the densities are cached
+        other = self.m1.pssm.distribution(background, precision=10**3)
+        self.assertIs(other.bg_density, distribution.bg_density)
+
+    def test_thresholds_for(self):
+        thresholds = thresholds_for([self.m1, self.m2.pssm], fpr=0.01)
+        self.assertEqual(len(thresholds), 2)
+        self.assertAlmostEqual(
+            thresholds[0], self.m1.pssm.distribution().threshold_fpr(0.01)
+        )
+        self.assertAlmostEqual(thresholds[1], 3.133707, places=5)
+        thresholds = thresholds_for([self.m2], fnr=0.1)
+        self.assertAlmostEqual(thresholds[0], -1.035775, places=5)
+        self.assertRaises(ValueError, thresholds_for, [self.m1])
+        self.assertRaises(ValueError, thresholds_for, [self.m1], fpr=0.1, fnr=0.1)
+
+
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
     unittest.main(testRunner=runner)
@@ -20,6 +20,7 @@ except ImportError:
 
 from Bio import Align
 from Bio import SeqIO
+from Bio.Align import substitution_matrices
 from Bio.Seq import reverse_complement
 from Bio.Seq import Seq
 from Bio.SeqRecord import SeqRecord
@@ -444,6 +445,166 @@ query             1 A-B 3
         )
 
 
+class TestPairwiseLinearSpace(unittest.TestCase):
+    def check_alignment(self, aligner, target, query, strand="+"):
+        # compare to the alignments found using the full traceback matrix
+        aligner.linear_space = False
+        alignments = aligner.align(target, query, strand)
+        aligner.linear_space = True
+        linear_space_alignments = aligner.align(target, query, strand)
+        self.assertAlmostEqual(linear_space_alignments.score, alignments.score)
+        self.assertEqual(len(linear_space_alignments), 1)
+        alignment = linear_space_alignments[0]
+        self.assertAlmostEqual(alignment.score, alignments.score)
+        coordinates = [alignment.coordinates.tolist() for alignment in alignments]
+        self.assertIn(alignment.coordinates.tolist(), coordinates)
+        return alignment
+
+    def test_hirschberg_global(self):
+        aligner = Align.PairwiseAligner(mismatch_score=-1, gap_score=-1)
+        aligner.linear_space = True
+        self.assertEqual(aligner.algorithm, "Hirschberg global alignment algorithm")
+        self.assertIn("linear_space: True", str(aligner))
+        alignment = self.check_alignment(aligner, "GAACTGACCGTA", "GACTTGACGTA")
+        self.assertEqual(
+            str(alignment),
+            """\
+target            0 GAAC-TGACCGTA 12
+                  0 |-||-|||-|||| 13
+query             0 G-ACTTGA-CGTA 11
+""",
+        )
+
+    def test_myers_miller_global(self):
+        aligner = Align.PairwiseAligner(
+            match_score=2, mismatch_score=-3, open_gap_score=-5, extend_gap_score=-2
+        )
+        aligner.target_end_gap_score = 0.0
+        aligner.linear_space = True
+        self.assertEqual(aligner.algorithm, "Myers-Miller global alignment algorithm")
+        alignment = self.check_alignment(aligner, "ACGTTTTAGCA", "TTGACGTTAGCATT")
+        self.assertAlmostEqual(alignment.score, 11.0)
+        alignment = self.check_alignment(aligner, "ACGTTTTAGCA", "TGCTAAAACGTTT", "-")
+        self.assertAlmostEqual(alignment.score, 22.0)
+
+    def test_myers_miller_local(self):
+        aligner = Align.PairwiseAligner(mode="local", scoring="blastp")
+        aligner.linear_space = True
+        self.assertEqual(aligner.algorithm, "Myers-Miller local alignment algorithm")
+        alignment = self.check_alignment(
+            aligner, "PPPMKEVLAGHWCRHEELLPP", "WWMKEVLAGHWLLHEELLW"
+        )
+        self.assertEqual(
+            str(alignment),
+            """\
+target            3 MKEVLAGHWCRHEELL 19
+                  0 |||||||||..||||| 16
+query             2 MKEVLAGHWLLHEELL 18
+""",
+        )
+        aligner.mismatch_score = -1
+        alignments = aligner.align("AAAA", "WWWW")
+        self.assertAlmostEqual(alignments.score, 0.0)
+        self.assertEqual(len(alignments), 0)
+
+    def test_long_sequences(self):
+        # long enough to require several rounds of divide-and-conquer
+        target = "ACGTTGACCTGATTACAGGTCA" * 20
+        query = target[5:200] + "TTTT" + target[220:410]
+        aligner = Align.PairwiseAligner(
+            mismatch_score=-1, open_gap_score=-2, extend_gap_score=-0.5
+        )
+        for mode in ("global", "local"):
+            aligner.mode = mode
+            aligner.linear_space = True
+            alignment = aligner.align(target, query)[0]
+            aligner.linear_space = False
+            self.assertAlmostEqual(alignment.score, aligner.score(target, query))
+        self.assertEqual(alignment.coordinates[1, 0], 0)
+        self.assertEqual(alignment.coordinates[1, -1], len(query))
+
+    def test_gap_function(self):
+        aligner = Align.PairwiseAligner(linear_space=True)
+        aligner.target_gap_score = lambda i, n: -n
+        with self.assertRaises(ValueError):
+            aligner.align("ACGT", "AGT")
+
+
+class TestQueryProfile(unittest.TestCase):
+    def test_substitution_matrix(self):
+        aligner = Align.PairwiseAligner(scoring="blastp")
+        query = "MKEVLAGHWLLHEELLW"
+        profile = Align.QueryProfile(aligner, query)
+        self.assertEqual(len(profile), len(query))
+        for mode in ("global", "local"):
+            aligner.mode = mode
+            for target in ("PPPMKEVLAGHWCRHEELLPP", "KEVLA", "WWWWW"):
+                self.assertAlmostEqual(
+                    aligner.score(target, profile), aligner.score(target, query)
+                )
+                alignments = aligner.align(target, profile)
+                expected = aligner.align(target, query)
+                self.assertAlmostEqual(alignments.score, expected.score)
+                self.assertEqual(len(alignments), len(expected))
+                for alignment, expected_alignment in zip(alignments, expected):
+                    self.assertEqual(str(alignment), str(expected_alignment))
+
+    def test_match_mismatch(self):
+        aligner = Align.PairwiseAligner(mismatch_score=-1, gap_score=-1)
+        query = Seq("ACGTTGCA")
+        profile = Align.QueryProfile(aligner, query)
+        target = "CAACGTTCA"
+        for strand in "+-":
+            self.assertAlmostEqual(
+                aligner.score(target, profile, strand),
+                aligner.score(target, query, strand),
+            )
+            alignments = aligner.align(target, profile, strand)
+            expected = aligner.align(target, query, strand)
+            self.assertEqual(len(alignments), len(expected))
+            self.assertEqual(str(alignments[0]), str(expected[0]))
+            self.assertIs(alignments[0].query, query)
+
+    def test_alphabet(self):
+        aligner = Align.PairwiseAligner(mismatch_score=-1)
+        aligner.alphabet = "ACGT"
+        profile = Align.QueryProfile(aligner, "ACGT")
+        self.assertAlmostEqual(aligner.score("ACGT", "ACGT"), 4.0)
+        self.assertAlmostEqual(aligner.score("ACGT", profile), 4.0)
+        self.assertAlmostEqual(
+            aligner.score("AGGT", profile), aligner.score("AGGT", "ACGT")
+        )
+        with self.assertRaises(ValueError):
+            Align.QueryProfile(aligner, "ACGTN")
+
+    def test_alphabet_changed(self):
+        aligner = Align.PairwiseAligner()
+        aligner.alphabet = "ACGT"
+        profile = Align.QueryProfile(aligner, "ACGT")
+        aligner.alphabet = "TGCA"
+        with self.assertRaises(ValueError):
+            aligner.score("ACGT", profile)
+
+    def test_wildcard_changed(self):
+        aligner = Align.PairwiseAligner()
+        profile = Align.QueryProfile(aligner, "ACGT")
+        aligner.wildcard = "N"
+        with self.assertRaises(ValueError):
+            aligner.score("ACGT", profile)
+
+    def test_substitution_matrix_changed(self):
+        aligner = Align.PairwiseAligner(scoring="blastp")
+        profile = Align.QueryProfile(aligner, "KEVLA")
+        aligner.substitution_matrix = substitution_matrices.load("BLOSUM80")
+        with self.assertRaises(ValueError):
+            aligner.score("EVL", profile)
+
+    def test_letters_not_in_alphabet(self):
+        aligner = Align.PairwiseAligner(scoring="blastp")
+        with self.assertRaises(ValueError):
+            Align.QueryProfile(aligner, "KEVLA#")
+
+
 class TestUnknownCharacter(unittest.TestCase):
     def test_needlemanwunsch_simple1(self):
         seq1 = "GACT"
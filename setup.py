@@ -206,6 +206,7 @@ EXTENSIONS = [
     Extension("Bio.PDB.ccealign", ["Bio/PDB/ccealignmodule.c"]),
     Extension("Bio.PDB.kdtrees", ["Bio/PDB/kdtrees.c"]),
     Extension("Bio.PDB._bcif_helper", ["Bio/PDB/bcifhelpermodule.c"]),
+    Extension("Bio.PDB._mmcif_tokenizer", ["Bio/PDB/mmciftokenizermodule.c"]),
     Extension("Bio.SeqIO._twoBitIO", ["Bio/SeqIO/_twoBitIO.c"]),
 ]
 